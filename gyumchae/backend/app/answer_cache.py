@@ -0,0 +1,239 @@
+from datetime import datetime, timedelta
+from typing import List, Optional
+from sqlalchemy import bindparam, delete, func, select, update
+from sqlalchemy.dialects.sqlite import insert
+from app.database import engine
+from app.models import ChatAnswerBand, ChatAnswerCache
+import hashlib
+import os
+import re
+import threading
+
+# AI 채팅 답변 캐시 - 유효 시간(초, 0이면 사용 안 함), 최대 항목 수(넘으면 오래 안 쓴 것부터 삭제)
+AI_CHAT_CACHE_TTL = float(os.getenv("AI_CHAT_CACHE_TTL", "86400"))
+AI_CHAT_CACHE_MAX_ENTRIES = int(os.getenv("AI_CHAT_CACHE_MAX_ENTRIES", "2000"))
+# 유사 질문으로 볼 최소 유사도 (문자 bigram Jaccard 추정치)
+AI_CHAT_CACHE_SIMILARITY = float(os.getenv("AI_CHAT_CACHE_SIMILARITY", "0.8"))
+
+# MinHash 서명 길이 = 밴드 수 x 밴드당 행 수 (LSH)
+MINHASH_BANDS = 16
+MINHASH_ROWS = 4
+_MERSENNE_PRIME = (1 << 61) - 1
+_PERMUTATIONS = [
+    (int.from_bytes(hashlib.blake2b(f"a{i}".encode(), digest_size=8).digest(), "big") % (_MERSENNE_PRIME - 1) + 1,
+     int.from_bytes(hashlib.blake2b(f"b{i}".encode(), digest_size=8).digest(), "big") % _MERSENNE_PRIME)
+    for i in range(MINHASH_BANDS * MINHASH_ROWS)
+]
+
+_WORD_RE = re.compile(r"[0-9a-z]+|[가-힣]+")
+
+# 질문 내용과 관계없는 표현 (추천 요청 문구, 위치 표현, 어미) - 같은 질문의 변형을 같은 키로 묶음
+_FILLER_WORDS = {
+    "추천", "추천해", "추천해줘", "추천해주세요", "추천해줄", "추천해줄수있어", "추천좀", "수", "있어", "있나요", "있어요",
+    "어떤", "어떤거", "뭐", "뭐가", "어디", "어디야", "어디에", "어디가", "좀", "알려줘", "알려주세요",
+    "한림대", "한림대에서", "한림대학교", "주변", "주변에서", "근처", "근처에", "맛집", "가게", "곳",
+}
+
+def normalize_question(message: str) -> str:
+    """캐시 키용 질문 정규화 (소문자, 기호 제거, 추천 요청 문구 제거)"""
+    words = _WORD_RE.findall(message.casefold())
+    return " ".join(word for word in words if word not in _FILLER_WORDS)
+
+def _shingles(question_key: str) -> set:
+    text = question_key.replace(" ", "")
+    if len(text) < 2:
+        return {text}
+    return {text[i:i + 2] for i in range(len(text) - 1)}
+
+def minhash_signature(question_key: str) -> List[int]:
+    hashes = [int.from_bytes(hashlib.blake2b(s.encode(), digest_size=8).digest(), "big") for s in _shingles(question_key)]
+    return [min((a * h + b) % _MERSENNE_PRIME for h in hashes) for a, b in _PERMUTATIONS]
+
+def estimate_similarity(left: List[int], right: List[int]) -> float:
+    return sum(1 for x, y in zip(left, right) if x == y) / len(left)
+
+def _band_keys(catalog_version: str, signature: List[int]) -> List[str]:
+    keys = []
+    for band in range(MINHASH_BANDS):
+        rows = signature[band * MINHASH_ROWS:(band + 1) * MINHASH_ROWS]
+        digest = hashlib.blake2b(",".join(map(str, rows)).encode(), digest_size=8).hexdigest()
+        keys.append(f"{catalog_version}:{band}:{digest}")
+    return keys
+
+class AnswerCache:
+    """
+    AI 채팅 답변 캐시 (SQLite 테이블)
+    키 = 정규화된 질문 + 카탈로그 버전 (restaurants.json/가게가 바뀌면 자동으로 새 키).
+    정확히 같은 질문이 없으면 MinHash LSH 밴드 테이블로 비슷한 질문을 찾는다.
+    조회는 읽기만 하고, 적중 수/마지막 사용 시각은 메모리에 모았다가 저장(store) 때 함께 반영한다.
+    (항목 수만큼만 쌓이고, LRU 정리는 store 안에서만 일어나므로 정리 전에 항상 반영됨)
+    """
+
+    def __init__(self, ttl: float, max_entries: int, similarity: float, bind=engine):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.similarity = similarity
+        self._bind = bind
+        self._lock = threading.Lock()
+        # 아직 테이블에 반영하지 않은 적중 {항목 id: [적중 수, 마지막 사용 시각]}
+        self._touches = {}
+        self.exact_hits = 0
+        self.similar_hits = 0
+        self.misses = 0
+        self.saved_ms = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0
+
+    def lookup(self, message: str, catalog_version: str) -> Optional[str]:
+        """캐시된 답변 반환 (없으면 None)"""
+        if not self.enabled:
+            return None
+        question_key = normalize_question(message)
+        expires_before = datetime.utcnow() - timedelta(seconds=self.ttl)
+        with self._bind.connect() as conn:
+            row = conn.execute(
+                select(ChatAnswerCache.id, ChatAnswerCache.answer, ChatAnswerCache.generation_ms)
+                .where(ChatAnswerCache.catalog_version == catalog_version)
+                .where(ChatAnswerCache.question_key == question_key)
+                .where(ChatAnswerCache.created_at >= expires_before)
+            ).first()
+            exact = row is not None
+            if not exact:
+                row = self._find_similar(conn, question_key, catalog_version, expires_before)
+            if row is None:
+                with self._lock:
+                    self.misses += 1
+                return None
+        with self._lock:
+            touch = self._touches.setdefault(row.id, [0, None])
+            touch[0] += 1
+            touch[1] = datetime.utcnow()
+            if exact:
+                self.exact_hits += 1
+            else:
+                self.similar_hits += 1
+            self.saved_ms += row.generation_ms
+        return row.answer
+
+    def _find_similar(self, conn, question_key: str, catalog_version: str, expires_before):
+        signature = minhash_signature(question_key)
+        candidates = conn.execute(
+            select(ChatAnswerCache.id, ChatAnswerCache.answer, ChatAnswerCache.generation_ms, ChatAnswerCache.signature)
+            .where(ChatAnswerCache.id.in_(
+                select(ChatAnswerBand.entry_id).where(ChatAnswerBand.band_key.in_(_band_keys(catalog_version, signature)))
+            ))
+            .where(ChatAnswerCache.created_at >= expires_before)
+        ).all()
+        best, best_score = None, self.similarity
+        for candidate in candidates:
+            score = estimate_similarity(signature, [int(v) for v in candidate.signature.split(",")])
+            if score >= best_score:
+                best, best_score = candidate, score
+        return best
+
+    def store(self, message: str, catalog_version: str, answer: str, generation_ms: int):
+        """새 답변 저장 후 만료/다른 버전/초과 항목 정리"""
+        if not self.enabled or not answer:
+            return
+        question_key = normalize_question(message)
+        signature = minhash_signature(question_key)
+        now = datetime.utcnow()
+        with self._bind.begin() as conn:
+            result = conn.execute(
+                insert(ChatAnswerCache)
+                .values(
+                    catalog_version=catalog_version,
+                    question_key=question_key,
+                    signature=",".join(map(str, signature)),
+                    answer=answer,
+                    generation_ms=generation_ms,
+                    hits=0,
+                    created_at=now,
+                    last_used_at=now,
+                )
+                # 같은 질문이 동시에 들어와 먼저 저장된 경우
+                .on_conflict_do_nothing(index_elements=["catalog_version", "question_key"])
+            )
+            if result.rowcount:
+                entry_id = result.inserted_primary_key[0]
+                conn.execute(
+                    insert(ChatAnswerBand),
+                    [{"entry_id": entry_id, "band": band, "band_key": key}
+                     for band, key in enumerate(_band_keys(catalog_version, signature))],
+                )
+            self._flush_touches(conn)
+            self._evict(conn, catalog_version, now)
+
+    def flush_touches(self):
+        """모아 둔 적중 수/마지막 사용 시각을 테이블에 반영 (서버 종료 시 호출)"""
+        with self._bind.begin() as conn:
+            self._flush_touches(conn)
+
+    def _flush_touches(self, conn):
+        with self._lock:
+            touches, self._touches = self._touches, {}
+        if not touches:
+            return
+        try:
+            # 그사이 삭제된 항목은 UPDATE 대상이 없어 그냥 넘어감
+            conn.execute(
+                update(ChatAnswerCache)
+                .where(ChatAnswerCache.id == bindparam("touch_id"))
+                .values(hits=ChatAnswerCache.hits + bindparam("touch_hits"), last_used_at=bindparam("touch_used_at")),
+                [{"touch_id": entry_id, "touch_hits": hits, "touch_used_at": used_at}
+                 for entry_id, (hits, used_at) in touches.items()],
+            )
+        except Exception:
+            # 실패하면 다음 반영 때 다시 시도
+            with self._lock:
+                for entry_id, (hits, used_at) in touches.items():
+                    touch = self._touches.setdefault(entry_id, [0, used_at])
+                    touch[0] += hits
+                    touch[1] = max(touch[1], used_at)
+            raise
+
+    def _evict(self, conn, catalog_version: str, now: datetime):
+        expired = (ChatAnswerCache.catalog_version != catalog_version) | (
+            ChatAnswerCache.created_at < now - timedelta(seconds=self.ttl)
+        )
+        stale_ids = select(ChatAnswerCache.id).where(expired)
+        overflow = conn.execute(select(func.count()).select_from(ChatAnswerCache)).scalar() - self.max_entries
+        if overflow > 0:
+            # 오래 사용하지 않은 항목부터 (LRU)
+            stale_ids = stale_ids.union(
+                select(ChatAnswerCache.id).order_by(ChatAnswerCache.last_used_at.asc(), ChatAnswerCache.id.asc()).limit(overflow)
+            )
+        ids = [row[0] for row in conn.execute(stale_ids)]
+        if ids:
+            conn.execute(delete(ChatAnswerBand).where(ChatAnswerBand.entry_id.in_(ids)))
+            conn.execute(delete(ChatAnswerCache).where(ChatAnswerCache.id.in_(ids)))
+
+    def clear(self):
+        with self._lock:
+            self._touches = {}
+        with self._bind.begin() as conn:
+            conn.execute(delete(ChatAnswerBand))
+            conn.execute(delete(ChatAnswerCache))
+
+    def stats(self) -> dict:
+        with self._bind.connect() as conn:
+            entries = conn.execute(select(func.count()).select_from(ChatAnswerCache)).scalar()
+        lookups = self.exact_hits + self.similar_hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "entries": entries,
+            "max_entries": self.max_entries,
+            "exact_hits": self.exact_hits,
+            "similar_hits": self.similar_hits,
+            "misses": self.misses,
+            "hit_rate": round((self.exact_hits + self.similar_hits) / lookups, 3) if lookups else 0.0,
+            "saved_ms": self.saved_ms,
+        }
+
+answer_cache = AnswerCache(
+    ttl=AI_CHAT_CACHE_TTL,
+    max_entries=AI_CHAT_CACHE_MAX_ENTRIES,
+    similarity=AI_CHAT_CACHE_SIMILARITY,
+)
@@ -1,43 +1,54 @@
+from dataclasses import dataclass
 from datetime import datetime, timedelta
 from typing import Optional
 from jose import JWTError, jwt
-import bcrypt
-from fastapi import Depends, HTTPException, status
-from fastapi.security import OAuth2PasswordBearer
-from sqlalchemy.orm import Session
-from app.database import get_db
-from app.models import User
+from fastapi import Depends, HTTPException, Security, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer, OAuth2PasswordBearer
+from sqlalchemy import event, inspect
+from app.cache import TTLCache
+from app.database import SessionLocal
+from app.models import User, UserRole
+from app.passwords import verify_password, get_password_hash, password_pool  # noqa: F401 (기존 import 경로 유지)
 import os
+import time
 
 SECRET_KEY = os.getenv("SECRET_KEY", "your-secret-key-change-in-production")
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
 
+# 인증된 사용자 캐시 (토큰 subject = username 기준)
+AUTH_USER_CACHE_SIZE = int(os.getenv("AUTH_USER_CACHE_SIZE", "10000"))
+AUTH_USER_CACHE_TTL = float(os.getenv("AUTH_USER_CACHE_TTL", "300"))
+
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="api/auth/login")
+optional_bearer_scheme = HTTPBearer(auto_error=False)
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    """비밀번호 검증 - bcrypt 직접 사용"""
-    try:
-        password_bytes = plain_password.encode('utf-8')
-        # 72바이트 제한
-        if len(password_bytes) > 72:
-            password_bytes = password_bytes[:72]
-        return bcrypt.checkpw(password_bytes, hashed_password.encode('utf-8'))
-    except Exception:
-        return False
-
-def get_password_hash(password: str) -> str:
-    """비밀번호 해싱 - bcrypt 직접 사용 (passlib 우회)"""
-    # bcrypt는 최대 72바이트까지만 지원
-    password_bytes = password.encode('utf-8')
-    if len(password_bytes) > 72:
-        # 72바이트로 제한
-        password_bytes = password_bytes[:72]
-    
-    # bcrypt 직접 사용 (passlib 우회로 버전 호환성 문제 해결)
-    salt = bcrypt.gensalt(rounds=12)
-    hashed = bcrypt.hashpw(password_bytes, salt)
-    return hashed.decode('utf-8')
+@dataclass(frozen=True)
+class AuthenticatedUser:
+    """요청 처리에 필요한 사용자 정보 (세션과 분리되어 캐시에 보관 가능)"""
+    id: int
+    username: str
+    role: str = UserRole.USER.value
+    created_at: Optional[datetime] = None
+
+    @classmethod
+    def from_user(cls, user: User) -> "AuthenticatedUser":
+        return cls(id=user.id, username=user.username, role=_role_value(user.role), created_at=user.created_at)
+
+user_cache = TTLCache(maxsize=AUTH_USER_CACHE_SIZE, ttl=AUTH_USER_CACHE_TTL)
+# 정보가 바뀐 사용자 {username: 변경 시각(epoch 초)} - 그 전에 발급된 토큰의 클레임은 믿지 않음
+# 토큰 유효 시간 동안만 보관 (그 뒤에는 변경 전에 발급된 토큰이 모두 만료됨)
+changed_users = TTLCache(maxsize=AUTH_USER_CACHE_SIZE, ttl=ACCESS_TOKEN_EXPIRE_MINUTES * 60)
+
+def _role_value(role) -> str:
+    if role is None:
+        return UserRole.USER.value
+    return role.value if isinstance(role, UserRole) else str(role)
+
+def token_claims(user: User) -> dict:
+    """액세스 토큰에 담을 클레임 (subject + 사용자 id, 역할)"""
+    return {"sub": user.username, "uid": user.id, "role": _role_value(user.role)}
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     to_encode = data.copy()
@@ -45,21 +56,59 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
         expire = datetime.utcnow() + expires_delta
     else:
         expire = datetime.utcnow() + timedelta(minutes=15)
-    to_encode.update({"exp": expire})
+    # 발급 시각 - 사용자 정보가 바뀐 뒤에도 클레임을 그대로 믿어도 되는지 판단
+    to_encode.update({"exp": expire, "iat": time.time()})
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
-def get_current_user(
-    token: str = Depends(oauth2_scheme),
-    db: Session = Depends(get_db)
-) -> User:
+def decode_access_token(token: str) -> dict:
+    return jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+
+def invalidate_user(username: str):
+    """사용자 정보가 바뀌었을 때 캐시에서 제거"""
+    user_cache.pop(username)
+    changed_users.set(username, time.time())
+
+def _claims_user(payload: dict) -> Optional[AuthenticatedUser]:
+    """
+    토큰 클레임만으로 사용자 식별 (DB/캐시 조회 없음)
+    uid가 없는 예전 토큰이거나, 발급 후 사용자 정보가 바뀌었으면(삭제/권한 변경 등) None
+    """
+    if "uid" not in payload:
+        return None
+    changed_at = changed_users.get(payload["sub"])
+    if changed_at is not None and payload.get("iat", 0) <= changed_at:
+        return None
+    return AuthenticatedUser(id=payload["uid"], username=payload["sub"], role=payload.get("role", UserRole.USER.value))
+
+def _load_user(username: str) -> Optional[AuthenticatedUser]:
+    db = SessionLocal()
+    try:
+        user = db.query(User).filter(User.username == username).first()
+        return AuthenticatedUser.from_user(user) if user else None
+    finally:
+        db.close()
+
+async def _resolve_user(payload: dict) -> Optional[AuthenticatedUser]:
+    """캐시에 있으면 DB 조회 없이 반환, 없으면 한 번 조회 후 캐시"""
+    username = payload.get("sub")
+    user = user_cache.get(username)
+    # 같은 이름으로 다시 가입한 경우 등 토큰의 uid와 다르면 다시 조회
+    if user is not None and payload.get("uid", user.id) == user.id:
+        return user
+    user = await run_in_threadpool(_load_user, username)
+    if user is not None:
+        user_cache.set(username, user)
+    return user
+
+async def get_current_user(token: str = Depends(oauth2_scheme)) -> AuthenticatedUser:
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="로그인이 필요합니다.",
         headers={"WWW-Authenticate": "Bearer"},
     )
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        payload = decode_access_token(token)
         username: str = payload.get("sub")
         if username is None:
             raise credentials_exception
@@ -69,7 +118,7 @@ def get_current_user(
             detail="토큰이 만료되었거나 유효하지 않습니다. 다시 로그인해주세요.",
             headers={"WWW-Authenticate": "Bearer"},
         )
-    user = db.query(User).filter(User.username == username).first()
+    user = await _resolve_user(payload)
     if user is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -78,3 +127,36 @@ def get_current_user(
         )
     return user
 
+async def get_current_admin(user: AuthenticatedUser = Depends(get_current_user)) -> AuthenticatedUser:
+    """관리자 전용 API"""
+    if user.role != UserRole.ADMIN.value:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="관리자만 사용할 수 있습니다."
+        )
+    return user
+
+async def get_current_user_optional(
+    credentials: Optional[HTTPAuthorizationCredentials] = Security(optional_bearer_scheme)
+) -> Optional[AuthenticatedUser]:
+    """선택적 인증 - 토큰이 없거나 유효하지 않으면 None"""
+    if not credentials:
+        return None
+    try:
+        payload = decode_access_token(credentials.credentials)
+    except JWTError:
+        return None
+    username = payload.get("sub")
+    if not username:
+        return None
+    # 무상태 경로: 발급 후 바뀌지 않은 사용자는 클레임으로 식별 (피드 조회에서 users 테이블을 읽지 않음)
+    # 바뀐 사용자는 get_current_user와 같은 캐시/DB 경로로 다시 확인 (삭제되면 비로그인으로 처리)
+    return _claims_user(payload) or await _resolve_user(payload)
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _invalidate_changed_user(mapper, connection, target):
+    # 사용자명이 바뀐 경우 이전 이름의 캐시도 제거
+    for username in inspect(target).attrs.username.history.deleted or ():
+        invalidate_user(username)
+    invalidate_user(target.username)
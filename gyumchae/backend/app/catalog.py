@@ -0,0 +1,246 @@
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from app.database import SessionLocal
+from app.models import Store
+import hashlib
+import json
+import os
+import threading
+import time
+
+# 한림대 주변 음식점 JSON 파일 경로
+RESTAURANTS_JSON_PATH = os.getenv("RESTAURANTS_JSON_PATH", "restaurants.json")
+
+# 파일 변경 확인(stat) 최소 간격(초) - 요청마다 파일 시스템을 건드리지 않도록
+CATALOG_RELOAD_CHECK_INTERVAL = float(os.getenv("CATALOG_RELOAD_CHECK_INTERVAL", "2"))
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent  # app -> backend
+
+@dataclass(frozen=True)
+class Restaurant:
+    """음식점 레코드 (restaurants.json 항목 또는 stores 테이블 행)"""
+    name: str
+    category: str
+    description: Optional[str] = None
+    menu: Tuple[str, ...] = ()
+    price_range: Optional[str] = None
+    address: Optional[str] = None
+    store_id: Optional[int] = None
+
+    @classmethod
+    def from_json(cls, item: dict) -> "Restaurant":
+        menu = item.get("menu") or ()
+        if isinstance(menu, str):
+            menu = (menu,)
+        return cls(
+            name=str(item.get("name", "")).strip(),
+            category=str(item.get("category") or "기타").strip(),
+            description=item.get("description"),
+            menu=tuple(str(m) for m in menu),
+            price_range=item.get("price_range"),
+            address=item.get("address"),
+        )
+
+    @classmethod
+    def from_store(cls, store: Store) -> "Restaurant":
+        category = store.category.value if store.category is not None else "기타"
+        try:
+            menu = json.loads(store.menu) if store.menu else ()
+        except ValueError:
+            menu = (store.menu,)
+        return cls(
+            name=store.name,
+            category=category,
+            description=store.description,
+            menu=tuple(str(m) for m in menu),
+            price_range=store.price_range,
+            address=store.address,
+            store_id=store.id,
+        )
+
+    def to_dict(self) -> dict:
+        """restaurants.json과 같은 형태의 딕셔너리 (빈 값 제외)"""
+        data = {"name": self.name, "category": self.category}
+        if self.description:
+            data["description"] = self.description
+        if self.menu:
+            data["menu"] = list(self.menu)
+        if self.price_range:
+            data["price_range"] = self.price_range
+        if self.address:
+            data["address"] = self.address
+        return data
+
+@dataclass(frozen=True)
+class CatalogSnapshot:
+    """특정 시점의 음식점 카탈로그 (불변 - 요청 간에 안전하게 공유)"""
+    version: str
+    restaurants: Tuple[Restaurant, ...]
+    path: Optional[Path] = None
+    by_category: Dict[str, Tuple[Restaurant, ...]] = field(default_factory=dict)
+    by_name: Dict[str, Restaurant] = field(default_factory=dict)
+
+    @classmethod
+    def build(cls, version: str, restaurants: List[Restaurant], path: Optional[Path]) -> "CatalogSnapshot":
+        by_category = {}
+        by_name = {}
+        for restaurant in restaurants:
+            by_category.setdefault(restaurant.category, []).append(restaurant)
+            # 같은 이름이면 stores 테이블 행(나중에 추가됨)이 JSON 항목보다 우선
+            by_name[restaurant.name.casefold()] = restaurant
+        return cls(
+            version=version,
+            restaurants=tuple(restaurants),
+            path=path,
+            by_category={category: tuple(items) for category, items in by_category.items()},
+            by_name=by_name,
+        )
+
+    def find(self, category: Optional[str] = None, query: Optional[str] = None) -> List[Restaurant]:
+        candidates = self.by_category.get(category, ()) if category else self.restaurants
+        if not query:
+            return list(candidates)
+        needle = query.casefold()
+        return [
+            r for r in candidates
+            if needle in r.name.casefold() or any(needle in m.casefold() for m in r.menu)
+        ]
+
+    def to_json_data(self) -> Optional[dict]:
+        if not self.restaurants:
+            return None
+        return {"restaurants": [r.to_dict() for r in self.restaurants]}
+
+def _candidate_paths() -> List[Path]:
+    project_root = BACKEND_DIR.parent  # backend -> gyumchae
+    configured = Path(RESTAURANTS_JSON_PATH)
+    return [
+        configured if configured.is_absolute() else BACKEND_DIR / configured,  # 환경 변수로 지정된 경로
+        BACKEND_DIR / "restaurants.json",  # backend/restaurants.json
+        project_root / "restaurants.json",  # gyumchae/restaurants.json
+        project_root / configured,  # gyumchae/환경변수경로
+        Path.cwd() / "restaurants.json",  # 현재 작업 디렉토리
+        Path.cwd() / "backend" / "restaurants.json",  # 현재작업디렉토리/backend/restaurants.json
+    ]
+
+class RestaurantCatalog:
+    """
+    프로세스 전역 음식점 카탈로그
+    restaurants.json과 stores 테이블을 한 번 읽어 메모리 인덱스로 보관하고,
+    파일의 mtime/해시가 바뀌었거나 가게 정보가 변경됐을 때만 다시 읽는다.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._snapshot = CatalogSnapshot.build("empty", [], None)
+        self._path = None
+        self._mtime = None
+        self._file_hash = None
+        self._json_restaurants = []
+        self._store_restaurants = []
+        self._stores_dirty = True
+        self._last_check = 0.0
+        self._loaded = False
+
+    def load(self) -> CatalogSnapshot:
+        """파일과 stores 테이블을 (다시) 읽어 스냅샷 갱신"""
+        with self._lock:
+            self._reload_file(force=True)
+            self._reload_stores()
+            self._rebuild()
+            self._loaded = True
+            return self._snapshot
+
+    def snapshot(self) -> CatalogSnapshot:
+        """
+        현재 스냅샷 반환 (필요할 때만 다시 읽음)
+        파일/stores 테이블을 다시 읽을 수 있으므로 async 핸들러에서는 run_in_threadpool로 호출한다.
+        다른 스레드가 다시 읽는 중이면 기다리지 않고 이전 스냅샷을 반환한다.
+        """
+        now = time.monotonic()
+        if self._loaded and not self._stores_dirty and now - self._last_check < CATALOG_RELOAD_CHECK_INTERVAL:
+            return self._snapshot
+        if not self._lock.acquire(blocking=not self._loaded):
+            return self._snapshot
+        try:
+            changed = False
+            if not self._loaded:
+                changed = self._reload_file(force=True)
+                self._loaded = True
+            elif now - self._last_check >= CATALOG_RELOAD_CHECK_INTERVAL:
+                changed = self._reload_file(force=False)
+            if self._stores_dirty:
+                self._reload_stores()
+                changed = True
+            if changed:
+                self._rebuild()
+            return self._snapshot
+        finally:
+            self._lock.release()
+
+    def mark_stores_changed(self):
+        """stores 테이블이 바뀌었음을 알림 (다음 조회 시 다시 읽음)"""
+        self._stores_dirty = True
+
+    def _resolve_path(self) -> Optional[Path]:
+        for path in _candidate_paths():
+            if path.exists():
+                return path.resolve()
+        return None
+
+    def _reload_file(self, force: bool) -> bool:
+        self._last_check = time.monotonic()
+        path = self._path if self._path and self._path.exists() else self._resolve_path()
+        if path is None:
+            if self._path is not None or force:
+                print("⚠️ 음식점 JSON 파일을 찾을 수 없습니다. 다음 경로들을 확인했습니다:")
+                for candidate in _candidate_paths():
+                    print(f"  - {candidate.resolve()}")
+            changed = bool(self._json_restaurants)
+            self._path, self._mtime, self._file_hash, self._json_restaurants = None, None, None, []
+            return changed
+        try:
+            mtime = path.stat().st_mtime_ns
+            if not force and path == self._path and mtime == self._mtime:
+                return False
+            content = path.read_bytes()
+            file_hash = hashlib.sha256(content).hexdigest()
+            self._path, self._mtime = path, mtime
+            if not force and file_hash == self._file_hash:
+                return False
+            data = json.loads(content.decode("utf-8"))
+            items = data.get("restaurants", []) if isinstance(data, dict) else data
+            self._json_restaurants = [Restaurant.from_json(item) for item in items if isinstance(item, dict)]
+            self._file_hash = file_hash
+            print(f"✅ 음식점 데이터 로드 성공: {path} ({len(self._json_restaurants)}개)")
+            return True
+        except Exception as e:
+            # 파일이 잘못됐으면 기존 데이터를 계속 사용
+            print(f"⚠️ 음식점 JSON 파일 로드 오류: {e}")
+            return False
+
+    def _reload_stores(self):
+        self._stores_dirty = False
+        db = SessionLocal()
+        try:
+            stores = db.query(Store).filter(Store.is_active == True).order_by(Store.id.asc()).all()
+            self._store_restaurants = [Restaurant.from_store(store) for store in stores]
+        except Exception as e:
+            print(f"⚠️ stores 테이블 로드 오류: {e}")
+        finally:
+            db.close()
+
+    def _rebuild(self):
+        # 같은 이름의 가게가 stores 테이블에 있으면 JSON 항목 대신 사용 (일괄 가져오기 후 중복 방지)
+        store_names = {restaurant.name.casefold() for restaurant in self._store_restaurants}
+        restaurants = [
+            restaurant for restaurant in self._json_restaurants if restaurant.name.casefold() not in store_names
+        ] + self._store_restaurants
+        # 버전 = 내용 해시 (재시작해도 내용이 같으면 같은 버전)
+        digest = hashlib.sha256()
+        for restaurant in restaurants:
+            digest.update(json.dumps([restaurant.to_dict(), restaurant.store_id], ensure_ascii=False).encode("utf-8"))
+        self._snapshot = CatalogSnapshot.build(digest.hexdigest()[:16], restaurants, self._path)
+
+restaurant_catalog = RestaurantCatalog()
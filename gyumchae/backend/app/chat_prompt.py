@@ -0,0 +1,110 @@
+from typing import List, Optional, Tuple
+from app.catalog import CatalogSnapshot, Restaurant, restaurant_catalog
+from app.retrieval import get_restaurant_index
+import json
+import os
+import threading
+
+# 프롬프트에 넣을 관련 음식점 수 (0이면 검색 없이 전체 카탈로그를 넣음)
+AI_CHAT_RETRIEVAL_TOP_K = int(os.getenv("AI_CHAT_RETRIEVAL_TOP_K", "8"))
+# 전체 카탈로그를 넣은 시스템 프롬프트가 이 토큰 수(추정)를 넘을 때만 관련 음식점 검색 사용
+# 넘지 않으면 모든 가게를 보여주는 편이 답변 품질이 좋다
+AI_CHAT_PROMPT_TOKEN_BUDGET = int(os.getenv("AI_CHAT_PROMPT_TOKEN_BUDGET", "6000"))
+
+BASE_SYSTEM_PROMPT = """당신은 강원도 춘천시 한림대학교 주변 맛집 전문 상담사입니다.
+
+위치: 강원도 춘천시 한림대학교 주변 (춘천시 동면, 한림대학교 인근)
+
+중요 규칙:
+1. 모든 추천은 반드시 강원도 춘천시 한림대학교 주변 지역의 가게로만 제한합니다.
+2. 아래 제공된 음식점 정보를 우선적으로 참고하여 추천하세요.
+3. 음식점, 카페, 술집, 기타 가게 등 모든 종류의 가게를 추천할 수 있습니다.
+4. 사용자가 특정 종류의 가게를 요청하면 (예: "카페 추천", "술집 추천", "치킨집 추천"), 제공된 정보에서 해당 종류의 한림대 주변 가게를 찾아 추천하세요.
+5. 제공된 정보에 없는 가게는 추천하지 마세요. 정확한 정보가 없다면 솔직하게 말하세요.
+6. 가게 이름, 위치, 특징, 메뉴, 가격대 등을 상세히 알려주세요.
+7. 친절하고 상세하게 답변하며, 이모지를 적절히 사용하여 답변을 더 친근하게 만들어주세요.
+8. 답변은 일반 텍스트로만 작성하세요. Markdown 문법(**, #, -, 등)을 사용하지 마세요.
+9. 줄바꿈은 자연스럽게 하고, 특수 기호나 포맷팅 없이 자연스러운 대화체로 작성해주세요.
+10. 사용자가 다른 지역의 가게를 물어봐도, 한림대 주변 가게로 대체해서 추천합니다."""
+
+_NO_DATA_PROMPT = BASE_SYSTEM_PROMPT + """
+
+참고: 음식점 정보 파일이 로드되지 않았습니다. 기본 정보만 사용합니다.
+"""
+
+# 카탈로그 버전별 전체 시스템 프롬프트와 토큰 수 캐시 (최신 버전 하나만 보관)
+_full_prompt_lock = threading.Lock()
+_full_prompt_cache = {}
+
+def estimate_tokens(text: str) -> int:
+    """대략적인 토큰 수 (한글 1글자 ≈ 1토큰, 그 외 4글자 ≈ 1토큰)"""
+    hangul = sum(1 for ch in text if "가" <= ch <= "힣")
+    return hangul + (len(text) - hangul + 3) // 4
+
+def _restaurants_section(restaurants_info: str) -> str:
+    return BASE_SYSTEM_PROMPT + f"""
+
+=== 한림대 주변 음식점 정보 ===
+{restaurants_info}
+=== 위 정보를 참고하여 추천해주세요 ===
+"""
+
+def build_system_prompt(snapshot: CatalogSnapshot, restaurants: Optional[List[Restaurant]] = None) -> str:
+    """
+    시스템 프롬프트 생성
+    restaurants를 주면 해당 음식점만 (한 줄에 하나씩) 넣고,
+    없으면 카탈로그 전체를 넣은 프롬프트를 버전별로 한 번만 만들어 재사용한다.
+    """
+    if not snapshot.restaurants:
+        return _NO_DATA_PROMPT
+    if restaurants is not None:
+        restaurants_info = "\n".join(json.dumps(r.to_dict(), ensure_ascii=False) for r in restaurants)
+        return _restaurants_section(restaurants_info)
+
+    return _full_prompt(snapshot)[0]
+
+def _full_prompt(snapshot: CatalogSnapshot) -> Tuple[str, int]:
+    """카탈로그 전체를 넣은 시스템 프롬프트와 추정 토큰 수 (버전별로 한 번만 생성)"""
+    cached = _full_prompt_cache.get(snapshot.version)
+    if cached is None:
+        with _full_prompt_lock:
+            cached = _full_prompt_cache.get(snapshot.version)
+            if cached is None:
+                restaurants_info = json.dumps(snapshot.to_json_data(), ensure_ascii=False, indent=2)
+                prompt = _restaurants_section(restaurants_info)
+                cached = (prompt, estimate_tokens(prompt))
+                _full_prompt_cache.clear()
+                _full_prompt_cache[snapshot.version] = cached
+    return cached
+
+def rewrite_user_message(message: str) -> str:
+    """사용자 메시지 처리 - 추천 요청 문구 자동 추가"""
+    user_message = message.strip()
+
+    # 사용자 메시지가 추천 요청 형태가 아니면 자동으로 추가
+    recommendation_keywords = ['추천', '추천해', '추천해줘', '추천해주', '어떤', '뭐', '뭐가', '뭐 먹', '어디', '가게', '맛집']
+    has_recommendation_request = any(keyword in user_message for keyword in recommendation_keywords)
+
+    # 질문 형태가 아니거나 추천 요청이 없으면 자동으로 추가
+    if not user_message.endswith('?') and not user_message.endswith('요') and not user_message.endswith('어') and not has_recommendation_request:
+        user_message = f"{user_message} 어떤거 추천해줄수있어?"
+    elif not has_recommendation_request and ('?' in user_message or '어디' in user_message or '뭐' in user_message):
+        # 질문 형태지만 추천 요청이 명확하지 않으면 보강
+        if '어떤' not in user_message and '추천' not in user_message:
+            user_message = f"{user_message} 한림대 주변에서 추천해줄 수 있어?"
+    return user_message
+
+def build_chat_prompt(message: str, snapshot: Optional[CatalogSnapshot] = None, top_k: int = AI_CHAT_RETRIEVAL_TOP_K,
+                      token_budget: int = AI_CHAT_PROMPT_TOKEN_BUDGET) -> str:
+    """
+    전체 프롬프트 생성
+    전체 카탈로그가 token_budget 안에 들어가면 모든 음식점을, 넘으면 질문에 관련된 음식점 top_k개만 넣는다.
+    """
+    snapshot = snapshot or restaurant_catalog.snapshot()
+    restaurants = None
+    if top_k > 0 and len(snapshot.restaurants) > top_k and _full_prompt(snapshot)[1] > token_budget:
+        restaurants = get_restaurant_index(snapshot).search(message, top_k)
+    system_prompt = build_system_prompt(snapshot, restaurants)
+    user_message = rewrite_user_message(message)
+    # 사용자 메시지에 시스템 프롬프트 추가
+    return f"{system_prompt}\n\n사용자: {user_message}\n\n상담사:"
@@ -0,0 +1,31 @@
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+from app.models import Post
+
+# 비정규화 카운터 컬럼 (스키마 업그레이드로 새로 추가되면 백필 필요)
+POST_COUNTER_COLUMNS = {"posts.like_count", "posts.comment_count"}
+
+def increment_post_counter(db: Session, post_id: int, column, amount: int = 1):
+    """
+    게시글 카운터를 UPDATE 한 문장으로 증감 (읽고-쓰기 경쟁 없이 원자적으로 반영)
+    호출한 쪽의 트랜잭션 안에서 실행되므로 좋아요/댓글 INSERT와 함께 커밋된다.
+    """
+    db.query(Post).filter(Post.id == post_id).update(
+        {column: column + amount},
+        synchronize_session=False
+    )
+
+def reconcile_post_counters(db: Session) -> int:
+    """
+    post_likes, comments 테이블 기준으로 posts.like_count / comment_count 재계산
+    값이 어긋난 게시글만 갱신하고, 갱신된 게시글 수를 반환
+    """
+    result = db.execute(text("""
+        UPDATE posts
+        SET like_count = (SELECT COUNT(*) FROM post_likes WHERE post_likes.post_id = posts.id),
+            comment_count = (SELECT COUNT(*) FROM comments WHERE comments.post_id = posts.id)
+        WHERE like_count IS NOT (SELECT COUNT(*) FROM post_likes WHERE post_likes.post_id = posts.id)
+           OR comment_count IS NOT (SELECT COUNT(*) FROM comments WHERE comments.post_id = posts.id)
+    """))
+    db.commit()
+    return result.rowcount
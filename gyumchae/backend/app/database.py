@@ -1,4 +1,4 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker, declarative_base
 import os
 from dotenv import load_dotenv
@@ -25,12 +25,63 @@ if os.name == 'nt':  # Windows
 else:
     DATABASE_URL = f"sqlite:///{DATABASE_FILE}"
 
-# SQLite는 check_same_thread=False 필요 (FastAPI에서 사용 시)
-engine = create_engine(
-    DATABASE_URL,
-    connect_args={"check_same_thread": False},
-    echo=False
-)
+# 엔진 프로파일: default(기본 설정) / production(WAL 등 SQLite 튜닝 적용)
+DATABASE_PROFILE = os.getenv("DATABASE_PROFILE", "default")
+
+# production 프로파일에서 모든 커넥션에 적용할 PRAGMA
+SQLITE_PRODUCTION_PRAGMAS = {
+    "journal_mode": "WAL",  # 읽기가 쓰기에 막히지 않도록
+    "synchronous": "NORMAL",  # WAL에서는 NORMAL로도 안전 (체크포인트 시에만 fsync)
+    "cache_size": -int(os.getenv("SQLITE_CACHE_SIZE_KB", "65536")),  # 음수 = KiB 단위
+    "mmap_size": int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024))),
+    "busy_timeout": int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000")),
+    "temp_store": "MEMORY",
+}
+
+# production 프로파일 커넥션 풀 크기
+DATABASE_POOL_SIZE = int(os.getenv("DATABASE_POOL_SIZE", "10"))
+DATABASE_MAX_OVERFLOW = int(os.getenv("DATABASE_MAX_OVERFLOW", "10"))
+DATABASE_POOL_TIMEOUT = float(os.getenv("DATABASE_POOL_TIMEOUT", "30"))
+
+def create_database_engine(url: str = DATABASE_URL, profile: str = DATABASE_PROFILE):
+    """프로파일에 맞는 SQLite 엔진 생성"""
+    # SQLite는 check_same_thread=False 필요 (FastAPI에서 사용 시)
+    if profile != "production":
+        return create_engine(
+            url,
+            connect_args={"check_same_thread": False},
+            echo=False
+        )
+
+    new_engine = create_engine(
+        url,
+        connect_args={"check_same_thread": False},
+        pool_size=DATABASE_POOL_SIZE,
+        max_overflow=DATABASE_MAX_OVERFLOW,
+        pool_timeout=DATABASE_POOL_TIMEOUT,
+        echo=False
+    )
+
+    @event.listens_for(new_engine, "connect")
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for name, value in SQLITE_PRODUCTION_PRAGMAS.items():
+            cursor.execute(f"PRAGMA {name}={value}")
+        cursor.close()
+
+    return new_engine
+
+def get_database_settings(bind=None) -> dict:
+    """현재 커넥션에 실제로 적용된 SQLite 설정 조회 (/api/health 표시용)"""
+    bind = bind or engine
+    settings = {"profile": DATABASE_PROFILE}
+    with bind.connect() as conn:
+        for name in SQLITE_PRODUCTION_PRAGMAS:
+            settings[name] = conn.exec_driver_sql(f"PRAGMA {name}").scalar()
+    settings["pool"] = bind.pool.status()
+    return settings
+
+engine = create_database_engine()
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 Base = declarative_base()
@@ -0,0 +1,253 @@
+from fastapi import HTTPException, status
+from html import escape
+from typing import Dict, List, NamedTuple, Optional, Tuple
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+from app.database import engine
+from app.models import Post, PostCategory, Store, StoreCategory
+from app.pagination import decode_cursor, encode_cursor
+import os
+import re
+
+# 전문 검색 토크나이저: trigram(부분 문자열 검색, 조사가 붙은 한국어 단어도 찾음) / unicode61(띄어쓰기 단위 + 접두어 검색)
+# 바꾸면 다음 시작 시 인덱스를 다시 만든다
+FULLTEXT_TOKENIZER = os.getenv("FULLTEXT_TOKENIZER", "trigram").lower()
+# 검색어 단어 수 상한 / 미리보기(snippet) 글자 수
+FULLTEXT_MAX_TERMS = int(os.getenv("FULLTEXT_MAX_TERMS", "8"))
+FULLTEXT_SNIPPET_LENGTH = int(os.getenv("FULLTEXT_SNIPPET_LENGTH", "80"))
+# 관련도순 정렬 대상 = 최근 일치 행 N개 (자주 나오는 단어도 일치하는 행 전체를 점수 계산하지 않도록, 0이면 전체)
+FULLTEXT_RANK_WINDOW = int(os.getenv("FULLTEXT_RANK_WINDOW", "5000"))
+
+_TOKENIZERS = {"trigram": "trigram", "unicode61": "unicode61 remove_diacritics 2"}
+if FULLTEXT_TOKENIZER not in _TOKENIZERS:
+    print(f"⚠️ 알 수 없는 FULLTEXT_TOKENIZER({FULLTEXT_TOKENIZER}) - trigram을 사용합니다.")
+    FULLTEXT_TOKENIZER = "trigram"
+# trigram 인덱스로 찾을 수 있는 최소 글자 수 (더 짧은 단어는 단어 인덱스로 찾는다)
+TRIGRAM_MIN_LENGTH = 3
+# 짧은 단어용 단어 인덱스 ({FTS 테이블}_words, trigram일 때만 본 인덱스 옆에 둠)
+# 띄어쓰기 단위 접두어 검색이라 조사가 붙은 단어("카페에서")는 찾지만 단어 중간("스터디카페")은 찾지 않는다
+WORD_INDEX_SUFFIX = "_words"
+_WORD_INDEX_OPTIONS = "tokenize='unicode61 remove_diacritics 2', prefix='1 2'"
+
+# FTS5 테이블 -> (원본 테이블, 검색 컬럼, bm25 컬럼 가중치)
+FULLTEXT_TABLES = {
+    "stores_fts": ("stores", ("name", "description", "address"), (10.0, 2.0, 1.0)),
+    "posts_fts": ("posts", ("title", "content"), (5.0, 1.0)),
+}
+
+def _index_tables(tokenizer: str) -> Dict[str, Tuple[str, Optional[str]]]:
+    """{인덱스 테이블: (FULLTEXT_TABLES 키, 테이블 옵션 - None이면 만들지 않고 있으면 지움)}"""
+    tables = {}
+    for fts in FULLTEXT_TABLES:
+        tables[fts] = (fts, f"tokenize='{_TOKENIZERS[tokenizer]}'")
+        # unicode61은 본 인덱스에서 짧은 단어도 접두어로 찾으므로 단어 인덱스가 필요 없음
+        tables[fts + WORD_INDEX_SUFFIX] = (fts, _WORD_INDEX_OPTIONS if tokenizer == "trigram" else None)
+    return tables
+
+def _fulltext_ddl(table: str, fts: str, options: str) -> List[str]:
+    """외부 콘텐츠 FTS5 테이블 + 원본 테이블 트리거 (검색 컬럼이 바뀔 때만 인덱스 갱신)"""
+    source, columns, _ = FULLTEXT_TABLES[fts]
+    names = ", ".join(columns)
+    new_values = ", ".join(f"new.{column}" for column in columns)
+    old_values = ", ".join(f"old.{column}" for column in columns)
+    return [
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {table} USING fts5("
+        f"{names}, content='{source}', content_rowid='id', {options})",
+        f"""
+        CREATE TRIGGER IF NOT EXISTS {table}_insert AFTER INSERT ON {source}
+        BEGIN
+            INSERT INTO {table}(rowid, {names}) VALUES (new.id, {new_values});
+        END
+        """,
+        # 조회수/좋아요 수 등 다른 컬럼 변경에는 실행되지 않음
+        f"""
+        CREATE TRIGGER IF NOT EXISTS {table}_update AFTER UPDATE OF {names} ON {source}
+        BEGIN
+            INSERT INTO {table}({table}, rowid, {names}) VALUES ('delete', old.id, {old_values});
+            INSERT INTO {table}(rowid, {names}) VALUES (new.id, {new_values});
+        END
+        """,
+        f"""
+        CREATE TRIGGER IF NOT EXISTS {table}_delete AFTER DELETE ON {source}
+        BEGIN
+            INSERT INTO {table}({table}, rowid, {names}) VALUES ('delete', old.id, {old_values});
+        END
+        """,
+    ]
+
+def ensure_fulltext_index(bind=engine, tokenizer: str = FULLTEXT_TOKENIZER) -> List[str]:
+    """전문 검색 테이블/트리거 생성 - 새로 만들었거나 토크나이저가 바뀐 테이블은 기존 데이터로 채우고 이름 반환"""
+    rebuilt = []
+    with bind.begin() as conn:
+        for table, (fts, options) in _index_tables(tokenizer).items():
+            sql = conn.execute(
+                text("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = :name"), {"name": table}
+            ).scalar()
+            if sql is not None and (options is None or options not in sql):
+                conn.execute(text(f"DROP TABLE {table}"))
+                sql = None
+            if options is None:
+                # 쓰지 않는 인덱스의 트리거도 지움 (원본 테이블 쓰기가 없는 테이블을 찾다가 실패하지 않도록)
+                for action in ("insert", "update", "delete"):
+                    conn.execute(text(f"DROP TRIGGER IF EXISTS {table}_{action}"))
+                continue
+            for ddl in _fulltext_ddl(table, fts, options):
+                conn.execute(text(ddl))
+            if sql is None:
+                conn.execute(text(f"INSERT INTO {table}({table}) VALUES ('rebuild')"))
+                rebuilt.append(table)
+    return rebuilt
+
+class ParsedQuery(NamedTuple):
+    terms: List[str]  # 하이라이트용 전체 단어
+    match: Optional[str]  # 본 인덱스 FTS5 MATCH 식 (본 인덱스로 찾을 단어가 없으면 None)
+    word_match: Optional[str] = None  # trigram으로 찾을 수 없는 짧은 단어의 단어 인덱스 MATCH 식
+
+def parse_query(q: str, tokenizer: str = FULLTEXT_TOKENIZER) -> ParsedQuery:
+    """검색어를 단어별 AND 조건으로 변환 (FTS5 문법 문자는 그대로 검색)"""
+    terms = list(dict.fromkeys(q.replace('"', " ").split()))[:FULLTEXT_MAX_TERMS]
+    if not terms:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="검색어를 입력해주세요.")
+    if tokenizer != "trigram":
+        return ParsedQuery(terms, " AND ".join(f'"{term}"*' for term in terms))
+    phrases = [f'"{term}"' for term in terms if len(term) >= TRIGRAM_MIN_LENGTH]
+    word_phrases = [f'"{term}"*' for term in terms if len(term) < TRIGRAM_MIN_LENGTH]
+    return ParsedQuery(terms, " AND ".join(phrases) or None, " AND ".join(word_phrases) or None)
+
+class SearchHit(NamedTuple):
+    id: int
+    score: Optional[float]  # bm25 (작을수록 관련도 높음), 최신순이면 None
+    min_rowid: int = 0  # 관련도순 정렬 대상의 시작 rowid (다음 페이지도 같은 범위에서)
+
+def _search(db: Session, fts: str, query: ParsedQuery, filters: List[str], params: dict,
+            relevance: bool, cursor: Optional[str], limit: int) -> List[SearchHit]:
+    """
+    관련도순: 최근 일치 FULLTEXT_RANK_WINDOW개 안에서 bm25 점수 + id 키셋 (커서 = [점수, id, 시작 rowid])
+    최신순: id 역순 키셋 (커서 = [id])
+    본 인덱스로 찾을 단어가 있으면 본 인덱스로 읽고 점수를 매기며, 짧은 단어는 단어 인덱스 일치 여부로 거른다.
+    짧은 단어만 있으면 단어 인덱스로 읽고 점수를 매긴다.
+    """
+    source, columns, weights = FULLTEXT_TABLES[fts]
+    conditions = list(filters)
+    params = {**params, "limit": limit}
+    words = fts + WORD_INDEX_SUFFIX
+    if query.match is None:
+        fts, query = words, query._replace(match=query.word_match, word_match=None)
+    if query.word_match is not None:
+        params["word_match"] = query.word_match
+        conditions.append(f"{source}.id IN (SELECT rowid FROM {words} WHERE {words} MATCH :word_match)")
+
+    params["match"] = query.match
+    conditions.insert(0, f"{fts} MATCH :match")
+    if relevance:
+        score = f"bm25({fts}, {', '.join(map(str, weights))})"
+        order = f"{score}, {source}.id"
+        if cursor:
+            params["last_score"], params["last_id"], params["min_rowid"] = decode_cursor(cursor, 3)
+            conditions.append(f"({score} > :last_score OR ({score} = :last_score AND {source}.id > :last_id))")
+        elif FULLTEXT_RANK_WINDOW:
+            # 최근 N번째 일치 행의 rowid (rowid 역순으로 읽으므로 점수 계산 없이 빠름, 일치 행이 적으면 None)
+            params["min_rowid"] = db.execute(
+                text(f"SELECT rowid FROM {fts} WHERE {fts} MATCH :match ORDER BY rowid DESC LIMIT 1 OFFSET :offset"),
+                {"match": query.match, "offset": FULLTEXT_RANK_WINDOW - 1},
+            ).scalar() or 0
+        else:
+            params["min_rowid"] = 0
+        conditions.append(f"{fts}.rowid >= :min_rowid")
+    else:
+        # FTS5가 rowid 역순으로 바로 읽어 LIMIT에서 멈춤 (일치하는 행 전체를 정렬하지 않음)
+        score = "NULL"
+        order = f"{fts}.rowid DESC"
+        if cursor:
+            (params["last_id"],) = decode_cursor(cursor, 1)
+            conditions.append(f"{fts}.rowid < :last_id")
+    # CROSS JOIN으로 FTS 테이블을 먼저 읽도록 고정 (카테고리 인덱스로 원본 테이블부터 읽는 계획 방지)
+    sql = (f"SELECT {source}.id, {score} FROM {fts} CROSS JOIN {source} ON {source}.id = {fts}.rowid "
+           f"WHERE {' AND '.join(conditions)} ORDER BY {order} LIMIT :limit")
+    return [SearchHit(*row, params.get("min_rowid", 0)) for row in db.execute(text(sql), params)]
+
+def search_cursor(hit: SearchHit) -> str:
+    """검색 결과 다음 페이지 커서"""
+    if hit.score is None:
+        return encode_cursor(hit.id)
+    return encode_cursor(hit.score, hit.id, hit.min_rowid)
+
+def _terms_pattern(terms: List[str]) -> Optional[re.Pattern]:
+    if not terms:
+        return None
+    return re.compile("|".join(re.escape(term) for term in sorted(terms, key=len, reverse=True)), re.IGNORECASE)
+
+def highlight(value: Optional[str], terms: List[str], length: Optional[int] = None) -> str:
+    """
+    검색어를 <mark>로 감싼 HTML 반환 (나머지 텍스트는 escape)
+    length를 주면 첫 번째 일치 위치 주변 length 글자만 (앞뒤 생략은 …)
+    """
+    if not value:
+        return ""
+    pattern = _terms_pattern(terms)
+    matches = list(pattern.finditer(value)) if pattern else []
+    start, end = 0, len(value)
+    if length and len(value) > length:
+        first = matches[0].start() if matches else 0
+        start = max(0, min(first - length // 4, len(value) - length))
+        end = start + length
+    parts = ["…" if start > 0 else ""]
+    position = start
+    for match in matches:
+        if match.end() <= start or match.start() >= end:
+            continue
+        match_start, match_end = max(match.start(), start), min(match.end(), end)
+        parts.append(escape(value[position:match_start]))
+        parts.append(f"<mark>{escape(value[match_start:match_end])}</mark>")
+        position = match_end
+    parts.append(escape(value[position:end]))
+    if end < len(value):
+        parts.append("…")
+    return "".join(parts)
+
+def _snippet(values: List[Optional[str]], terms: List[str]) -> Optional[str]:
+    """검색어가 들어 있는 첫 번째 값의 미리보기 (없으면 첫 번째 값)"""
+    pattern = _terms_pattern(terms)
+    present = [value for value in values if value]
+    if not present:
+        return None
+    chosen = next((value for value in present if pattern.search(value)), present[0])
+    return highlight(chosen, terms, FULLTEXT_SNIPPET_LENGTH)
+
+def search_stores(db: Session, q: str, category: Optional[StoreCategory] = None,
+                  cursor: Optional[str] = None, limit: int = 20) -> Tuple[List[tuple], List[SearchHit]]:
+    """
+    활성 가게 전문 검색 (이름 > 설명 > 주소 가중치 관련도순)
+    ([(가게, 이름 하이라이트, 미리보기)], 커서용 검색 결과) 반환
+    """
+    query = parse_query(q)
+    filters, params = ["stores.is_active = 1"], {}
+    if category is not None:
+        filters.append("stores.category = :category")
+        params["category"] = category.name
+    hits = _search(db, "stores_fts", query, filters, params, relevance=True, cursor=cursor, limit=limit)
+    stores = {store.id: store for store in db.query(Store).filter(Store.id.in_([hit.id for hit in hits]))}
+    results = [
+        (store, highlight(store.name, query.terms), _snippet([store.description, store.address], query.terms))
+        for store in (stores.get(hit.id) for hit in hits) if store is not None
+    ]
+    return results, hits
+
+def search_posts(db: Session, q: str, category: Optional[PostCategory] = None, sort: str = "relevance",
+                 cursor: Optional[str] = None, limit: int = 20) -> Tuple[List[tuple], List[SearchHit]]:
+    """
+    게시글 전문 검색 (relevance: 제목 > 본문 가중치 관련도순, recent: 최신순)
+    ([(게시글, 제목 하이라이트, 미리보기)], 커서용 검색 결과) 반환
+    """
+    query = parse_query(q)
+    filters, params = [], {}
+    if category and category != PostCategory.ALL:
+        filters.append("posts.category = :category")
+        params["category"] = category.name
+    hits = _search(db, "posts_fts", query, filters, params, relevance=sort == "relevance", cursor=cursor, limit=limit)
+    posts = {post.id: post for post in db.query(Post).filter(Post.id.in_([hit.id for hit in hits]))}
+    results = [
+        (post, highlight(post.title, query.terms), _snippet([post.content], query.terms))
+        for post in (posts.get(hit.id) for hit in hits) if post is not None
+    ]
+    return results, hits
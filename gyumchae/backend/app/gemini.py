@@ -0,0 +1,289 @@
+from concurrent.futures import ThreadPoolExecutor
+from fastapi import HTTPException
+from typing import AsyncIterator, List, Optional
+import asyncio
+import functools
+import os
+import threading
+import time
+from dotenv import load_dotenv
+try:
+    import google.generativeai as genai
+    from google.api_core import exceptions as google_exceptions
+except ImportError:
+    genai = None
+    google_exceptions = None
+
+load_dotenv()
+
+# Gemini API 키 설정
+GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
+# API 주소 변경 (선택사항) - 로컬 가짜 Gemini 서버로 오프라인 테스트할 때 사용 (REST 전송)
+GEMINI_API_ENDPOINT = os.getenv("GEMINI_API_ENDPOINT")
+# 사용할 모델을 직접 지정 (선택사항, 지정하면 후보 목록보다 먼저 시도)
+GEMINI_MODEL = os.getenv("GEMINI_MODEL")
+# 서버 시작 시 모델 확인을 기다리는 최대 시간(초) - 넘으면 백그라운드에서 계속 확인
+GEMINI_STARTUP_TIMEOUT = float(os.getenv("GEMINI_STARTUP_TIMEOUT", "10"))
+# 모델 확인 실패 후 재시도 간격(초, 실패할 때마다 두 배, 최대 GEMINI_REPROBE_MAX_INTERVAL)
+GEMINI_REPROBE_INTERVAL = float(os.getenv("GEMINI_REPROBE_INTERVAL", "5"))
+GEMINI_REPROBE_MAX_INTERVAL = float(os.getenv("GEMINI_REPROBE_MAX_INTERVAL", "300"))
+# Gemini 호출 전용 스레드 수 - SDK 호출이 동기(블로킹)라 이벤트 루프 밖에서 실행
+GEMINI_MAX_WORKERS = int(os.getenv("GEMINI_MAX_WORKERS", "16"))
+# Gemini가 요청 한도 초과(429)로 응답했을 때 클라이언트에 알려줄 재시도 대기 시간(초)
+GEMINI_RATE_LIMIT_RETRY_AFTER = int(os.getenv("GEMINI_RATE_LIMIT_RETRY_AFTER", "5"))
+
+GENERATION_CONFIG = {
+    'temperature': 0.7,
+    'top_p': 0.8,
+    'top_k': 40,
+}
+
+_STREAM_END = object()
+
+# 최신 Gemini 모델 사용 (2.5 버전 우선)
+MODEL_CANDIDATES = [
+    'gemini-2.5-flash',
+    'gemini-2.5-pro',
+    'gemini-2.0-flash-exp',
+    'gemini-2.0-flash',
+    'gemini-exp',
+    'gemini-2.0-flash-thinking-exp',
+]
+
+def _is_rate_limited(error: Exception) -> bool:
+    return google_exceptions is not None and isinstance(error, google_exceptions.TooManyRequests)
+
+def _rate_limited_error() -> HTTPException:
+    return HTTPException(
+        status_code=503,
+        detail="AI 서비스 요청 한도를 초과했습니다. 잠시 후 다시 시도해주세요.",
+        headers={"Retry-After": str(GEMINI_RATE_LIMIT_RETRY_AFTER)}
+    )
+
+class GeminiModelProvider:
+    """
+    Gemini 모델 선택을 서버 시작 시 한 번만 수행하고 결과 모델을 공유한다.
+    확인에 실패했거나 사용 중인 모델이 없어지면(404) 백그라운드 스레드에서
+    간격을 늘려 가며 다시 확인한다. 요청 처리 중에는 네트워크로 모델을 찾지 않는다.
+    """
+
+    def __init__(self, candidates: List[str]):
+        self.candidates = candidates
+        self.model = None
+        self.model_name: Optional[str] = None
+        self.last_error: Optional[Exception] = None
+        self.probes = 0
+        self.resolved_at: Optional[float] = None
+        self.rate_limited = 0
+        self._lock = threading.Lock()
+        self._ready = threading.Event()
+        self._stop = threading.Event()
+        self._probe_thread: Optional[threading.Thread] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    def _check_config(self):
+        if not genai:
+            raise HTTPException(
+                status_code=500,
+                detail="google-generativeai 패키지가 설치되지 않았습니다. pip install google-generativeai를 실행해주세요."
+            )
+
+        if not GEMINI_API_KEY:
+            raise HTTPException(
+                status_code=500,
+                detail="GEMINI_API_KEY가 설정되지 않았습니다. .env 파일에 GEMINI_API_KEY를 추가해주세요."
+            )
+
+    def _configure(self):
+        options = {}
+        if GEMINI_API_ENDPOINT:
+            options = {"transport": "rest", "client_options": {"api_endpoint": GEMINI_API_ENDPOINT}}
+        genai.configure(api_key=GEMINI_API_KEY, **options)
+
+    def _supports_generate(self, model_name: str) -> bool:
+        info = genai.get_model(f"models/{model_name}")
+        return 'generateContent' in info.supported_generation_methods
+
+    def resolve(self):
+        """후보 모델을 실제 API로 확인해 사용할 모델 결정 (네트워크 호출)"""
+        self.probes += 1
+        candidates = [GEMINI_MODEL] + self.candidates if GEMINI_MODEL else self.candidates
+        last_error = None
+        for model_name in candidates:
+            try:
+                if self._supports_generate(model_name):
+                    return self._set_model(model_name, "✅ 사용 중인 모델")
+            except Exception as e:
+                last_error = e
+                continue
+
+        # 모든 후보 모델이 실패하면 사용 가능한 모델 목록 확인
+        try:
+            models = genai.list_models()
+            available_models = [m.name for m in models if 'generateContent' in m.supported_generation_methods]
+            if available_models:
+                gemini_models = [m for m in available_models if 'gemini' in m.lower()]
+                model_name = (gemini_models or available_models)[0].split('/')[-1]
+                return self._set_model(model_name, "✅ 자동 선택된 모델")
+        except Exception as e:
+            last_error = e
+
+        self.last_error = last_error or RuntimeError("generateContent를 지원하는 모델이 없습니다.")
+        raise self.last_error
+
+    def _set_model(self, model_name: str, message: str):
+        model = genai.GenerativeModel(model_name)
+        with self._lock:
+            self.model, self.model_name = model, model_name
+            self.last_error = None
+            self.resolved_at = time.time()
+        self._ready.set()
+        print(f"{message}: {model_name}")
+        return model
+
+    def _probe_loop(self):
+        interval = GEMINI_REPROBE_INTERVAL
+        while not self._stop.is_set():
+            try:
+                self.resolve()
+                return
+            except Exception as e:
+                print(f"⚠️ Gemini 모델 확인 실패 ({interval:.0f}초 후 재시도): {e}")
+            if self._stop.wait(interval):
+                return
+            interval = min(interval * 2, GEMINI_REPROBE_MAX_INTERVAL)
+
+    def _start_probe(self):
+        with self._lock:
+            if self._probe_thread is not None and self._probe_thread.is_alive():
+                return
+            self._probe_thread = threading.Thread(target=self._probe_loop, name="gemini-model-probe", daemon=True)
+            self._probe_thread.start()
+
+    async def start(self):
+        """서버 시작 시 모델 확인 (최대 GEMINI_STARTUP_TIMEOUT초 대기, 이후 백그라운드에서 계속)"""
+        try:
+            self._check_config()
+        except HTTPException as e:
+            print(f"⚠️ AI 채팅 비활성화: {e.detail}")
+            return
+        self._stop.clear()
+        self._configure()
+        self._start_probe()
+        await asyncio.to_thread(self._ready.wait, GEMINI_STARTUP_TIMEOUT)
+
+    def stop(self):
+        self._stop.set()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=GEMINI_MAX_WORKERS, thread_name_prefix="gemini")
+            return self._executor
+
+    async def generate(self, prompt: str):
+        """응답 전체 생성 (전용 스레드에서 실행해 이벤트 루프를 막지 않음)"""
+        model = self.get_model()
+        call = functools.partial(model.generate_content, prompt, generation_config=GENERATION_CONFIG)
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._get_executor(), call)
+        except Exception as e:
+            # 모델이 없어졌으면 백그라운드에서 다시 선택
+            self.report_failure(e)
+            if _is_rate_limited(e):
+                raise _rate_limited_error() from e
+            raise
+
+    def stream(self, prompt: str) -> AsyncIterator[str]:
+        """응답을 생성되는 대로 텍스트 청크 단위로 전달 (모델이 없으면 바로 예외)"""
+        return self._stream(self.get_model(), prompt)
+
+    async def _stream(self, model, prompt: str) -> AsyncIterator[str]:
+        loop = asyncio.get_running_loop()
+        queue = asyncio.Queue()
+        cancelled = threading.Event()
+
+        def put(item):
+            try:
+                loop.call_soon_threadsafe(queue.put_nowait, item)
+            except RuntimeError:
+                # 이벤트 루프가 이미 종료됨
+                cancelled.set()
+
+        def produce():
+            try:
+                for chunk in model.generate_content(prompt, generation_config=GENERATION_CONFIG, stream=True):
+                    if cancelled.is_set():
+                        return
+                    try:
+                        text = chunk.text
+                    except ValueError:
+                        # 텍스트가 없는 청크 (종료 사유만 있는 경우 등)
+                        continue
+                    if text:
+                        put(text)
+            except Exception as e:
+                put(e)
+            else:
+                put(_STREAM_END)
+
+        loop.run_in_executor(self._get_executor(), produce)
+        try:
+            while True:
+                item = await queue.get()
+                if item is _STREAM_END:
+                    return
+                if isinstance(item, Exception):
+                    self.report_failure(item)
+                    if _is_rate_limited(item):
+                        raise _rate_limited_error() from item
+                    raise item
+                yield item
+        finally:
+            # 클라이언트 연결이 끊기면 생성 스레드도 다음 청크에서 멈춤
+            cancelled.set()
+
+    def get_model(self):
+        """확인된 모델 반환 (요청 처리 중 네트워크 호출 없음)"""
+        model = self.model
+        if model is not None:
+            return model
+        self._check_config()
+        if self._probe_thread is None:
+            # lifespan 없이 사용된 경우 (스크립트 등) - 여기서 확인 시작
+            self._configure()
+        self._start_probe()
+        raise HTTPException(
+            status_code=503,
+            detail=f"AI 모델을 준비 중입니다. 잠시 후 다시 시도해주세요. (마지막 오류: {self.last_error})",
+            headers={"Retry-After": str(int(GEMINI_REPROBE_INTERVAL))}
+        )
+
+    def report_failure(self, error: Exception):
+        """모델 호출 실패 알림 - 모델이 없어졌으면(404) 선택을 취소하고 다시 확인"""
+        if _is_rate_limited(error):
+            self.rate_limited += 1
+        if google_exceptions is None or not isinstance(error, google_exceptions.NotFound):
+            return
+        with self._lock:
+            failed_name = self.model_name
+            self.model, self.model_name = None, None
+            self.last_error = error
+        self._ready.clear()
+        print(f"⚠️ Gemini 모델을 사용할 수 없어 다시 확인합니다: {failed_name}")
+        self._start_probe()
+
+    def status(self) -> dict:
+        return {
+            "model": self.model_name,
+            "ready": self.model is not None,
+            "probes": self.probes,
+            "probing": self._probe_thread is not None and self._probe_thread.is_alive(),
+            "last_error": str(self.last_error) if self.last_error else None,
+            "rate_limited": self.rate_limited,
+        }
+
+gemini_models = GeminiModelProvider(MODEL_CANDIDATES)
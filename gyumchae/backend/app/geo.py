@@ -0,0 +1,164 @@
+from math import asin, cos, degrees, radians, sin, sqrt
+from typing import List, Optional, Tuple
+from sqlalchemy import Column, Float, Integer, MetaData, Table, select, text
+from sqlalchemy.orm import Session
+from app.database import engine
+from app.models import Store, StoreCategory
+import heapq
+import os
+
+EARTH_RADIUS_M = 6371008.8
+# 반경 검색 최대 반경(m)과 결과 수 상한
+STORE_NEARBY_MAX_RADIUS = float(os.getenv("STORE_NEARBY_MAX_RADIUS", "20000"))
+STORE_GEO_MAX_RESULTS = int(os.getenv("STORE_GEO_MAX_RESULTS", "500"))
+# 가까운 가게 검색을 시작할 반경(m) - 결과가 모자라면 넓혀 가며 다시 조회
+STORE_GEO_INITIAL_RADIUS = float(os.getenv("STORE_GEO_INITIAL_RADIUS", "300"))
+
+# 가게 위치 공간 인덱스 (SQLite R*Tree 가상 테이블, 좌표는 점이라 min = max)
+# Base.metadata에 넣지 않음 - create_all이 일반 테이블로 만들지 않도록 ensure_store_location_index()에서 생성
+store_locations = Table(
+    "store_locations",
+    MetaData(),
+    Column("id", Integer, primary_key=True),
+    Column("min_lat", Float),
+    Column("max_lat", Float),
+    Column("min_lng", Float),
+    Column("max_lng", Float),
+)
+
+# stores가 바뀌면 트리거로 인덱스 갱신 (ORM, 일괄 등록, 직접 SQL 모두 반영)
+_STORE_LOCATION_DDL = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS store_locations USING rtree(id, min_lat, max_lat, min_lng, max_lng)",
+    """
+    CREATE TRIGGER IF NOT EXISTS stores_location_insert AFTER INSERT ON stores
+    WHEN new.is_active AND new.latitude IS NOT NULL AND new.longitude IS NOT NULL
+    BEGIN
+        INSERT INTO store_locations VALUES (new.id, new.latitude, new.latitude, new.longitude, new.longitude);
+    END
+    """,
+    # 조회수 등 다른 컬럼 변경에는 실행되지 않음
+    """
+    CREATE TRIGGER IF NOT EXISTS stores_location_update AFTER UPDATE OF latitude, longitude, is_active ON stores
+    BEGIN
+        DELETE FROM store_locations WHERE id = old.id;
+        INSERT INTO store_locations
+        SELECT new.id, new.latitude, new.latitude, new.longitude, new.longitude
+        WHERE new.is_active AND new.latitude IS NOT NULL AND new.longitude IS NOT NULL;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS stores_location_delete AFTER DELETE ON stores
+    BEGIN
+        DELETE FROM store_locations WHERE id = old.id;
+    END
+    """,
+]
+
+def ensure_store_location_index(bind=engine) -> bool:
+    """공간 인덱스/트리거 생성 - 새로 만든 경우 기존 가게 위치를 채우고 True 반환"""
+    with bind.begin() as conn:
+        exists = conn.execute(
+            text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'store_locations'")
+        ).first() is not None
+        for ddl in _STORE_LOCATION_DDL:
+            conn.execute(text(ddl))
+        if not exists:
+            conn.execute(text(
+                "INSERT INTO store_locations "
+                "SELECT id, latitude, latitude, longitude, longitude FROM stores "
+                "WHERE is_active AND latitude IS NOT NULL AND longitude IS NOT NULL"
+            ))
+    return not exists
+
+def haversine_m(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
+    """두 좌표 사이 거리(m)"""
+    dlat = radians(lat2 - lat1)
+    dlng = radians(lng2 - lng1)
+    a = sin(dlat / 2) ** 2 + cos(radians(lat1)) * cos(radians(lat2)) * sin(dlng / 2) ** 2
+    return 2 * EARTH_RADIUS_M * asin(min(1.0, sqrt(a)))
+
+def radius_bounds(lat: float, lng: float, radius_m: float) -> Tuple[float, float, float, float]:
+    """반경을 감싸는 사각형 (south, west, north, east)"""
+    dlat = degrees(radius_m / EARTH_RADIUS_M)
+    south, north = max(-90.0, lat - dlat), min(90.0, lat + dlat)
+    lat_cos = cos(radians(max(abs(south), abs(north))))
+    if lat_cos < 1e-9 or north >= 90.0 or south <= -90.0:
+        return south, -180.0, north, 180.0
+    dlng = degrees(radius_m / (EARTH_RADIUS_M * lat_cos))
+    if dlng >= 180.0:
+        return south, -180.0, north, 180.0
+    # 날짜 변경선을 넘는 경우는 경도 전체로 (한림대 주변 서비스라 단순화)
+    west, east = lng - dlng, lng + dlng
+    if west < -180.0 or east > 180.0:
+        return south, -180.0, north, 180.0
+    return south, west, north, east
+
+def _candidates(db: Session, bounds, lat: float, lng: float,
+                category: Optional[StoreCategory]) -> List[Tuple[float, int]]:
+    """R*Tree로 사각형 안의 가게만 조회해 (거리m, id) 목록 반환"""
+    # R*Tree 좌표는 32비트라 후보만 고르고, 거리는 stores의 원래 좌표로 계산
+    # (JOIN으로 쓰면 SQLite가 stores를 먼저 읽는 계획을 고를 수 있어 IN 서브쿼리로 R*Tree를 먼저 조회)
+    south, west, north, east = bounds
+    in_bounds = (
+        select(store_locations.c.id)
+        .where(store_locations.c.max_lat >= south, store_locations.c.min_lat <= north)
+        .where(store_locations.c.max_lng >= west, store_locations.c.min_lng <= east)
+    )
+    query = (
+        select(Store.id, Store.latitude, Store.longitude)
+        .where(Store.id.in_(in_bounds))
+        .where(Store.is_active == True)
+    )
+    if category is not None:
+        query = query.where(Store.category == category)
+    return [
+        (haversine_m(lat, lng, store_lat, store_lng), store_id)
+        for store_id, store_lat, store_lng in db.execute(query)
+        if south <= store_lat <= north and west <= store_lng <= east
+    ]
+
+def _intersect(box, limit_box):
+    return (max(box[0], limit_box[0]), max(box[1], limit_box[1]), min(box[2], limit_box[2]), min(box[3], limit_box[3]))
+
+def _nearest(db: Session, lat: float, lng: float, max_radius: float, limit_box, category: Optional[StoreCategory],
+             limit: int, within_radius: bool) -> List[Tuple[Store, float]]:
+    """
+    (lat, lng)에서 가까운 순으로 limit개 (limit_box 안, within_radius면 max_radius 안)
+    작은 반경부터 조회해 반경 안에 limit개가 모일 때까지 넓힌다 (넓은 반경의 후보 전체를 계산하지 않음).
+    """
+    radius = min(max_radius, STORE_GEO_INITIAL_RADIUS)
+    while True:
+        box = _intersect(radius_bounds(lat, lng, radius), limit_box)
+        candidates = _candidates(db, box, lat, lng, category)
+        # 반경 안의 가게는 빠짐없이 조회됨 -> 반경 안에 limit개 이상이면 가까운 limit개가 확정
+        inside = [candidate for candidate in candidates if candidate[0] <= radius]
+        if len(inside) >= limit:
+            nearest = heapq.nsmallest(limit, inside)
+            break
+        if radius >= max_radius or box == limit_box:
+            nearest = heapq.nsmallest(limit, inside if within_radius else candidates)
+            break
+        # 지금까지의 밀도로 limit개가 들어올 반경을 추정 (최소 2배)
+        growth = sqrt(limit / len(inside)) * 1.2 if inside else 4.0
+        radius = min(max_radius, radius * max(2.0, growth))
+    if not nearest:
+        return []
+
+    # 선택된 가게만 전체 정보 조회
+    stores = {store.id: store for store in db.query(Store).filter(Store.id.in_([store_id for _, store_id in nearest]))}
+    return [(stores[store_id], distance) for distance, store_id in nearest if store_id in stores]
+
+def find_nearby_stores(db: Session, lat: float, lng: float, radius_m: float,
+                       category: Optional[StoreCategory] = None, limit: int = 50) -> List[Tuple[Store, float]]:
+    """반경 radius_m 안의 가게를 가까운 순으로 (가게, 거리m) 목록 반환"""
+    return _nearest(db, lat, lng, radius_m, radius_bounds(lat, lng, radius_m), category, limit, within_radius=True)
+
+def find_stores_in_bounds(db: Session, south: float, west: float, north: float, east: float,
+                          category: Optional[StoreCategory] = None, limit: int = 200,
+                          center: Optional[Tuple[float, float]] = None) -> List[Tuple[Store, float]]:
+    """지도 화면(사각형) 안의 가게를 중심(기본: 사각형 가운데)에서 가까운 순으로 반환"""
+    lat, lng = center or ((south + north) / 2, (west + east) / 2)
+    # 중심에서 가장 먼 모서리까지 넓히면 화면 전체
+    max_radius = max(haversine_m(lat, lng, corner_lat, corner_lng)
+                     for corner_lat in (south, north) for corner_lng in (west, east))
+    return _nearest(db, lat, lng, max_radius, (south, west, north, east), category, limit, within_radius=False)
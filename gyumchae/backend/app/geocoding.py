@@ -0,0 +1,319 @@
+from fastapi import HTTPException
+from fastapi.concurrency import run_in_threadpool
+from datetime import datetime, timedelta
+from typing import Dict, List, NamedTuple, Optional
+from sqlalchemy import bindparam, or_, select, update
+from sqlalchemy.dialects.sqlite import insert
+from app.cache import TTLCache
+from app.database import engine
+from app.http_client import OutboundHTTPClient, http_client
+from app.models import GeocodeCache, Store
+import asyncio
+import hashlib
+import httpx
+import math
+import os
+import re
+import threading
+import time
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# 좌표 변환 제공자: naver(네이버 클라우드 Geocoding API) / stub(외부 호출 없는 오프라인 테스트용)
+GEOCODE_PROVIDER = os.getenv("GEOCODE_PROVIDER", "naver").lower()
+NAVER_GEOCODE_URL = os.getenv("NAVER_GEOCODE_URL", "https://maps.apigw.ntruss.com/map-geocode/v2/geocode")
+GEOCODE_TIMEOUT = float(os.getenv("GEOCODE_TIMEOUT", "5"))
+# 외부 API 동시 호출 수 (모든 요청 합계) / 한 번에 변환할 수 있는 최대 주소 수
+GEOCODE_CONCURRENCY = int(os.getenv("GEOCODE_CONCURRENCY", "8"))
+GEOCODE_BATCH_MAX = int(os.getenv("GEOCODE_BATCH_MAX", "100"))
+# 한 번에 변환할 수 있는 최대 주소 수 - 로그인 사용자(관리자 제외) / 비로그인 (검색 결과 한 페이지 분량)
+GEOCODE_USER_BATCH_MAX = int(os.getenv("GEOCODE_USER_BATCH_MAX", "20"))
+GEOCODE_ANON_BATCH_MAX = int(os.getenv("GEOCODE_ANON_BATCH_MAX", "10"))
+# 관리자가 아닌 클라이언트(로그인 사용자 또는 IP)가 GEOCODE_RATE_WINDOW초 동안 변환할 수 있는 주소 수
+GEOCODE_RATE_LIMIT = int(os.getenv("GEOCODE_RATE_LIMIT", "100"))
+GEOCODE_RATE_WINDOW = float(os.getenv("GEOCODE_RATE_WINDOW", "60"))
+# 찾지 못한 주소를 다시 조회하기까지의 시간(초) - 찾은 좌표는 만료 없이 사용
+GEOCODE_NOT_FOUND_TTL = float(os.getenv("GEOCODE_NOT_FOUND_TTL", "86400"))
+# stub 제공자의 호출당 지연(초) - 벤치마크에서 외부 API 응답 시간 흉내
+GEOCODE_STUB_DELAY = float(os.getenv("GEOCODE_STUB_DELAY", "0"))
+
+_TAG_RE = re.compile(r"<[^>]+>")
+
+def clean_address(address: str) -> str:
+    """검색 결과 강조 태그(<b>) 제거, 연속 공백 정리"""
+    return " ".join(_TAG_RE.sub("", address).split())
+
+class Location(NamedTuple):
+    latitude: float
+    longitude: float
+    road_address: Optional[str] = None
+
+class NaverGeocoder:
+    """네이버 클라우드 플랫폼 Geocoding API (공유 연결 풀 사용)"""
+    name = "naver"
+
+    def __init__(self, url: str = NAVER_GEOCODE_URL, client: OutboundHTTPClient = http_client):
+        self.url = url
+        self.client = client
+
+    async def geocode(self, address: str) -> Optional[Location]:
+        # Geocoding은 검색 API와 달리 Maps API 키로 인증
+        client_id = os.getenv("NAVER_MAP_CLIENT_ID") or os.getenv("NAVER_CLIENT_ID")
+        client_secret = os.getenv("NAVER_MAP_CLIENT_SECRET") or os.getenv("NAVER_CLIENT_SECRET")
+        if not client_id or not client_secret:
+            raise HTTPException(
+                status_code=500,
+                detail="네이버 API 키가 설정되지 않았습니다. NAVER_MAP_CLIENT_ID와 NAVER_MAP_CLIENT_SECRET을 환경 변수에 추가해주세요."
+            )
+        response = await self.client.get(
+            self.url,
+            params={"query": address},
+            headers={"x-ncp-apigw-api-key-id": client_id, "x-ncp-apigw-api-key": client_secret},
+            timeout=GEOCODE_TIMEOUT,
+        )
+        response.raise_for_status()
+        addresses = response.json().get("addresses") or []
+        if not addresses:
+            return None
+        first = addresses[0]
+        return Location(float(first["y"]), float(first["x"]), first.get("roadAddress") or None)
+
+class StubGeocoder:
+    """
+    오프라인 테스트용 제공자 - 외부 호출 없이 주소 해시로 한림대 주변 좌표를 만든다 (같은 주소는 항상 같은 좌표).
+    한글/숫자가 없는 문자열은 찾지 못한 주소로 처리.
+    """
+    name = "stub"
+    CENTER = (37.8863, 127.7357)
+    SPREAD = 0.02
+
+    def __init__(self, delay: float = GEOCODE_STUB_DELAY):
+        self.delay = delay
+        self.calls = 0
+
+    async def geocode(self, address: str) -> Optional[Location]:
+        self.calls += 1
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        if not re.search(r"[가-힣0-9]", address):
+            return None
+        digest = hashlib.blake2b(address.casefold().encode(), digest_size=8).digest()
+        lat_offset = int.from_bytes(digest[:4], "big") / 2 ** 32 - 0.5
+        lng_offset = int.from_bytes(digest[4:], "big") / 2 ** 32 - 0.5
+        return Location(
+            round(self.CENTER[0] + lat_offset * 2 * self.SPREAD, 7),
+            round(self.CENTER[1] + lng_offset * 2 * self.SPREAD, 7),
+            address,
+        )
+
+class GeocodingService:
+    """
+    주소 일괄 좌표 변환
+    1) 정규화된 주소 기준으로 중복 제거
+    2) 좌표가 있는 가게(stores.address) -> 캐시 테이블 -> 제공자 호출 순으로 조회
+       (제공자 호출은 동시 호출 수 제한, 여러 요청이 같은 주소를 동시에 찾으면 한 번만 호출)
+    찾은 좌표는 캐시 테이블과 좌표가 비어 있는 같은 주소의 가게에 저장해 다음부터는 변환하지 않는다.
+    """
+
+    def __init__(self, provider, concurrency: int, not_found_ttl: float, bind=engine):
+        self.provider = provider
+        self.concurrency = concurrency
+        self.not_found_ttl = not_found_ttl
+        self._bind = bind
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self.requested = 0
+        self.duplicates = 0
+        self.store_hits = 0
+        self.cache_hits = 0
+        self.provider_calls = 0
+        self.coalesced = 0
+        self.not_found = 0
+        self.errors = 0
+        self.stores_updated = 0
+
+    async def geocode(self, addresses: List[str]) -> List[dict]:
+        """입력 순서대로 {address, latitude, longitude, road_address, source} 목록 반환"""
+        cleaned = [clean_address(address) for address in addresses]
+        unique: Dict[str, str] = {}
+        for address in cleaned:
+            if address:
+                unique.setdefault(address.casefold(), address)
+        self.requested += len(addresses)
+        self.duplicates += sum(1 for address in cleaned if address) - len(unique)
+
+        resolved = await run_in_threadpool(self._lookup, unique) if unique else {}
+        misses = {key: address for key, address in unique.items() if key not in resolved}
+        fetched = {}
+        if misses:
+            found = await asyncio.gather(*(self._fetch(key, address) for key, address in misses.items()))
+            fetched = {key: result for key, result in zip(misses, found) if result["source"] != "error"}
+            resolved.update(zip(misses, found))
+        # 캐시/제공자에서 찾은 좌표는 좌표가 비어 있는 가게에도 저장
+        locations = {
+            unique[key]: result for key, result in resolved.items()
+            if result["source"] in ("cache", "geocoded") and result["latitude"] is not None
+        }
+        if fetched or locations:
+            # 좌표는 카탈로그(AI 채팅 프롬프트)에 쓰이지 않으므로 카탈로그를 다시 읽지 않음
+            # (버전이 바뀌면 답변/프롬프트 캐시까지 무효화됨)
+            self.stores_updated += await run_in_threadpool(self._save, unique, fetched, locations)
+
+        return [
+            {"address": address, **resolved.get(cleaned_address.casefold(), {"source": "not_found"})}
+            for address, cleaned_address in zip(addresses, cleaned)
+        ]
+
+    def _lookup(self, unique: Dict[str, str]) -> Dict[str, dict]:
+        resolved = {}
+        with self._bind.connect() as conn:
+            # 1) 좌표가 이미 있는 가게
+            rows = conn.execute(
+                select(Store.address, Store.latitude, Store.longitude)
+                .where(Store.address.in_(list(unique.values())))
+                .where(Store.latitude.isnot(None), Store.longitude.isnot(None))
+            )
+            for address, latitude, longitude in rows:
+                resolved[address.casefold()] = {
+                    "latitude": latitude, "longitude": longitude, "road_address": None, "source": "store",
+                }
+            self.store_hits += len(resolved)
+
+            # 2) 캐시 테이블 (찾지 못한 주소는 GEOCODE_NOT_FOUND_TTL 안에서만 사용)
+            keys = [key for key in unique if key not in resolved]
+            if keys:
+                retry_before = datetime.utcnow() - timedelta(seconds=self.not_found_ttl)
+                rows = conn.execute(
+                    select(GeocodeCache.address_key, GeocodeCache.latitude, GeocodeCache.longitude, GeocodeCache.road_address)
+                    .where(GeocodeCache.provider == self.provider.name)
+                    .where(GeocodeCache.address_key.in_(keys))
+                    .where(or_(GeocodeCache.latitude.isnot(None), GeocodeCache.created_at >= retry_before))
+                )
+                for key, latitude, longitude, road_address in rows:
+                    resolved[key] = {
+                        "latitude": latitude,
+                        "longitude": longitude,
+                        "road_address": road_address,
+                        "source": "cache" if latitude is not None else "not_found",
+                    }
+                    self.cache_hits += 1
+        return resolved
+
+    async def _fetch(self, key: str, address: str) -> dict:
+        task = self._inflight.get(key)
+        if task is not None:
+            self.coalesced += 1
+        else:
+            task = asyncio.ensure_future(self._call_provider(address))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        # 요청 하나가 취소돼도 같은 주소를 기다리는 다른 요청을 위해 호출은 계속 진행
+        return await asyncio.shield(task)
+
+    async def _call_provider(self, address: str) -> dict:
+        async with self._semaphore:
+            self.provider_calls += 1
+            try:
+                location = await self.provider.geocode(address)
+            except (httpx.HTTPError, ValueError, KeyError) as e:
+                # 일시적 오류는 캐시하지 않고 다음 요청에서 다시 시도
+                self.errors += 1
+                print(f"⚠️ 주소 좌표 변환 실패 ({address}): {e}")
+                return {"latitude": None, "longitude": None, "road_address": None, "source": "error"}
+        if location is None:
+            self.not_found += 1
+            return {"latitude": None, "longitude": None, "road_address": None, "source": "not_found"}
+        return {**location._asdict(), "source": "geocoded"}
+
+    def _save(self, unique: Dict[str, str], fetched: Dict[str, dict], locations: Dict[str, dict]) -> int:
+        """제공자 결과를 캐시에 저장하고, 좌표가 비어 있는 가게에 좌표 저장 (갱신한 가게 수 반환)"""
+        now = datetime.utcnow()
+        with self._bind.begin() as conn:
+            if fetched:
+                statement = insert(GeocodeCache)
+                conn.execute(
+                    statement.on_conflict_do_update(
+                        index_elements=["provider", "address_key"],
+                        set_={
+                            column: statement.excluded[column]
+                            for column in ("address", "latitude", "longitude", "road_address", "created_at")
+                        },
+                    ),
+                    [
+                        {
+                            "provider": self.provider.name,
+                            "address_key": key,
+                            "address": unique[key],
+                            "latitude": result["latitude"],
+                            "longitude": result["longitude"],
+                            "road_address": result["road_address"],
+                            "created_at": now,
+                        }
+                        for key, result in fetched.items()
+                    ],
+                )
+            if not locations:
+                return 0
+            # 공간 인덱스(store_locations)는 stores 트리거로 함께 갱신됨
+            result = conn.execute(
+                update(Store)
+                .where(Store.address == bindparam("b_address"))
+                .where(or_(Store.latitude.is_(None), Store.longitude.is_(None)))
+                .values(latitude=bindparam("b_latitude"), longitude=bindparam("b_longitude")),
+                [
+                    {"b_address": address, "b_latitude": result["latitude"], "b_longitude": result["longitude"]}
+                    for address, result in locations.items()
+                ],
+            )
+            return max(result.rowcount, 0)
+
+    def stats(self) -> dict:
+        return {
+            "provider": self.provider.name,
+            "concurrency": self.concurrency,
+            "requested": self.requested,
+            "duplicates": self.duplicates,
+            "store_hits": self.store_hits,
+            "cache_hits": self.cache_hits,
+            "provider_calls": self.provider_calls,
+            "coalesced": self.coalesced,
+            "not_found": self.not_found,
+            "errors": self.errors,
+            "stores_updated": self.stores_updated,
+            "inflight": len(self._inflight),
+        }
+
+class GeocodeRateLimiter:
+    """클라이언트별 변환 주소 수 제한 (고정 구간) - 넘으면 429 + Retry-After"""
+
+    def __init__(self, limit: int, window: float, maxsize: int = 10000):
+        self.limit = limit
+        self.window = window
+        # {클라이언트: (구간 시작 시각, 사용한 주소 수)} - 구간이 끝나면 만료
+        self._windows = TTLCache(maxsize=maxsize, ttl=window)
+        self._lock = threading.Lock()
+        self.rejected = 0
+
+    def acquire(self, key: str, amount: int):
+        now = time.monotonic()
+        with self._lock:
+            started, used = self._windows.get(key, (now, 0))
+            if used + amount > self.limit:
+                self.rejected += 1
+                raise HTTPException(
+                    status_code=429,
+                    detail="주소 변환 요청이 너무 많습니다. 잠시 후 다시 시도해주세요.",
+                    headers={"Retry-After": str(max(1, math.ceil(started + self.window - now)))},
+                )
+            self._windows.set(key, (started, used + amount), ttl=started + self.window - now)
+
+def _default_provider():
+    if GEOCODE_PROVIDER == "stub":
+        return StubGeocoder()
+    if GEOCODE_PROVIDER != "naver":
+        print(f"⚠️ 알 수 없는 GEOCODE_PROVIDER({GEOCODE_PROVIDER}) - naver를 사용합니다.")
+    return NaverGeocoder()
+
+geocoder = GeocodingService(_default_provider(), concurrency=GEOCODE_CONCURRENCY, not_found_ttl=GEOCODE_NOT_FOUND_TTL)
+geocode_limiter = GeocodeRateLimiter(limit=GEOCODE_RATE_LIMIT, window=GEOCODE_RATE_WINDOW)
@@ -0,0 +1,236 @@
+from collections import defaultdict
+from datetime import datetime
+from typing import Dict, List, Optional
+from sqlalchemy import bindparam, select, tuple_, update
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.orm import Session
+from app.database import engine
+from app.models import Comment, Post, PostHotScore, PostHotScoreState, PostLike
+from app.pagination import decode_cursor, encode_cursor
+from app.view_counter import view_counts
+import math
+import os
+import threading
+import time
+import traceback
+
+# 새 게시글/좋아요/댓글을 인기 점수에 반영하는 주기(초)
+HOT_REFRESH_INTERVAL = float(os.getenv("HOT_REFRESH_INTERVAL", "30"))
+# 활동의 영향이 절반으로 줄어드는 시간
+HOT_HALF_LIFE_HOURS = float(os.getenv("HOT_HALF_LIFE_HOURS", "24"))
+# 활동별 가중치 (게시글 작성 1번 = HOT_WEIGHT_POST점)
+HOT_WEIGHT_POST = float(os.getenv("HOT_WEIGHT_POST", "1"))
+HOT_WEIGHT_LIKE = float(os.getenv("HOT_WEIGHT_LIKE", "3"))
+HOT_WEIGHT_COMMENT = float(os.getenv("HOT_WEIGHT_COMMENT", "5"))
+HOT_WEIGHT_VIEW = float(os.getenv("HOT_WEIGHT_VIEW", "0.1"))
+# 한 번에 읽어 반영하는 활동 수 (처음 만들 때 전체 게시글을 나눠서 처리)
+HOT_REFRESH_BATCH = 10_000
+
+# 점수 기준 시각 - 점수는 로그 공간에 저장하므로 시간이 지나도 값이 넘치지 않는다
+HOT_EPOCH = datetime(2024, 1, 1)
+_DECAY_SECONDS = HOT_HALF_LIFE_HOURS * 3600 / math.log(2)
+_STATE_ID = 1
+
+def activity_term(weight: float, at: Optional[datetime]) -> float:
+    """
+    at 시각의 활동 하나(가중치 weight)가 점수에 더하는 항 = ln(weight) + (at - 기준 시각) / τ
+    점수 = ln(Σ e^항) 이고, 지금 시점의 인기도 Σ weight × e^(-(now - at) / τ)와는 모든 게시글에 같은 값을 곱한 관계라
+    오래된 게시글의 점수를 다시 계산하지 않아도 점수 순서가 곧 지금의 인기 순서가 된다.
+    """
+    seconds = ((at or datetime.utcnow()) - HOT_EPOCH).total_seconds()
+    return math.log(weight) + seconds / _DECAY_SECONDS
+
+def add_terms(score: Optional[float], terms: List[float]) -> float:
+    """ln(e^score + Σ e^항) - 큰 값 기준으로 계산해 overflow 방지"""
+    values = terms if score is None else [score, *terms]
+    top = max(values)
+    return top + math.log(sum(math.exp(value - top) for value in values))
+
+def remove_term(score: float, term: float) -> float:
+    """ln(e^score - e^항) - 빼는 항이 점수와 거의 같으면 아주 작은 값만 남김"""
+    ratio = min(math.exp(term - score), 1 - 1e-9)
+    return score + math.log1p(-ratio)
+
+def hot_cursor(row) -> str:
+    """(score, post_id) 키셋 기준 커서 생성"""
+    post, score = row
+    return encode_cursor(score, post.id)
+
+def apply_hot_cursor(query, cursor: str):
+    """인기순 다음 페이지 조건 - 페이지 사이에 점수가 바뀐 게시글은 위치가 달라질 수 있음"""
+    score, post_id = decode_cursor(cursor, 2)
+    return query.filter(tuple_(PostHotScore.score, PostHotScore.post_id) < (score, post_id))
+
+_UPDATE_SCORE = (
+    update(PostHotScore)
+    .where(PostHotScore.post_id == bindparam("hot_post_id"))
+    .values(score=bindparam("hot_score"), updated_at=bindparam("hot_updated_at"))
+)
+
+def _apply_terms(conn, terms: Dict[int, List[float]], now: datetime) -> int:
+    """게시글별 새 항을 점수에 더함 (점수가 없으면 새로 만듦) - 갱신한 게시글 수 반환"""
+    if not terms:
+        return 0
+    post_ids = list(terms)
+    existing = dict(conn.execute(
+        select(PostHotScore.post_id, PostHotScore.score).where(PostHotScore.post_id.in_(post_ids))
+    ).all())
+    missing = [post_id for post_id in post_ids if post_id not in existing]
+    categories = dict(conn.execute(select(Post.id, Post.category).where(Post.id.in_(missing))).all()) if missing else {}
+    inserts, updates = [], []
+    for post_id, values in terms.items():
+        if post_id in existing:
+            updates.append({"hot_post_id": post_id, "hot_score": add_terms(existing[post_id], values), "hot_updated_at": now})
+        elif post_id in categories:
+            inserts.append({"post_id": post_id, "category": categories[post_id], "score": add_terms(None, values), "updated_at": now})
+    if inserts:
+        conn.execute(insert(PostHotScore), inserts)
+    if updates:
+        conn.execute(_UPDATE_SCORE, updates)
+    return len(inserts) + len(updates)
+
+def record_views(conn, batch: Dict[str, Dict[int, int]]):
+    """
+    조회수 플러시 트랜잭션 안에서 게시글 조회수 증가분을 점수에 반영 (view_counts 리스너)
+    아직 점수에 반영되지 않은 게시글(마지막으로 반영한 게시글 id 이후)은 건너뛴다 -
+    같은 트랜잭션에서 올린 view_count를 게시글 반영 때 읽으므로 여기서 더하면 두 번 세게 된다.
+    """
+    counts = batch.get(Post.__tablename__)
+    if not counts:
+        return
+    # 조회수 UPDATE로 이미 쓰기 잠금을 잡은 뒤라 점수 갱신과 순서가 엇갈리지 않음
+    last_post_id = conn.execute(
+        select(PostHotScoreState.last_post_id).where(PostHotScoreState.id == _STATE_ID)
+    ).scalar()
+    if last_post_id is None:
+        return
+    now = datetime.utcnow()
+    _apply_terms(conn, {
+        post_id: [activity_term(HOT_WEIGHT_VIEW * amount, now)]
+        for post_id, amount in counts.items() if post_id <= last_post_id
+    }, now)
+
+def remove_like(db: Session, like: PostLike):
+    """
+    좋아요 취소 - 이미 점수에 반영된 좋아요면 같은 트랜잭션에서 그 항을 뺌
+    좋아요 삭제와 함께 커밋되므로 주기적 반영과 순서가 엇갈려도 두 번 빼거나 빼지 않는 경우가 없다.
+    (호출 전에 같은 트랜잭션에서 쓰기를 먼저 실행해 다른 반영 작업과 겹치지 않게 할 것)
+    """
+    last_like_id = db.execute(
+        select(PostHotScoreState.last_like_id).where(PostHotScoreState.id == _STATE_ID)
+    ).scalar()
+    if last_like_id is None or like.id > last_like_id:
+        return
+    score = db.execute(select(PostHotScore.score).where(PostHotScore.post_id == like.post_id)).scalar()
+    if score is None:
+        return
+    db.execute(_UPDATE_SCORE, {
+        "hot_post_id": like.post_id,
+        "hot_score": remove_term(score, activity_term(HOT_WEIGHT_LIKE, like.created_at)),
+        "hot_updated_at": datetime.utcnow(),
+    })
+
+class HotPostRanking:
+    """
+    인기 게시글 점수 갱신기
+    마지막으로 반영한 게시글/좋아요/댓글 id 이후의 행만 읽어 해당 게시글 점수에 더하므로
+    갱신 비용은 전체 게시글 수가 아니라 그동안의 활동 수에 비례한다.
+    게시글을 처음 반영할 때 그때까지의 조회수를 함께 더하고, 이후 조회수는 조회수 플러시 때,
+    좋아요 취소는 취소 요청 트랜잭션에서 바로 반영된다.
+    """
+
+    def __init__(self, refresh_interval: float, bind=engine):
+        self._refresh_interval = refresh_interval
+        self._bind = bind
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopped = threading.Event()
+        self._thread = None
+        self.last_refresh = {}
+
+    def refresh(self) -> dict:
+        """새 활동을 점수에 반영하고 반영 결과(활동 수, 갱신한 게시글 수, 걸린 시간)를 반환"""
+        with self._lock:
+            started = time.perf_counter()
+            now = datetime.utcnow()
+            result = {"posts": 0, "likes": 0, "comments": 0, "scored_posts": 0}
+            with self._bind.begin() as conn:
+                conn.execute(insert(PostHotScoreState).values(
+                    id=_STATE_ID, last_post_id=0, last_like_id=0, last_comment_id=0, refreshed_at=now
+                ).on_conflict_do_nothing())
+
+            def posts(row):
+                terms = [activity_term(HOT_WEIGHT_POST, row.created_at)]
+                # 반영 전까지 쌓인 조회수는 작성 시각 기준으로 반영 (이후 조회수는 record_views가 반영)
+                if row.view_count:
+                    terms.append(activity_term(HOT_WEIGHT_VIEW * row.view_count, row.created_at))
+                return terms
+
+            self._scan(now, result, "posts", PostHotScoreState.last_post_id, posts,
+                       select(Post.id, Post.id.label("post_id"), Post.created_at, Post.view_count), Post.id)
+            self._scan(now, result, "likes", PostHotScoreState.last_like_id,
+                       lambda row: [activity_term(HOT_WEIGHT_LIKE, row.created_at)],
+                       select(PostLike.id, PostLike.post_id, PostLike.created_at), PostLike.id)
+            self._scan(now, result, "comments", PostHotScoreState.last_comment_id,
+                       lambda row: [activity_term(HOT_WEIGHT_COMMENT, row.created_at)],
+                       select(Comment.id, Comment.post_id, Comment.created_at), Comment.id)
+            result["seconds"] = round(time.perf_counter() - started, 4)
+            self.last_refresh = result
+            return result
+
+    def _scan(self, now: datetime, result: dict, name: str, state_column, make_terms, query, id_column):
+        """
+        마지막으로 반영한 id 이후의 행을 HOT_REFRESH_BATCH개씩 읽어 점수에 반영
+        배치마다 점수와 마지막 id를 함께 커밋하므로 처음 만들 때도 쓰기 잠금을 오래 잡지 않고,
+        중간에 멈춰도 다음 갱신이 이어서 반영한다.
+        """
+        while True:
+            with self._bind.begin() as conn:
+                # 상태 행을 먼저 갱신해 쓰기 잠금을 잡음 (여러 프로세스가 같은 활동을 두 번 반영하지 않도록)
+                conn.execute(update(PostHotScoreState).where(PostHotScoreState.id == _STATE_ID).values(refreshed_at=now))
+                last_id = conn.execute(select(state_column).where(PostHotScoreState.id == _STATE_ID)).scalar()
+                rows = conn.execute(query.where(id_column > last_id).order_by(id_column).limit(HOT_REFRESH_BATCH)).all()
+                if not rows:
+                    return
+                terms = defaultdict(list)
+                for row in rows:
+                    if row.post_id is not None:
+                        terms[row.post_id].extend(make_terms(row))
+                result[name] += len(rows)
+                result["scored_posts"] += _apply_terms(conn, terms, now)
+                conn.execute(update(PostHotScoreState).where(PostHotScoreState.id == _STATE_ID).values(
+                    {state_column: rows[-1].id}
+                ))
+            if len(rows) < HOT_REFRESH_BATCH:
+                return
+
+    def start(self):
+        """백그라운드 갱신 스레드 시작 (시작하자마자 한 번 갱신)"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._run, name="hot-post-ranking", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """갱신 스레드를 멈추고 남은 활동을 반영 (서버 종료 시 호출)"""
+        self._stopped.set()
+        self._wakeup.set()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+        self.refresh()
+
+    def _run(self):
+        while not self._stopped.is_set():
+            try:
+                self.refresh()
+            except Exception as e:
+                print(f"⚠️ 인기 게시글 점수 갱신 오류: {e}")
+                traceback.print_exc()
+            self._wakeup.wait(self._refresh_interval)
+            self._wakeup.clear()
+
+hot_posts = HotPostRanking(refresh_interval=HOT_REFRESH_INTERVAL)
+# 조회수는 플러시할 때 같은 트랜잭션에서 점수에 반영
+view_counts.add_flush_listener(record_views)
@@ -0,0 +1,139 @@
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+import asyncio
+import httpx
+import os
+import random
+from dotenv import load_dotenv
+try:
+    import h2  # noqa: F401
+except ImportError:
+    h2 = None
+
+load_dotenv()
+
+# 외부 API 호출용 공유 클라이언트 설정
+# HTTP/2 사용 여부 (h2 패키지가 없으면 HTTP/1.1 keep-alive로 동작)
+HTTP_CLIENT_HTTP2 = os.getenv("HTTP_CLIENT_HTTP2", "true").lower() in ("1", "true", "yes")
+if HTTP_CLIENT_HTTP2 and h2 is None:
+    print("⚠️ h2 패키지가 없어 외부 API 호출에 HTTP/1.1을 사용합니다. (pip install 'httpx[http2]')")
+    HTTP_CLIENT_HTTP2 = False
+# 전체 연결 수 / 유지할 유휴 연결 수 / 유휴 연결 유지 시간(초)
+HTTP_CLIENT_MAX_CONNECTIONS = int(os.getenv("HTTP_CLIENT_MAX_CONNECTIONS", "100"))
+HTTP_CLIENT_MAX_KEEPALIVE = int(os.getenv("HTTP_CLIENT_MAX_KEEPALIVE", "20"))
+HTTP_CLIENT_KEEPALIVE_EXPIRY = float(os.getenv("HTTP_CLIENT_KEEPALIVE_EXPIRY", "30"))
+HTTP_CLIENT_TIMEOUT = float(os.getenv("HTTP_CLIENT_TIMEOUT", "10"))
+# 호스트별 동시 요청 수 제한 (한 외부 API가 연결 풀을 독차지하지 않도록)
+HTTP_CLIENT_PER_HOST_LIMIT = int(os.getenv("HTTP_CLIENT_PER_HOST_LIMIT", "20"))
+# 일시적 오류 재시도 횟수 / 첫 재시도 대기 기준(초, 지수 증가 + 무작위 jitter)
+HTTP_CLIENT_RETRIES = int(os.getenv("HTTP_CLIENT_RETRIES", "2"))
+HTTP_CLIENT_RETRY_BACKOFF = float(os.getenv("HTTP_CLIENT_RETRY_BACKOFF", "0.2"))
+
+# 재시도할 응답 코드 / 재시도해도 안전한 메서드
+RETRY_STATUS_CODES = {429, 502, 503, 504}
+IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS", "PUT", "DELETE"}
+
+class OutboundHTTPClient:
+    """
+    애플리케이션 전체에서 공유하는 외부 API 클라이언트
+    연결 풀(keep-alive, HTTP/2)을 재사용하고, 호스트별 동시 요청 수 제한과
+    일시적 오류(연결 실패, 429/502/503/504) 재시도를 처리한다.
+    """
+
+    def __init__(
+        self,
+        http2: bool = HTTP_CLIENT_HTTP2,
+        max_connections: int = HTTP_CLIENT_MAX_CONNECTIONS,
+        max_keepalive: int = HTTP_CLIENT_MAX_KEEPALIVE,
+        keepalive_expiry: float = HTTP_CLIENT_KEEPALIVE_EXPIRY,
+        timeout: float = HTTP_CLIENT_TIMEOUT,
+        per_host_limit: int = HTTP_CLIENT_PER_HOST_LIMIT,
+        retries: int = HTTP_CLIENT_RETRIES,
+        retry_backoff: float = HTTP_CLIENT_RETRY_BACKOFF,
+    ):
+        self.http2 = http2
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self.timeout = timeout
+        self.per_host_limit = per_host_limit
+        self.retries = retries
+        self.retry_backoff = retry_backoff
+        self._client: Optional[httpx.AsyncClient] = None
+        self._host_limits: Dict[str, asyncio.Semaphore] = {}
+        self.requests = 0
+        self.retried = 0
+
+    def start(self):
+        """연결 풀 생성 (lifespan 시작 시 호출, 호출 전 첫 요청에서도 자동 생성)"""
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(http2=self.http2, limits=self.limits, timeout=self.timeout)
+            self._host_limits = {}
+        return self
+
+    async def close(self):
+        """연결 풀 정리 (lifespan 종료 시 호출)"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    def _host_limit(self, url: str) -> asyncio.Semaphore:
+        host = urlsplit(url).netloc
+        semaphore = self._host_limits.get(host)
+        if semaphore is None:
+            semaphore = self._host_limits.setdefault(host, asyncio.Semaphore(self.per_host_limit))
+        return semaphore
+
+    def _retry_delay(self, attempt: int) -> float:
+        # full jitter - 동시에 실패한 요청들이 같은 순간에 다시 몰리지 않도록
+        return random.uniform(0, self.retry_backoff * (2 ** attempt))
+
+    async def request(self, method: str, url: str, retries: Optional[int] = None, **kwargs) -> httpx.Response:
+        """
+        요청 전송 (응답 상태 확인은 호출하는 쪽에서)
+        재시도는 멱등 메서드에만 적용하며, 마지막 시도의 응답/예외를 그대로 돌려준다.
+        """
+        self.start()
+        method = method.upper()
+        if retries is None:
+            retries = self.retries if method in IDEMPOTENT_METHODS else 0
+
+        async with self._host_limit(url):
+            for attempt in range(retries + 1):
+                self.requests += 1
+                last_attempt = attempt == retries
+                try:
+                    response = await self._client.request(method, url, **kwargs)
+                except httpx.TransportError:
+                    if last_attempt:
+                        raise
+                else:
+                    if response.status_code not in RETRY_STATUS_CODES or last_attempt:
+                        return response
+                    await response.aclose()
+                self.retried += 1
+                await asyncio.sleep(self._retry_delay(attempt))
+
+    async def get(self, url: str, **kwargs) -> httpx.Response:
+        return await self.request("GET", url, **kwargs)
+
+    async def post(self, url: str, **kwargs) -> httpx.Response:
+        return await self.request("POST", url, **kwargs)
+
+    def stats(self) -> dict:
+        return {
+            "http2": self.http2,
+            "max_connections": self.limits.max_connections,
+            "max_keepalive_connections": self.limits.max_keepalive_connections,
+            "per_host_limit": self.per_host_limit,
+            "requests": self.requests,
+            "retried": self.retried,
+        }
+
+http_client = OutboundHTTPClient()
+
+def get_http_client() -> OutboundHTTPClient:
+    """외부 API 클라이언트 의존성 (라우터에서 Depends로 주입)"""
+    return http_client
@@ -0,0 +1,243 @@
+from datetime import datetime, timedelta
+from typing import Callable, Dict, NamedTuple, Optional
+from sqlalchemy import delete, func, insert, select, update
+from app.database import engine
+from app.models import Job
+import json
+import os
+import random
+import threading
+import time
+import traceback
+
+# 백그라운드 작업 워커 스레드 수 / 대기 작업 확인 주기(초)
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "4"))
+JOB_POLL_INTERVAL = float(os.getenv("JOB_POLL_INTERVAL", "1"))
+# 최대 시도 횟수 / 재시도 대기 기준(초, 시도마다 2배 + jitter)
+JOB_MAX_ATTEMPTS = int(os.getenv("JOB_MAX_ATTEMPTS", "5"))
+JOB_RETRY_BACKOFF = float(os.getenv("JOB_RETRY_BACKOFF", "2"))
+# 실행 중 상태로 이 시간(초)이 지난 작업은 워커가 죽은 것으로 보고 다시 대기열로
+JOB_LOCK_TIMEOUT = float(os.getenv("JOB_LOCK_TIMEOUT", "300"))
+# 완료된 작업 기록 보관 시간(초)
+JOB_RETENTION = float(os.getenv("JOB_RETENTION", str(7 * 86400)))
+
+class ClaimedJob(NamedTuple):
+    id: int
+    kind: str
+    payload: str
+    attempts: int
+
+class JobQueue:
+    """
+    SQLite 테이블(jobs) 기반 작업 큐 + 워커 스레드 풀
+    - enqueue(conn=...)로 데이터 행과 작업 행을 같은 트랜잭션에 커밋 (커밋되면 작업도 남아 있음)
+    - 워커는 UPDATE ... RETURNING 한 문장으로 작업 하나를 가져감 (여러 워커/프로세스가 같은 작업을 가져가지 않음)
+    - 처리 함수가 예외를 내면 지수 대기 후 재시도, max_attempts를 넘으면 failed + on_failure 호출
+    - 실행 중에 프로세스가 죽어 running으로 남은 작업은 lock_timeout 후 다시 queued
+    처리 함수는 같은 작업이 다시 실행돼도 결과가 같도록(멱등) 작성한다.
+    """
+
+    def __init__(self, workers: int, poll_interval: float, max_attempts: int, retry_backoff: float,
+                 lock_timeout: float, retention: float, bind=engine):
+        self.workers = workers
+        self.poll_interval = poll_interval
+        self.max_attempts = max_attempts
+        self.retry_backoff = retry_backoff
+        self.lock_timeout = lock_timeout
+        self.retention = retention
+        self._bind = bind
+        self._handlers: Dict[str, tuple] = {}
+        self._condition = threading.Condition()
+        self._stopped = threading.Event()
+        self._threads = []
+        self._last_recovery = 0.0
+        self._lock = threading.Lock()
+        self.completed = 0
+        self.retried = 0
+        self.failed = 0
+
+    def register(self, kind: str, handler: Callable[[dict], None],
+                 on_failure: Optional[Callable[[dict, str], None]] = None):
+        """작업 종류별 처리 함수 등록 (on_failure: 최대 시도 후에도 실패했을 때)"""
+        self._handlers[kind] = (handler, on_failure)
+
+    def enqueue(self, kind: str, payload: dict, conn=None, delay: float = 0) -> int:
+        """
+        작업 추가 후 id 반환
+        conn을 주면 그 트랜잭션 안에서 추가 (커밋 후 notify() 호출), 없으면 바로 커밋하고 워커를 깨움
+        """
+        statement = insert(Job).values(
+            kind=kind,
+            payload=json.dumps(payload, ensure_ascii=False),
+            status="queued",
+            attempts=0,
+            available_at=datetime.utcnow() + timedelta(seconds=delay),
+        )
+        if conn is not None:
+            return conn.execute(statement).inserted_primary_key[0]
+        with self._bind.begin() as own_conn:
+            job_id = own_conn.execute(statement).inserted_primary_key[0]
+        self.notify()
+        return job_id
+
+    def notify(self, count: int = 1):
+        """대기 중인 워커 깨우기"""
+        with self._condition:
+            self._condition.notify(count)
+
+    def claim(self, worker: str) -> Optional[ClaimedJob]:
+        """실행할 수 있는 가장 오래된 작업 하나를 running으로 바꾸고 반환"""
+        if not self._handlers:
+            return None
+        now = datetime.utcnow()
+        next_job = (
+            select(Job.id)
+            .where(Job.status == "queued", Job.available_at <= now, Job.kind.in_(list(self._handlers)))
+            .order_by(Job.available_at, Job.id)
+            .limit(1)
+            .scalar_subquery()
+        )
+        with self._bind.begin() as conn:
+            row = conn.execute(
+                update(Job)
+                .where(Job.id == next_job)
+                .values(status="running", attempts=Job.attempts + 1, locked_by=worker, locked_at=now)
+                .returning(Job.id, Job.kind, Job.payload, Job.attempts)
+            ).first()
+        return ClaimedJob(*row) if row else None
+
+    def process_one(self, worker: str) -> bool:
+        """작업 하나 처리 (없으면 False)"""
+        job = self.claim(worker)
+        if job is None:
+            return False
+        handler, on_failure = self._handlers[job.kind]
+        payload = json.loads(job.payload)
+        try:
+            handler(payload)
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+            if self._fail(job, worker, error) and on_failure is not None:
+                on_failure(payload, error)
+        else:
+            self._finish(job, worker, status="done", last_error=None)
+            with self._lock:
+                self.completed += 1
+        return True
+
+    def run_pending(self, worker: str = "inline") -> int:
+        """대기 작업을 모두 현재 스레드에서 처리 (스크립트용), 처리한 작업 수 반환"""
+        processed = 0
+        while self.process_one(worker):
+            processed += 1
+        return processed
+
+    def _finish(self, job: ClaimedJob, worker: str, **values):
+        # 잠금 시간이 지나 다른 워커가 다시 가져간 작업이면 아무것도 바꾸지 않음
+        with self._bind.begin() as conn:
+            conn.execute(
+                update(Job)
+                .where(Job.id == job.id, Job.status == "running", Job.locked_by == worker)
+                .values(locked_by=None, locked_at=None, finished_at=datetime.utcnow(), **values)
+            )
+
+    def _fail(self, job: ClaimedJob, worker: str, error: str) -> bool:
+        """재시도 예약 또는 실패 처리 - 최종 실패면 True"""
+        if job.attempts >= self.max_attempts:
+            print(f"❌ 작업 실패 ({job.kind} #{job.id}, {job.attempts}회 시도): {error}")
+            self._finish(job, worker, status="failed", last_error=error)
+            with self._lock:
+                self.failed += 1
+            return True
+        delay = self.retry_backoff * (2 ** (job.attempts - 1)) * random.uniform(0.5, 1.0)
+        with self._bind.begin() as conn:
+            conn.execute(
+                update(Job)
+                .where(Job.id == job.id, Job.status == "running", Job.locked_by == worker)
+                .values(
+                    status="queued",
+                    locked_by=None,
+                    locked_at=None,
+                    last_error=error,
+                    available_at=datetime.utcnow() + timedelta(seconds=delay),
+                )
+            )
+        with self._lock:
+            self.retried += 1
+        return False
+
+    def recover(self) -> int:
+        """잠금 시간이 지난 running 작업을 다시 대기열로, 오래된 완료 기록 삭제 - 되돌린 작업 수 반환"""
+        now = datetime.utcnow()
+        self._last_recovery = time.monotonic()
+        with self._bind.begin() as conn:
+            requeued = conn.execute(
+                update(Job)
+                .where(Job.status == "running", Job.locked_at < now - timedelta(seconds=self.lock_timeout))
+                .values(status="queued", locked_by=None, locked_at=None, available_at=now)
+            ).rowcount
+            conn.execute(
+                delete(Job).where(Job.status == "done", Job.finished_at < now - timedelta(seconds=self.retention))
+            )
+        if requeued:
+            print(f"⚠️ 잠금 시간이 지난 작업 {requeued}개를 다시 대기열에 넣었습니다.")
+        return requeued
+
+    def _run(self, worker: str):
+        while not self._stopped.is_set():
+            try:
+                if self.process_one(worker):
+                    continue
+                if time.monotonic() - self._last_recovery > self.lock_timeout / 4:
+                    self.recover()
+            except Exception:
+                # DB 잠금 등 일시적 오류 - 잠시 후 다시 시도
+                traceback.print_exc()
+            with self._condition:
+                if not self._stopped.is_set():
+                    self._condition.wait(self.poll_interval)
+
+    def start(self):
+        """워커 스레드 시작"""
+        if any(thread.is_alive() for thread in self._threads):
+            return
+        self._stopped.clear()
+        self.recover()
+        self._threads = [
+            threading.Thread(target=self._run, args=(f"{os.getpid()}-{index}",), name=f"job-worker-{index}", daemon=True)
+            for index in range(self.workers)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def stop(self, timeout: float = 10):
+        """워커 종료 (실행 중인 작업은 끝날 때까지 기다림)"""
+        self._stopped.set()
+        with self._condition:
+            self._condition.notify_all()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    def stats(self) -> dict:
+        with self._bind.connect() as conn:
+            counts = dict(conn.execute(select(Job.status, func.count()).group_by(Job.status)).all())
+        return {
+            "workers": self.workers,
+            "running_workers": sum(1 for thread in self._threads if thread.is_alive()),
+            # DB 기준 상태별 작업 수
+            "jobs": {status: counts.get(status, 0) for status in ("queued", "running", "done", "failed")},
+            # 이 프로세스의 워커가 처리한 수
+            "completed": self.completed,
+            "retried": self.retried,
+            "failed": self.failed,
+        }
+
+job_queue = JobQueue(
+    workers=JOB_WORKERS,
+    poll_interval=JOB_POLL_INTERVAL,
+    max_attempts=JOB_MAX_ATTEMPTS,
+    retry_backoff=JOB_RETRY_BACKOFF,
+    lock_timeout=JOB_LOCK_TIMEOUT,
+    retention=JOB_RETENTION,
+)
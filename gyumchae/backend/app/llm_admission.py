@@ -0,0 +1,191 @@
+from collections import OrderedDict, defaultdict, deque
+from contextlib import asynccontextmanager
+from fastapi import HTTPException, status
+from typing import Callable, Deque, Dict
+import asyncio
+import bisect
+import os
+import time
+
+# Gemini 동시 호출 수 (넘으면 대기열에서 기다림)
+AI_CHAT_MAX_IN_FLIGHT = int(os.getenv("AI_CHAT_MAX_IN_FLIGHT", "8"))
+# 대기열 크기 (전체 / 사용자별) - 넘으면 바로 503으로 거절
+AI_CHAT_MAX_QUEUE = int(os.getenv("AI_CHAT_MAX_QUEUE", "64"))
+AI_CHAT_MAX_QUEUE_PER_USER = int(os.getenv("AI_CHAT_MAX_QUEUE_PER_USER", "4"))
+# 대기열에서 기다릴 수 있는 최대 시간(초) - 넘으면 503
+AI_CHAT_QUEUE_TIMEOUT = float(os.getenv("AI_CHAT_QUEUE_TIMEOUT", "20"))
+AI_CHAT_RETRY_AFTER = int(os.getenv("AI_CHAT_RETRY_AFTER", "2"))
+
+# 히스토그램 구간 - 대기 시간(ms), 요청이 도착했을 때의 대기열 길이 (마지막은 그 이상)
+WAIT_BUCKETS_MS = [10, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 20000]
+QUEUE_DEPTH_BUCKETS = [0, 1, 2, 4, 8, 16, 32, 64]
+
+def _histogram(bounds, counts, unit: str = "") -> dict:
+    histogram = {f"le_{bound}{unit}": count for bound, count in zip(bounds, counts)}
+    histogram["inf"] = counts[-1]
+    return histogram
+
+class LLMAdmissionController:
+    """
+    AI 채팅 Gemini 호출 입장 제어
+    동시 호출 수를 max_in_flight로 제한하고, 나머지는 사용자별 대기열에 넣는다.
+    자리가 나면 실행 중인 요청이 가장 적은 사용자부터 (같으면 돌아가며) 입장시켜
+    한 사용자가 요청을 몰아 보내도 다른 사용자가 밀리지 않게 한다.
+    대기열이 가득 찼거나 대기 시간이 deadline을 넘으면 503(Retry-After)으로 응답한다.
+    이벤트 루프 안에서만 사용 (잠금 없음).
+    """
+
+    def __init__(self, max_in_flight: int = AI_CHAT_MAX_IN_FLIGHT, max_queue: int = AI_CHAT_MAX_QUEUE,
+                 max_queue_per_user: int = AI_CHAT_MAX_QUEUE_PER_USER, queue_timeout: float = AI_CHAT_QUEUE_TIMEOUT):
+        self.max_in_flight = max_in_flight
+        self.max_queue = max_queue
+        self.max_queue_per_user = max_queue_per_user
+        self.queue_timeout = queue_timeout
+        self.in_flight = 0
+        self.queued = 0
+        self._running: Dict[str, int] = defaultdict(int)
+        # 사용자별 대기열 (입장 순서대로 돌아가며 선택)
+        self._waiters: "OrderedDict[str, Deque[asyncio.Future]]" = OrderedDict()
+        self.admitted = 0
+        self.rejected_full = 0
+        self.rejected_user_full = 0
+        self.timed_out = 0
+        self.max_queued_seen = 0
+        self._wait_histogram = [0] * (len(WAIT_BUCKETS_MS) + 1)
+        self._depth_histogram = [0] * (len(QUEUE_DEPTH_BUCKETS) + 1)
+        self._wait_total_ms = 0.0
+
+    def _reject(self, detail: str):
+        return HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=detail,
+            headers={"Retry-After": str(AI_CHAT_RETRY_AFTER)},
+        )
+
+    def _take_slot(self, key: str):
+        self.in_flight += 1
+        self._running[key] += 1
+
+    def _record_wait(self, waited: float):
+        self.admitted += 1
+        waited_ms = waited * 1000
+        self._wait_total_ms += waited_ms
+        self._wait_histogram[bisect.bisect_left(WAIT_BUCKETS_MS, waited_ms)] += 1
+
+    async def acquire(self, key: str) -> Callable[[], None]:
+        """
+        호출 자리 하나 확보 (자리가 없으면 대기, 거절 시 HTTPException 503)
+        자리를 반환하는 함수를 돌려준다 (여러 번 호출해도 한 번만 반환)
+        """
+        await self._acquire(key)
+        released = False
+
+        def release():
+            nonlocal released
+            if not released:
+                released = True
+                self.release(key)
+        return release
+
+    async def _acquire(self, key: str):
+        self._depth_histogram[bisect.bisect_left(QUEUE_DEPTH_BUCKETS, self.queued)] += 1
+        if self.in_flight < self.max_in_flight and not self.queued:
+            self._take_slot(key)
+            self._record_wait(0.0)
+            return
+        if self.queued >= self.max_queue:
+            self.rejected_full += 1
+            raise self._reject("AI 상담 요청이 많습니다. 잠시 후 다시 시도해주세요.")
+        waiters = self._waiters.get(key)
+        if waiters is not None and len(waiters) >= self.max_queue_per_user:
+            self.rejected_user_full += 1
+            raise self._reject("이전 질문의 답변을 기다리는 중입니다. 잠시 후 다시 시도해주세요.")
+
+        future = asyncio.get_running_loop().create_future()
+        if waiters is None:
+            waiters = self._waiters[key] = deque()
+        waiters.append(future)
+        self.queued += 1
+        self.max_queued_seen = max(self.max_queued_seen, self.queued)
+        started = time.monotonic()
+        try:
+            await asyncio.wait_for(asyncio.shield(future), self.queue_timeout)
+        except (asyncio.TimeoutError, asyncio.CancelledError) as e:
+            if future.done() and not future.cancelled():
+                # 자리를 넘겨받은 직후 취소/시간 초과 - 받은 자리를 돌려줌
+                self.release(key)
+            else:
+                future.cancel()
+                self._remove_waiter(key, future)
+            if isinstance(e, asyncio.TimeoutError):
+                self.timed_out += 1
+                raise self._reject("AI 상담 대기 시간이 초과되었습니다. 잠시 후 다시 시도해주세요.")
+            raise
+        self._record_wait(time.monotonic() - started)
+
+    def _remove_waiter(self, key: str, future: asyncio.Future):
+        waiters = self._waiters.get(key)
+        if waiters is None:
+            return
+        try:
+            waiters.remove(future)
+            self.queued -= 1
+        except ValueError:
+            return
+        if not waiters:
+            del self._waiters[key]
+
+    def release(self, key: str):
+        """호출 자리 반환 후 다음 대기자 입장"""
+        self.in_flight -= 1
+        self._running[key] -= 1
+        if self._running[key] <= 0:
+            del self._running[key]
+        self._wake_next()
+
+    def _wake_next(self):
+        while self._waiters and self.in_flight < self.max_in_flight:
+            # 실행 중인 요청이 가장 적은 사용자 (같으면 먼저 기다린 사용자)
+            key = min(self._waiters, key=lambda k: self._running.get(k, 0))
+            waiters = self._waiters.pop(key)
+            future = waiters.popleft()
+            self.queued -= 1
+            if waiters:
+                # 남은 요청은 다른 사용자 뒤로 (돌아가며 입장)
+                self._waiters[key] = waiters
+            # 자리는 여기서 바로 넘겨줌 (깨어난 요청이 실행되기 전에 다른 요청이 가로채지 않도록)
+            self._take_slot(key)
+            future.set_result(None)
+
+    @asynccontextmanager
+    async def slot(self, key: str):
+        release = await self.acquire(key)
+        try:
+            yield
+        finally:
+            release()
+
+    def stats(self) -> dict:
+        return {
+            "max_in_flight": self.max_in_flight,
+            "in_flight": self.in_flight,
+            "queue_depth": self.queued,
+            "queue_depth_max": self.max_queued_seen,
+            "max_queue": self.max_queue,
+            "waiting_users": len(self._waiters),
+            "admitted": self.admitted,
+            "rejected_queue_full": self.rejected_full,
+            "rejected_user_queue_full": self.rejected_user_full,
+            "timed_out": self.timed_out,
+            "wait_ms_avg": round(self._wait_total_ms / self.admitted, 1) if self.admitted else 0.0,
+            "wait_ms_histogram": _histogram(WAIT_BUCKETS_MS, self._wait_histogram, "ms"),
+            "queue_depth_histogram": _histogram(QUEUE_DEPTH_BUCKETS, self._depth_histogram),
+        }
+
+def client_key(user, request) -> str:
+    """대기열 공정성 기준 - 로그인 사용자는 토큰 subject, 아니면 클라이언트 IP"""
+    if user is not None:
+        return f"user:{user.username}"
+    return f"ip:{request.client.host if request.client else 'unknown'}"
+
+chat_admission = LLMAdmissionController()
@@ -0,0 +1,188 @@
+import functools
+import re
+
+# AI 응답 Markdown 제거 규칙 (적용 순서 유지)
+_BOLD = re.compile(r'\*\*(.*?)\*\*')
+_ITALIC = re.compile(r'\*(.*?)\*')
+# # 헤더(^#+\s+) 제거 후 - 리스트(^-\s+) 제거를 한 번에 (헤더 바로 뒤의 - 까지, 두 번 적용한 것과 같은 결과)
+_LINE_MARK = re.compile(r'^(?:#+\s+(?:-\s+)?|-\s+)', flags=re.MULTILINE)
+_CODE = re.compile(r'`([^`]+)`')
+_LINK = re.compile(r'\[([^\]]+)\]\([^\)]+\)')
+_BLANK_LINES = re.compile(r'\n{3,}')
+
+# 줄 시작부터 끝까지 헤더/리스트 기호와 공백뿐인 부분 (\s+가 다음 줄까지 지울 수 있어 보류)
+_LINE_MARK_PENDING = (re.compile(r'(?:#+\s+-|-|#*)\s*'), re.compile(r'(?<=\n)(?:#+\s+-|-|#*)\s*\Z'))
+
+# 규칙에 영향을 주는 문자 (없는 청크는 스트리밍 단계를 거치지 않고 그대로 통과)
+_MARKUP_CHARS = re.compile(r'[*#`\[\n-]')
+
+# 줄 중간에서 잘린 조각 앞에 붙여 ^(줄 시작) 규칙이 적용되지 않게 하는 문자
+_MID_LINE = "\x00"
+
+def _unwrap(pattern: re.Pattern, text: str) -> str:
+    # pattern.sub(r'\1', text)와 같은 결과 - 매치마다 치환 템플릿을 처리하지 않고 split(C 구현)으로 한 번에
+    return ''.join(pattern.split(text))
+
+# 규칙별 제거 함수 - 해당 기호가 없으면 정규식을 실행하지 않음 (스트리밍 단계도 같은 함수 사용)
+def _strip_emphasis(text: str, mid_line: bool = False) -> str:
+    # **bold**, *italic* 제거
+    if '*' not in text:
+        return text
+    text = _unwrap(_BOLD, text)
+    return _unwrap(_ITALIC, text) if '*' in text else text
+
+def _strip_line_marks(text: str, mid_line: bool = False) -> str:
+    # # 헤더, - 리스트 제거
+    if '#' not in text and '-' not in text:
+        return text
+    if mid_line:
+        return _LINE_MARK.sub('', _MID_LINE + text)[len(_MID_LINE):]
+    return _LINE_MARK.sub('', text)
+
+def _strip_code(text: str, mid_line: bool = False) -> str:
+    # `코드` 제거
+    return _unwrap(_CODE, text) if '`' in text else text
+
+def _strip_links(text: str, mid_line: bool = False) -> str:
+    # 링크 [text](url) 제거
+    return _unwrap(_LINK, text) if '[' in text else text
+
+def _strip(text: str) -> str:
+    return _strip_links(_strip_code(_strip_line_marks(_strip_emphasis(text))))
+
+def strip_markdown(text: str) -> str:
+    """응답 전체에서 Markdown 문법 제거"""
+    text = _strip(text)
+    # 여러 공백 정리
+    return _BLANK_LINES.sub('\n\n', text) if '\n\n\n' in text else text
+
+def _open_code_start(text: str) -> int:
+    """아직 닫히지 않은 `코드` 시작 위치 (없으면 -1)"""
+    start = text.find('`')
+    while start != -1:
+        end = text.find('`', start + 1)
+        if end == -1:
+            return start
+        if end == start + 1:
+            start = end
+        else:
+            start = text.find('`', end + 1)
+    return -1
+
+def _open_link_start(text: str) -> int:
+    """아직 링크인지 판단할 수 없는 [ 위치 (없으면 -1)"""
+    start = text.find('[')
+    while start != -1:
+        close = text.find(']', start + 1)
+        if close == -1 or close + 1 >= len(text):
+            return start
+        if close > start + 1 and text[close + 1] == '(':
+            paren = text.find(')', close + 2)
+            if paren == -1:
+                return start
+            if paren > close + 2:
+                start = text.find('[', paren + 1)
+                continue
+        start = text.find('[', start + 1)
+    return -1
+
+def _inline_cut(text: str, mid_line: bool) -> int:
+    # 마지막 줄의 * 는 줄이 끝나야 짝을 알 수 있음
+    star = text.find('*', text.rfind('\n') + 1)
+    return len(text) if star == -1 else star
+
+def _line_start_cut(text: str, mid_line: bool) -> int:
+    # 줄 시작부터 끝까지 기호/공백뿐인 가장 앞 줄부터 보류 (# 나 - 가 없으면 보류할 것 없음)
+    if '#' not in text and '-' not in text:
+        return len(text)
+    line, tail = _LINE_MARK_PENDING
+    if not mid_line and line.fullmatch(text):
+        return 0
+    match = tail.search(text)
+    return match.start() if match else len(text)
+
+def _open_cut(find_open, text: str, mid_line: bool) -> int:
+    start = find_open(text)
+    return len(text) if start == -1 else start
+
+class _StreamStage:
+    """규칙 한 단계의 스트리밍 버전 - 결과가 확정된 앞부분만 치환해서 넘김"""
+
+    def __init__(self, cut, apply):
+        self._cut = cut
+        self._apply = apply
+        self._pending = ""
+        self._mid_line = False
+
+    def feed(self, text: str, final: bool = False) -> str:
+        self._pending += text
+        cut = len(self._pending) if final else self._cut(self._pending, self._mid_line)
+        if cut <= 0:
+            return ""
+        segment, self._pending = self._pending[:cut], self._pending[cut:]
+        output = self._apply(segment, self._mid_line)
+        self._mid_line = not segment.endswith('\n')
+        return output
+
+    @property
+    def idle(self) -> bool:
+        return not self._pending
+
+    def pass_through(self):
+        """기호/줄바꿈 없는 텍스트를 치환 없이 그대로 넘긴 것으로 기록 (보류 중인 텍스트가 없을 때만)"""
+        self._mid_line = True
+
+class MarkdownStreamFilter:
+    """
+    스트리밍 응답용 청크 단위 Markdown 제거 (strip_markdown과 같은 결과)
+    규칙마다 단계를 두고, 뒤에 올 텍스트에 따라 결과가 달라질 수 있는 부분
+    (줄 안의 *, 줄 시작의 헤더/리스트 기호, 닫히지 않은 ` 와 [)만 보류한다.
+    """
+
+    def __init__(self):
+        self._stages = [
+            _StreamStage(_inline_cut, _strip_emphasis),
+            _StreamStage(_line_start_cut, _strip_line_marks),
+            _StreamStage(functools.partial(_open_cut, _open_code_start), _strip_code),
+            _StreamStage(functools.partial(_open_cut, _open_link_start), _strip_links),
+        ]
+        self._newlines = 0
+
+    def feed(self, chunk: str) -> str:
+        """새 청크를 받아 지금 내보낼 수 있는 정리된 텍스트 반환"""
+        if self._is_plain(chunk):
+            self._newlines = 0
+            return chunk
+        for stage in self._stages:
+            chunk = stage.feed(chunk)
+        return self._collapse_blank_lines(chunk)
+
+    def _is_plain(self, chunk: str) -> bool:
+        # 공백뿐인 청크는 줄 시작 기호 판단에 영향을 주므로 제외
+        if _MARKUP_CHARS.search(chunk) or not chunk.strip():
+            return False
+        if not all(stage.idle for stage in self._stages):
+            return False
+        for stage in self._stages:
+            stage.pass_through()
+        return True
+
+    def flush(self) -> str:
+        """스트림 종료 - 보류 중인 나머지 텍스트 반환"""
+        text = ""
+        for stage in self._stages:
+            text = stage.feed(text, final=True)
+        return self._collapse_blank_lines(text)
+
+    def _collapse_blank_lines(self, text: str) -> str:
+        if not text:
+            return ""
+        if '\n' not in text:
+            self._newlines = 0
+            return text
+        # 이전 조각 끝의 줄바꿈과 이어서 연속 빈 줄 정리
+        prefix = '\n' * self._newlines
+        text = _BLANK_LINES.sub('\n\n', prefix + text)
+        stripped = text.rstrip('\n')
+        self._newlines = len(text) - len(stripped)
+        return text[len(prefix):]
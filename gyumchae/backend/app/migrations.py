@@ -0,0 +1,42 @@
+from sqlalchemy import inspect, text
+from app.database import Base, engine
+import app.models  # noqa: F401  (모든 모델을 Base.metadata에 등록)
+
+# 기존 DB에 고유 인덱스를 새로 만들기 전에 실행할 문장 (중복 행은 가장 먼저 만든 행만 남기고 카운터 재계산)
+UNIQUE_INDEX_DEDUPLICATE = {
+    "ux_post_likes_post_id_user_id": (
+        "DELETE FROM post_likes WHERE id NOT IN (SELECT MIN(id) FROM post_likes GROUP BY post_id, user_id)",
+        "UPDATE posts SET like_count = (SELECT COUNT(*) FROM post_likes WHERE post_likes.post_id = posts.id)",
+    ),
+}
+
+def upgrade_schema(bind=engine):
+    """
+    기존 DB 파일에 모델에 새로 추가된 컬럼/인덱스 반영
+    Base.metadata.create_all()은 이미 있는 테이블을 변경하지 않으므로 별도로 처리한다.
+    추가된 컬럼 목록("테이블.컬럼")을 반환
+    """
+    inspector = inspect(bind)
+    added_columns = []
+    with bind.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            if not inspector.has_table(table.name):
+                continue
+            existing_columns = {column["name"] for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name in existing_columns:
+                    continue
+                column_type = column.type.compile(dialect=bind.dialect)
+                ddl = f'ALTER TABLE {table.name} ADD COLUMN "{column.name}" {column_type}'
+                if column.server_default is not None:
+                    ddl += f" DEFAULT {column.server_default.arg}"
+                conn.execute(text(ddl))
+                added_columns.append(f"{table.name}.{column.name}")
+            existing_indexes = {index["name"] for index in inspector.get_indexes(table.name)}
+            for index in table.indexes:
+                if index.name in existing_indexes:
+                    continue
+                for statement in UNIQUE_INDEX_DEDUPLICATE.get(index.name, ()):
+                    conn.execute(text(statement))
+                index.create(bind=conn, checkfirst=True)
+    return added_columns
@@ -1,6 +1,6 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, ForeignKey, Float, Enum as SQLEnum
+from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, ForeignKey, Float, Index, Enum as SQLEnum
 from sqlalchemy.orm import relationship
-from sqlalchemy.sql import func
+from sqlalchemy.sql import func, text
 from app.database import Base
 import enum
 
@@ -35,10 +35,18 @@ class User(Base):
 
     # Relationships
     posts = relationship("Post", back_populates="author")
-    applications = relationship("Application", back_populates="user")
+    applications = relationship("Application", back_populates="user", foreign_keys="Application.user_id")
 
 class Store(Base):
     __tablename__ = "stores"
+    __table_args__ = (
+        # 활성 가게 id 키셋 페이지네이션
+        Index("ix_stores_is_active_id", "is_active", "id"),
+        # 일괄 좌표 변환 시 주소로 가게 좌표 조회/저장
+        Index("ix_stores_address", "address"),
+        # 일괄 가져오기(import_stores)로 등록한 가게 - 같은 키로 다시 가져오면 갱신
+        Index("ux_stores_source_key", "source_key", unique=True, sqlite_where=text("source_key IS NOT NULL")),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, nullable=False, index=True)
@@ -50,6 +58,9 @@ class Store(Base):
     latitude = Column(Float)
     longitude = Column(Float)
     image_url = Column(String)
+    menu = Column(Text)  # 대표 메뉴 JSON 배열 (restaurants.json의 menu)
+    price_range = Column(String)
+    source_key = Column(String)  # 일괄 가져오기 원본 키 (직접 등록한 가게는 NULL)
     rating = Column(Float, default=0.0)
     view_count = Column(Integer, default=0)
     is_active = Column(Boolean, default=True)
@@ -58,6 +69,11 @@ class Store(Base):
 
 class Post(Base):
     __tablename__ = "posts"
+    __table_args__ = (
+        # (created_at, id) 키셋 페이지네이션 (전체 / 카테고리별)
+        Index("ix_posts_created_at_id", "created_at", "id"),
+        Index("ix_posts_category_created_at_id", "category", "created_at", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String, nullable=False)
@@ -65,6 +81,9 @@ class Post(Base):
     category = Column(SQLEnum(PostCategory), default=PostCategory.ALL)
     author_id = Column(Integer, ForeignKey("users.id"))
     view_count = Column(Integer, default=0)
+    # 좋아요/댓글 수 비정규화 카운터 (toggle_like, create_comment에서 갱신)
+    like_count = Column(Integer, default=0, server_default="0", nullable=False)
+    comment_count = Column(Integer, default=0, server_default="0", nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
@@ -75,6 +94,10 @@ class Post(Base):
 
 class Comment(Base):
     __tablename__ = "comments"
+    __table_args__ = (
+        # 게시글별 댓글 (created_at, id) 키셋 페이지네이션
+        Index("ix_comments_post_id_created_at_id", "post_id", "created_at", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     content = Column(Text, nullable=False)
@@ -88,9 +111,13 @@ class Comment(Base):
 
 class PostLike(Base):
     __tablename__ = "post_likes"
+    __table_args__ = (
+        # 사용자당 게시글 하나에 좋아요 한 번 (동시에 눌러도 중복 행/카운터 +2 방지)
+        Index("ux_post_likes_post_id_user_id", "post_id", "user_id", unique=True),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
-    post_id = Column(Integer, ForeignKey("posts.id"), nullable=False)
+    post_id = Column(Integer, ForeignKey("posts.id"), nullable=False, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
@@ -98,6 +125,33 @@ class PostLike(Base):
     post = relationship("Post", back_populates="likes")
     user = relationship("User")
 
+class PostHotScore(Base):
+    """
+    인기 게시글 점수 (app.hot_posts가 새 활동만 반영해 갱신)
+    점수 = ln(Σ 가중치 × e^(활동 시각 / τ)) - 모든 점수가 같은 비율로 감쇠하므로 정렬 순서는 지금 시점의 인기도와 같다.
+    """
+    __tablename__ = "post_hot_scores"
+    __table_args__ = (
+        # sort=hot 목록 (전체 / 카테고리별) - (score, post_id) 키셋
+        Index("ix_post_hot_scores_score_post_id", "score", "post_id"),
+        Index("ix_post_hot_scores_category_score_post_id", "category", "score", "post_id"),
+    )
+
+    post_id = Column(Integer, ForeignKey("posts.id"), primary_key=True)
+    category = Column(SQLEnum(PostCategory), nullable=False)
+    score = Column(Float, nullable=False)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now())
+
+class PostHotScoreState(Base):
+    """인기 점수에 반영한 마지막 게시글/좋아요/댓글 id (행 1개)"""
+    __tablename__ = "post_hot_score_state"
+
+    id = Column(Integer, primary_key=True)
+    last_post_id = Column(Integer, nullable=False, default=0)
+    last_like_id = Column(Integer, nullable=False, default=0)
+    last_comment_id = Column(Integer, nullable=False, default=0)
+    refreshed_at = Column(DateTime(timezone=True))
+
 class Event(Base):
     __tablename__ = "events"
 
@@ -109,8 +163,18 @@ class Event(Base):
     is_active = Column(Boolean, default=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
+class ReceiptStatus(str, enum.Enum):
+    PENDING = "pending"  # 검증 대기 (작업 큐)
+    VERIFIED = "verified"
+    REJECTED = "rejected"
+    FAILED = "failed"  # 검증 작업이 재시도 후에도 실패
+
 class Receipt(Base):
     __tablename__ = "receipts"
+    __table_args__ = (
+        # 내 영수증 목록 (최신순 키셋)
+        Index("ix_receipts_user_id_id", "user_id", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"))
@@ -118,22 +182,64 @@ class Receipt(Base):
     image_url = Column(String)
     amount = Column(Integer)
     verified = Column(Boolean, default=False)
+    # 검증 상태 (verified는 기존 호환용으로 함께 갱신)
+    status = Column(String, default=ReceiptStatus.PENDING.value, server_default=ReceiptStatus.PENDING.value, nullable=False)
+    reject_reason = Column(String)
+    image_size = Column(Integer)
+    image_sha256 = Column(String, index=True)  # 같은 이미지 중복 제출 확인
     created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+
+class PrizeSlot(Base):
+    """이벤트 경품 원장 - 경품 수만큼 미리 만들어 두고(섞인 순번) 추첨마다 한 칸씩 가져감 (app.prize_draw)"""
+    __tablename__ = "prize_slots"
+    __table_args__ = (
+        # 남은 칸 중 순번이 가장 앞선 칸 (추첨된 칸은 인덱스에서 빠짐)
+        Index("ix_prize_slots_open", "event_id", "position", sqlite_where=text("receipt_id IS NULL")),
+        # 영수증 하나는 한 칸만 가져갈 수 있음 (추첨 결과 1회 보장)
+        # (부분 인덱스라서 남은 칸 찾기에는 쓰이지 않음)
+        Index("ux_prize_slots_receipt_id", "receipt_id", unique=True, sqlite_where=text("receipt_id IS NOT NULL")),
+        Index("ix_prize_slots_event_id_prize", "event_id", "prize"),
+    )
+
+    id = Column(Integer, primary_key=True)
+    event_id = Column(Integer, ForeignKey("events.id"), nullable=False)
+    position = Column(Integer, nullable=False)  # 무작위 순번 (작은 순서대로 추첨)
+    prize = Column(String, nullable=False)  # "1등", "2등", "꽝" 등
+    receipt_id = Column(Integer, ForeignKey("receipts.id"))  # 추첨된 영수증 (NULL이면 남은 칸)
+    user_id = Column(Integer, ForeignKey("users.id"))
+    claimed_at = Column(DateTime)
 
 class EventResult(Base):
     __tablename__ = "event_results"
+    __table_args__ = (
+        Index("ix_event_results_receipt_id", "receipt_id"),
+        Index("ix_event_results_user_id_id", "user_id", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"))
     receipt_id = Column(Integer, ForeignKey("receipts.id"))
+    event_id = Column(Integer, ForeignKey("events.id"))
     result = Column(String)  # "1등", "2등", "꽝" 등
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
     # Relationships
     user = relationship("User")
 
+class ApplicationStatus(str, enum.Enum):
+    PENDING = "pending"
+    APPROVED = "approved"
+    REJECTED = "rejected"
+
 class Application(Base):
     __tablename__ = "applications"
+    __table_args__ = (
+        # 관리자 심사 대기열: status = ? ORDER BY created_at, id (키셋)
+        Index("ix_applications_status_created_at_id", "status", "created_at", "id"),
+        # 내 신청 목록
+        Index("ix_applications_user_id_id", "user_id", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"))
@@ -144,12 +250,19 @@ class Application(Base):
     email = Column(String, nullable=False)
     title = Column(String)
     details = Column(Text)
+    # 승인 시 만들 가게 정보
+    category = Column(SQLEnum(StoreCategory))
+    address = Column(String)
     status = Column(String, default="pending")  # pending, approved, rejected
+    store_id = Column(Integer, ForeignKey("stores.id"))  # 승인으로 만든 가게
+    reviewed_by = Column(Integer, ForeignKey("users.id"))
+    reviewed_at = Column(DateTime)
+    reject_reason = Column(String)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
     # Relationships
-    user = relationship("User", back_populates="applications")
+    user = relationship("User", back_populates="applications", foreign_keys=[user_id])
 
 class Notice(Base):
     __tablename__ = "notices"
@@ -160,3 +273,62 @@ class Notice(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
+
+class ChatAnswerCache(Base):
+    """AI 채팅 답변 캐시 (정규화된 질문 + 카탈로그 버전별)"""
+    __tablename__ = "chat_answer_cache"
+    __table_args__ = (
+        Index("ix_chat_answer_cache_version_key", "catalog_version", "question_key", unique=True),
+        # LRU 정리용
+        Index("ix_chat_answer_cache_last_used_at", "last_used_at"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    catalog_version = Column(String, nullable=False)
+    question_key = Column(String, nullable=False)  # 정규화된 질문
+    signature = Column(Text, nullable=False)  # MinHash 서명 (유사 질문 비교용)
+    answer = Column(Text, nullable=False)
+    generation_ms = Column(Integer, default=0, nullable=False)  # 생성에 걸린 시간 (절약 시간 계산용)
+    hits = Column(Integer, default=0, nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    last_used_at = Column(DateTime(timezone=True), server_default=func.now())
+
+class ChatAnswerBand(Base):
+    """MinHash LSH 밴드 - 유사 질문 후보를 인덱스로 찾기 위한 테이블"""
+    __tablename__ = "chat_answer_bands"
+
+    entry_id = Column(Integer, ForeignKey("chat_answer_cache.id"), primary_key=True)
+    band = Column(Integer, primary_key=True)
+    band_key = Column(String, nullable=False, index=True)  # 카탈로그 버전 + 밴드 번호 + 밴드 해시
+
+class GeocodeCache(Base):
+    """주소 -> 좌표 캐시 (제공자 + 정규화된 주소별, 찾지 못한 주소도 저장)"""
+    __tablename__ = "geocode_cache"
+
+    provider = Column(String, primary_key=True)
+    address_key = Column(String, primary_key=True)  # 정규화된 주소
+    address = Column(String, nullable=False)
+    latitude = Column(Float)  # 찾지 못한 주소면 NULL
+    longitude = Column(Float)
+    road_address = Column(String)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+class Job(Base):
+    """SQLite 작업 큐 (app.job_queue) - 서버가 재시작돼도 남아 있는 백그라운드 작업"""
+    __tablename__ = "jobs"
+    __table_args__ = (
+        # 대기 작업 꺼내기: status = 'queued' AND available_at <= now ORDER BY available_at, id
+        Index("ix_jobs_status_available_at_id", "status", "available_at", "id"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    kind = Column(String, nullable=False)  # 작업 종류 (처리 함수 이름)
+    payload = Column(Text, nullable=False)  # JSON
+    status = Column(String, nullable=False, default="queued")  # queued, running, done, failed
+    attempts = Column(Integer, nullable=False, default=0)
+    available_at = Column(DateTime, nullable=False)  # 이 시각 이후에 실행 (재시도 대기)
+    locked_by = Column(String)  # 실행 중인 워커
+    locked_at = Column(DateTime)
+    last_error = Column(Text)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    finished_at = Column(DateTime)
@@ -0,0 +1,174 @@
+from fastapi import HTTPException
+from typing import Awaitable, Callable
+from app.cache import TTLCache
+from app.http_client import OutboundHTTPClient, http_client
+import asyncio
+import httpx
+import os
+import time
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# 네이버 지역 검색 API 주소 (로컬 스텁 서버로 바꿔 테스트할 수 있음)
+NAVER_SEARCH_URL = os.getenv("NAVER_SEARCH_URL", "https://openapi.naver.com/v1/search/local.json")
+NAVER_SEARCH_TIMEOUT = float(os.getenv("NAVER_SEARCH_TIMEOUT", "10"))
+
+# 검색 결과 캐시 - 신선 유지 시간(초), 만료 후에도 stale 응답을 허용하는 시간(초), 최대 항목 수
+NAVER_SEARCH_CACHE_TTL = float(os.getenv("NAVER_SEARCH_CACHE_TTL", "300"))
+NAVER_SEARCH_CACHE_STALE_TTL = float(os.getenv("NAVER_SEARCH_CACHE_STALE_TTL", "3600"))
+NAVER_SEARCH_CACHE_SIZE = int(os.getenv("NAVER_SEARCH_CACHE_SIZE", "2000"))
+
+def normalize_query(query: str) -> str:
+    """캐시 키용 검색어 정규화 (앞뒤 공백 제거, 연속 공백 축소, 대소문자 통일)"""
+    return " ".join(query.split()).casefold()
+
+class SearchResponseCache:
+    """
+    검색 응답 캐시
+    - TTL 안의 항목은 그대로 반환 (hit)
+    - 같은 키로 동시에 들어온 요청은 업스트림 호출 하나를 함께 기다림 (single-flight)
+    - TTL이 지났지만 stale 허용 시간 안이면 기존 응답을 바로 반환하고 백그라운드에서 갱신
+      (업스트림이 느리거나 실패해도 캐시된 결과를 제공)
+    """
+
+    def __init__(self, maxsize: int, ttl: float, stale_ttl: float):
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self._cache = TTLCache(maxsize=maxsize, ttl=ttl + stale_ttl)
+        self._inflight = {}
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.stale_served = 0
+        self.refreshes = 0
+        self.errors = 0
+
+    async def get(self, key, fetch: Callable[[], Awaitable[dict]]) -> dict:
+        entry = self._cache.get(key)
+        if entry is not None:
+            fresh_until, value = entry
+            if time.monotonic() < fresh_until:
+                self.hits += 1
+                return value
+            # 만료됐지만 stale 허용 시간 안 - 기존 응답 반환 + 백그라운드 갱신
+            self.stale_served += 1
+            if key not in self._inflight:
+                self.refreshes += 1
+                self._start_fetch(key, fetch).add_done_callback(self._log_refresh_error)
+            return value
+
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            self.coalesced += 1
+        else:
+            self.misses += 1
+            inflight = self._start_fetch(key, fetch)
+        # 요청 하나가 취소돼도 업스트림 호출은 다른 대기 요청을 위해 계속 진행
+        return await asyncio.shield(inflight)
+
+    def _start_fetch(self, key, fetch) -> asyncio.Task:
+        task = asyncio.ensure_future(self._fetch(key, fetch))
+        self._inflight[key] = task
+        return task
+
+    async def _fetch(self, key, fetch) -> dict:
+        try:
+            value = await fetch()
+        except Exception:
+            self.errors += 1
+            raise
+        else:
+            self._cache.set(key, (time.monotonic() + self.ttl, value))
+            return value
+        finally:
+            self._inflight.pop(key, None)
+
+    @staticmethod
+    def _log_refresh_error(task: asyncio.Task):
+        if not task.cancelled() and task.exception() is not None:
+            # 갱신 실패 시 기존 stale 응답을 계속 사용
+            error = task.exception()
+            print(f"⚠️ 검색 캐시 갱신 실패: {getattr(error, 'detail', error)}")
+
+    def clear(self):
+        self._cache.clear()
+
+    def stats(self) -> dict:
+        return {
+            "size": len(self._cache),
+            "maxsize": self._cache.maxsize,
+            "ttl": self.ttl,
+            "stale_ttl": self.stale_ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "stale_served": self.stale_served,
+            "refreshes": self.refreshes,
+            "errors": self.errors,
+            "inflight": len(self._inflight),
+        }
+
+search_cache = SearchResponseCache(
+    maxsize=NAVER_SEARCH_CACHE_SIZE,
+    ttl=NAVER_SEARCH_CACHE_TTL,
+    stale_ttl=NAVER_SEARCH_CACHE_STALE_TTL,
+)
+
+def _naver_credentials():
+    # 네이버 검색 API는 Maps API와 별도이지만, 같은 Client ID 사용 가능
+    # Maps API Client ID를 사용하거나, 별도 검색 API 키 사용 가능
+    client_id = os.getenv("NAVER_MAP_CLIENT_ID") or os.getenv("NAVER_CLIENT_ID")
+    client_secret = os.getenv("NAVER_CLIENT_SECRET")
+
+    if not client_id or not client_secret:
+        raise HTTPException(
+            status_code=500,
+            detail="네이버 API 키가 설정되지 않았습니다. NAVER_MAP_CLIENT_ID 또는 NAVER_CLIENT_ID를 환경 변수에 추가해주세요."
+        )
+    return client_id, client_secret
+
+async def fetch_local_search(query: str, display: int, start: int, client: OutboundHTTPClient = http_client) -> dict:
+    """네이버 지역 검색 API 호출 (캐시 없이, 공유 연결 풀 사용)"""
+    client_id, client_secret = _naver_credentials()
+    try:
+        params = {
+            "query": query,
+            "display": display,
+            "start": start,
+            "sort": "random"
+        }
+        headers = {
+            "X-Naver-Client-Id": client_id,
+            "X-Naver-Client-Secret": client_secret
+        }
+
+        response = await client.get(NAVER_SEARCH_URL, params=params, headers=headers, timeout=NAVER_SEARCH_TIMEOUT)
+        response.raise_for_status()
+        return response.json()
+
+    except httpx.HTTPStatusError as e:
+        raise HTTPException(
+            status_code=e.response.status_code,
+            detail=f"네이버 API 오류: {e.response.text}"
+        )
+    except httpx.RequestError as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"네트워크 오류: {str(e)}"
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"검색 중 오류가 발생했습니다: {str(e)}"
+        )
+
+async def search_local(query: str, display: int, start: int, client: OutboundHTTPClient = http_client) -> dict:
+    """캐시를 거친 네이버 지역 검색"""
+    # 키가 없으면 캐시 여부와 관계없이 바로 알림
+    _naver_credentials()
+    normalized = normalize_query(query)
+    if not normalized:
+        raise HTTPException(status_code=400, detail="검색어를 입력해주세요.")
+    key = (normalized, display, start)
+    return await search_cache.get(key, lambda: fetch_local_search(normalized, display, start, client))
@@ -0,0 +1,61 @@
+from fastapi import HTTPException, Response, status
+from sqlalchemy import String, tuple_, type_coerce
+from datetime import datetime
+import base64
+import json
+
+# 다음 페이지 커서를 전달하는 응답 헤더 (응답 본문은 기존 리스트 형식 유지)
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+def encode_cursor(*values) -> str:
+    """정렬 키 값들을 불투명한 커서 문자열로 인코딩"""
+    raw = json.dumps(list(values), ensure_ascii=False, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+def decode_cursor(cursor: str, size: int) -> list:
+    """커서 문자열을 정렬 키 값 리스트로 디코딩 (값은 문자열/숫자, 마지막 값은 정수 id)"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")).decode("utf-8"))
+        if not isinstance(values, list) or len(values) != size:
+            raise ValueError
+        if any(isinstance(value, bool) or not isinstance(value, (str, int, float)) for value in values):
+            raise ValueError
+        if not isinstance(values[-1], int):
+            raise ValueError
+        return values
+    except (ValueError, UnicodeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="잘못된 페이지 커서입니다."
+        )
+
+def sqlite_timestamp(value: datetime) -> str:
+    """
+    DateTime 값을 SQLite에 저장된 문자열 형식으로 변환
+    server_default(CURRENT_TIMESTAMP)는 'YYYY-MM-DD HH:MM:SS' 형식으로 저장되므로
+    커서 비교는 이 문자열 그대로 수행해야 인덱스를 타면서 같은 초의 행을 놓치지 않는다.
+    """
+    if value.microsecond:
+        return value.strftime("%Y-%m-%d %H:%M:%S.%f")
+    return value.strftime("%Y-%m-%d %H:%M:%S")
+
+def apply_created_at_cursor(query, model, cursor: str, descending: bool = True):
+    """
+    (created_at, id) 키셋 조건 적용 - 커서 이후의 행만 조회
+    행 값 비교((a, b) < (?, ?))를 써야 SQLite가 복합 인덱스로 범위 탐색을 한다.
+    """
+    created_at, row_id = decode_cursor(cursor, 2)
+    key = tuple_(type_coerce(model.created_at, String), model.id)
+    if descending:
+        return query.filter(key < (created_at, row_id))
+    return query.filter(key > (created_at, row_id))
+
+def created_at_cursor(row) -> str:
+    """(created_at, id) 키셋 기준 커서 생성"""
+    return encode_cursor(sqlite_timestamp(row.created_at), row.id)
+
+def set_next_cursor(response: Response, rows: list, limit: int, make_cursor):
+    """페이지가 가득 찼으면 마지막 행 기준 다음 페이지 커서를 응답 헤더에 설정"""
+    if rows and len(rows) == limit:
+        response.headers[NEXT_CURSOR_HEADER] = make_cursor(rows[-1])
@@ -0,0 +1,91 @@
+from concurrent.futures import ProcessPoolExecutor
+from fastapi import HTTPException, status
+import asyncio
+import bcrypt
+import multiprocessing
+import os
+import threading
+
+# bcrypt 비용(라운드) - 1 증가할 때마다 해싱 시간이 2배
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+
+# 해싱/검증 전용 프로세스 수와 대기 허용 건수 (실행 중 + 대기 중)
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", str(os.cpu_count() or 1)))
+PASSWORD_HASH_MAX_PENDING = int(os.getenv("PASSWORD_HASH_MAX_PENDING", str(PASSWORD_HASH_WORKERS * 4)))
+PASSWORD_HASH_RETRY_AFTER = int(os.getenv("PASSWORD_HASH_RETRY_AFTER", "1"))
+
+def _password_bytes(password: str) -> bytes:
+    # bcrypt는 최대 72바이트까지만 지원
+    password_bytes = password.encode('utf-8')
+    if len(password_bytes) > 72:
+        password_bytes = password_bytes[:72]
+    return password_bytes
+
+def verify_password(plain_password: str, hashed_password: str) -> bool:
+    """비밀번호 검증 - bcrypt 직접 사용"""
+    try:
+        return bcrypt.checkpw(_password_bytes(plain_password), hashed_password.encode('utf-8'))
+    except Exception:
+        return False
+
+def get_password_hash(password: str, rounds: int = BCRYPT_ROUNDS) -> str:
+    """비밀번호 해싱 - bcrypt 직접 사용 (passlib 우회로 버전 호환성 문제 해결)"""
+    salt = bcrypt.gensalt(rounds=rounds)
+    hashed = bcrypt.hashpw(_password_bytes(password), salt)
+    return hashed.decode('utf-8')
+
+class PasswordHashPool:
+    """
+    bcrypt 해싱/검증 전용 프로세스 풀
+    요청 처리 스레드에서 CPU를 쓰지 않도록 별도 프로세스에서 실행하고,
+    대기 건수가 한도를 넘으면 바로 503(Retry-After)으로 거절한다.
+    """
+
+    def __init__(self, workers: int = PASSWORD_HASH_WORKERS, max_pending: int = PASSWORD_HASH_MAX_PENDING,
+                 rounds: int = BCRYPT_ROUNDS):
+        self.workers = workers
+        self.max_pending = max_pending
+        self.rounds = rounds
+        self.pending = 0
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        # 첫 사용 시 생성 (spawn: 서버 프로세스의 스레드/커넥션을 물려받지 않도록)
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn")
+                )
+            return self._executor
+
+    async def _submit(self, func, *args):
+        with self._lock:
+            if self.pending >= self.max_pending:
+                raise HTTPException(
+                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                    detail="로그인 요청이 많습니다. 잠시 후 다시 시도해주세요.",
+                    headers={"Retry-After": str(PASSWORD_HASH_RETRY_AFTER)},
+                )
+            self.pending += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._get_executor(), func, *args)
+        finally:
+            with self._lock:
+                self.pending -= 1
+
+    async def hash(self, password: str) -> str:
+        return await self._submit(get_password_hash, password, self.rounds)
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        return await self._submit(verify_password, plain_password, hashed_password)
+
+    def shutdown(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+password_pool = PasswordHashPool()
@@ -0,0 +1,190 @@
+from fastapi import HTTPException, status
+from datetime import datetime, timezone
+from typing import Dict, List, NamedTuple, Optional, Tuple
+from sqlalchemy import bindparam, func, insert, select, update
+from sqlalchemy.exc import IntegrityError
+from app.database import engine
+from app.models import Event, EventResult, PrizeSlot, Receipt, ReceiptStatus
+import os
+import random
+import threading
+
+# 이벤트 하나에 만들 수 있는 최대 경품 칸 수 (= 최대 추첨 횟수)
+PRIZE_SLOTS_MAX = int(os.getenv("PRIZE_SLOTS_MAX", "1000000"))
+PRIZE_INSERT_BATCH = 10_000
+
+# 추첨 순서는 예측할 수 없어야 하므로 OS 난수 사용
+_random = random.SystemRandom()
+# SQLite는 쓰기를 한 번에 하나만 처리 - 같은 프로세스의 추첨은 여기서 차례를 기다림
+# (SQLite 잠금 대기는 sleep 후 재시도라 동시 추첨이 많으면 응답 시간이 크게 늘어남)
+_write_lock = threading.Lock()
+
+def utc_naive(value: Optional[datetime]) -> Optional[datetime]:
+    """DB 비교용 UTC 시각 (timezone 없는 값은 UTC로 간주)"""
+    if value is None or value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+def _validate_prizes(prizes: Dict[str, int]) -> int:
+    names = [name.strip() for name in prizes]
+    if not prizes or any(not name for name in names) or len(set(names)) != len(names):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="경품 이름과 수량을 입력해주세요."
+        )
+    if any(count < 0 for count in prizes.values()) or sum(prizes.values()) == 0:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="경품 수량은 0 이상이어야 하고 전체 수량은 1개 이상이어야 합니다."
+        )
+    return sum(prizes.values())
+
+def allocate_prizes(conn, event_id: int, prizes: Dict[str, int]) -> int:
+    """
+    경품 원장에 경품 수만큼 칸 추가 (호출한 쪽 트랜잭션 안에서) - 추가한 칸 수 반환
+    칸마다 무작위 순번을 주고 추첨은 순번이 앞선 칸부터 가져가므로 원장 전체가 섞인 순서가 된다.
+    나중에 추가한 칸도 기존 남은 칸 사이에 고르게 섞인다.
+    """
+    total = _validate_prizes(prizes)
+    existing = conn.execute(select(func.count()).select_from(PrizeSlot).where(PrizeSlot.event_id == event_id)).scalar()
+    if existing + total > PRIZE_SLOTS_MAX:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"이벤트 하나의 경품은 {PRIZE_SLOTS_MAX:,}개까지 등록할 수 있습니다."
+        )
+    slots = [name.strip() for name, count in prizes.items() for _ in range(count)]
+    for start in range(0, len(slots), PRIZE_INSERT_BATCH):
+        conn.execute(insert(PrizeSlot), [
+            {"event_id": event_id, "position": _random.getrandbits(62), "prize": prize}
+            for prize in slots[start:start + PRIZE_INSERT_BATCH]
+        ])
+    return total
+
+def prize_stock(event_id: int) -> List[dict]:
+    """경품별 전체/남은 수량"""
+    with engine.connect() as conn:
+        rows = conn.execute(
+            select(PrizeSlot.prize, func.count(), func.count(PrizeSlot.receipt_id))
+            .where(PrizeSlot.event_id == event_id)
+            .group_by(PrizeSlot.prize)
+            .order_by(PrizeSlot.prize)
+        ).all()
+    return [{"prize": prize, "total": total, "remaining": total - claimed} for prize, total, claimed in rows]
+
+class DrawResult(NamedTuple):
+    id: int
+    event_id: Optional[int]
+    receipt_id: int
+    user_id: int
+    result: str
+    created_at: datetime
+
+# 추첨마다 실행하는 문장은 미리 만들어 둠 (매번 식을 만드는 비용이 SQLite 실행보다 큼)
+_RESULT_COLUMNS = (
+    EventResult.id, EventResult.event_id, EventResult.receipt_id, EventResult.user_id, EventResult.result,
+    EventResult.created_at,
+)
+_FIND_RESULT = select(*_RESULT_COLUMNS).where(EventResult.receipt_id == bindparam("receipt_id"))
+# 영수증 + 이벤트 + 기존 추첨 결과를 한 번에
+_DRAW_CHECK = (
+    select(
+        Receipt.user_id.label("owner_id"),
+        Receipt.status,
+        Receipt.created_at.label("receipt_created_at"),
+        Event.id.label("event_id"),
+        Event.is_active,
+        Event.start_date,
+        Event.end_date,
+        EventResult.id.label("result_id"),
+    )
+    .select_from(Receipt)
+    .outerjoin(Event, Event.id == bindparam("event_id"))
+    .outerjoin(EventResult, EventResult.receipt_id == Receipt.id)
+    .where(Receipt.id == bindparam("receipt_id"))
+)
+# 남은 칸 중 순번이 가장 앞선 칸 (ix_prize_slots_open)
+_CLAIM_SLOT = (
+    update(PrizeSlot)
+    .where(PrizeSlot.id == (
+        select(PrizeSlot.id)
+        .where(PrizeSlot.event_id == bindparam("slot_event_id"), PrizeSlot.receipt_id.is_(None))
+        .order_by(PrizeSlot.position)
+        .limit(1)
+        .scalar_subquery()
+    ))
+    .values(receipt_id=bindparam("slot_receipt_id"), user_id=bindparam("slot_user_id"), claimed_at=bindparam("now"))
+    .returning(PrizeSlot.prize)
+)
+_RECORD_RESULT = insert(EventResult).returning(EventResult.id)
+
+def _find_result(conn, receipt_id: int) -> Optional[DrawResult]:
+    row = conn.execute(_FIND_RESULT, {"receipt_id": receipt_id}).first()
+    return DrawResult(*row) if row else None
+
+def _check_drawable(conn, event_id: int, receipt_id: int, user_id: int) -> Optional[DrawResult]:
+    """추첨 가능한 영수증인지 확인 - 이미 추첨한 영수증이면 그 결과 반환"""
+    row = conn.execute(_DRAW_CHECK, {"event_id": event_id, "receipt_id": receipt_id}).first()
+    if row is None or row.owner_id != user_id:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="영수증을 찾을 수 없습니다."
+        )
+    if row.result_id is not None:
+        return _find_result(conn, receipt_id)
+    if row.event_id is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="이벤트를 찾을 수 없습니다."
+        )
+    now = datetime.utcnow()
+    if not row.is_active or (row.start_date and now < row.start_date) or (row.end_date and now > row.end_date):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="진행 중인 이벤트가 아닙니다."
+        )
+    if row.status != ReceiptStatus.VERIFIED.value:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="인증된 영수증만 추첨할 수 있습니다."
+        )
+    if row.start_date and row.receipt_created_at < row.start_date:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="이벤트 기간에 제출한 영수증만 추첨할 수 있습니다."
+        )
+    return None
+
+def draw_prize(event_id: int, receipt_id: int, user_id: int) -> Tuple[DrawResult, bool]:
+    """
+    영수증 하나로 경품 추첨 - (추첨 결과, 이번에 추첨했는지) 반환
+    남은 칸 중 순번이 가장 앞선 칸을 UPDATE ... RETURNING 한 문장으로 가져가므로
+    동시에 추첨해도 같은 칸(경품)이 두 번 나가지 않고, 남은 수량을 읽고 쓰는 사이에 끼어들 틈이 없다.
+    같은 영수증으로 다시(또는 동시에) 추첨하면 처음 결과를 그대로 반환한다.
+    """
+    with engine.connect() as conn:
+        existing = _check_drawable(conn, event_id, receipt_id, user_id)
+    if existing is not None:
+        return existing, False
+
+    now = datetime.utcnow()
+    try:
+        # 첫 문장이 쓰기라서 다른 프로세스가 쓰는 중이면 busy_timeout 동안 기다렸다가 최신 상태에서 실행
+        with _write_lock, engine.begin() as conn:
+            slot = conn.execute(
+                _CLAIM_SLOT,
+                {"slot_event_id": event_id, "slot_receipt_id": receipt_id, "slot_user_id": user_id, "now": now},
+            ).first()
+            if slot is None:
+                raise HTTPException(
+                    status_code=status.HTTP_409_CONFLICT,
+                    detail="경품이 모두 소진되었습니다."
+                )
+            result_id = conn.execute(_RECORD_RESULT, {
+                "user_id": user_id, "receipt_id": receipt_id, "event_id": event_id, "result": slot.prize,
+                "created_at": now,
+            }).scalar()
+    except IntegrityError:
+        # 같은 영수증으로 동시에 추첨 - 먼저 커밋된 결과 (ux_prize_slots_receipt_id)
+        with engine.connect() as conn:
+            return _find_result(conn, receipt_id), False
+    return DrawResult(result_id, event_id, receipt_id, user_id, slot.prize, now), True
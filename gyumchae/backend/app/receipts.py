@@ -0,0 +1,189 @@
+from fastapi import HTTPException, status
+from fastapi.concurrency import run_in_threadpool
+from datetime import datetime
+from typing import AsyncIterator, NamedTuple, Optional
+from app.database import BASE_DIR, SessionLocal
+from app.job_queue import job_queue
+from app.models import Receipt, ReceiptStatus, Store
+import hashlib
+import os
+import time
+import uuid
+
+# 영수증 이미지 저장 폴더 / 최대 크기(바이트)
+RECEIPT_UPLOAD_DIR = os.path.abspath(os.getenv("RECEIPT_UPLOAD_DIR", os.path.join(BASE_DIR, "uploads", "receipts")))
+RECEIPT_MAX_BYTES = int(os.getenv("RECEIPT_MAX_BYTES", str(10 * 1024 * 1024)))
+# 업로드 중 메모리에 모았다가 파일에 쓰는 단위 (요청 하나가 쓰는 메모리 상한)
+RECEIPT_WRITE_BUFFER = 256 * 1024
+# 인정 금액 상한 (원)
+RECEIPT_MAX_AMOUNT = int(os.getenv("RECEIPT_MAX_AMOUNT", "1000000"))
+# 검증 작업마다 추가 지연(초) - OCR 등 외부 검증 시간 흉내 (벤치마크용)
+RECEIPT_VERIFY_DELAY = float(os.getenv("RECEIPT_VERIFY_DELAY", "0"))
+
+VERIFY_RECEIPT_JOB = "verify_receipt"
+
+def detect_image_type(head: bytes) -> Optional[str]:
+    """파일 앞부분(12바이트 이상)으로 이미지 형식(확장자) 판별"""
+    if head.startswith(b"\xff\xd8\xff"):
+        return "jpg"
+    if head.startswith(b"\x89PNG\r\n\x1a\n"):
+        return "png"
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return "webp"
+    if head[4:12] in (b"ftypheic", b"ftypheix", b"ftypmif1"):
+        return "heic"
+    return None
+
+class SavedImage(NamedTuple):
+    path: str  # RECEIPT_UPLOAD_DIR 기준 경로 (Receipt.image_url)
+    size: int
+    sha256: str
+
+def _write_chunk(file, digest, data: bytes):
+    file.write(data)
+    digest.update(data)
+
+def _move_into_place(temp_path: str, relative_path: str):
+    final_path = os.path.join(RECEIPT_UPLOAD_DIR, relative_path)
+    os.makedirs(os.path.dirname(final_path), exist_ok=True)
+    os.replace(temp_path, final_path)
+
+def _open_temp_file():
+    temp_dir = os.path.join(RECEIPT_UPLOAD_DIR, "tmp")
+    os.makedirs(temp_dir, exist_ok=True)
+    temp_path = os.path.join(temp_dir, f"{uuid.uuid4().hex}.part")
+    return temp_path, open(temp_path, "wb")
+
+def _discard(file, temp_path: str):
+    file.close()
+    if os.path.exists(temp_path):
+        os.remove(temp_path)
+
+async def save_receipt_image(chunks: AsyncIterator[bytes]) -> SavedImage:
+    """
+    요청 본문을 받는 대로 임시 파일에 쓰고(최대 RECEIPT_WRITE_BUFFER만 메모리에 보관) 완료되면 제자리로 옮긴다.
+    파일 쓰기와 해시 계산은 스레드 풀에서 처리해 이벤트 루프를 막지 않는다.
+    """
+    temp_path, file = await run_in_threadpool(_open_temp_file)
+    digest = hashlib.sha256()
+    buffer = bytearray()
+    size = 0
+    extension = None
+    try:
+        async for chunk in chunks:
+            size += len(chunk)
+            if size > RECEIPT_MAX_BYTES:
+                raise HTTPException(
+                    status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                    detail=f"영수증 이미지는 {RECEIPT_MAX_BYTES // (1024 * 1024)}MB까지 업로드할 수 있습니다."
+                )
+            buffer += chunk
+            if extension is None and len(buffer) >= 12:
+                extension = _require_image(buffer)
+            if len(buffer) >= RECEIPT_WRITE_BUFFER:
+                await run_in_threadpool(_write_chunk, file, digest, bytes(buffer))
+                buffer.clear()
+        if extension is None:
+            extension = _require_image(buffer)
+        if buffer:
+            await run_in_threadpool(_write_chunk, file, digest, bytes(buffer))
+        await run_in_threadpool(file.close)
+        relative_path = os.path.join(datetime.utcnow().strftime("%Y%m"), f"{uuid.uuid4().hex}.{extension}")
+        await run_in_threadpool(_move_into_place, temp_path, relative_path)
+    except BaseException:
+        # 클라이언트 연결 끊김/크기 초과 등 - 임시 파일 정리
+        await run_in_threadpool(_discard, file, temp_path)
+        raise
+    return SavedImage(relative_path, size, digest.hexdigest())
+
+def _require_image(head: bytes) -> str:
+    extension = detect_image_type(bytes(head[:12]))
+    if extension is None:
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail="영수증은 JPEG, PNG, WebP, HEIC 이미지 파일 본문으로 업로드해주세요."
+        )
+    return extension
+
+def remove_receipt_image(path: str):
+    full_path = os.path.join(RECEIPT_UPLOAD_DIR, path)
+    if os.path.exists(full_path):
+        os.remove(full_path)
+
+def create_receipt(user_id: int, store_id: int, amount: Optional[int], image: SavedImage) -> Receipt:
+    """영수증 행과 검증 작업을 한 트랜잭션으로 저장"""
+    db = SessionLocal()
+    try:
+        receipt = Receipt(
+            user_id=user_id,
+            store_id=store_id,
+            amount=amount,
+            image_url=image.path,
+            image_size=image.size,
+            image_sha256=image.sha256,
+            status=ReceiptStatus.PENDING.value,
+            verified=False,
+        )
+        db.add(receipt)
+        db.flush()
+        job_queue.enqueue(VERIFY_RECEIPT_JOB, {"receipt_id": receipt.id}, conn=db.connection())
+        db.commit()
+        db.refresh(receipt)
+        db.expunge(receipt)
+        return receipt
+    finally:
+        db.close()
+
+def _reject_reason(db, receipt: Receipt) -> Optional[str]:
+    """검증 실패 사유 (통과하면 None)"""
+    path = os.path.join(RECEIPT_UPLOAD_DIR, receipt.image_url or "")
+    if not receipt.image_url or not os.path.isfile(path) or os.path.getsize(path) != receipt.image_size:
+        return "영수증 이미지를 찾을 수 없습니다."
+    with open(path, "rb") as f:
+        if detect_image_type(f.read(12)) is None:
+            return "이미지 파일이 아닙니다."
+    store = db.get(Store, receipt.store_id)
+    if store is None or not store.is_active:
+        return "등록되지 않은 가게입니다."
+    if receipt.amount is not None and not 0 < receipt.amount <= RECEIPT_MAX_AMOUNT:
+        return "영수증 금액이 올바르지 않습니다."
+    # 같은 이미지가 먼저 제출돼 인정됐거나 검증 대기 중이면 중복
+    duplicate = db.query(Receipt.id).filter(
+        Receipt.image_sha256 == receipt.image_sha256,
+        Receipt.id < receipt.id,
+        Receipt.status.in_([ReceiptStatus.PENDING.value, ReceiptStatus.VERIFIED.value]),
+    ).first()
+    if duplicate is not None:
+        return "이미 제출된 영수증입니다."
+    return None
+
+def verify_receipt(payload: dict):
+    """영수증 검증 작업 (대기 상태인 영수증만 처리하므로 다시 실행돼도 결과가 같음)"""
+    if RECEIPT_VERIFY_DELAY:
+        time.sleep(RECEIPT_VERIFY_DELAY)
+    db = SessionLocal()
+    try:
+        receipt = db.get(Receipt, payload["receipt_id"])
+        if receipt is None or receipt.status != ReceiptStatus.PENDING.value:
+            return
+        reason = _reject_reason(db, receipt)
+        receipt.status = ReceiptStatus.REJECTED.value if reason else ReceiptStatus.VERIFIED.value
+        receipt.verified = reason is None
+        receipt.reject_reason = reason
+        db.commit()
+    finally:
+        db.close()
+
+def mark_receipt_failed(payload: dict, error: str):
+    """재시도 후에도 검증 작업이 실패한 영수증"""
+    db = SessionLocal()
+    try:
+        receipt = db.get(Receipt, payload["receipt_id"])
+        if receipt is not None and receipt.status == ReceiptStatus.PENDING.value:
+            receipt.status = ReceiptStatus.FAILED.value
+            receipt.reject_reason = "검증 중 오류가 발생했습니다. 다시 제출해주세요."
+            db.commit()
+    finally:
+        db.close()
+
+job_queue.register(VERIFY_RECEIPT_JOB, verify_receipt, on_failure=mark_receipt_failed)
@@ -0,0 +1,135 @@
+from collections import defaultdict
+from typing import Dict, List, Tuple
+from app.catalog import CatalogSnapshot, Restaurant
+import math
+import random
+import re
+import threading
+
+# 한글은 음절 bigram, 영문/숫자는 단어 단위로 색인 (조사가 붙어도 부분 일치하도록)
+_TOKEN_RE = re.compile(r"[0-9a-z]+|[가-힣]+")
+
+# 필드별 가중치 - 이름/메뉴 일치가 설명 일치보다 중요
+FIELD_WEIGHTS = {"name": 3.0, "category": 2.0, "menu": 2.0, "description": 1.0, "intent": 1.5}
+
+# 질문에 쓰는 표현 ← 가게 정보에 나오는 표현
+# 가게 정보(카테고리/설명/메뉴/가격대)에 오른쪽 표현이 있으면 왼쪽 표현으로도 찾을 수 있게 색인한다
+# (예: "술 마시기 좋은 곳" → 요리주점/막걸리 가게, "싸고 양 많은 곳" → 가성비/저렴 가게)
+INTENT_SYNONYMS = [
+    (("술", "술집", "주점", "한잔", "안주", "마시"), ("요리주점", "주점", "막걸리", "맥주", "소주", "호프", "포차", "안주")),
+    (("싸다", "싸고", "싼", "저렴", "가성비", "양많", "많은"), ("저렴", "가성비", "백반", "분식")),
+    (("혼밥", "혼자", "간단"), ("분식", "백반", "국수", "카츠", "국밥", "해장국", "김밥", "라면", "커리", "마라탕", "간편식")),
+    (("디저트", "달달", "단거", "빵", "브런치"), ("디저트", "케이크", "베이커리", "빵집", "브런치")),
+    (("카페", "커피", "공부"), ("카페", "커피", "라떼", "로스팅")),
+    (("해장", "국물", "국밥"), ("해장국", "국밥", "내장탕", "찌개", "국수")),
+    (("고기", "구이", "회식"), ("삼겹살", "갈매기살", "닭갈비", "고깃집", "스테이크", "수육", "모듬구이")),
+    (("매운", "매콤", "얼큰"), ("마라", "매운", "떡볶이", "닭갈비", "제육")),
+    (("점심", "식사", "밥집", "한식"), ("백반", "가정식", "비빔밥", "쌈밥", "덮밥", "볶음밥", "국수")),
+]
+
+# 질문에 자주 붙지만 가게를 구분하는 데 도움이 안 되는 표현
+_QUERY_STOPWORDS = [
+    "추천", "추천해", "추천해줘", "추천해주", "알려줘", "알려주", "어디", "어떤", "어떤거", "뭐가",
+    "맛집", "가게", "주변", "근처", "한림대", "한림", "있어", "있나", "해줘", "좀", "요즘",
+]
+
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+def tokenize(text: str) -> List[str]:
+    """검색용 토큰 (한글 음절 bigram + 영문/숫자 단어)"""
+    grams = []
+    for token in _TOKEN_RE.findall((text or "").lower()):
+        if token[0] >= "가" and len(token) > 1:
+            grams.extend(token[i:i + 2] for i in range(len(token) - 1))
+        else:
+            grams.append(token)
+    return grams
+
+_STOP_GRAMS = {gram for word in _QUERY_STOPWORDS for gram in tokenize(word)}
+
+def intent_words(restaurant: Restaurant) -> List[str]:
+    """가게 정보에 맞는 질문 표현 (INTENT_SYNONYMS)"""
+    text = " ".join([restaurant.category, restaurant.description or "", restaurant.price_range or ""] + list(restaurant.menu))
+    words = []
+    for query_words, store_words in INTENT_SYNONYMS:
+        if any(word in text for word in store_words):
+            words.extend(query_words)
+    return words
+
+class RestaurantIndex:
+    """음식점 카탈로그 키워드/n-gram 역색인 (BM25 점수)"""
+
+    def __init__(self, snapshot: CatalogSnapshot):
+        self.version = snapshot.version
+        self.restaurants: Tuple[Restaurant, ...] = snapshot.restaurants
+        self._postings: Dict[str, List[Tuple[int, float]]] = defaultdict(list)
+        self._doc_lengths = []
+        for doc_id, restaurant in enumerate(self.restaurants):
+            weights = defaultdict(float)
+            fields = {
+                "name": restaurant.name,
+                "category": restaurant.category,
+                "menu": " ".join(restaurant.menu),
+                "description": restaurant.description or "",
+                "intent": " ".join(intent_words(restaurant)),
+            }
+            for field_name, text in fields.items():
+                for gram in tokenize(text):
+                    weights[gram] += FIELD_WEIGHTS[field_name]
+            for gram, weight in weights.items():
+                self._postings[gram].append((doc_id, weight))
+            self._doc_lengths.append(sum(weights.values()))
+        self._avg_length = (sum(self._doc_lengths) / len(self._doc_lengths)) if self._doc_lengths else 1.0
+
+    def search(self, question: str, top_k: int) -> List[Restaurant]:
+        """질문과 관련도가 높은 음식점 top_k개 (모자라면 나머지 가게 중에서 카테고리별로 고르게 무작위로 채움)"""
+        query_grams = [gram for gram in set(tokenize(question)) if gram not in _STOP_GRAMS]
+        scores = defaultdict(float)
+        total = len(self.restaurants)
+        for gram in query_grams:
+            postings = self._postings.get(gram)
+            if not postings:
+                continue
+            idf = math.log(1 + (total - len(postings) + 0.5) / (len(postings) + 0.5))
+            for doc_id, tf in postings:
+                norm = BM25_K1 * (1 - BM25_B + BM25_B * self._doc_lengths[doc_id] / self._avg_length)
+                scores[doc_id] += idf * tf * (BM25_K1 + 1) / (tf + norm)
+        ranked = sorted(scores, key=lambda doc_id: (-scores[doc_id], doc_id))
+        picked = [self.restaurants[doc_id] for doc_id in ranked[:top_k]]
+        if len(picked) < top_k:
+            # 일치한 가게가 적으면 나머지는 다른 카테고리 가게로 채워 선택지를 남김
+            # 매번 같은 가게만 채워지지 않도록 무작위로 고른다
+            matched = set(ranked)
+            picked.extend(self._diverse_sample(top_k - len(picked), exclude=matched))
+        return picked
+
+    def _diverse_sample(self, top_k: int, exclude=()) -> List[Restaurant]:
+        by_category = defaultdict(list)
+        for doc_id, restaurant in enumerate(self.restaurants):
+            if doc_id not in exclude:
+                by_category[restaurant.category].append(restaurant)
+        picked = []
+        queues = list(by_category.values())
+        random.shuffle(queues)
+        for queue in queues:
+            random.shuffle(queue)
+        while len(picked) < top_k and any(queues):
+            for queue in queues:
+                if queue and len(picked) < top_k:
+                    picked.append(queue.pop(0))
+        return picked
+
+_index_lock = threading.Lock()
+_current_index = None
+
+def get_restaurant_index(snapshot: CatalogSnapshot) -> RestaurantIndex:
+    """카탈로그 버전별로 한 번만 색인 생성"""
+    global _current_index
+    index = _current_index
+    if index is not None and index.version == snapshot.version:
+        return index
+    with _index_lock:
+        if _current_index is None or _current_index.version != snapshot.version:
+            _current_index = RestaurantIndex(snapshot)
+        return _current_index
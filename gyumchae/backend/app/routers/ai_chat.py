@@ -1,221 +1,56 @@
-from fastapi import APIRouter, HTTPException
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from starlette.background import BackgroundTask
 from app.schemas import ChatMessage, ChatResponse
-try:
-    import google.generativeai as genai
-except ImportError:
-    genai = None
-import os
-import re
+from app.answer_cache import answer_cache
+from app.auth import AuthenticatedUser, get_current_admin, get_current_user_optional
+from app.catalog import restaurant_catalog
+from app.chat_prompt import build_chat_prompt, rewrite_user_message
+from app.gemini import gemini_models
+from app.llm_admission import chat_admission, client_key
+from app.markdown_filter import MarkdownStreamFilter, strip_markdown
 import json
-from pathlib import Path
-from dotenv import load_dotenv
-
-load_dotenv()
+import time
 
 router = APIRouter()
 
-# Gemini API 키 설정
-GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
-
-# 한림대 주변 음식점 JSON 파일 경로
-RESTAURANTS_JSON_PATH = os.getenv("RESTAURANTS_JSON_PATH", "restaurants.json")
-
-def load_restaurants_data():
-    """한림대 주변 음식점 JSON 파일 로드"""
-    try:
-        # 현재 파일 기준으로 경로 계산
-        current_file = Path(__file__)
-        backend_dir = current_file.parent.parent  # app/routers -> app -> backend
-        project_root = backend_dir.parent  # backend -> gyumchae
-        
-        # 여러 경로에서 시도 (절대 경로 사용)
-        possible_paths = [
-            Path(RESTAURANTS_JSON_PATH) if os.path.isabs(RESTAURANTS_JSON_PATH) else backend_dir / RESTAURANTS_JSON_PATH,  # 환경 변수로 지정된 경로
-            backend_dir / "restaurants.json",  # backend/restaurants.json
-            backend_dir / RESTAURANTS_JSON_PATH,  # backend/환경변수경로
-            project_root / "restaurants.json",  # gyumchae/restaurants.json
-            project_root / RESTAURANTS_JSON_PATH,  # gyumchae/환경변수경로
-            Path.cwd() / "restaurants.json",  # 현재 작업 디렉토리
-            Path.cwd() / "backend" / "restaurants.json",  # 현재작업디렉토리/backend/restaurants.json
-        ]
-        
-        print(f"🔍 JSON 파일 검색 중... (현재 작업 디렉토리: {Path.cwd()})")
-        for json_path in possible_paths:
-            abs_path = json_path.resolve()
-            print(f"  - 시도: {abs_path} (존재: {abs_path.exists()})")
-            if abs_path.exists():
-                with open(abs_path, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    print(f"✅ 음식점 데이터 로드 성공: {abs_path}")
-                    return data
-        
-        print(f"⚠️ 음식점 JSON 파일을 찾을 수 없습니다. 다음 경로들을 확인했습니다:")
-        for path in possible_paths:
-            print(f"  - {path.resolve()}")
-        print(f"⚠️ 기본 정보를 사용합니다. restaurants.json 파일을 backend 폴더에 생성해주세요.")
-        return None
-    except Exception as e:
-        print(f"⚠️ 음식점 JSON 파일 로드 오류: {e}")
-        import traceback
-        traceback.print_exc()
-        return None
-
-def get_gemini_model():
-    """Gemini 모델 초기화"""
-    if not genai:
-        raise HTTPException(
-            status_code=500,
-            detail="google-generativeai 패키지가 설치되지 않았습니다. pip install google-generativeai를 실행해주세요."
-        )
-    
-    if not GEMINI_API_KEY:
-        raise HTTPException(
-            status_code=500,
-            detail="GEMINI_API_KEY가 설정되지 않았습니다. .env 파일에 GEMINI_API_KEY를 추가해주세요."
-        )
-    
-    genai.configure(api_key=GEMINI_API_KEY)
-    # 최신 Gemini 모델 사용 (2.5 버전 우선)
-    model_candidates = [
-        'gemini-2.5-flash',
-        'gemini-2.5-pro',
-        'gemini-2.0-flash-exp',
-        'gemini-2.0-flash',
-        'gemini-exp',
-        'gemini-2.0-flash-thinking-exp',
-    ]
-    
-    last_error = None
-    for model_name in model_candidates:
-        try:
-            model = genai.GenerativeModel(model_name)
-            print(f"✅ 사용 중인 모델: {model_name}")
-            return model
-        except Exception as e:
-            last_error = e
-            continue
-    
-    # 모든 후보 모델이 실패하면 사용 가능한 모델 목록 확인
-    try:
-        models = genai.list_models()
-        available_models = [m.name for m in models if 'generateContent' in m.supported_generation_methods]
-        if available_models:
-            gemini_models = [m for m in available_models if 'gemini' in m.lower()]
-            if gemini_models:
-                model_name = gemini_models[0].split('/')[-1]
-                print(f"✅ 자동 선택된 모델: {model_name}")
-                return genai.GenerativeModel(model_name)
-            else:
-                model_name = available_models[0].split('/')[-1]
-                print(f"✅ 자동 선택된 모델: {model_name}")
-                return genai.GenerativeModel(model_name)
-    except Exception as e:
-        last_error = e
-    
-    raise HTTPException(
-        status_code=500,
-        detail=f"사용 가능한 Gemini 모델을 찾을 수 없습니다. 오류: {str(last_error)}"
-    )
-
-def build_system_prompt(restaurants_data=None):
-    """시스템 프롬프트 생성 (JSON 데이터 포함)"""
-    base_prompt = """당신은 강원도 춘천시 한림대학교 주변 맛집 전문 상담사입니다.
-
-위치: 강원도 춘천시 한림대학교 주변 (춘천시 동면, 한림대학교 인근)
-
-중요 규칙:
-1. 모든 추천은 반드시 강원도 춘천시 한림대학교 주변 지역의 가게로만 제한합니다.
-2. 아래 제공된 음식점 정보를 우선적으로 참고하여 추천하세요.
-3. 음식점, 카페, 술집, 기타 가게 등 모든 종류의 가게를 추천할 수 있습니다.
-4. 사용자가 특정 종류의 가게를 요청하면 (예: "카페 추천", "술집 추천", "치킨집 추천"), 제공된 정보에서 해당 종류의 한림대 주변 가게를 찾아 추천하세요.
-5. 제공된 정보에 없는 가게는 추천하지 마세요. 정확한 정보가 없다면 솔직하게 말하세요.
-6. 가게 이름, 위치, 특징, 메뉴, 가격대 등을 상세히 알려주세요.
-7. 친절하고 상세하게 답변하며, 이모지를 적절히 사용하여 답변을 더 친근하게 만들어주세요.
-8. 답변은 일반 텍스트로만 작성하세요. Markdown 문법(**, #, -, 등)을 사용하지 마세요.
-9. 줄바꿈은 자연스럽게 하고, 특수 기호나 포맷팅 없이 자연스러운 대화체로 작성해주세요.
-10. 사용자가 다른 지역의 가게를 물어봐도, 한림대 주변 가게로 대체해서 추천합니다."""
-    
-    # JSON 데이터가 있으면 추가
-    if restaurants_data:
-        restaurants_info = json.dumps(restaurants_data, ensure_ascii=False, indent=2)
-        base_prompt += f"""
-
-=== 한림대 주변 음식점 정보 ===
-{restaurants_info}
-=== 위 정보를 참고하여 추천해주세요 ===
-"""
-    else:
-        base_prompt += """
-
-참고: 음식점 정보 파일이 로드되지 않았습니다. 기본 정보만 사용합니다.
-"""
-    
-    return base_prompt
-
-
 @router.post("/", response_model=ChatResponse)
-async def chat(message: ChatMessage):
+async def chat(
+    message: ChatMessage,
+    request: Request,
+    current_user: Optional[AuthenticatedUser] = Depends(get_current_user_optional)
+):
     """
     Gemini API를 사용한 AI 채팅
     한림대 주변 상권 추천에 특화된 응답 제공 (JSON 파일 참고)
+    Gemini 동시 호출 수는 제한되며, 대기열이 가득 차면 503(Retry-After)으로 응답
     """
     try:
-        model = get_gemini_model()
-        
-        # JSON 파일에서 음식점 데이터 로드
-        restaurants_data = load_restaurants_data()
-        
-        # 시스템 프롬프트 생성 (JSON 데이터 포함)
-        system_prompt = build_system_prompt(restaurants_data)
-        
-        # 사용자 메시지 처리 - 추천 요청 문구 자동 추가
-        user_message = message.message.strip()
-        
-        # 사용자 메시지가 추천 요청 형태가 아니면 자동으로 추가
-        recommendation_keywords = ['추천', '추천해', '추천해줘', '추천해주', '어떤', '뭐', '뭐가', '뭐 먹', '어디', '가게', '맛집']
-        has_recommendation_request = any(keyword in user_message for keyword in recommendation_keywords)
-        
-        # 질문 형태가 아니거나 추천 요청이 없으면 자동으로 추가
-        if not user_message.endswith('?') and not user_message.endswith('요') and not user_message.endswith('어') and not has_recommendation_request:
-            user_message = f"{user_message} 어떤거 추천해줄수있어?"
-        elif not has_recommendation_request and ('?' in user_message or '어디' in user_message or '뭐' in user_message):
-            # 질문 형태지만 추천 요청이 명확하지 않으면 보강
-            if '어떤' not in user_message and '추천' not in user_message:
-                user_message = f"{user_message} 한림대 주변에서 추천해줄 수 있어?"
-        
-        # 사용자 메시지에 시스템 프롬프트 추가
-        full_prompt = f"{system_prompt}\n\n사용자: {user_message}\n\n상담사:"
+        # 카탈로그 재로드(파일/stores 테이블)와 검색 색인 생성은 이벤트 루프를 막지 않도록 스레드풀에서 실행
+        snapshot = await run_in_threadpool(restaurant_catalog.snapshot)
+        user_message = rewrite_user_message(message.message)
+
+        # 같은(비슷한) 질문의 답변이 캐시에 있으면 Gemini 호출 없이 응답
+        cached = await run_in_threadpool(answer_cache.lookup, user_message, snapshot.version)
+        if cached is not None:
+            return ChatResponse(response=cached)
+
+        # 질문과 관련된 음식점만 넣은 프롬프트 생성 (카탈로그 버전별 캐시 + 로컬 검색)
+        full_prompt = await run_in_threadpool(build_chat_prompt, message.message, snapshot)
         
-        # Gemini API 호출
-        response = model.generate_content(
-            full_prompt,
-            generation_config={
-                'temperature': 0.7,
-                'top_p': 0.8,
-                'top_k': 40,
-            }
-        )
+        # Gemini API 호출 (서버 시작 시 확인해 둔 모델, 전용 스레드에서 실행)
+        async with chat_admission.slot(client_key(current_user, request)):
+            started = time.perf_counter()
+            response = await gemini_models.generate(full_prompt)
         
         # 응답 텍스트 추출 및 Markdown 제거
         if response and response.text:
-            # Markdown 문법 제거
-            cleaned_text = response.text
-            # **bold** 제거
-            cleaned_text = re.sub(r'\*\*(.*?)\*\*', r'\1', cleaned_text)
-            # *italic* 제거
-            cleaned_text = re.sub(r'\*(.*?)\*', r'\1', cleaned_text)
-            # # 헤더 제거
-            cleaned_text = re.sub(r'^#+\s+', '', cleaned_text, flags=re.MULTILINE)
-            # - 리스트 제거
-            cleaned_text = re.sub(r'^-\s+', '', cleaned_text, flags=re.MULTILINE)
-            # `코드` 제거
-            cleaned_text = re.sub(r'`([^`]+)`', r'\1', cleaned_text)
-            # 링크 [text](url) 제거
-            cleaned_text = re.sub(r'\[([^\]]+)\]\([^\)]+\)', r'\1', cleaned_text)
-            # 여러 공백 정리
-            cleaned_text = re.sub(r'\n{3,}', '\n\n', cleaned_text)
-            
-            return ChatResponse(response=cleaned_text)
+            answer = strip_markdown(response.text)
+            generation_ms = int((time.perf_counter() - started) * 1000)
+            await run_in_threadpool(answer_cache.store, user_message, snapshot.version, answer, generation_ms)
+            return ChatResponse(response=answer)
         else:
             raise HTTPException(
                 status_code=500,
@@ -235,3 +70,91 @@ async def chat(message: ChatMessage):
             detail=f"AI 채팅 중 오류가 발생했습니다: {error_detail}"
         )
 
+def _sse(data: dict, event: str = None) -> str:
+    """Server-Sent Events 메시지 형식"""
+    payload = json.dumps(data, ensure_ascii=False)
+    return f"event: {event}\ndata: {payload}\n\n" if event else f"data: {payload}\n\n"
+
+@router.post("/stream")
+async def chat_stream(
+    message: ChatMessage,
+    request: Request,
+    current_user: Optional[AuthenticatedUser] = Depends(get_current_user_optional)
+):
+    """
+    AI 채팅 스트리밍 (Server-Sent Events)
+    생성되는 대로 Markdown을 제거한 텍스트를 data: {"text": ...} 이벤트로 보내고,
+    끝나면 event: done, 오류가 나면 event: error 이벤트를 보낸다.
+    캐시된 답변이 있으면 텍스트 이벤트 하나로 바로 보낸다.
+    """
+    snapshot = await run_in_threadpool(restaurant_catalog.snapshot)
+    user_message = rewrite_user_message(message.message)
+    cached = await run_in_threadpool(answer_cache.lookup, user_message, snapshot.version)
+    if cached is not None:
+        async def cached_events():
+            yield _sse({"text": cached})
+            yield _sse({}, event="done")
+        return StreamingResponse(
+            cached_events(),
+            media_type="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        )
+
+    full_prompt = await run_in_threadpool(build_chat_prompt, message.message, snapshot)
+    # 대기열이 가득 찼거나 모델이 준비되지 않았으면 스트림을 시작하기 전에 HTTP 오류로 응답
+    release_slot = await chat_admission.acquire(client_key(current_user, request))
+    try:
+        started = time.perf_counter()
+        chunks = gemini_models.stream(full_prompt)
+    except Exception:
+        release_slot()
+        raise
+
+    async def events():
+        markdown = MarkdownStreamFilter()
+        received = False
+        answer = []
+        try:
+            async for chunk in chunks:
+                received = True
+                text = markdown.feed(chunk)
+                if text:
+                    answer.append(text)
+                    yield _sse({"text": text})
+            text = markdown.flush()
+            if text:
+                answer.append(text)
+                yield _sse({"text": text})
+            if not received:
+                yield _sse({"detail": "AI 응답을 생성할 수 없습니다."}, event="error")
+                return
+            # 끝까지 생성된 답변만 캐시에 저장
+            generation_ms = int((time.perf_counter() - started) * 1000)
+            await run_in_threadpool(answer_cache.store, user_message, snapshot.version, "".join(answer), generation_ms)
+            yield _sse({}, event="done")
+        except HTTPException as e:
+            yield _sse({"detail": e.detail}, event="error")
+        except Exception as e:
+            print(f"AI 채팅 스트리밍 오류 상세: {e}")
+            yield _sse({"detail": f"AI 채팅 중 오류가 발생했습니다: {str(e)}"}, event="error")
+        finally:
+            # 응답이 끝나거나 클라이언트 연결이 끊기면 호출 자리 반환
+            release_slot()
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        # 전송을 시작하기 전에 연결이 끊긴 경우에도 자리 반환
+        background=BackgroundTask(release_slot),
+    )
+
+@router.get("/cache/stats")
+async def chat_cache_stats(current_user: AuthenticatedUser = Depends(get_current_admin)):
+    """AI 채팅 답변 캐시 적중률 / 절약한 생성 시간 (관리자)"""
+    return await run_in_threadpool(answer_cache.stats)
+
+@router.get("/admission/stats")
+async def chat_admission_stats(current_user: AuthenticatedUser = Depends(get_current_admin)):
+    """AI 채팅 동시 호출 제한 상태 (대기열 길이 / 대기 시간 히스토그램, 관리자)"""
+    return chat_admission.stats()
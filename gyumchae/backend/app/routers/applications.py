@@ -1,8 +1,192 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from sqlalchemy import insert, update
+from sqlalchemy.orm import Session
+from datetime import datetime
+from typing import List, Optional
+from app.database import get_db
+from app.models import Application, ApplicationStatus, Store, StoreCategory, UserRole
+from app.schemas import ApplicationCreate, ApplicationResponse, ApplicationReview, ApplicationReviewResult
+from app.auth import AuthenticatedUser, get_current_admin, get_current_user
+from app.catalog import restaurant_catalog
+from app.pagination import apply_created_at_cursor, created_at_cursor, decode_cursor, encode_cursor, set_next_cursor
+import os
+import re
+
+# 한 번에 승인/거절할 수 있는 최대 신청 수
+APPLICATION_REVIEW_MAX = int(os.getenv("APPLICATION_REVIEW_MAX", "500"))
 
 router = APIRouter()
 
-@router.get("/")
-def get_applications():
-    return {"message": "업체 신청 목록"}
+def _required(value: str, label: str) -> str:
+    if not value or not value.strip():
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"{label}을(를) 입력해주세요."
+        )
+    return value.strip()
+
+def _normalize_tax_id(tax_id: str) -> str:
+    """사업자등록번호 10자리 -> 000-00-00000"""
+    digits = re.sub(r"\D", "", tax_id or "")
+    if len(digits) != 10:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="사업자등록번호 10자리를 입력해주세요."
+        )
+    return f"{digits[:3]}-{digits[3:5]}-{digits[5:]}"
+
+@router.post("/", response_model=ApplicationResponse, status_code=status.HTTP_201_CREATED)
+def create_application(
+    application: ApplicationCreate,
+    db: Session = Depends(get_db),
+    current_user: AuthenticatedUser = Depends(get_current_user)
+):
+    """업체 신청 (심사 대기 상태로 접수)"""
+    db_application = Application(
+        user_id=current_user.id,
+        name=_required(application.name, "이름"),
+        company_name=_required(application.company_name, "업체명"),
+        tax_id=_normalize_tax_id(application.tax_id),
+        phone_number=_required(application.phone_number, "전화번호"),
+        email=_required(application.email, "이메일"),
+        title=application.title.strip() if application.title else None,
+        details=application.details.strip() if application.details else None,
+        category=application.category,
+        address=application.address.strip() if application.address else None,
+        status=ApplicationStatus.PENDING.value,
+    )
+    db.add(db_application)
+    db.commit()
+    db.refresh(db_application)
+    return db_application
+
+@router.get("/me", response_model=List[ApplicationResponse])
+def get_my_applications(
+    response: Response,
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="이전 응답의 X-Next-Cursor 헤더 값"),
+    db: Session = Depends(get_db),
+    current_user: AuthenticatedUser = Depends(get_current_user)
+):
+    """내 신청 목록 (최신순)"""
+    query = db.query(Application).filter(Application.user_id == current_user.id)
+    if cursor:
+        (last_id,) = decode_cursor(cursor, 1)
+        query = query.filter(Application.id < last_id)
+    applications = query.order_by(Application.id.desc()).limit(limit).all()
+    set_next_cursor(response, applications, limit, lambda application: encode_cursor(application.id))
+    return applications
+
+@router.get("/", response_model=List[ApplicationResponse])
+def get_applications(
+    response: Response,
+    status_filter: ApplicationStatus = Query(ApplicationStatus.PENDING, alias="status"),
+    order: str = Query("oldest", pattern="^(oldest|newest)$", description="oldest(먼저 접수된 순) 또는 newest(최신순)"),
+    limit: int = Query(50, ge=1, le=200),
+    cursor: Optional[str] = Query(None, description="이전 응답의 X-Next-Cursor 헤더 값 (같은 status, order로 요청)"),
+    db: Session = Depends(get_db),
+    current_user: AuthenticatedUser = Depends(get_current_admin)
+):
+    """심사 대기열 (관리자) - (status, created_at, id) 인덱스로 키셋 페이지네이션"""
+    descending = order == "newest"
+    query = db.query(Application).filter(Application.status == status_filter.value)
+    if cursor:
+        query = apply_created_at_cursor(query, Application, cursor, descending=descending)
+    if descending:
+        query = query.order_by(Application.created_at.desc(), Application.id.desc())
+    else:
+        query = query.order_by(Application.created_at.asc(), Application.id.asc())
+    applications = query.limit(limit).all()
+    set_next_cursor(response, applications, limit, created_at_cursor)
+    return applications
+
+def _review_ids(review: ApplicationReview) -> List[int]:
+    ids = list(dict.fromkeys(review.ids))
+    if not ids or len(ids) > APPLICATION_REVIEW_MAX:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"신청은 한 번에 1~{APPLICATION_REVIEW_MAX}개까지 처리할 수 있습니다."
+        )
+    return ids
+
+def _claim_pending(db: Session, ids: List[int], reviewer_id: int, **values):
+    """
+    대기 중인 신청만 상태 변경 후 반환 (UPDATE ... RETURNING 한 문장)
+    이미 다른 관리자가 처리한 신청은 바뀌지 않으므로 같은 신청으로 가게가 두 번 만들어지지 않는다.
+    """
+    rows = db.execute(
+        update(Application)
+        .where(Application.id.in_(ids), Application.status == ApplicationStatus.PENDING.value)
+        .values(reviewed_by=reviewer_id, reviewed_at=datetime.utcnow(), **values)
+        .returning(
+            Application.id, Application.title, Application.company_name, Application.details,
+            Application.category, Application.address, Application.phone_number, Application.email,
+        ),
+        execution_options={"synchronize_session": False},
+    ).all()
+    return sorted(rows, key=lambda row: row.id)
+
+@router.post("/approve", response_model=ApplicationReviewResult)
+def approve_applications(
+    review: ApplicationReview,
+    db: Session = Depends(get_db),
+    current_user: AuthenticatedUser = Depends(get_current_admin)
+):
+    """신청 일괄 승인 (관리자) - 상태 변경과 가게 생성을 한 트랜잭션으로"""
+    ids = _review_ids(review)
+    rows = _claim_pending(db, ids, current_user.id, status=ApplicationStatus.APPROVED.value, reject_reason=None)
+    store_ids = []
+    if rows:
+        store_ids = db.execute(
+            insert(Store).returning(Store.id, sort_by_parameter_order=True),
+            [
+                {
+                    "name": row.title or row.company_name,
+                    "category": row.category or review.category or StoreCategory.ETC,
+                    "description": row.details,
+                    "address": row.address,
+                    "phone": row.phone_number,
+                    "email": row.email,
+                    "is_active": True,
+                }
+                for row in rows
+            ],
+        ).scalars().all()
+        db.execute(
+            update(Application),
+            [{"id": row.id, "store_id": store_id} for row, store_id in zip(rows, store_ids)],
+        )
+    db.commit()
+    if rows:
+        restaurant_catalog.mark_stores_changed()
+    processed = [row.id for row in rows]
+    return {"processed": processed, "skipped": sorted(set(ids) - set(processed)), "store_ids": store_ids}
+
+@router.post("/reject", response_model=ApplicationReviewResult)
+def reject_applications(
+    review: ApplicationReview,
+    db: Session = Depends(get_db),
+    current_user: AuthenticatedUser = Depends(get_current_admin)
+):
+    """신청 일괄 거절 (관리자)"""
+    ids = _review_ids(review)
+    reason = review.reason.strip() if review.reason else None
+    rows = _claim_pending(db, ids, current_user.id, status=ApplicationStatus.REJECTED.value, reject_reason=reason)
+    db.commit()
+    processed = [row.id for row in rows]
+    return {"processed": processed, "skipped": sorted(set(ids) - set(processed))}
 
+@router.get("/{application_id}", response_model=ApplicationResponse)
+def get_application(
+    application_id: int,
+    db: Session = Depends(get_db),
+    current_user: AuthenticatedUser = Depends(get_current_user)
+):
+    """신청 상세 (본인 또는 관리자)"""
+    application = db.query(Application).filter(Application.id == application_id).first()
+    if not application or (application.user_id != current_user.id and current_user.role != UserRole.ADMIN.value):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="신청을 찾을 수 없습니다."
+        )
+    return application
@@ -1,4 +1,5 @@
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.orm import Session
 from datetime import timedelta
@@ -6,19 +7,22 @@ from app.database import get_db
 from app.models import User
 from app.schemas import UserCreate, UserResponse, Token
 from app.auth import (
-    verify_password,
-    get_password_hash,
+    password_pool,
     create_access_token,
+    token_claims,
     get_current_user,
+    AuthenticatedUser,
     ACCESS_TOKEN_EXPIRE_MINUTES
 )
 
 router = APIRouter()
 
 @router.post("/register", response_model=UserResponse)
-def register(user_data: UserCreate, db: Session = Depends(get_db)):
+async def register(user_data: UserCreate, db: Session = Depends(get_db)):
     # 사용자명 중복 확인
-    existing_user = db.query(User).filter(User.username == user_data.username).first()
+    existing_user = await run_in_threadpool(
+        lambda: db.query(User).filter(User.username == user_data.username).first()
+    )
     if existing_user:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -38,31 +42,38 @@ def register(user_data: UserCreate, db: Session = Depends(get_db)):
             detail="비밀번호는 최대 50자까지 입력 가능합니다."
         )
     
-    # 새 사용자 생성
-    hashed_password = get_password_hash(user_data.password)
+    # 새 사용자 생성 (bcrypt 해싱은 전용 프로세스 풀에서 실행)
+    hashed_password = await password_pool.hash(user_data.password)
     db_user = User(
         username=user_data.username,
         hashed_password=hashed_password,
         email=None  # 기존 DB 호환을 위해 None으로 설정
     )
-    db.add(db_user)
-    db.commit()
-    db.refresh(db_user)
+
+    def save_user():
+        db.add(db_user)
+        db.commit()
+        db.refresh(db_user)
+
+    await run_in_threadpool(save_user)
     return db_user
 
 @router.post("/login", response_model=Token)
-def login(
+async def login(
     form_data: OAuth2PasswordRequestForm = Depends(),
     db: Session = Depends(get_db)
 ):
-    user = db.query(User).filter(User.username == form_data.username).first()
+    user = await run_in_threadpool(
+        lambda: db.query(User).filter(User.username == form_data.username).first()
+    )
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="사용자명이 존재하지 않습니다.",
             headers={"WWW-Authenticate": "Bearer"},
         )
-    if not verify_password(form_data.password, user.hashed_password):
+    # bcrypt 검증은 전용 프로세스 풀에서 실행 (포화 시 503 + Retry-After)
+    if not await password_pool.verify(form_data.password, user.hashed_password):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="비밀번호가 올바르지 않습니다.",
@@ -71,11 +82,11 @@ def login(
     
     access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = create_access_token(
-        data={"sub": user.username}, expires_delta=access_token_expires
+        data=token_claims(user), expires_delta=access_token_expires
     )
     return {"access_token": access_token, "token_type": "bearer"}
 
 @router.get("/me", response_model=UserResponse)
-def get_current_user_info(current_user: User = Depends(get_current_user)):
+def get_current_user_info(current_user: AuthenticatedUser = Depends(get_current_user)):
     return current_user
 
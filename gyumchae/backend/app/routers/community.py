@@ -1,62 +1,69 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Security
-from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
-from sqlalchemy import func
 from typing import List, Optional
 from app.database import get_db
-from app.models import Post, PostCategory, Comment, PostLike, User
-from app.schemas import PostCreate, PostResponse, CommentCreate, CommentResponse
-from app.auth import get_current_user
+from app.models import Post, PostCategory, Comment, PostLike, PostHotScore
+from app.schemas import PostCreate, PostResponse, PostSearchResponse, CommentCreate, CommentResponse
+from app.auth import AuthenticatedUser, get_current_user, get_current_user_optional
+from app.counters import increment_post_counter
+from app.view_counter import view_counts
+from app.pagination import apply_created_at_cursor, created_at_cursor, set_next_cursor
+from app.fulltext import search_cursor, search_posts
+from app.hot_posts import apply_hot_cursor, hot_cursor, remove_like
 
 router = APIRouter()
 
-# 선택적 인증을 위한 헬퍼 함수
-async def get_current_user_optional(
-    credentials: Optional[HTTPAuthorizationCredentials] = Security(HTTPBearer(auto_error=False)),
-    db: Session = Depends(get_db)
-) -> Optional[User]:
-    if not credentials:
-        return None
-    try:
-        token = credentials.credentials
-        from jose import jwt
-        import os
-        from dotenv import load_dotenv
-        load_dotenv()
-        SECRET_KEY = os.getenv("SECRET_KEY", "your-secret-key-change-in-production")
-        ALGORITHM = "HS256"
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        username: str = payload.get("sub")
-        if username:
-            user = db.query(User).filter(User.username == username).first()
-            return user
-    except Exception:
-        pass
-    return None
-
 @router.get("/posts", response_model=List[PostResponse])
 def get_posts(
+    response: Response,
     category: Optional[PostCategory] = None,
+    sort: str = Query("recent", pattern="^(recent|hot)$", description="recent(최신순) 또는 hot(인기순)"),
     skip: int = 0,
     limit: int = 20,
+    cursor: Optional[str] = Query(None, description="이전 응답의 X-Next-Cursor 헤더 값 (지정 시 skip 무시, 같은 sort로 요청)"),
     db: Session = Depends(get_db),
-    current_user: Optional[User] = Depends(get_current_user_optional)
+    current_user: Optional[AuthenticatedUser] = Depends(get_current_user_optional)
 ):
-    query = db.query(Post)
-    if category and category != PostCategory.ALL:
-        query = query.filter(Post.category == category)
-    posts = query.order_by(Post.created_at.desc()).offset(skip).limit(limit).all()
+    if sort == "hot":
+        # 미리 계산해 둔 인기 점수 인덱스 순서대로 한 페이지만 읽음
+        query = db.query(Post, PostHotScore.score).join(PostHotScore, PostHotScore.post_id == Post.id)
+        if category and category != PostCategory.ALL:
+            query = query.filter(PostHotScore.category == category)
+        query = query.order_by(PostHotScore.score.desc(), PostHotScore.post_id.desc())
+        if cursor:
+            query = apply_hot_cursor(query, cursor)
+        else:
+            query = query.offset(skip)
+        rows = query.limit(limit).all()
+        set_next_cursor(response, rows, limit, hot_cursor)
+        posts = [post for post, _ in rows]
+    else:
+        query = db.query(Post)
+        if category and category != PostCategory.ALL:
+            query = query.filter(Post.category == category)
+        query = query.order_by(Post.created_at.desc(), Post.id.desc())
+        # cursor가 있으면 (created_at, id) 키셋 페이지네이션, 없으면 기존 offset 방식
+        if cursor:
+            query = apply_created_at_cursor(query, Post, cursor)
+        else:
+            query = query.offset(skip)
+        posts = query.limit(limit).all()
+        set_next_cursor(response, posts, limit, created_at_cursor)
+    
+    # 페이지 내 게시글에 대한 사용자 좋아요 여부를 한 번에 조회
+    liked_post_ids = set()
+    if current_user and posts:
+        liked_post_ids = {
+            post_id for (post_id,) in db.query(PostLike.post_id).filter(
+                PostLike.post_id.in_([post.id for post in posts]),
+                PostLike.user_id == current_user.id
+            ).all()
+        }
     
-    # 각 게시글의 좋아요 수 계산 및 사용자 좋아요 여부 확인
     result = []
     for post in posts:
-        like_count = db.query(func.count(PostLike.id)).filter(PostLike.post_id == post.id).scalar() or 0
-        is_liked = False
-        if current_user:
-            is_liked = db.query(PostLike).filter(
-                PostLike.post_id == post.id,
-                PostLike.user_id == current_user.id
-            ).first() is not None
+        is_liked = post.id in liked_post_ids
         
         post_dict = {
             "id": post.id,
@@ -65,7 +72,8 @@ def get_posts(
             "category": post.category,
             "author_id": post.author_id,
             "view_count": post.view_count,
-            "like_count": like_count,
+            "like_count": post.like_count,
+            "comment_count": post.comment_count,
             "is_liked": is_liked,
             "created_at": post.created_at
         }
@@ -73,11 +81,41 @@ def get_posts(
     
     return result
 
+@router.get("/posts/search", response_model=List[PostSearchResponse])
+def search_post_text(
+    response: Response,
+    q: str = Query(..., min_length=1, description="검색어 (제목, 본문)"),
+    category: Optional[PostCategory] = None,
+    sort: str = Query("relevance", pattern="^(relevance|recent)$", description="relevance(관련도순) 또는 recent(최신순)"),
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="이전 응답의 X-Next-Cursor 헤더 값 (같은 q, sort로 요청)"),
+    db: Session = Depends(get_db)
+):
+    """게시글 전문 검색 (FTS5, 검색어 하이라이트)"""
+    results, hits = search_posts(db, q, category=category, sort=sort, cursor=cursor, limit=limit)
+    set_next_cursor(response, hits, limit, search_cursor)
+    return [
+        {
+            "id": post.id,
+            "title": post.title,
+            "content": post.content,
+            "category": post.category,
+            "author_id": post.author_id,
+            "view_count": post.view_count,
+            "like_count": post.like_count,
+            "comment_count": post.comment_count,
+            "created_at": post.created_at,
+            "title_highlight": title_highlight,
+            "snippet": snippet
+        }
+        for post, title_highlight, snippet in results
+    ]
+
 @router.get("/posts/{post_id}", response_model=PostResponse)
 def get_post(
     post_id: int, 
     db: Session = Depends(get_db),
-    current_user: Optional[User] = Depends(get_current_user_optional)
+    current_user: Optional[AuthenticatedUser] = Depends(get_current_user_optional)
 ):
     post = db.query(Post).filter(Post.id == post_id).first()
     if not post:
@@ -85,11 +123,10 @@ def get_post(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="게시글이 존재하지 않습니다."
         )
-    post.view_count += 1
-    db.commit()
+    # 조회수는 버퍼에 모았다가 주기적으로 일괄 반영 (읽기 요청에서 쓰기 트랜잭션 제거)
+    view_counts.increment(Post, post.id)
     
-    # 좋아요 수 계산 및 사용자 좋아요 여부 확인
-    like_count = db.query(func.count(PostLike.id)).filter(PostLike.post_id == post.id).scalar() or 0
+    # 사용자 좋아요 여부 확인 (좋아요 수는 posts.like_count 사용)
     is_liked = False
     if current_user:
         is_liked = db.query(PostLike).filter(
@@ -103,8 +140,9 @@ def get_post(
         "content": post.content,
         "category": post.category,
         "author_id": post.author_id,
-        "view_count": post.view_count,
-        "like_count": like_count,
+        "view_count": (post.view_count or 0) + view_counts.pending(Post, post.id),
+        "like_count": post.like_count,
+        "comment_count": post.comment_count,
         "is_liked": is_liked,
         "created_at": post.created_at
     }
@@ -133,8 +171,21 @@ def create_post(
     return db_post
 
 @router.get("/posts/{post_id}/comments", response_model=List[CommentResponse])
-def get_comments(post_id: int, db: Session = Depends(get_db)):
-    comments = db.query(Comment).filter(Comment.post_id == post_id).order_by(Comment.created_at.asc()).all()
+def get_comments(
+    post_id: int,
+    response: Response,
+    skip: int = 0,
+    limit: int = Query(100, ge=1, le=500),
+    cursor: Optional[str] = Query(None, description="이전 응답의 X-Next-Cursor 헤더 값 (지정 시 skip 무시)"),
+    db: Session = Depends(get_db)
+):
+    query = db.query(Comment).filter(Comment.post_id == post_id).order_by(Comment.created_at.asc(), Comment.id.asc())
+    if cursor:
+        query = apply_created_at_cursor(query, Comment, cursor, descending=False)
+    else:
+        query = query.offset(skip)
+    comments = query.limit(limit).all()
+    set_next_cursor(response, comments, limit, created_at_cursor)
     return comments
 
 @router.post("/posts/{post_id}/comments", response_model=CommentResponse)
@@ -164,6 +215,7 @@ def create_comment(
         author_id=current_user.id
     )
     db.add(db_comment)
+    increment_post_counter(db, post_id, Post.comment_count)
     db.commit()
     db.refresh(db_comment)
     return db_comment
@@ -192,9 +244,10 @@ def toggle_like(
     if existing_like:
         # 좋아요 취소
         db.delete(existing_like)
-        db.commit()
-        like_count = db.query(func.count(PostLike.id)).filter(PostLike.post_id == post_id).scalar() or 0
-        return {"liked": False, "like_count": like_count}
+        increment_post_counter(db, post_id, Post.like_count, -1)
+        # 인기 점수에 이미 반영된 좋아요면 함께 뺌 (위 UPDATE로 쓰기 잠금을 잡은 뒤)
+        remove_like(db, existing_like)
+        liked = False
     else:
         # 좋아요 추가
         new_like = PostLike(
@@ -202,7 +255,15 @@ def toggle_like(
             user_id=current_user.id
         )
         db.add(new_like)
-        db.commit()
-        like_count = db.query(func.count(PostLike.id)).filter(PostLike.post_id == post_id).scalar() or 0
-        return {"liked": True, "like_count": like_count}
-
+        try:
+            db.flush()
+        except IntegrityError:
+            # 동시에 누른 같은 좋아요가 먼저 저장됨 (post_id, user_id 고유 인덱스) - 이미 좋아요 상태로 응답
+            db.rollback()
+            db.refresh(post)
+            return {"liked": True, "like_count": post.like_count}
+        increment_post_counter(db, post_id, Post.like_count)
+        liked = True
+    db.commit()
+    db.refresh(post)
+    return {"liked": liked, "like_count": post.like_count}
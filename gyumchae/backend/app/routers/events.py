@@ -1,8 +1,160 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.orm import Session
+from typing import List, Optional
+from app.database import SessionLocal, get_db
+from app.models import Event, Receipt, Store, UserRole
+from app.schemas import (
+    DrawRequest, EventCreate, EventResponse, EventResultResponse, PrizesAdd, PrizeStockResponse, ReceiptResponse
+)
+from app.auth import AuthenticatedUser, get_current_admin, get_current_user
+from app.pagination import decode_cursor, encode_cursor, set_next_cursor
+from app.job_queue import job_queue
+from app.receipts import RECEIPT_MAX_BYTES, create_receipt, remove_receipt_image, save_receipt_image
+from app.prize_draw import allocate_prizes, draw_prize, prize_stock, utc_naive
 
 router = APIRouter()
 
-@router.get("/")
-def get_events():
-    return {"message": "이벤트 목록"}
+@router.get("/", response_model=List[EventResponse])
+def get_events(db: Session = Depends(get_db)):
+    """진행 중인 이벤트 목록"""
+    return db.query(Event).filter(Event.is_active == True).order_by(Event.id.desc()).all()
 
+@router.post("/", response_model=EventResponse, status_code=status.HTTP_201_CREATED)
+def create_event(
+    event: EventCreate,
+    db: Session = Depends(get_db),
+    current_user: AuthenticatedUser = Depends(get_current_admin)
+):
+    """이벤트 생성 + 경품 원장 준비 (관리자)"""
+    db_event = Event(
+        title=event.title,
+        description=event.description,
+        start_date=utc_naive(event.start_date),
+        end_date=utc_naive(event.end_date),
+        is_active=True,
+    )
+    db.add(db_event)
+    db.flush()
+    allocate_prizes(db.connection(), db_event.id, event.prizes)
+    db.commit()
+    db.refresh(db_event)
+    return db_event
+
+@router.post("/{event_id}/prizes", response_model=List[PrizeStockResponse])
+def add_prizes(
+    event_id: int,
+    body: PrizesAdd,
+    db: Session = Depends(get_db),
+    current_user: AuthenticatedUser = Depends(get_current_admin)
+):
+    """경품 추가 (관리자) - 남은 칸 사이에 섞여 들어감"""
+    if db.query(Event.id).filter(Event.id == event_id).first() is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="이벤트를 찾을 수 없습니다."
+        )
+    allocate_prizes(db.connection(), event_id, body.prizes)
+    db.commit()
+    return prize_stock(event_id)
+
+@router.get("/{event_id}/prizes", response_model=List[PrizeStockResponse])
+def get_prize_stock(event_id: int):
+    """경품별 전체/남은 수량"""
+    return prize_stock(event_id)
+
+@router.post("/{event_id}/draw", response_model=EventResultResponse)
+def draw(
+    event_id: int,
+    body: DrawRequest,
+    response: Response,
+    current_user: AuthenticatedUser = Depends(get_current_user)
+):
+    """
+    인증된 영수증으로 경품 추첨 - 영수증 하나에 한 번 (다시 요청하면 처음 결과를 200으로 반환)
+    경품이 모두 소진되면 409
+    """
+    result, created = draw_prize(event_id, body.receipt_id, current_user.id)
+    if created:
+        response.status_code = status.HTTP_201_CREATED
+    return result
+
+def _store_exists(store_id: int) -> bool:
+    db = SessionLocal()
+    try:
+        return db.query(Store.id).filter(Store.id == store_id, Store.is_active == True).first() is not None
+    finally:
+        db.close()
+
+@router.post("/receipts", response_model=ReceiptResponse, status_code=status.HTTP_202_ACCEPTED)
+async def submit_receipt(
+    request: Request,
+    response: Response,
+    store_id: int = Query(..., description="영수증을 발급한 가게 id"),
+    amount: Optional[int] = Query(None, description="영수증 금액 (원)"),
+    current_user: AuthenticatedUser = Depends(get_current_user)
+):
+    """
+    영수증 제출 - 요청 본문에 이미지 파일을 그대로 담아 보낸다 (Content-Type: image/jpeg 등)
+    이미지는 받는 대로 디스크에 저장하고 검증은 백그라운드 워커가 처리하므로 바로 202(status=pending)를 반환한다.
+    처리 결과는 GET /receipts/{id}로 확인
+    """
+    content_length = request.headers.get("content-length")
+    if content_length and content_length.isdigit() and int(content_length) > RECEIPT_MAX_BYTES:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"영수증 이미지는 {RECEIPT_MAX_BYTES // (1024 * 1024)}MB까지 업로드할 수 있습니다."
+        )
+    if not await run_in_threadpool(_store_exists, store_id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="가게를 찾을 수 없습니다."
+        )
+
+    image = await save_receipt_image(request.stream())
+    try:
+        receipt = await run_in_threadpool(create_receipt, current_user.id, store_id, amount, image)
+    except Exception:
+        await run_in_threadpool(remove_receipt_image, image.path)
+        raise
+    # 커밋된 뒤에 워커를 깨움
+    job_queue.notify()
+    response.headers["Location"] = str(request.url_for("get_receipt", receipt_id=receipt.id))
+    return receipt
+
+@router.get("/receipts", response_model=List[ReceiptResponse])
+def get_my_receipts(
+    response: Response,
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="이전 응답의 X-Next-Cursor 헤더 값"),
+    db: Session = Depends(get_db),
+    current_user: AuthenticatedUser = Depends(get_current_user)
+):
+    """내가 제출한 영수증 목록 (최신순)"""
+    query = db.query(Receipt).filter(Receipt.user_id == current_user.id)
+    if cursor:
+        (last_id,) = decode_cursor(cursor, 1)
+        query = query.filter(Receipt.id < last_id)
+    receipts = query.order_by(Receipt.id.desc()).limit(limit).all()
+    set_next_cursor(response, receipts, limit, lambda receipt: encode_cursor(receipt.id))
+    return receipts
+
+@router.get("/receipts/queue/stats")
+async def get_receipt_queue_stats(current_user: AuthenticatedUser = Depends(get_current_admin)):
+    """검증 작업 큐 상태 (관리자)"""
+    return await run_in_threadpool(job_queue.stats)
+
+@router.get("/receipts/{receipt_id}", response_model=ReceiptResponse)
+def get_receipt(
+    receipt_id: int,
+    db: Session = Depends(get_db),
+    current_user: AuthenticatedUser = Depends(get_current_user)
+):
+    """영수증 처리 상태 조회 (pending → verified / rejected / failed)"""
+    receipt = db.query(Receipt).filter(Receipt.id == receipt_id).first()
+    if not receipt or (receipt.user_id != current_user.id and current_user.role != UserRole.ADMIN.value):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="영수증을 찾을 수 없습니다."
+        )
+    return receipt
@@ -1,10 +1,12 @@
-from fastapi import APIRouter, HTTPException, Query
-from typing import Optional
-import httpx
-import os
-from dotenv import load_dotenv
-
-load_dotenv()
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from typing import List, Optional
+from app.auth import AuthenticatedUser, get_current_admin, get_current_user_optional
+from app.geocoding import GEOCODE_ANON_BATCH_MAX, GEOCODE_BATCH_MAX, GEOCODE_USER_BATCH_MAX, geocode_limiter, geocoder
+from app.http_client import OutboundHTTPClient, get_http_client
+from app.llm_admission import client_key
+from app.models import UserRole
+from app.naver_search import search_local, search_cache
+from app.schemas import GeocodeRequest, GeocodeResult
 
 router = APIRouter()
 
@@ -13,53 +15,47 @@ router = APIRouter()
 async def search_places(
     query: str = Query(..., description="검색어 (예: 음식점, 카페, 상린)"),
     display: int = Query(10, ge=1, le=100, description="검색 결과 개수"),
-    start: int = Query(1, ge=1, description="시작 위치")
+    start: int = Query(1, ge=1, description="시작 위치"),
+    client: OutboundHTTPClient = Depends(get_http_client)
 ):
     """
     네이버 검색 API를 통한 장소 검색 (CORS 우회 프록시)
+    같은 검색어는 캐시된 결과를 사용하고, 동시에 들어온 같은 요청은 한 번만 호출한다.
     """
-    # 네이버 검색 API는 Maps API와 별도이지만, 같은 Client ID 사용 가능
-    # Maps API Client ID를 사용하거나, 별도 검색 API 키 사용 가능
-    client_id = os.getenv("NAVER_MAP_CLIENT_ID") or os.getenv("NAVER_CLIENT_ID")
-    client_secret = os.getenv("NAVER_CLIENT_SECRET")
-    
-    if not client_id or not client_secret:
-        raise HTTPException(
-            status_code=500,
-            detail="네이버 API 키가 설정되지 않았습니다. NAVER_MAP_CLIENT_ID 또는 NAVER_CLIENT_ID를 환경 변수에 추가해주세요."
-        )
-    
-    try:
-        url = "https://openapi.naver.com/v1/search/local.json"
-        params = {
-            "query": query,
-            "display": display,
-            "start": start,
-            "sort": "random"
-        }
-        headers = {
-            "X-Naver-Client-Id": client_id,
-            "X-Naver-Client-Secret": client_secret
-        }
-        
-        async with httpx.AsyncClient() as client:
-            response = await client.get(url, params=params, headers=headers, timeout=10.0)
-            response.raise_for_status()
-            return response.json()
-            
-    except httpx.HTTPStatusError as e:
-        raise HTTPException(
-            status_code=e.response.status_code,
-            detail=f"네이버 API 오류: {e.response.text}"
-        )
-    except httpx.RequestError as e:
-        raise HTTPException(
-            status_code=500,
-            detail=f"네트워크 오류: {str(e)}"
-        )
-    except Exception as e:
+    return await search_local(query, display, start, client)
+
+@router.get("/search/stats")
+async def search_cache_stats(current_user: AuthenticatedUser = Depends(get_current_admin)):
+    """검색 캐시 적중/미스/병합 통계 + 외부 API 클라이언트 설정 (관리자)"""
+    return {**search_cache.stats(), "http_client": get_http_client().stats()}
+
+@router.post("/geocode", response_model=List[GeocodeResult])
+async def geocode_addresses(
+    request: GeocodeRequest,
+    http_request: Request,
+    current_user: Optional[AuthenticatedUser] = Depends(get_current_user_optional)
+):
+    """
+    주소 목록을 한 번에 좌표로 변환 (검색 결과 마커 표시용, 결과는 입력 순서대로)
+    중복 주소는 한 번만 변환하고, 좌표가 있는 가게나 캐시에 있는 주소는 외부 API를 호출하지 않는다.
+    외부 API 사용량이 걸려 있으므로 관리자가 아니면 한 번에 변환할 주소 수(로그인 GEOCODE_USER_BATCH_MAX,
+    비로그인 GEOCODE_ANON_BATCH_MAX)와 사용자/IP별 분당 변환 주소 수(GEOCODE_RATE_LIMIT)를 제한한다.
+    """
+    is_admin = current_user is not None and current_user.role == UserRole.ADMIN.value
+    if is_admin:
+        batch_max = GEOCODE_BATCH_MAX
+    else:
+        batch_max = GEOCODE_USER_BATCH_MAX if current_user is not None else GEOCODE_ANON_BATCH_MAX
+    if len(request.addresses) > batch_max:
         raise HTTPException(
-            status_code=500,
-            detail=f"검색 중 오류가 발생했습니다: {str(e)}"
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"주소는 한 번에 {batch_max}개까지 변환할 수 있습니다."
         )
+    if not is_admin:
+        geocode_limiter.acquire(client_key(current_user, http_request), len(request.addresses))
+    return await geocoder.geocode(request.addresses)
 
+@router.get("/geocode/stats")
+async def geocode_stats(current_user: AuthenticatedUser = Depends(get_current_admin)):
+    """좌표 변환 가게/캐시 적중, 외부 API 호출 수, 제한으로 거절한 요청 수 (관리자)"""
+    return {**geocoder.stats(), "rate_limited": geocode_limiter.rejected}
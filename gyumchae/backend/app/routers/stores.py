@@ -1,14 +1,176 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 from app.database import get_db
-from app.models import Store
-from app.schemas import StoreResponse
+from app.models import Store, StoreCategory
+from app.schemas import (
+    StoreResponse, StoreSearchResponse, NearbyStoreResponse, CatalogRestaurantResponse, StoreImportResult
+)
+from app.auth import AuthenticatedUser, get_current_admin
+from app.catalog import restaurant_catalog
+from app.fulltext import search_cursor, search_stores
+from app.geo import STORE_GEO_MAX_RESULTS, STORE_NEARBY_MAX_RADIUS, find_nearby_stores, find_stores_in_bounds
+from app.pagination import decode_cursor, encode_cursor, set_next_cursor
+from app.store_import import export_stores, import_store_file, spool_upload
+from app.view_counter import view_counts
+import os
 
 router = APIRouter()
 
+STORE_FORMAT_PATTERN = "^(json|jsonl|csv)$"
+# 형식별 Content-Type (가져오기는 format 파라미터가 없으면 Content-Type으로 판단)
+STORE_MEDIA_TYPES = {
+    "json": "application/json",
+    "jsonl": "application/x-ndjson",
+    "csv": "text/csv",  # StreamingResponse가 charset=utf-8을 붙임
+}
+
 @router.get("/", response_model=List[StoreResponse])
-def get_stores(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    stores = db.query(Store).filter(Store.is_active == True).offset(skip).limit(limit).all()
+def get_stores(
+    response: Response,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = Query(None, description="이전 응답의 X-Next-Cursor 헤더 값 (지정 시 skip 무시)"),
+    db: Session = Depends(get_db)
+):
+    query = db.query(Store).filter(Store.is_active == True).order_by(Store.id.asc())
+    # cursor가 있으면 id 키셋 페이지네이션, 없으면 기존 offset 방식
+    if cursor:
+        (last_id,) = decode_cursor(cursor, 1)
+        query = query.filter(Store.id > last_id)
+    else:
+        query = query.offset(skip)
+    stores = query.limit(limit).all()
+    set_next_cursor(response, stores, limit, lambda store: encode_cursor(store.id))
     return stores
 
+
+@router.get("/catalog", response_model=List[CatalogRestaurantResponse])
+def get_catalog(
+    category: Optional[str] = Query(None, description="카테고리 (예: 음식점, 카페, 술집)"),
+    q: Optional[str] = Query(None, description="가게 이름 또는 메뉴 검색어"),
+    limit: int = Query(100, ge=1, le=1000)
+):
+    """restaurants.json + stores 테이블을 합친 메모리 카탈로그 조회"""
+    return restaurant_catalog.snapshot().find(category=category, query=q)[:limit]
+
+@router.get("/search", response_model=List[StoreSearchResponse])
+def search_store_text(
+    response: Response,
+    q: str = Query(..., min_length=1, description="검색어 (가게 이름, 설명, 주소)"),
+    category: Optional[StoreCategory] = None,
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="이전 응답의 X-Next-Cursor 헤더 값"),
+    db: Session = Depends(get_db)
+):
+    """가게 전문 검색 (FTS5, 관련도순, 검색어 하이라이트)"""
+    results, hits = search_stores(db, q, category=category, cursor=cursor, limit=limit)
+    set_next_cursor(response, hits, limit, search_cursor)
+    return [
+        StoreSearchResponse(**StoreResponse.model_validate(store).model_dump(), name_highlight=name_highlight, snippet=snippet)
+        for store, name_highlight, snippet in results
+    ]
+
+@router.get("/export")
+def export_store_file(
+    format: str = Query("jsonl", pattern=STORE_FORMAT_PATTERN, description="json(restaurants.json 형태), jsonl, csv"),
+    include_inactive: bool = Query(False, description="비활성 가게 포함"),
+    current_user: AuthenticatedUser = Depends(get_current_admin)
+):
+    """가게 전체 내보내기 (관리자) - id 순으로 조금씩 읽어 바로 전송, 그대로 /import 할 수 있음"""
+    return StreamingResponse(
+        export_stores(format, include_inactive),
+        media_type=STORE_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="stores.{format}"'},
+    )
+
+def _upload_format(request: Request, format: Optional[str]) -> str:
+    if format:
+        return format
+    content_type = request.headers.get("content-type", "").split(";")[0].strip().lower()
+    for fmt, media_type in STORE_MEDIA_TYPES.items():
+        if content_type == media_type:
+            return fmt
+    raise HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        detail="format 파라미터(json, jsonl, csv) 또는 Content-Type을 지정해주세요."
+    )
+
+@router.post("/import", response_model=StoreImportResult)
+async def import_stores_upload(
+    request: Request,
+    format: Optional[str] = Query(None, pattern=STORE_FORMAT_PATTERN, description="json, jsonl, csv (없으면 Content-Type으로 판단)"),
+    dry_run: bool = Query(False, description="반영하지 않고 바뀔 가게 수만 확인"),
+    current_user: AuthenticatedUser = Depends(get_current_admin)
+):
+    """
+    가게 일괄 가져오기 (관리자) - 요청 본문에 파일을 그대로 담아 보낸다
+    key(없으면 id, 둘 다 없으면 이름 + 주소)로 기존 가게를 찾아 바뀐 가게만 갱신하고 없는 가게는 추가
+    """
+    fmt = _upload_format(request, format)
+    path = await spool_upload(request.stream())
+    try:
+        stats = await run_in_threadpool(import_store_file, path, fmt, dry_run=dry_run)
+    finally:
+        await run_in_threadpool(os.remove, path)
+    if stats.changed and not dry_run:
+        restaurant_catalog.mark_stores_changed()
+    if stats.failure:
+        applied = "" if dry_run else f" (앞부분 추가 {stats.inserted}개 / 갱신 {stats.updated}개는 반영됨)"
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"{stats.failure}{applied}"
+        )
+    return stats
+
+def _with_distance(results) -> List[NearbyStoreResponse]:
+    return [
+        NearbyStoreResponse(**StoreResponse.model_validate(store).model_dump(), distance_m=round(distance, 1))
+        for store, distance in results
+    ]
+
+@router.get("/nearby", response_model=List[NearbyStoreResponse])
+def get_nearby_stores(
+    lat: float = Query(..., ge=-90, le=90, description="위도"),
+    lng: float = Query(..., ge=-180, le=180, description="경도"),
+    radius: float = Query(1000, gt=0, le=STORE_NEARBY_MAX_RADIUS, description="반경(m)"),
+    category: Optional[StoreCategory] = None,
+    limit: int = Query(50, ge=1, le=STORE_GEO_MAX_RESULTS),
+    db: Session = Depends(get_db)
+):
+    """좌표 반경 안의 가게를 가까운 순으로 조회 (공간 인덱스 사용)"""
+    return _with_distance(find_nearby_stores(db, lat, lng, radius, category=category, limit=limit))
+
+@router.get("/bbox", response_model=List[NearbyStoreResponse])
+def get_stores_in_bounds(
+    south: float = Query(..., ge=-90, le=90, description="남쪽 위도"),
+    west: float = Query(..., ge=-180, le=180, description="서쪽 경도"),
+    north: float = Query(..., ge=-90, le=90, description="북쪽 위도"),
+    east: float = Query(..., ge=-180, le=180, description="동쪽 경도"),
+    category: Optional[StoreCategory] = None,
+    limit: int = Query(200, ge=1, le=STORE_GEO_MAX_RESULTS),
+    db: Session = Depends(get_db)
+):
+    """지도 화면 영역 안의 가게를 화면 중심에서 가까운 순으로 조회 (공간 인덱스 사용)"""
+    if south > north or west > east:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="south <= north, west <= east 인 영역을 지정해주세요."
+        )
+    return _with_distance(find_stores_in_bounds(db, south, west, north, east, category=category, limit=limit))
+
+@router.get("/{store_id}", response_model=StoreResponse)
+def get_store(store_id: int, db: Session = Depends(get_db)):
+    store = db.query(Store).filter(Store.id == store_id, Store.is_active == True).first()
+    if not store:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="가게가 존재하지 않습니다."
+        )
+    # 조회수는 버퍼에 모았다가 주기적으로 일괄 반영
+    view_counts.increment(Store, store.id)
+    response = StoreResponse.model_validate(store)
+    response.view_count = (store.view_count or 0) + view_counts.pending(Store, store.id)
+    return response
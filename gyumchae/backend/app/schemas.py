@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import Optional, List
+from typing import Dict, Optional, List
 from datetime import datetime
 from app.models import PostCategory, StoreCategory
 
@@ -34,12 +34,17 @@ class PostResponse(BaseModel):
     author_id: int
     view_count: int
     like_count: Optional[int] = 0
+    comment_count: Optional[int] = 0
     is_liked: Optional[bool] = False
     created_at: datetime
 
     class Config:
         from_attributes = True
 
+class PostSearchResponse(PostResponse):
+    title_highlight: str  # 검색어를 <mark>로 감싼 제목 (HTML escape 적용)
+    snippet: Optional[str] = None  # 본문 중 검색어 주변 미리보기
+
 # 음식점 스키마
 class StoreCreate(BaseModel):
     name: str
@@ -68,6 +73,36 @@ class StoreResponse(BaseModel):
     class Config:
         from_attributes = True
 
+class StoreSearchResponse(StoreResponse):
+    name_highlight: str  # 검색어를 <mark>로 감싼 이름 (HTML escape 적용)
+    snippet: Optional[str] = None  # 설명/주소 중 검색어 주변 미리보기
+
+class NearbyStoreResponse(StoreResponse):
+    distance_m: float  # 기준 좌표(반경 검색: 요청 좌표, 화면 검색: 화면 중심)까지 거리
+
+class StoreImportResult(BaseModel):
+    inserted: int
+    updated: int
+    unchanged: int  # 내용이 같아 건드리지 않은 가게
+    duplicates: int  # 같은 키가 다시 나와 나중 레코드로 처리
+    invalid: int
+    errors: List[str] = []  # 잘못된 레코드 (앞쪽 20개)
+
+    class Config:
+        from_attributes = True
+
+class CatalogRestaurantResponse(BaseModel):
+    name: str
+    category: str
+    description: Optional[str] = None
+    menu: List[str] = []
+    price_range: Optional[str] = None
+    address: Optional[str] = None
+    store_id: Optional[int] = None
+
+    class Config:
+        from_attributes = True
+
 # 이벤트 스키마
 class ReceiptCreate(BaseModel):
     store_id: int
@@ -80,6 +115,51 @@ class ReceiptResponse(BaseModel):
     image_url: str
     amount: Optional[int] = None
     verified: bool
+    # pending(검증 대기) / verified / rejected / failed
+    status: str
+    reject_reason: Optional[str] = None
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
+
+class EventCreate(BaseModel):
+    title: str
+    description: Optional[str] = None
+    start_date: Optional[datetime] = None
+    end_date: Optional[datetime] = None
+    # 경품별 수량 (예: {"1등": 1, "2등": 10, "꽝": 989}) - 전체 수량만큼 추첨할 수 있음
+    prizes: Dict[str, int]
+
+class PrizesAdd(BaseModel):
+    prizes: Dict[str, int]
+
+class EventResponse(BaseModel):
+    id: int
+    title: str
+    description: Optional[str] = None
+    start_date: Optional[datetime] = None
+    end_date: Optional[datetime] = None
+    is_active: bool
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
+
+class PrizeStockResponse(BaseModel):
+    prize: str
+    total: int
+    remaining: int
+
+class DrawRequest(BaseModel):
+    receipt_id: int
+
+class EventResultResponse(BaseModel):
+    id: int
+    event_id: Optional[int] = None
+    receipt_id: int
+    user_id: int
+    result: str
     created_at: datetime
 
     class Config:
@@ -115,6 +195,8 @@ class ApplicationCreate(BaseModel):
     email: str
     title: Optional[str] = None
     details: Optional[str] = None
+    category: Optional[StoreCategory] = None
+    address: Optional[str] = None
 
 class ApplicationResponse(BaseModel):
     id: int
@@ -126,9 +208,39 @@ class ApplicationResponse(BaseModel):
     email: str
     title: Optional[str] = None
     details: Optional[str] = None
+    category: Optional[StoreCategory] = None
+    address: Optional[str] = None
     status: str
+    store_id: Optional[int] = None
+    reject_reason: Optional[str] = None
+    reviewed_at: Optional[datetime] = None
     created_at: datetime
 
     class Config:
         from_attributes = True
 
+class ApplicationReview(BaseModel):
+    ids: List[int]
+    # 거절 사유 (거절 시)
+    reason: Optional[str] = None
+    # 신청서에 분류가 없을 때 만들 가게 분류 (승인 시, 기본값: 기타)
+    category: Optional[StoreCategory] = None
+
+class ApplicationReviewResult(BaseModel):
+    processed: List[int]
+    # 없거나 이미 심사된 신청
+    skipped: List[int]
+    # 승인으로 만든 가게 id (processed 순서)
+    store_ids: List[int] = []
+
+
+# 지도 검색 스키마
+class GeocodeRequest(BaseModel):
+    addresses: List[str]
+
+class GeocodeResult(BaseModel):
+    address: str
+    latitude: Optional[float] = None
+    longitude: Optional[float] = None
+    road_address: Optional[str] = None
+    source: str  # store(가게 테이블) / cache / geocoded / not_found / error
@@ -0,0 +1,397 @@
+from fastapi import HTTPException, status
+from fastapi.concurrency import run_in_threadpool
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import IO, AsyncIterator, Dict, Iterable, Iterator, List, Optional
+from sqlalchemy import insert, select, update
+from app.database import SessionLocal, engine
+from app.models import Store, StoreCategory
+import csv
+import io
+import json
+import os
+import re
+import tempfile
+
+# 한 트랜잭션에서 처리할 레코드 수 (배치마다 커밋)
+STORE_IMPORT_BATCH = int(os.getenv("STORE_IMPORT_BATCH", "2000"))
+# 업로드로 가져올 수 있는 최대 파일 크기, 임시 파일에 쓰기 전 메모리에 모으는 크기
+STORE_IMPORT_MAX_BYTES = int(os.getenv("STORE_IMPORT_MAX_BYTES", str(100 * 1024 * 1024)))
+STORE_IMPORT_WRITE_BUFFER = 256 * 1024
+# 내보내기 시 한 번에 읽는 가게 수
+STORE_EXPORT_BATCH = 1000
+# JSON 파일을 나눠 읽는 크기
+JSON_READ_CHUNK = 64 * 1024
+# CSV의 menu 칸은 메뉴를 "|"로 구분
+CSV_MENU_SEPARATOR = "|"
+
+STORE_FORMATS = ("json", "jsonl", "csv")
+# 가져오기/내보내기 대상 컬럼 (id, 평점, 조회수 등은 서비스에서 관리)
+STORE_FIELDS = (
+    "name", "category", "description", "address", "phone", "email", "latitude", "longitude", "image_url",
+    "menu", "price_range", "is_active",
+)
+EXPORT_COLUMNS = ("id", "key") + STORE_FIELDS
+# 새 가게를 만들 때 레코드에 없는 항목의 값
+INSERT_DEFAULTS = {
+    "category": StoreCategory.ETC, "description": None, "address": None, "phone": None, "email": None,
+    "latitude": None, "longitude": None, "image_url": None, "menu": None, "price_range": None, "is_active": True,
+}
+_TRUE_VALUES = {"1", "true", "t", "yes", "y"}
+_FALSE_VALUES = {"0", "false", "f", "no", "n"}
+
+def detect_format(filename: str) -> Optional[str]:
+    """파일 확장자로 형식 판단 (.json / .jsonl, .ndjson / .csv)"""
+    extension = os.path.splitext(filename.lower())[1]
+    return {".json": "json", ".jsonl": "jsonl", ".ndjson": "jsonl", ".csv": "csv"}.get(extension)
+
+def iter_json_array(file: IO[str], chunk_size: int = JSON_READ_CHUNK) -> Iterator[dict]:
+    """
+    JSON 배열의 항목을 하나씩 읽음 - 최상위 배열 또는 restaurants.json처럼 첫 배열 값을 가진 객체
+    파일 전체를 메모리에 올리지 않고 chunk_size씩 읽어 항목 단위로 디코딩한다.
+    """
+    decoder = json.JSONDecoder()
+    buffer = ""
+    eof = False
+
+    def fill() -> bool:
+        nonlocal buffer, eof
+        if eof:
+            return False
+        chunk = file.read(chunk_size)
+        if not chunk:
+            eof = True
+            return False
+        buffer += chunk
+        return True
+
+    # 배열 시작 위치 찾기
+    while "[" not in buffer:
+        if not fill():
+            raise ValueError("JSON 배열을 찾을 수 없습니다.")
+    position = buffer.index("[") + 1
+    while True:
+        # 공백과 구분자(,) 건너뛰기
+        while True:
+            while position < len(buffer) and (buffer[position].isspace() or buffer[position] == ","):
+                position += 1
+            if position < len(buffer) or not fill():
+                break
+        if position >= len(buffer):
+            raise ValueError("JSON 배열이 닫히지 않았습니다.")
+        if buffer[position] == "]":
+            return
+        try:
+            item, end = decoder.raw_decode(buffer, position)
+        except json.JSONDecodeError:
+            # 항목이 읽은 범위 끝에서 잘렸으면 더 읽어서 다시 시도
+            if fill():
+                continue
+            raise
+        yield item
+        position = end
+        # 읽은 앞부분은 가끔씩만 잘라냄 (항목마다 자르면 버퍼 복사가 항목 수 x 버퍼 크기)
+        if position >= chunk_size:
+            buffer, position = buffer[position:], 0
+
+def iter_json_lines(file: IO[str]) -> Iterator[dict]:
+    for line in file:
+        if line.strip():
+            yield json.loads(line)
+
+def iter_csv(file: IO[str]) -> Iterator[dict]:
+    for row in csv.DictReader(file):
+        # 빈 칸은 값 없음으로
+        yield {key: (value if value != "" else None) for key, value in row.items() if key}
+
+def iter_records(file: IO[str], fmt: str) -> Iterator[dict]:
+    """텍스트 파일에서 가게 레코드를 하나씩 읽음"""
+    if fmt == "json":
+        return iter_json_array(file)
+    if fmt == "jsonl":
+        return iter_json_lines(file)
+    if fmt == "csv":
+        return iter_csv(file)
+    raise ValueError(f"지원하지 않는 형식입니다: {fmt} ({', '.join(STORE_FORMATS)})")
+
+def parse_category(value) -> StoreCategory:
+    """카테고리 값("음식점") 또는 이름("RESTAURANT") -> StoreCategory (모르는 값은 기타)"""
+    if isinstance(value, StoreCategory):
+        return value
+    text = str(value or "").strip()
+    for category in StoreCategory:
+        if text == category.value or text.upper() == category.name:
+            return category
+    return StoreCategory.ETC
+
+def _text(value) -> Optional[str]:
+    if value is None:
+        return None
+    text = str(value).strip()
+    return text or None
+
+def _float(value, label: str) -> Optional[float]:
+    if value is None or (isinstance(value, str) and not value.strip()):
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"{label} 값이 숫자가 아닙니다: {value!r}")
+
+def _bool(value) -> bool:
+    if isinstance(value, bool):
+        return value
+    text = str(value).strip().lower()
+    if text in _TRUE_VALUES:
+        return True
+    if text in _FALSE_VALUES:
+        return False
+    raise ValueError(f"is_active 값을 알 수 없습니다: {value!r}")
+
+def _menu(value) -> Optional[str]:
+    if value is None:
+        return None
+    if isinstance(value, str):
+        items = value.split(CSV_MENU_SEPARATOR)
+    elif isinstance(value, (list, tuple)):
+        items = value
+    else:
+        raise ValueError(f"menu 값을 알 수 없습니다: {value!r}")
+    items = [str(item).strip() for item in items if str(item).strip()]
+    return json.dumps(items, ensure_ascii=False) if items else None
+
+def source_key(name: str, address: Optional[str]) -> str:
+    """키가 없는 레코드의 기본 키 - 이름 + 주소 (대소문자/공백 차이 무시)"""
+    return re.sub(r"\s+", " ", f"{name}|{address or ''}").strip().casefold()
+
+def normalize_record(item: dict) -> dict:
+    """
+    가게 레코드 -> stores 컬럼 값 (레코드에 있는 항목만, 잘못된 레코드는 ValueError)
+    key가 있으면 key로, 없고 id가 있으면 id로, 둘 다 없으면 이름 + 주소로 기존 가게를 찾는다.
+    """
+    if not isinstance(item, dict):
+        raise ValueError("가게 레코드는 객체여야 합니다.")
+    name = _text(item.get("name"))
+    if not name:
+        raise ValueError("name이 없습니다.")
+    values = {"name": name}
+    # 카테고리는 빈 값이면 기존 값 유지 (새 가게는 기타)
+    if _text(item.get("category")) is not None:
+        values["category"] = parse_category(item["category"])
+    for column in ("description", "address", "phone", "email", "image_url", "price_range"):
+        if column in item:
+            values[column] = _text(item[column])
+    for column in ("latitude", "longitude"):
+        if column in item:
+            values[column] = _float(item[column], column)
+    if "menu" in item:
+        values["menu"] = _menu(item["menu"])
+    if item.get("is_active") is not None:
+        values["is_active"] = _bool(item["is_active"])
+
+    key = _text(item.get("key"))
+    store_id = item.get("id")
+    if key is None and store_id not in (None, ""):
+        try:
+            return {"id": int(store_id), "values": values}
+        except (TypeError, ValueError):
+            raise ValueError(f"id 값이 정수가 아닙니다: {store_id!r}")
+    return {"key": key or source_key(name, values.get("address")), "values": values}
+
+@dataclass
+class ImportStats:
+    inserted: int = 0
+    updated: int = 0
+    unchanged: int = 0
+    duplicates: int = 0  # 같은 배치에 같은 키가 다시 나옴 (나중 레코드 사용)
+    invalid: int = 0
+    errors: List[str] = field(default_factory=list)  # 잘못된 레코드 (앞쪽 일부만)
+    failure: Optional[str] = None  # 파일을 끝까지 읽지 못한 이유 (그 앞까지는 반영됨)
+
+    @property
+    def changed(self) -> int:
+        return self.inserted + self.updated
+
+    def reject(self, line: int, message: str):
+        self.invalid += 1
+        if len(self.errors) < 20:
+            self.errors.append(f"{line}번째 레코드: {message}")
+
+_EXISTING_COLUMNS = (Store.id, Store.source_key) + tuple(getattr(Store, column) for column in STORE_FIELDS)
+
+def _import_batch(db, batch: List[dict], stats: ImportStats):
+    """
+    배치 하나를 기존 가게와 비교해 새 가게는 INSERT, 바뀐 가게만 UPDATE (한 트랜잭션)
+    내용이 같은 가게는 건드리지 않으므로 다시 실행해도 검색 인덱스 트리거와 updated_at이 바뀌지 않는다.
+    """
+    by_key: Dict[str, dict] = {}
+    by_id: Dict[int, dict] = {}
+    for record in batch:
+        target = by_key if "key" in record else by_id
+        match = record.get("key", record.get("id"))
+        if match in target:
+            stats.duplicates += 1
+        target[match] = record
+
+    existing = {}
+    if by_key:
+        for row in db.execute(select(*_EXISTING_COLUMNS).where(Store.source_key.in_(list(by_key)))):
+            existing[("key", row.source_key)] = row
+    if by_id:
+        for row in db.execute(select(*_EXISTING_COLUMNS).where(Store.id.in_(list(by_id)))):
+            existing[("id", row.id)] = row
+
+    inserts, updates = [], []
+    now = datetime.utcnow()
+    for kind, records in (("key", by_key), ("id", by_id)):
+        for match, record in records.items():
+            row = existing.get((kind, match))
+            values = record["values"]
+            if row is None:
+                if kind == "id":
+                    stats.reject(record["line"], f"id {match} 가게가 없습니다.")
+                    continue
+                inserts.append({**INSERT_DEFAULTS, **values, "source_key": match})
+                continue
+            changes = {column: value for column, value in values.items() if getattr(row, column) != value}
+            if changes:
+                updates.append({"id": row.id, **changes, "updated_at": now})
+            else:
+                stats.unchanged += 1
+
+    if inserts:
+        db.execute(insert(Store), inserts)
+    if updates:
+        # 바뀐 컬럼 조합별로 묶어서 UPDATE ... WHERE id = ? 실행
+        db.execute(update(Store), updates)
+    stats.inserted += len(inserts)
+    stats.updated += len(updates)
+
+def import_stores(records: Iterable[dict], batch_size: int = STORE_IMPORT_BATCH, dry_run: bool = False) -> ImportStats:
+    """
+    가게 레코드를 batch_size개씩 stores 테이블에 upsert (배치마다 커밋)
+    dry_run이면 바뀔 내용만 세고 롤백한다.
+    바뀐 가게가 있으면 호출한 쪽에서 restaurant_catalog.mark_stores_changed()를 호출해야 한다.
+    """
+    stats = ImportStats()
+    db = SessionLocal()
+    try:
+        batch = []
+        try:
+            for line, item in enumerate(records, start=1):
+                try:
+                    record = normalize_record(item)
+                except ValueError as e:
+                    stats.reject(line, str(e))
+                    continue
+                record["line"] = line
+                batch.append(record)
+                if len(batch) >= batch_size:
+                    _import_batch(db, batch, stats)
+                    _finish_batch(db, dry_run)
+                    batch = []
+        except ValueError as e:
+            # JSON/CSV 형식 오류 - 이미 읽은 레코드까지만 반영
+            stats.failure = f"파일을 읽을 수 없습니다: {e}"
+        if batch:
+            _import_batch(db, batch, stats)
+            _finish_batch(db, dry_run)
+    finally:
+        db.close()
+    return stats
+
+def _finish_batch(db, dry_run: bool):
+    if dry_run:
+        db.rollback()
+    else:
+        db.commit()
+
+def import_store_file(path: str, fmt: str, batch_size: int = STORE_IMPORT_BATCH, dry_run: bool = False) -> ImportStats:
+    """JSON / JSON Lines / CSV 파일을 읽는 대로 가져오기"""
+    with open(path, encoding="utf-8-sig", newline="") as file:
+        return import_stores(iter_records(file, fmt), batch_size=batch_size, dry_run=dry_run)
+
+async def spool_upload(chunks: AsyncIterator[bytes]) -> str:
+    """
+    요청 본문을 받는 대로 임시 파일에 저장하고 경로 반환 (호출한 쪽에서 삭제)
+    파일 쓰기는 스레드 풀에서 처리해 이벤트 루프를 막지 않는다.
+    """
+    fd, path = tempfile.mkstemp(prefix="store-import-", suffix=".tmp")
+    file = os.fdopen(fd, "wb")
+    buffer = bytearray()
+    size = 0
+    try:
+        async for chunk in chunks:
+            size += len(chunk)
+            if size > STORE_IMPORT_MAX_BYTES:
+                raise HTTPException(
+                    status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                    detail=f"가게 파일은 {STORE_IMPORT_MAX_BYTES // (1024 * 1024)}MB까지 업로드할 수 있습니다."
+                )
+            buffer += chunk
+            if len(buffer) >= STORE_IMPORT_WRITE_BUFFER:
+                await run_in_threadpool(file.write, bytes(buffer))
+                buffer.clear()
+        if buffer:
+            await run_in_threadpool(file.write, bytes(buffer))
+        await run_in_threadpool(file.close)
+    except BaseException:
+        file.close()
+        os.remove(path)
+        raise
+    return path
+
+def _export_record(row) -> dict:
+    record = {"id": row.id, "key": row.source_key}
+    for column in STORE_FIELDS:
+        record[column] = getattr(row, column)
+    record["category"] = row.category.value if row.category is not None else StoreCategory.ETC.value
+    record["menu"] = json.loads(row.menu) if row.menu else []
+    return record
+
+def iter_store_rows(include_inactive: bool = False) -> Iterator:
+    """stores를 id 순으로 STORE_EXPORT_BATCH개씩 읽음 (키셋, 배치마다 짧은 읽기)"""
+    last_id = 0
+    while True:
+        query = select(*_EXISTING_COLUMNS).where(Store.id > last_id)
+        if not include_inactive:
+            query = query.where(Store.is_active == True)
+        with engine.connect() as conn:
+            rows = conn.execute(query.order_by(Store.id).limit(STORE_EXPORT_BATCH)).all()
+        if not rows:
+            return
+        yield from rows
+        last_id = rows[-1].id
+
+def export_stores(fmt: str, include_inactive: bool = False) -> Iterator[bytes]:
+    """
+    가게 목록을 fmt 형식으로 조금씩 직렬화 (StreamingResponse 본문)
+    json은 restaurants.json과 같은 {"restaurants": [...]} 형태라 그대로 다시 가져올 수 있다.
+    """
+    if fmt not in STORE_FORMATS:
+        raise ValueError(f"지원하지 않는 형식입니다: {fmt} ({', '.join(STORE_FORMATS)})")
+    buffer = io.StringIO()
+    writer = None
+    if fmt == "json":
+        buffer.write('{"restaurants": [')
+    elif fmt == "csv":
+        writer = csv.DictWriter(buffer, fieldnames=EXPORT_COLUMNS)
+        writer.writeheader()
+    first = True
+    for count, row in enumerate(iter_store_rows(include_inactive), start=1):
+        record = _export_record(row)
+        if fmt == "csv":
+            record["menu"] = CSV_MENU_SEPARATOR.join(record["menu"])
+            writer.writerow(record)
+        elif fmt == "jsonl":
+            buffer.write(json.dumps(record, ensure_ascii=False) + "\n")
+        else:
+            buffer.write(("\n  " if first else ",\n  ") + json.dumps(record, ensure_ascii=False))
+        first = False
+        if count % STORE_EXPORT_BATCH == 0:
+            yield buffer.getvalue().encode("utf-8")
+            buffer.seek(0)
+            buffer.truncate()
+    if fmt == "json":
+        buffer.write("\n]}\n")
+    yield buffer.getvalue().encode("utf-8")
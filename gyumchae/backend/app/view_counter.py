@@ -0,0 +1,119 @@
+from collections import defaultdict
+from sqlalchemy import case, func, update
+from app.database import engine
+from app.models import Post, Store
+import os
+import threading
+import traceback
+
+# 조회수 버퍼 플러시 주기(초)와 즉시 플러시를 유발하는 누적 증가분
+VIEW_COUNT_FLUSH_INTERVAL = float(os.getenv("VIEW_COUNT_FLUSH_INTERVAL", "5"))
+VIEW_COUNT_FLUSH_THRESHOLD = int(os.getenv("VIEW_COUNT_FLUSH_THRESHOLD", "1000"))
+
+class ViewCountBuffer:
+    """
+    조회수 쓰기 지연(write-behind) 버퍼
+    상세 조회마다 UPDATE + COMMIT을 하지 않고 메모리에 증가분을 모아 두었다가,
+    주기적으로 (또는 누적 증가분이 임계값을 넘으면) 테이블별 UPDATE 한 문장으로 반영한다.
+    """
+
+    def __init__(self, models, flush_interval: float, flush_threshold: int, bind=engine):
+        self._models = {model.__tablename__: model for model in models}
+        self._flush_interval = flush_interval
+        self._flush_threshold = flush_threshold
+        self._bind = bind
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._pending = {name: defaultdict(int) for name in self._models}
+        self._pending_total = 0
+        # 플러시 중인(아직 커밋되지 않은) 증가분 - 커밋 전까지 pending()에 포함
+        self._in_flight = {}
+        self._listeners = []
+        self._wakeup = threading.Event()
+        self._stopped = threading.Event()
+        self._thread = None
+
+    def add_flush_listener(self, listener):
+        """플러시 트랜잭션 안에서 호출할 함수 등록 - listener(conn, {테이블 이름: {id: 증가분}})"""
+        self._listeners.append(listener)
+
+    def increment(self, model, row_id: int, amount: int = 1):
+        """조회수 증가분 기록 (DB 쓰기 없음)"""
+        with self._lock:
+            self._pending[model.__tablename__][row_id] += amount
+            self._pending_total += amount
+            if self._pending_total >= self._flush_threshold:
+                self._wakeup.set()
+
+    def pending(self, model, row_id: int) -> int:
+        """아직 DB에 반영되지 않은 조회수 증가분 (플러시 중인 증가분 포함)"""
+        name = model.__tablename__
+        with self._lock:
+            return self._pending[name].get(row_id, 0) + self._in_flight.get(name, {}).get(row_id, 0)
+
+    def flush(self) -> int:
+        """모아 둔 증가분을 DB에 반영하고 반영한 증가분 합계를 반환"""
+        with self._flush_lock:
+            with self._lock:
+                batch = {name: dict(counts) for name, counts in self._pending.items() if counts}
+                self._pending = {name: defaultdict(int) for name in self._models}
+                self._pending_total = 0
+                self._in_flight = batch
+            if not batch:
+                return 0
+            try:
+                with self._bind.begin() as conn:
+                    for name, counts in batch.items():
+                        model = self._models[name]
+                        conn.execute(
+                            update(model)
+                            .where(model.id.in_(list(counts)))
+                            .values(view_count=func.coalesce(model.view_count, 0) + case(counts, value=model.id, else_=0))
+                        )
+                    for listener in self._listeners:
+                        listener(conn, batch)
+            except Exception:
+                # 실패한 증가분은 버리지 않고 다음 플러시에 다시 시도
+                with self._lock:
+                    self._in_flight = {}
+                    for name, counts in batch.items():
+                        for row_id, amount in counts.items():
+                            self._pending[name][row_id] += amount
+                            self._pending_total += amount
+                raise
+            with self._lock:
+                self._in_flight = {}
+            return sum(sum(counts.values()) for counts in batch.values())
+
+    def start(self):
+        """백그라운드 플러시 스레드 시작"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._run, name="view-count-flusher", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """플러시 스레드를 멈추고 남은 증가분을 반영 (서버 종료 시 호출)"""
+        self._stopped.set()
+        self._wakeup.set()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+        self.flush()
+
+    def _run(self):
+        while not self._stopped.is_set():
+            self._wakeup.wait(self._flush_interval)
+            self._wakeup.clear()
+            try:
+                self.flush()
+            except Exception as e:
+                print(f"⚠️ 조회수 플러시 오류: {e}")
+                traceback.print_exc()
+
+view_counts = ViewCountBuffer(
+    [Post, Store],
+    flush_interval=VIEW_COUNT_FLUSH_INTERVAL,
+    flush_threshold=VIEW_COUNT_FLUSH_THRESHOLD,
+)
@@ -1,9 +1,26 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from sqlalchemy import text
 from app.routers import auth, stores, community, events, ai_chat, applications, map
-from app.database import engine, Base, DATABASE_FILE
+from app.database import engine, Base, DATABASE_FILE, SessionLocal, get_database_settings
+from app.migrations import upgrade_schema
+from app.pagination import NEXT_CURSOR_HEADER
+from app.view_counter import view_counts
+from app.passwords import password_pool
+from app.catalog import restaurant_catalog
+from app.http_client import http_client
+from app.gemini import gemini_models
+from app.counters import POST_COUNTER_COLUMNS, reconcile_post_counters
+from app.geo import ensure_store_location_index
+from app.fulltext import ensure_fulltext_index
+from app.job_queue import job_queue
+from app.receipts import VERIFY_RECEIPT_JOB
+from app.hot_posts import hot_posts
+from app.answer_cache import answer_cache
+import inspect
 import os
+import traceback
 
 # 데이터베이스 테이블 생성
 # DB 파일이 존재하지 않을 때만 테이블 생성
@@ -14,6 +31,35 @@ else:
     print(f"기존 데이터베이스 파일을 사용합니다: {DATABASE_FILE}")
     # 기존 DB가 있으면 테이블이 없을 경우에만 생성 (스키마 변경 대응)
     Base.metadata.create_all(bind=engine)
+    # 기존 테이블에 새로 추가된 컬럼/인덱스 반영
+    added_columns = upgrade_schema(engine)
+    if added_columns:
+        print(f"✓ 스키마 업그레이드: {', '.join(added_columns)}")
+    # 카운터 컬럼이 새로 추가됐다면 기존 좋아요/댓글 수로 백필
+    if POST_COUNTER_COLUMNS & set(added_columns):
+        db = SessionLocal()
+        try:
+            updated = reconcile_post_counters(db)
+            print(f"✓ 게시글 카운터 백필: {updated}개 게시글")
+        finally:
+            db.close()
+    # 영수증 상태 컬럼이 새로 추가됐다면 인증된 영수증은 verified로, 나머지는 검증 작업을 넣음
+    if "receipts.status" in added_columns:
+        with engine.begin() as conn:
+            conn.execute(text("UPDATE receipts SET status = 'verified' WHERE verified"))
+            pending = conn.execute(text("SELECT id FROM receipts WHERE status = 'pending'")).scalars().all()
+            for receipt_id in pending:
+                job_queue.enqueue(VERIFY_RECEIPT_JOB, {"receipt_id": receipt_id}, conn=conn)
+        print(f"✓ 영수증 상태 백필: 검증 대기 {len(pending)}개")
+
+# 가게 위치 공간 인덱스 (R*Tree) - 처음 만들 때 기존 가게 위치로 채움
+if ensure_store_location_index(engine):
+    print("✓ 가게 위치 공간 인덱스 생성")
+
+# 가게/게시글 전문 검색 인덱스 (FTS5) - 새로 만들거나 토크나이저가 바뀌면 기존 데이터로 채움
+rebuilt_fulltext = ensure_fulltext_index(engine)
+if rebuilt_fulltext:
+    print(f"✓ 전문 검색 인덱스 생성: {', '.join(rebuilt_fulltext)}")
 
 # 데이터베이스 연결 테스트 (파일 생성 보장)
 try:
@@ -31,10 +77,45 @@ except Exception as e:
     import traceback
     traceback.print_exc()
 
+async def _shutdown_step(name: str, step):
+    """종료 처리 한 단계 실행 (동기/비동기 함수 모두) - 오류는 기록만 하고 넘어감"""
+    try:
+        result = step()
+        if inspect.isawaitable(result):
+            await result
+    except Exception as e:
+        print(f"⚠️ 종료 처리 오류 ({name}): {e}")
+        traceback.print_exc()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # 조회수 버퍼 플러시 스레드 시작 / 종료 시 남은 조회수 반영
+    view_counts.start()
+    restaurant_catalog.load()
+    # 외부 API(네이버 등) 호출용 공유 연결 풀
+    http_client.start()
+    # AI 채팅 모델 선택 (한 번만, 실패 시 백그라운드 재확인)
+    await gemini_models.start()
+    # 백그라운드 작업(영수증 검증 등) 워커 시작 / 종료 시 실행 중인 작업 마무리
+    job_queue.start()
+    # 인기 게시글 점수 갱신 (새 게시글/좋아요/댓글만 주기적으로 반영)
+    hot_posts.start()
+    yield
+    # 한 단계가 실패해도 남은 반영/정리 작업은 계속 실행
+    await _shutdown_step("작업 큐", job_queue.stop)
+    await _shutdown_step("AI 채팅 모델", gemini_models.stop)
+    await _shutdown_step("외부 API 클라이언트", http_client.close)
+    await _shutdown_step("조회수 반영", view_counts.stop)
+    await _shutdown_step("인기 게시글 점수 반영", hot_posts.stop)
+    # AI 채팅 답변 캐시 적중 기록 반영
+    await _shutdown_step("답변 캐시 적중 기록 반영", answer_cache.flush_touches)
+    await _shutdown_step("비밀번호 해시 프로세스 풀", password_pool.shutdown)
+
 app = FastAPI(
     title="GYEOMCHAE API",
     description="한림대 상권 맵 API",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # CORS 설정
@@ -44,6 +125,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER],
 )
 
 # 라우터 등록
@@ -60,6 +142,6 @@ async def root():
     return {"message": "GYEOMCHAE API"}
 
 @app.get("/api/health")
-async def health_check():
-    return {"status": "healthy"}
+def health_check():
+    return {"status": "healthy", "database": get_database_settings(), "ai_model": gemini_models.status()}
 
@@ -0,0 +1,138 @@
+"""
+AI 채팅 동시 호출 제한 벤치마크 - 가짜 Gemini 서버(동시 처리 한도 초과 시 429) + 실제 uvicorn 서버
+
+한 사용자가 요청을 몰아 보내는 동안 다른 사용자들이 질문하는 상황을 재현해
+제한 없음 / 입장 제어 사용을 비교한다.
+- 응답 종류: 성공, 대기열 거절(503, 즉시), Gemini 429(503)
+- 사용자별 평균 응답 시간, 대기열 길이/대기 시간 히스토그램
+
+실행 (backend 폴더에서):
+    python scripts/bench_ai_chat_admission.py [몰아 보내는 요청 수]
+"""
+import asyncio
+import os
+import socket
+import sys
+import tempfile
+import threading
+import time
+import warnings
+from collections import Counter
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(SCRIPTS_DIR))
+
+from fake_gemini import FakeGemini
+
+UPSTREAM_LIMIT = 8
+LIGHT_USERS = 5
+LIGHT_REQUESTS = 2
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def ask(client, token, number):
+    started = time.perf_counter()
+    response = await client.post(
+        "/api/ai-chat/",
+        json={"message": f"{number}번째 질문: 닭갈비 맛집 추천해줘"},
+        headers={"Authorization": f"Bearer {token}"},
+    )
+    elapsed = time.perf_counter() - started
+    if response.status_code == 200:
+        kind = "성공"
+    elif "한도" in response.json().get("detail", ""):
+        kind = "Gemini 429"
+    elif response.status_code == 503:
+        kind = "대기열 거절"
+    else:
+        kind = f"HTTP {response.status_code}"
+    return kind, elapsed
+
+
+async def spike(client, tokens, burst):
+    heavy = [asyncio.create_task(ask(client, tokens[0], i)) for i in range(burst)]
+    await asyncio.sleep(0.05)
+    light = [
+        asyncio.create_task(ask(client, token, user * 100 + i))
+        for user, token in enumerate(tokens[1:], start=1)
+        for i in range(LIGHT_REQUESTS)
+    ]
+    return await asyncio.gather(*heavy), await asyncio.gather(*light)
+
+
+def report(label, heavy, light, fake):
+    def summary(results):
+        kinds = Counter(kind for kind, _ in results)
+        ok = [elapsed for kind, elapsed in results if kind == "성공"]
+        average = f"{sum(ok) / len(ok) * 1000:6.0f}ms" if ok else "     -"
+        return f"{dict(kinds)} 성공 평균 {average}"
+
+    print(f"\n[{label}] Gemini 최대 동시 호출 {fake.max_active}, 429 응답 {fake.counts['rate_limited']}회")
+    print(f"  몰아 보낸 사용자: {summary(heavy)}")
+    print(f"  다른 사용자들  : {summary(light)}")
+    rejected = [elapsed for kind, elapsed in heavy + light if kind == "대기열 거절"]
+    if rejected:
+        print(f"  대기열 거절 응답 시간 평균 {sum(rejected) / len(rejected) * 1000:.0f}ms")
+
+
+async def run(base_url, burst, fake, chat_admission, tokens):
+    import httpx
+    async with httpx.AsyncClient(base_url=base_url, timeout=120) as client:
+        chat_admission.max_in_flight = 10 ** 6
+        report("제한 없음", *await spike(client, tokens, burst), fake)
+
+        fake.counts.clear()
+        fake.max_active = 0
+        # 통계도 새로 시작 (처리 중인 요청이 없을 때)
+        chat_admission.__init__(max_in_flight=UPSTREAM_LIMIT)
+        report(f"입장 제어 (동시 {UPSTREAM_LIMIT}건)", *await spike(client, tokens, burst), fake)
+        stats = chat_admission.stats()
+        print(f"  대기열 최대 길이 {stats['queue_depth_max']}, 평균 대기 {stats['wait_ms_avg']}ms")
+        print(f"  대기 시간 히스토그램: {stats['wait_ms_histogram']}")
+        print(f"  도착 시 대기열 길이 히스토그램: {stats['queue_depth_histogram']}")
+
+
+def main():
+    burst = int(sys.argv[1]) if len(sys.argv) > 1 else 30
+    warnings.filterwarnings("ignore")
+    fake = FakeGemini(delay=0.5, max_concurrent=UPSTREAM_LIMIT).start()
+    print(f"가짜 Gemini: 응답 {fake.delay * 1000:.0f}ms, 동시 {UPSTREAM_LIMIT}건 초과 시 429")
+    print(f"한 사용자가 {burst}건을 동시에 보내고, 다른 사용자 {LIGHT_USERS}명이 {LIGHT_REQUESTS}건씩 질문")
+
+    # app 모듈 import 전에 가짜 서버/임시 DB 지정 (질문마다 Gemini를 호출하도록 답변 캐시는 끔)
+    os.environ["GEMINI_API_KEY"] = "fake-key"
+    os.environ["GEMINI_API_ENDPOINT"] = fake.url
+    os.environ["AI_CHAT_CACHE_TTL"] = "0"
+    os.environ["DATABASE_FILE"] = os.path.join(tempfile.mkdtemp(prefix="gyeomchae-bench-"), "bench.db")
+
+    import uvicorn
+    from main import app
+    from app.auth import create_access_token
+    from app.llm_admission import chat_admission
+
+    tokens = [
+        create_access_token({"sub": f"bench-user-{uid}", "uid": uid, "role": "user"})
+        for uid in range(LIGHT_USERS + 1)
+    ]
+
+    port = free_port()
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.05)
+    try:
+        asyncio.run(run(f"http://127.0.0.1:{port}", burst, fake, chat_admission, tokens))
+    finally:
+        server.should_exit = True
+        thread.join()
+        fake.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+AI 채팅 답변 캐시 벤치마크 - 가짜 Gemini 서버 사용
+
+자주 들어오는 질문(표현만 조금씩 다른 변형 포함)을 반복해서 보내
+캐시 적중률, 평균 응답 시간, 절약한 생성 시간, Gemini 호출 수를 비교한다.
+마지막으로 카탈로그 버전이 바뀌면 캐시가 무효화되는지 확인한다.
+
+실행 (backend 폴더에서):
+    python scripts/bench_ai_chat_cache.py [요청 수]
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+import warnings
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(SCRIPTS_DIR))
+
+from fake_gemini import FakeGemini
+
+# 같은 질문의 여러 표현
+QUESTIONS = [
+    ["카페 추천", "카페 추천해줘", "카페 추천해줘!", "카페 어디야?", "한림대 근처 카페 추천해주세요"],
+    ["술집 추천해줘", "술집 추천", "술집 어디", "술집 어디 있어?", "술집 추천 좀"],
+    ["치킨집 어디", "치킨집 어디야", "치킨집 추천해줘", "치킨집 어디에 있어요?"],
+    ["혼밥하기 좋은 곳", "혼밥하기 좋은 곳 추천", "혼밥하기 좋은곳 어디야?"],
+    ["닭갈비 맛집 추천해줘", "닭갈비 맛집", "닭갈비 어디가 맛있어?"],
+    ["24시간 하는 식당", "24시간 하는 식당 있어?", "24시간하는 식당 추천"],
+]
+
+
+def run(client, messages):
+    latencies = []
+    for text in messages:
+        started = time.perf_counter()
+        response = client.post("/api/ai-chat/", json={"message": text})
+        assert response.status_code == 200, response.text
+        latencies.append(time.perf_counter() - started)
+    return latencies
+
+
+def main():
+    requests = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    warnings.filterwarnings("ignore")
+    fake = FakeGemini(delay=0.3).start()
+
+    # app 모듈 import 전에 가짜 서버/임시 DB 지정
+    os.environ["GEMINI_API_KEY"] = "fake-key"
+    os.environ["GEMINI_API_ENDPOINT"] = fake.url
+    os.environ["DATABASE_FILE"] = os.path.join(tempfile.mkdtemp(prefix="gyeomchae-bench-"), "bench.db")
+
+    from fastapi.testclient import TestClient
+    from main import app
+    from app.answer_cache import answer_cache, normalize_question
+    from app.catalog import restaurant_catalog
+    from app.chat_prompt import rewrite_user_message
+    from app.database import SessionLocal
+    from app.models import Store, StoreCategory
+
+    random.seed(42)
+    messages = [random.choice(random.choice(QUESTIONS)) for _ in range(requests)]
+    print(f"가짜 Gemini 응답 지연 {fake.delay * 1000:.0f}ms, 요청 {requests}건 (질문 {len(QUESTIONS)}종, 표현 {sum(map(len, QUESTIONS))}가지)")
+    print("정규화 예시:", ", ".join(f"{q!r} -> {normalize_question(rewrite_user_message(q))!r}" for q in QUESTIONS[2][:3]))
+
+    with TestClient(app) as client:
+        answer_cache.ttl = 0
+        started = time.perf_counter()
+        baseline = run(client, messages)
+        baseline_total = time.perf_counter() - started
+        baseline_calls = fake.counts["generate"]
+
+        answer_cache.ttl = 86400
+        started = time.perf_counter()
+        cached = run(client, messages)
+        cached_total = time.perf_counter() - started
+        cached_calls = fake.counts["generate"] - baseline_calls
+        stats = answer_cache.stats()
+
+        print(f"\n{'':<12} {'평균 응답':>10} {'전체':>8} {'Gemini 호출':>12}")
+        print(f"{'캐시 없음':<12} {sum(baseline) / len(baseline) * 1000:8.1f}ms {baseline_total:7.2f}s {baseline_calls:>12}")
+        print(f"{'캐시 사용':<12} {sum(cached) / len(cached) * 1000:8.1f}ms {cached_total:7.2f}s {cached_calls:>12}")
+        print(f"\n캐시 통계: {stats}")
+
+        # 카탈로그 버전이 바뀌면 같은 질문도 다시 생성
+        version_before = restaurant_catalog.snapshot().version
+        db = SessionLocal()
+        db.add(Store(name="캐시 무효화 테스트 가게", category=StoreCategory.CAFE))
+        db.commit()
+        db.close()
+        restaurant_catalog.mark_stores_changed()
+        calls_before = fake.counts["generate"]
+        run(client, [messages[0]])
+        version_after = restaurant_catalog.snapshot().version
+        print(f"\n카탈로그 버전 {version_before} -> {version_after}, 같은 질문 재요청 시 Gemini 호출 {fake.counts['generate'] - calls_before}회")
+
+    fake.shutdown()
+
+
+if __name__ == "__main__":
+    main()
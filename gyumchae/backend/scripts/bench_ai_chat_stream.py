@@ -0,0 +1,121 @@
+"""
+AI 채팅 응답 시간 벤치마크 - 가짜 Gemini 서버 + 실제 uvicorn 서버
+
+1) 첫 바이트까지 시간(TTFB): POST /api/ai-chat/ (전체 생성 후 응답) vs POST /api/ai-chat/stream (SSE)
+2) 이벤트 루프 막힘: 채팅 요청이 처리되는 동안 GET / 응답 시간의 최댓값
+   - 기존 방식(async 핸들러 안에서 동기 generate_content 호출)을 재현한 경로와 비교
+
+실행 (backend 폴더에서):
+    python scripts/bench_ai_chat_stream.py [동시 채팅 수]
+"""
+import asyncio
+import os
+import socket
+import sys
+import tempfile
+import threading
+import time
+import warnings
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(SCRIPTS_DIR))
+
+from fake_gemini import FakeGemini
+
+REPLY = "**우성닭갈비** 추천드려요 😊\n\n- 위치: 한림대 후문\n- 메뉴: 닭갈비, 막국수\n\n" * 4
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def probe_loop(client, stop):
+    """GET / 를 계속 보내 가장 오래 걸린 응답 시간 기록"""
+    worst = 0.0
+    while not stop.is_set():
+        started = time.perf_counter()
+        await client.get("/")
+        worst = max(worst, time.perf_counter() - started)
+        await asyncio.sleep(0.02)
+    return worst
+
+
+async def measure(client, path, concurrency):
+    stop = asyncio.Event()
+    probe = asyncio.create_task(probe_loop(client, stop))
+
+    async def one():
+        started = time.perf_counter()
+        first = None
+        async with client.stream("POST", path, json={"message": "닭갈비 맛집 추천해줘"}) as response:
+            assert response.status_code == 200, await response.aread()
+            async for _ in response.aiter_raw():
+                if first is None:
+                    first = time.perf_counter() - started
+        return first, time.perf_counter() - started
+
+    results = await asyncio.gather(*(one() for _ in range(concurrency)))
+    stop.set()
+    worst_probe = await probe
+    ttfb = sum(r[0] for r in results) / len(results)
+    total = sum(r[1] for r in results) / len(results)
+    return ttfb, total, worst_probe
+
+
+async def run(base_url, concurrency):
+    import httpx
+    async with httpx.AsyncClient(base_url=base_url, timeout=60) as client:
+        print(f"{'경로':<28} {'TTFB':>8} {'전체':>8} {'GET / 최대 지연':>14}")
+        for label, path in [
+            ("기존 방식 (루프에서 동기 호출)", "/bench/blocking-chat"),
+            ("POST /api/ai-chat/", "/api/ai-chat/"),
+            ("POST /api/ai-chat/stream", "/api/ai-chat/stream"),
+        ]:
+            ttfb, total, worst = await measure(client, path, concurrency)
+            print(f"{label:<28} {ttfb * 1000:6.0f}ms {total * 1000:6.0f}ms {worst * 1000:12.0f}ms")
+
+
+def main():
+    concurrency = int(sys.argv[1]) if len(sys.argv) > 1 else 4
+    warnings.filterwarnings("ignore")
+    fake = FakeGemini(reply=REPLY, delay=0.3, chunk_size=12, chunk_delay=0.05).start()
+    print(f"가짜 Gemini: 첫 청크 {fake.delay * 1000:.0f}ms, 이후 {len(fake.chunks()) - 1}청크 x {fake.chunk_delay * 1000:.0f}ms, 동시 채팅 {concurrency}건")
+
+    # app 모듈 import 전에 가짜 서버/임시 DB 지정
+    os.environ["GEMINI_API_KEY"] = "fake-key"
+    os.environ["GEMINI_API_ENDPOINT"] = fake.url
+    os.environ["DATABASE_FILE"] = os.path.join(tempfile.mkdtemp(prefix="gyeomchae-bench-"), "bench.db")
+    # 답변 캐시를 끄고 매번 생성 경로를 측정 (켜 두면 두 번째 요청부터 캐시 적중)
+    os.environ["AI_CHAT_CACHE_TTL"] = "0"
+
+    import uvicorn
+    from main import app
+    from app.chat_prompt import build_chat_prompt
+    from app.gemini import GENERATION_CONFIG, gemini_models
+    from app.schemas import ChatMessage, ChatResponse
+
+    @app.post("/bench/blocking-chat", response_model=ChatResponse)
+    async def blocking_chat(message: ChatMessage):
+        # 변경 전 chat 핸들러와 같은 호출 방식 (이벤트 루프에서 동기 호출)
+        model = gemini_models.get_model()
+        response = model.generate_content(build_chat_prompt(message.message), generation_config=GENERATION_CONFIG)
+        return ChatResponse(response=response.text)
+
+    port = free_port()
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.05)
+    try:
+        asyncio.run(run(f"http://127.0.0.1:{port}", concurrency))
+    finally:
+        server.should_exit = True
+        thread.join()
+        fake.shutdown()
+
+
+if __name__ == "__main__":
+    main()
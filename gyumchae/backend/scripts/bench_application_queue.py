@@ -0,0 +1,203 @@
+"""
+업체 신청 심사 대기열 벤치마크 - 임시 DB에 가상 신청을 넣고 관리자 API로 심사
+
+1) 대기열 조회: 인덱스 없이(NOT INDEXED, 전체 스캔 + 정렬) vs (status, created_at, id) 인덱스 키셋
+   앞쪽 페이지와 OFFSET으로 뒤쪽 페이지를 읽을 때를 비교
+2) 승인: 신청마다 요청 1번 vs POST /api/applications/approve 일괄 (한 트랜잭션, 가게 생성 포함)
+3) 대기열 전체를 키셋으로 넘기며 페이지마다 일괄 승인/거절 - 누락/중복 없이 모두 처리되는지 확인
+
+실행 (backend 폴더에서):
+    python scripts/bench_application_queue.py [신청 수] [대기 중 신청 수]
+"""
+import asyncio
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(SCRIPTS_DIR))
+
+BATCH = 20_000
+PAGE = 200
+REPEAT = 20
+SINGLE_APPROVALS = 200
+
+
+def seed(total, pending):
+    from sqlalchemy import insert
+    from app.auth import create_access_token
+    from app.database import engine
+    from app.models import Application, User
+
+    random.seed(42)
+    started_at = datetime(2026, 3, 1)
+    with engine.begin() as conn:
+        conn.execute(insert(User), [
+            {"username": "admin", "hashed_password": "-", "role": "ADMIN"},
+            {"username": "owner", "hashed_password": "-", "role": "USER"},
+        ])
+        # 오래된 신청은 대부분 심사 완료, 최근(모집 기간) 신청이 대기 중
+        for start in range(0, total, BATCH):
+            rows = []
+            for index in range(start, min(total, start + BATCH)):
+                reviewed = index < total - pending
+                rows.append({
+                    "user_id": 2,
+                    "name": f"신청자{index}",
+                    "company_name": f"업체{index}",
+                    "tax_id": f"{index:010d}",
+                    "phone_number": "010-0000-0000",
+                    "email": f"owner{index}@example.com",
+                    "title": f"가게{index}",
+                    "address": "강원특별자치도 춘천시 한림대학길 1",
+                    "status": random.choice(["approved", "rejected"]) if reviewed else "pending",
+                    "created_at": (started_at + timedelta(seconds=index * 30 + random.randint(0, 20))),
+                })
+            conn.execute(insert(Application), rows)
+    return create_access_token({"sub": "admin", "uid": 1, "role": "admin"})
+
+
+def measure(func, repeat=REPEAT):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+
+def keyset_queue(conn, created_at, last_id):
+    from sqlalchemy import text
+    return conn.execute(text(
+        "SELECT * FROM applications WHERE status = 'pending' AND (created_at, id) > (:created_at, :id) "
+        "ORDER BY created_at, id LIMIT :limit"
+    ), {"created_at": created_at, "id": last_id, "limit": PAGE}).all()
+
+
+def scan_queue(conn, offset, indexed):
+    from sqlalchemy import text
+    hint = "" if indexed else "NOT INDEXED"
+    return conn.execute(text(
+        f"SELECT * FROM applications {hint} WHERE status = 'pending' ORDER BY created_at, id LIMIT :limit OFFSET :offset"
+    ), {"limit": PAGE, "offset": offset}).all()
+
+
+async def run(total, pending):
+    import httpx
+    from sqlalchemy import func, select, text
+    from app.catalog import restaurant_catalog
+    from app.database import engine
+    from app.models import Application, Store
+    from main import app
+
+    started = time.perf_counter()
+    token = seed(total, pending)
+    print(f"\n신청 {total:,}개 (대기 중 {pending:,}개) 등록: {time.perf_counter() - started:.1f}s")
+    headers = {"Authorization": f"Bearer {token}"}
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        async def queue_page(cursor=None, status="pending"):
+            params = {"status": status, "limit": PAGE}
+            if cursor:
+                params["cursor"] = cursor
+            response = await client.get("/api/applications/", params=params, headers=headers)
+            response.raise_for_status()
+            return response.json(), response.headers.get("x-next-cursor")
+
+        # 1) 대기열 조회
+        deep = pending - PAGE
+        with engine.connect() as conn:
+            plan = conn.execute(text(
+                "EXPLAIN QUERY PLAN SELECT * FROM applications WHERE status = 'pending' "
+                "AND (created_at, id) > ('2026-01-01', 0) ORDER BY created_at, id LIMIT 50"
+            )).all()
+            scan_first = measure(lambda: scan_queue(conn, 0, indexed=False), repeat=5)
+            scan_deep = measure(lambda: scan_queue(conn, deep, indexed=False), repeat=5)
+            index_deep = measure(lambda: scan_queue(conn, deep, indexed=True), repeat=5)
+            # 키셋 커서로 마지막 페이지 직전 위치
+            last = scan_queue(conn, deep - 1, indexed=True)[0]
+            keyset_deep = measure(lambda: keyset_queue(conn, last.created_at, last.id), repeat=5)
+        from app.pagination import encode_cursor
+        deep_cursor = encode_cursor(last.created_at, last.id)
+
+        api_first, api_deep = [], []
+        for _ in range(REPEAT):
+            started = time.perf_counter()
+            await queue_page()
+            api_first.append((time.perf_counter() - started) * 1000)
+            started = time.perf_counter()
+            rows, _ = await queue_page(deep_cursor)
+            api_deep.append((time.perf_counter() - started) * 1000)
+        assert len(rows) == PAGE
+
+        print(f"\n대기열 조회 ({PAGE}개, 중앙값 ms)        {'첫 페이지':>10} {'마지막 페이지':>12}")
+        print(f"{'인덱스 없음 (전체 스캔 + 정렬)':<32} {scan_first:10.1f} {scan_deep:12.1f}")
+        print(f"{'인덱스 + OFFSET':<34} {'-':>10} {index_deep:12.1f}")
+        print(f"{'인덱스 + 키셋':<36} {'-':>10} {keyset_deep:12.1f}")
+        print(f"{'인덱스 + 키셋 (API 전체 응답)':<32} {statistics.median(api_first):10.1f} {statistics.median(api_deep):12.1f}")
+        print(f"쿼리 계획: {plan[0][-1]}")
+
+        # 2) 승인 - 신청마다 요청 vs 일괄
+        rows, cursor = await queue_page()
+        one_by_one = [row["id"] for row in rows[:SINGLE_APPROVALS]]
+        started = time.perf_counter()
+        for application_id in one_by_one:
+            (await client.post("/api/applications/approve", json={"ids": [application_id]}, headers=headers)).raise_for_status()
+        single_s = time.perf_counter() - started
+        rows, cursor = await queue_page()
+        bulk_ids = [row["id"] for row in rows]
+        started = time.perf_counter()
+        result = (await client.post("/api/applications/approve", json={"ids": bulk_ids}, headers=headers)).json()
+        bulk_s = time.perf_counter() - started
+        assert result["processed"] == sorted(bulk_ids) and len(result["store_ids"]) == len(bulk_ids)
+        print(f"\n승인 {len(one_by_one)}개 - 신청마다 요청: {single_s * 1000:.0f}ms ({single_s / len(one_by_one) * 1000:.1f}ms/건), "
+              f"일괄 {len(bulk_ids)}개: {bulk_s * 1000:.0f}ms ({bulk_s / len(bulk_ids) * 1000:.2f}ms/건)")
+
+        # 3) 남은 대기열을 키셋으로 넘기며 페이지마다 절반 승인 / 절반 거절
+        started = time.perf_counter()
+        approved = rejected = pages = 0
+        cursor = None
+        while True:
+            rows, cursor = await queue_page(cursor)
+            if not rows:
+                break
+            ids = [row["id"] for row in rows]
+            half = len(ids) // 2
+            approved += len((await client.post("/api/applications/approve", json={"ids": ids[:half]}, headers=headers)).json()["processed"])
+            rejected += len((await client.post("/api/applications/reject", json={"ids": ids[half:], "reason": "정보 부족"}, headers=headers)).json()["processed"])
+            pages += 1
+            if cursor is None:
+                break
+        triage_s = time.perf_counter() - started
+        remaining, _ = await queue_page()
+
+    with engine.connect() as conn:
+        counts = dict(conn.execute(select(Application.status, func.count()).group_by(Application.status)).all())
+        stores = conn.execute(select(func.count()).select_from(Store)).scalar()
+        linked = conn.execute(select(func.count()).where(Application.store_id.is_not(None))).scalar()
+    catalog_stores = sum(1 for restaurant in restaurant_catalog.snapshot().find(query="가게") if restaurant.store_id is not None)
+    total_approved = len(one_by_one) + len(bulk_ids) + approved
+    print(f"\n대기열 나머지 {approved + rejected:,}개를 {pages}페이지로 심사 (승인 {approved:,} / 거절 {rejected:,}): "
+          f"{triage_s:.1f}s ({(approved + rejected) / triage_s:,.0f}건/s)")
+    print(f"남은 대기 신청 {len(remaining)}개, 상태별 {counts}")
+    print(f"승인으로 만든 가게 {stores:,}개 (신청에 연결 {linked:,}개, 카탈로그 반영 {catalog_stores:,}개)")
+    assert not remaining and approved + rejected + len(one_by_one) + len(bulk_ids) == pending
+    assert stores == linked == total_approved == catalog_stores
+
+
+def main():
+    total = int(sys.argv[1]) if len(sys.argv) > 1 else 300_000
+    pending = int(sys.argv[2]) if len(sys.argv) > 2 else 20_000
+    # app 모듈 import 전에 임시 DB 지정 (WAL 등 production 설정)
+    os.environ["DATABASE_FILE"] = os.path.join(tempfile.mkdtemp(prefix="gyeomchae-bench-"), "bench.db")
+    os.environ.setdefault("DATABASE_PROFILE", "production")
+    asyncio.run(run(total, pending))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+커뮤니티 피드 SQL 쿼리 수 회귀 벤치마크
+
+임시 SQLite DB에 게시글/좋아요를 채운 뒤 GET /api/community/posts 요청 하나가
+실행하는 SQL 문 개수를 센다. 페이지 크기와 무관하게 쿼리 수가 일정해야 한다.
+
+실행 (backend 폴더에서):
+    python scripts/bench_feed_queries.py
+"""
+import os
+import sys
+import tempfile
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+# app 모듈 import 전에 임시 DB 경로 지정
+TMP_DIR = tempfile.mkdtemp(prefix="gyeomchae-bench-")
+os.environ["DATABASE_FILE"] = os.path.join(TMP_DIR, "bench.db")
+
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+from main import app
+from app.auth import create_access_token, get_password_hash, token_claims
+from app.counters import reconcile_post_counters
+from app.database import SessionLocal, engine
+from app.models import Post, PostLike, User
+
+PAGE_SIZES = [1, 20, 100]
+# 게시글 조회 1 + 사용자 좋아요 여부 1 (좋아요 수는 posts.like_count, 사용자는 토큰 클레임)
+MAX_QUERIES_PER_REQUEST = 2
+
+
+def seed(num_posts=200, num_users=30):
+    db = SessionLocal()
+    try:
+        hashed = get_password_hash("benchmark")
+        users = [User(username=f"bench{i}", hashed_password=hashed) for i in range(num_users)]
+        db.add_all(users)
+        db.flush()
+        posts = [Post(title=f"게시글 {i}", content="내용", author_id=users[i % num_users].id) for i in range(num_posts)]
+        db.add_all(posts)
+        db.flush()
+        likes = []
+        for i, post in enumerate(posts):
+            for user in users[: i % num_users]:
+                likes.append(PostLike(post_id=post.id, user_id=user.id))
+        db.add_all(likes)
+        db.commit()
+        reconcile_post_counters(db)
+        return token_claims(users[-1])
+    finally:
+        db.close()
+
+
+class StatementCounter:
+    def __init__(self):
+        self.count = 0
+        self.users_queries = 0
+
+    def __call__(self, conn, cursor, statement, parameters, context, executemany):
+        self.count += 1
+        if "FROM users" in statement:
+            self.users_queries += 1
+
+
+def main():
+    token = create_access_token(seed())
+    client = TestClient(app)
+    counter = StatementCounter()
+    event.listen(engine, "before_cursor_execute", counter)
+
+    failed = False
+    for authenticated in (False, True):
+        headers = {"Authorization": f"Bearer {token}"} if authenticated else {}
+        label = "로그인" if authenticated else "비로그인"
+        for page_size in PAGE_SIZES:
+            counter.count = 0
+            counter.users_queries = 0
+            started = time.perf_counter()
+            response = client.get("/api/community/posts", params={"limit": page_size}, headers=headers)
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            response.raise_for_status()
+            ok = counter.count <= MAX_QUERIES_PER_REQUEST and counter.users_queries == 0
+            status = "OK" if ok else "FAIL"
+            failed = failed or status == "FAIL"
+            print(f"[{status}] {label} limit={page_size:<4} 게시글 {len(response.json()):<4} SQL {counter.count:<3} {elapsed_ms:.1f}ms")
+
+    event.remove(engine, "before_cursor_execute", counter)
+    if failed:
+        print(f"피드 요청당 SQL 문이 {MAX_QUERIES_PER_REQUEST}개를 넘었거나 users 테이블을 조회했습니다.")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
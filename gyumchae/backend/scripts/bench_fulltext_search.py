@@ -0,0 +1,148 @@
+"""
+게시글 전문 검색 벤치마크 - 임시 DB에 가상 게시글을 넣고 FTS5 검색과 LIKE 검색 비교
+
+1) LIKE: posts.title/content LIKE '%검색어%' (전체 스캔, 최신순 20개)
+2) FTS5: app.fulltext.search_posts (관련도순 / 최신순 20개, 게시글 조회와 하이라이트 포함)
+게시글은 트리거로 전문 검색 인덱스에 들어가며, 두 방식의 최신순 결과가 같은지도 확인한다.
+2글자 이하 단어는 trigram 대신 단어 인덱스(posts_fts_words)로 찾는다 (자주 나오는 단어, 드문 단어 모두 확인).
+
+실행 (backend 폴더에서):
+    python scripts/bench_fulltext_search.py [게시글 수]
+"""
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(SCRIPTS_DIR))
+
+REPEAT = 20
+LIMIT = 20
+BATCH = 20_000
+# 자주 나오는 단어 (앞쪽일수록 자주)
+COMMON_WORDS = [
+    "닭갈비", "막국수", "카페", "맛집", "후기", "추천", "학식", "분위기", "가성비", "점심",
+    "저녁", "술집", "디저트", "라떼", "치킨", "떡볶이", "한림대", "후문", "정문", "배달",
+]
+SYLLABLES = "가나다라마바사아자차카타파하거너더러머버서어저처커터퍼허고노도로모보소오조초코토포호"
+# 드문 2글자 단어 (SYLLABLES에 없는 글자라 다른 단어 안에 나오지 않음 - LIKE 결과와 그대로 비교 가능)
+RARE_SHORT_WORD = "짬뽕"
+
+
+def make_vocabulary(size=20_000):
+    random.seed(1)
+    rare = {"".join(random.choice(SYLLABLES) for _ in range(3)) for _ in range(size)}
+    vocabulary = COMMON_WORDS + sorted(rare - set(COMMON_WORDS))
+    vocabulary.insert(len(vocabulary) // 2 + 1, RARE_SHORT_WORD)
+    weights = [1 / (rank + 1) for rank in range(len(vocabulary))]  # Zipf 분포
+    return vocabulary, weights
+
+
+def seed(engine, count, vocabulary, weights):
+    from sqlalchemy import text
+    random.seed(42)
+    insert = text(
+        "INSERT INTO posts (title, content, category, author_id, view_count, like_count, comment_count, created_at) "
+        "VALUES (:title, :content, :category, 1, 0, 0, 0, CURRENT_TIMESTAMP)"
+    )
+    categories = ["ALL", "CAFE", "RESTAURANT", "BAR", "ETC"]
+    for start in range(0, count, BATCH):
+        rows = []
+        for _ in range(min(BATCH, count - start)):
+            words = random.choices(vocabulary, weights, k=24)
+            rows.append({
+                "title": " ".join(words[:4]),
+                "content": " ".join(word + random.choice(["", "", "가", "를", "에서", "도"]) for word in words[4:]),
+                "category": random.choice(categories),
+            })
+        with engine.begin() as conn:
+            conn.execute(insert, rows)
+
+
+def measure(func, repeat=REPEAT):
+    timings, result = [], None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func()
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings), max(timings), result
+
+
+def like_search(db, terms, limit=LIMIT):
+    from sqlalchemy import text
+    conditions, params = [], {"limit": limit}
+    for index, term in enumerate(terms):
+        params[f"t{index}"] = f"%{term}%"
+        conditions.append(f"(title LIKE :t{index} OR content LIKE :t{index})")
+    sql = f"SELECT id FROM posts WHERE {' AND '.join(conditions)} ORDER BY id DESC LIMIT :limit"
+    return [row[0] for row in db.execute(text(sql), params)]
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    # app 모듈 import 전에 임시 DB 지정 (WAL 등 production 설정)
+    os.environ["DATABASE_FILE"] = os.path.join(tempfile.mkdtemp(prefix="gyeomchae-bench-"), "bench.db")
+    os.environ.setdefault("DATABASE_PROFILE", "production")
+    import main  # noqa: F401 (테이블/전문 검색 인덱스 생성)
+    from sqlalchemy import text
+    from app.database import DATABASE_FILE, SessionLocal, engine
+    from app.fulltext import WORD_INDEX_SUFFIX, parse_query, search_posts
+
+    vocabulary, weights = make_vocabulary()
+    started = time.perf_counter()
+    seed(engine, count, vocabulary, weights)
+    elapsed = time.perf_counter() - started
+    print(f"\n가상 게시글 {count:,}개 등록 (트리거로 전문 검색 인덱스 갱신 포함): {elapsed:.1f}s "
+          f"({count / elapsed:,.0f}개/s), DB 크기 {os.path.getsize(DATABASE_FILE) / 1024 ** 2:,.0f}MB")
+
+    rare = vocabulary[len(vocabulary) // 2]
+    queries = [
+        (f"드문 단어 ({rare})", rare),
+        ("자주 나오는 단어 (닭갈비)", "닭갈비"),
+        ("두 단어 (닭갈비 막국수)", "닭갈비 막국수"),
+        (f"자주 + 드문 (분위기 {rare})", f"분위기 {rare}"),
+        ("짧은 단어 (카페, 단어 인덱스)", "카페"),
+        (f"드문 짧은 단어 ({RARE_SHORT_WORD}, 단어 인덱스)", RARE_SHORT_WORD),
+        (f"자주 + 짧은 단어 (닭갈비 {RARE_SHORT_WORD})", f"닭갈비 {RARE_SHORT_WORD}"),
+    ]
+    db = SessionLocal()
+    try:
+        with engine.connect() as conn:
+            for label, q in queries:
+                query = parse_query(q)
+                indexes = [("posts_fts", query.match), ("posts_fts" + WORD_INDEX_SUFFIX, query.word_match)]
+                conditions = [f"id IN (SELECT rowid FROM {fts} WHERE {fts} MATCH :{fts})" for fts, match in indexes if match]
+                matches = conn.execute(
+                    text(f"SELECT count(*) FROM posts WHERE {' AND '.join(conditions)}"),
+                    {fts: match for fts, match in indexes if match},
+                ).scalar()
+                print(f"  {label}: 일치 {matches}개")
+
+        print(f"\n{'검색 (20개, 중앙값/최대 ms)':<40} {'LIKE 최신순':>16} {'FTS 최신순':>16} {'FTS 관련도순':>16}")
+        for label, q in queries:
+            like_median, like_max, like_ids = measure(lambda: like_search(db, q.split()), repeat=3)
+            recent_median, recent_max, (_, recent_hits) = measure(lambda: search_posts(db, q, sort="recent", limit=LIMIT))
+            relevance_median, relevance_max, _ = measure(lambda: search_posts(db, q, sort="relevance", limit=LIMIT))
+            assert like_ids == [hit.id for hit in recent_hits], f"{label} 결과 불일치"
+            print(f"{label:<40} {like_median:8.1f}/{like_max:7.1f} {recent_median:8.1f}/{recent_max:7.1f} "
+                  f"{relevance_median:8.1f}/{relevance_max:7.1f}")
+
+        # 커서로 다음 페이지 (관련도순 3페이지)
+        from app.fulltext import search_cursor
+        cursor, seen = None, []
+        started = time.perf_counter()
+        for _ in range(3):
+            _, hits = search_posts(db, "닭갈비 막국수", sort="relevance", cursor=cursor, limit=LIMIT)
+            seen += [hit.id for hit in hits]
+            cursor = search_cursor(hits[-1])
+        assert len(seen) == len(set(seen)) == 3 * LIMIT
+        print(f"\n관련도순 커서 3페이지: {(time.perf_counter() - started) * 1000:.1f}ms (중복 없음)")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+"""
+일괄 좌표 변환(POST /api/map/geocode) 벤치마크 - stub 제공자 사용 (외부 호출 없음)
+
+지도 검색 결과 10개마다 주소를 좌표로 바꾸는 상황을 흉내 낸다.
+1) 기존 방식: 결과마다 한 번씩 순서대로 변환 (검색할 때마다 같은 주소도 다시 변환)
+2) 일괄 변환: 검색마다 요청 1번 (중복 제거, 가게/캐시 테이블 조회, 나머지는 동시에 변환)
+좌표가 없던 가게에 좌표가 저장되고 반경 검색(공간 인덱스)에 나타나는지도 확인한다.
+
+실행 (backend 폴더에서):
+    python scripts/bench_geocode.py [검색 수]
+"""
+import asyncio
+import os
+import random
+import sys
+import tempfile
+import time
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(SCRIPTS_DIR))
+
+PROVIDER_DELAY = 0.05  # 외부 API 응답 시간 가정(초)
+RESULTS_PER_SEARCH = 10
+ADDRESS_POOL = 60
+STORES = 20
+
+
+def make_addresses():
+    return [f"강원특별자치도 춘천시 한림대학길 {number}" for number in range(1, ADDRESS_POOL + 1)]
+
+
+def seed_stores(addresses):
+    from app.database import SessionLocal
+    from app.models import Store, StoreCategory
+    db = SessionLocal()
+    try:
+        for index, address in enumerate(addresses[:STORES]):
+            # 절반은 좌표가 이미 있는 가게, 절반은 주소만 있는 가게
+            located = index % 2 == 0
+            db.add(Store(
+                name=f"가게 {index}",
+                category=StoreCategory.RESTAURANT,
+                address=address,
+                latitude=37.88 + index * 0.0001 if located else None,
+                longitude=127.73 + index * 0.0001 if located else None,
+            ))
+        db.commit()
+    finally:
+        db.close()
+
+
+def make_searches(addresses, count):
+    random.seed(42)
+    searches = []
+    for _ in range(count):
+        items = random.sample(addresses, RESULTS_PER_SEARCH)
+        # 검색 결과처럼 강조 태그/공백이 섞인 주소와 같은 검색 안의 중복 주소
+        items[0] = items[0].replace("춘천시", "<b>춘천시</b>")
+        items[-1] = items[1]
+        searches.append(items)
+    return searches
+
+
+async def run(count):
+    import httpx
+    from app.geocoding import StubGeocoder, clean_address, geocoder
+    from main import app
+
+    addresses = make_addresses()
+    seed_stores(addresses)
+    # 좌표 변환은 로그인 필요 - 일반 사용자 토큰으로 요청
+    from sqlalchemy import insert
+    from app.auth import create_access_token
+    from app.database import engine
+    from app.models import User
+    with engine.begin() as conn:
+        conn.execute(insert(User).values(username="bench", hashed_password="-", role="USER"))
+    token = create_access_token({"sub": "bench", "uid": 1, "role": "user"})
+    searches = make_searches(addresses, count)
+
+    # 1) 기존 방식 - 결과마다 순서대로 변환
+    sequential = StubGeocoder(delay=PROVIDER_DELAY)
+    started = time.perf_counter()
+    for items in searches:
+        for address in items:
+            await sequential.geocode(clean_address(address))
+    sequential_s = time.perf_counter() - started
+
+    # 2) 일괄 변환
+    geocoder.provider.delay = PROVIDER_DELAY
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test",
+                                 headers={"Authorization": f"Bearer {token}"}) as client:
+        async def geocode(items):
+            response = await client.post("/api/map/geocode", json={"addresses": items})
+            response.raise_for_status()
+            return response.json()
+
+        started = time.perf_counter()
+        first_results = [await geocode(items) for items in searches]
+        batch_s = time.perf_counter() - started
+        calls_after_first = geocoder.provider.calls
+        stats = geocoder.stats()
+
+        # 같은 검색을 다시 -> 외부 호출 없이 가게/캐시 테이블에서
+        started = time.perf_counter()
+        second_results = [await geocode(items) for items in searches]
+        repeat_s = time.perf_counter() - started
+        assert geocoder.provider.calls == calls_after_first, "다시 검색할 때 외부 호출이 발생했습니다"
+        for first, second in zip(first_results, second_results):
+            assert [(r["latitude"], r["longitude"]) for r in first] == [(r["latitude"], r["longitude"]) for r in second]
+
+        # 여러 요청이 새 주소를 동시에 변환하면 주소마다 한 번만 호출
+        fresh = [f"강원특별자치도 춘천시 새주소 {number}" for number in range(RESULTS_PER_SEARCH)]
+        await asyncio.gather(*(geocode(fresh) for _ in range(5)))
+        assert geocoder.provider.calls == calls_after_first + len(fresh)
+
+        # 좌표가 없던 가게에 좌표가 저장되고 반경 검색에 나타나는지
+        located = (await geocode([addresses[1]]))[0]
+        assert located["source"] == "store", located
+        response = await client.get(
+            "/api/stores/nearby",
+            params={"lat": located["latitude"], "lng": located["longitude"], "radius": 10},
+        )
+        assert "가게 1" in [store["name"] for store in response.json()]
+        coalesced = geocoder.stats()["coalesced"]
+
+    total = count * RESULTS_PER_SEARCH
+    print(f"\n검색 {count}번 x 결과 {RESULTS_PER_SEARCH}개 (주소 {ADDRESS_POOL}종, 가게 {STORES}개 중 절반은 좌표 있음)")
+    print(f"외부 API 응답 시간 가정: {PROVIDER_DELAY * 1000:.0f}ms\n")
+    print(f"{'방식':<28} {'외부 호출':>8} {'전체 시간':>10} {'검색당':>9}")
+    print(f"{'기존 (결과마다 순서대로)':<28} {sequential.calls:8d} {sequential_s:9.2f}s {sequential_s / count * 1000:7.0f}ms")
+    print(f"{'일괄 변환 (처음)':<28} {calls_after_first:8d} {batch_s:9.2f}s {batch_s / count * 1000:7.0f}ms")
+    print(f"{'일괄 변환 (다시 검색)':<28} {0:8d} {repeat_s:9.2f}s {repeat_s / count * 1000:7.0f}ms")
+    print(f"\n처음 검색 - 요청 주소 {total}개 중 중복 {stats['duplicates']}개, 가게 테이블 {stats['store_hits']}개, "
+          f"캐시 {stats['cache_hits']}개, 외부 호출 {stats['provider_calls']}개")
+    print(f"새 주소 {RESULTS_PER_SEARCH}개를 5개 요청이 동시에 변환 - 외부 호출 {RESULTS_PER_SEARCH}번 (병합 {coalesced}개)")
+    print(f"좌표를 저장한 가게: {stats['stores_updated']}개 (반경 검색에 표시 확인)")
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 30
+    # app 모듈 import 전에 임시 DB / stub 제공자 지정
+    os.environ["DATABASE_FILE"] = os.path.join(tempfile.mkdtemp(prefix="gyeomchae-bench-"), "bench.db")
+    os.environ["GEOCODE_PROVIDER"] = "stub"
+    # 같은 사용자가 연속으로 검색하므로 분당 변환 제한은 끔
+    os.environ["GEOCODE_RATE_LIMIT"] = str(10 ** 9)
+    asyncio.run(run(count))
+
+
+if __name__ == "__main__":
+    main()
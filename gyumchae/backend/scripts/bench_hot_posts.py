@@ -0,0 +1,197 @@
+"""
+인기 게시글(sort=hot) 벤치마크 - 임시 DB에 가상 게시글/좋아요/댓글을 넣고 비교
+
+1) 요청마다 계산: 게시글마다 좋아요/댓글 수를 세고 시간 감쇠 점수로 정렬 (HN 방식, 전체 게시글 스캔)
+2) 미리 계산한 점수 테이블(post_hot_scores) 인덱스로 한 페이지 - GET /api/community/posts?sort=hot
+3) 갱신 비용: 같은 양의 새 활동(좋아요/댓글/조회/새 글)을 반영하는 시간이 전체 게시글 수와 무관한지 확인
+
+실행 (backend 폴더에서):
+    python scripts/bench_hot_posts.py [게시글 수] [늘릴 배수]
+"""
+import asyncio
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(SCRIPTS_DIR))
+
+USERS = 1000
+BATCH = 50_000
+LIKES_PER_POST = 2
+COMMENTS_PER_POST = 0.5
+DAYS = 60
+PAGE = 20
+REPEAT = 20
+# 갱신 한 번 사이의 새 활동
+BURST_LIKES = 2000
+BURST_COMMENTS = 500
+BURST_POSTS = 50
+BURST_VIEWS = 3000
+# 새 활동이 몰리는 최근 게시글 수 (게시글 수가 달라도 같은 양의 활동)
+BURST_RECENT_POSTS = 2000
+
+NAIVE_HOT_SQL = """
+    SELECT posts.id,
+           (1 + 3 * (SELECT COUNT(*) FROM post_likes WHERE post_likes.post_id = posts.id)
+              + 5 * (SELECT COUNT(*) FROM comments WHERE comments.post_id = posts.id)
+              + 0.1 * COALESCE(posts.view_count, 0))
+           / ((julianday(:now) - julianday(posts.created_at)) * 24 + 2)
+           / ((julianday(:now) - julianday(posts.created_at)) * 24 + 2) AS hot
+    FROM posts ORDER BY hot DESC, posts.id DESC LIMIT :limit
+"""
+
+
+def insert_rows(conn, model, rows):
+    from sqlalchemy import insert
+    for start in range(0, len(rows), BATCH):
+        conn.execute(insert(model), rows[start:start + BATCH])
+
+
+def seed_posts(count, start, end, first_id):
+    """count개 게시글과 좋아요/댓글 (start ~ end 사이 시각)"""
+    from app.database import engine
+    from app.models import Comment, Post, PostLike
+    span = (end - start).total_seconds()
+    posts, likes, comments = [], [], []
+    for offset in range(count):
+        created_at = start + timedelta(seconds=span * offset / count)
+        posts.append({
+            "title": f"게시글 {first_id + offset}", "content": "내용", "category": random.choice(["CAFE", "RESTAURANT", "BAR", "ETC"]),
+            "author_id": random.randint(1, USERS), "view_count": int(random.paretovariate(1.5) * 10), "created_at": created_at,
+        })
+        remaining = max(1.0, (end - created_at).total_seconds())
+        # 활동은 일부 게시글에 몰림
+        weight = random.paretovariate(1.2)
+        for _ in range(int(LIKES_PER_POST * weight * random.random())):
+            likes.append({"post_id": first_id + offset, "user_id": random.randint(1, USERS),
+                          "created_at": created_at + timedelta(seconds=remaining * random.random() ** 3)})
+        for _ in range(int(COMMENTS_PER_POST * weight * random.random())):
+            comments.append({"post_id": first_id + offset, "author_id": random.randint(1, USERS), "content": "댓글",
+                             "created_at": created_at + timedelta(seconds=remaining * random.random() ** 3)})
+    likes.sort(key=lambda row: row["created_at"])
+    comments.sort(key=lambda row: row["created_at"])
+    with engine.begin() as conn:
+        insert_rows(conn, Post, posts)
+        insert_rows(conn, PostLike, likes)
+        insert_rows(conn, Comment, comments)
+    return len(likes), len(comments)
+
+
+def activity_burst(total_posts, now):
+    """최근 게시글 위주로 새 좋아요/댓글/게시글 + 조회수 플러시 - 플러시(점수 반영 포함) 시간 반환"""
+    from app.database import engine
+    from app.models import Comment, Post, PostLike
+    from app.view_counter import view_counts
+    pick = lambda: total_posts - int(random.random() ** 2 * min(total_posts - 1, BURST_RECENT_POSTS))
+    with engine.begin() as conn:
+        insert_rows(conn, PostLike, [{"post_id": pick(), "user_id": random.randint(1, USERS), "created_at": now}
+                                     for _ in range(BURST_LIKES)])
+        insert_rows(conn, Comment, [{"post_id": pick(), "author_id": 1, "content": "댓글", "created_at": now}
+                                    for _ in range(BURST_COMMENTS)])
+        insert_rows(conn, Post, [{"title": "새 글", "content": "내용", "category": "CAFE", "author_id": 1, "view_count": 0,
+                                  "created_at": now} for _ in range(BURST_POSTS)])
+    for _ in range(BURST_VIEWS):
+        view_counts.increment(Post, pick())
+    started = time.perf_counter()
+    view_counts.flush()
+    return time.perf_counter() - started
+
+
+def median_ms(func):
+    timings = []
+    for _ in range(REPEAT):
+        started = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+
+async def measure_api(total_posts):
+    import httpx
+    from sqlalchemy import text
+    from app.database import engine
+    from main import app
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        async def page(**params):
+            started = time.perf_counter()
+            response = await client.get("/api/community/posts", params={"limit": PAGE, **params})
+            response.raise_for_status()
+            return (time.perf_counter() - started) * 1000, response
+
+        hot = [(await page(sort="hot"))[0] for _ in range(REPEAT)]
+        recent = [(await page())[0] for _ in range(REPEAT)]
+        cafe = [(await page(sort="hot", category="CAFE"))[0] for _ in range(REPEAT)]
+        _, first = await page(sort="hot")
+        deep = [(await page(sort="hot", cursor=first.headers["x-next-cursor"]))[0] for _ in range(REPEAT)]
+
+    now = datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S")
+    with engine.connect() as conn:
+        naive = median_ms(lambda: conn.execute(text(NAIVE_HOT_SQL), {"now": now, "limit": PAGE}).all())
+        plan = conn.execute(text(
+            "EXPLAIN QUERY PLAN SELECT posts.id FROM posts JOIN post_hot_scores ON post_hot_scores.post_id = posts.id "
+            "ORDER BY post_hot_scores.score DESC, post_hot_scores.post_id DESC LIMIT 20"
+        )).all()
+    print(f"\n게시글 {total_posts:,}개 - 한 페이지({PAGE}개) 응답 시간 중앙값")
+    print(f"  요청마다 계산 (SQL만, 전체 스캔)       {naive:8.1f}ms")
+    print(f"  sort=hot (API 전체 응답)              {statistics.median(hot):8.1f}ms")
+    print(f"  sort=hot&category=CAFE                {statistics.median(cafe):8.1f}ms")
+    print(f"  sort=hot 다음 페이지 (커서)           {statistics.median(deep):8.1f}ms")
+    print(f"  sort=recent (기존 최신순)             {statistics.median(recent):8.1f}ms")
+    print(f"  쿼리 계획: {' / '.join(row[-1] for row in plan)}")
+
+
+def main():
+    total = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    grow = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    # app 모듈 import 전에 임시 DB 지정 (WAL 등 production 설정)
+    os.environ["DATABASE_FILE"] = os.path.join(tempfile.mkdtemp(prefix="gyeomchae-bench-"), "bench.db")
+    os.environ.setdefault("DATABASE_PROFILE", "production")
+    import main as server  # noqa: F401 (테이블 생성)
+    from app.database import engine
+    from app.hot_posts import hot_posts
+    from app.models import User
+
+    random.seed(42)
+    with engine.begin() as conn:
+        insert_rows(conn, User, [{"username": f"user{i}", "hashed_password": "-", "role": "USER"} for i in range(USERS)])
+    now = datetime.utcnow().replace(microsecond=0)
+    started = time.perf_counter()
+    likes, comments = seed_posts(total, now - timedelta(days=DAYS), now, 1)
+    print(f"\n게시글 {total:,}개, 좋아요 {likes:,}개, 댓글 {comments:,}개 등록: {time.perf_counter() - started:.1f}s")
+
+    result = hot_posts.refresh()
+    print(f"점수 테이블 처음 만들기: {result['seconds']:.1f}s ({result})")
+    asyncio.run(measure_api(total))
+
+    burst = f"좋아요 {BURST_LIKES:,} + 댓글 {BURST_COMMENTS:,} + 새 글 {BURST_POSTS} + 조회 {BURST_VIEWS:,}"
+    print(f"\n새 활동 반영 시간 ({burst})")
+    rows = []
+    posts = total
+    for size in (total, total * grow):
+        if size > posts:
+            # 게시글을 늘리고 한 번 반영해 둔 뒤 같은 양의 새 활동으로 다시 측정
+            seed_posts(size - posts, now - timedelta(days=DAYS), now, posts + 1)
+            hot_posts.refresh()
+            posts = size
+        refreshes, flushes = [], []
+        for _ in range(5):
+            flushes.append(activity_burst(posts, datetime.utcnow()) * 1000)
+            posts += BURST_POSTS
+            result = hot_posts.refresh()
+            refreshes.append(result["seconds"] * 1000)
+        rows.append((posts, statistics.median(refreshes), statistics.median(flushes), result["scored_posts"]))
+    for posts, refresh_ms, flush_ms, scored in rows:
+        print(f"  게시글 {posts:>10,}개: 갱신 {refresh_ms:6.1f}ms (점수를 갱신한 게시글 {scored:,}개), "
+              f"조회수 플러시(점수 반영 포함) {flush_ms:6.1f}ms")
+    asyncio.run(measure_api(posts))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+"""
+외부 API 호출 벤치마크 - 요청마다 새 클라이언트 vs 공유 연결 풀
+
+로컬 TLS 목 서버(자체 서명 인증서)를 띄우고 같은 요청을
+1) 요청마다 httpx.AsyncClient를 새로 만드는 방식 (기존 map.py)
+2) 공유 OutboundHTTPClient (keep-alive 연결 재사용)
+으로 보내 처리 시간과 서버가 받은 TCP 연결 수를 비교한다.
+목 서버는 HTTP/1.1만 지원하므로 HTTP/2 다중화 효과는 포함되지 않는다.
+
+실행 (backend 폴더에서):
+    python scripts/bench_http_client.py [요청 수] [동시 요청 수]
+"""
+import asyncio
+import datetime
+import ipaddress
+import os
+import ssl
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+class MockUpstreamHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive 허용
+    connections = 0
+
+    def setup(self):
+        MockUpstreamHandler.connections += 1
+        super().setup()
+
+    def do_GET(self):
+        body = b'{"total": 1, "items": [{"title": "mock"}]}'
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def write_self_signed_cert(directory):
+    from cryptography import x509
+    from cryptography.hazmat.primitives import hashes, serialization
+    from cryptography.hazmat.primitives.asymmetric import ec
+    from cryptography.x509.oid import NameOID
+
+    key = ec.generate_private_key(ec.SECP256R1())
+    name = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, "127.0.0.1")])
+    now = datetime.datetime.now(datetime.timezone.utc)
+    cert = (
+        x509.CertificateBuilder()
+        .subject_name(name)
+        .issuer_name(name)
+        .public_key(key.public_key())
+        .serial_number(x509.random_serial_number())
+        .not_valid_before(now - datetime.timedelta(days=1))
+        .not_valid_after(now + datetime.timedelta(days=1))
+        .add_extension(x509.SubjectAlternativeName([x509.IPAddress(ipaddress.ip_address("127.0.0.1"))]), critical=False)
+        .add_extension(x509.BasicConstraints(ca=True, path_length=None), critical=True)
+        .sign(key, hashes.SHA256())
+    )
+    cert_file = os.path.join(directory, "mock.crt")
+    key_file = os.path.join(directory, "mock.key")
+    with open(cert_file, "wb") as f:
+        f.write(cert.public_bytes(serialization.Encoding.PEM))
+    with open(key_file, "wb") as f:
+        f.write(key.private_bytes(serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption()))
+    return cert_file, key_file
+
+
+def start_mock_upstream(cert_file, key_file):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), MockUpstreamHandler)
+    context = ssl.create_default_context(ssl.Purpose.CLIENT_AUTH)
+    context.load_cert_chain(cert_file, key_file)
+    server.socket = context.wrap_socket(server.socket, server_side=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+async def run_batches(send, total, concurrency):
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one():
+        async with semaphore:
+            await send()
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(total)))
+    return time.perf_counter() - started
+
+
+async def run(url, total, concurrency):
+    import httpx
+    from app.http_client import OutboundHTTPClient
+
+    async def per_request_client():
+        async with httpx.AsyncClient() as client:
+            response = await client.get(url, timeout=10.0)
+            response.raise_for_status()
+
+    shared = OutboundHTTPClient(per_host_limit=concurrency).start()
+
+    async def shared_client():
+        response = await shared.get(url)
+        response.raise_for_status()
+
+    results = []
+    for label, send in [("요청마다 새 클라이언트", per_request_client), ("공유 연결 풀", shared_client)]:
+        await send()  # 워밍업
+        MockUpstreamHandler.connections = 0
+        elapsed = await run_batches(send, total, concurrency)
+        results.append((label, elapsed, MockUpstreamHandler.connections))
+    await shared.close()
+    return results
+
+
+def main():
+    total = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+    concurrency = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+    tmp_dir = tempfile.mkdtemp(prefix="gyeomchae-bench-")
+    cert_file, key_file = write_self_signed_cert(tmp_dir)
+    # httpx가 자체 서명 인증서를 신뢰하도록 지정
+    os.environ["SSL_CERT_FILE"] = cert_file
+    server = start_mock_upstream(cert_file, key_file)
+    url = f"https://127.0.0.1:{server.server_port}/v1/search/local.json"
+    try:
+        results = asyncio.run(run(url, total, concurrency))
+    finally:
+        server.shutdown()
+
+    print(f"TLS 목 서버, 요청 {total}건, 동시 {concurrency}건")
+    baseline = results[0][1]
+    for label, elapsed, connections in results:
+        print(f"{label:<14} {elapsed * 1000:8.0f}ms  {total / elapsed:7.0f} 요청/초  TCP 연결 {connections:>4}개  ({baseline / elapsed:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
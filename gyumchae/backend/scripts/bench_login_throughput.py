@@ -0,0 +1,51 @@
+"""
+로그인(bcrypt 검증) 처리량 벤치마크 - 프로세스 풀 크기별 비교
+
+PasswordHashPool의 워커 수를 1개부터 CPU 코어 수까지 늘려 가며
+동시 로그인 검증을 초당 몇 건 처리하는지 측정한다.
+
+실행 (backend 폴더에서):
+    python scripts/bench_login_throughput.py [동시 요청 수] [bcrypt 라운드]
+"""
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.passwords import PasswordHashPool, get_password_hash
+
+
+async def run(workers, requests, hashed):
+    pool = PasswordHashPool(workers=workers, max_pending=requests)
+    try:
+        # 워커 프로세스 기동 시간은 측정에서 제외
+        await asyncio.gather(*(pool.verify("benchmark", hashed) for _ in range(workers)))
+        started = time.perf_counter()
+        results = await asyncio.gather(*(pool.verify("benchmark", hashed) for _ in range(requests)))
+        elapsed = time.perf_counter() - started
+    finally:
+        pool.shutdown()
+    assert all(results)
+    return requests / elapsed
+
+
+def main():
+    requests = int(sys.argv[1]) if len(sys.argv) > 1 else 64
+    rounds = int(sys.argv[2]) if len(sys.argv) > 2 else 12
+    hashed = get_password_hash("benchmark", rounds)
+    cores = os.cpu_count() or 1
+
+    started = time.perf_counter()
+    get_password_hash("benchmark", rounds)
+    print(f"bcrypt rounds={rounds}: 1회 {((time.perf_counter() - started) * 1000):.0f}ms, CPU 코어 {cores}개, 동시 요청 {requests}건")
+
+    worker_counts = sorted({1, 2, 4, 8, 16, cores} & set(range(1, cores + 1)))
+    for workers in worker_counts:
+        throughput = asyncio.run(run(workers, requests, hashed))
+        print(f"워커 {workers:>2}개: {throughput:6.1f} 로그인/초")
+
+
+if __name__ == "__main__":
+    main()
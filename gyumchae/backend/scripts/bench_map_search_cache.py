@@ -0,0 +1,133 @@
+"""
+네이버 지역 검색 프록시 캐시 검증 - 로컬 스텁 서버 사용
+
+네이버 API 대신 로컬 스텁 HTTP 서버를 띄우고 GET /api/map/search에
+요청을 보내 업스트림 호출 수를 센다.
+- 같은 검색어 동시 요청은 업스트림 1회로 합쳐져야 한다 (single-flight)
+- 공백/대소문자만 다른 검색어는 같은 캐시 항목을 쓴다
+- TTL이 지나면 stale 응답을 바로 주고 백그라운드에서 갱신한다
+- 업스트림이 실패해도 stale 응답을 계속 준다
+
+실행 (backend 폴더에서):
+    python scripts/bench_map_search_cache.py [동시 요청 수]
+"""
+import asyncio
+import json
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+class StubNaverHandler(BaseHTTPRequestHandler):
+    """네이버 지역 검색 응답 형식을 흉내 내는 스텁"""
+    calls = 0
+    delay = 0.2
+    fail = False
+
+    def do_GET(self):
+        StubNaverHandler.calls += 1
+        time.sleep(StubNaverHandler.delay)
+        if StubNaverHandler.fail:
+            self.send_response(503)
+            self.end_headers()
+            self.wfile.write(b'{"errorMessage": "stub failure"}')
+            return
+        query = parse_qs(urlparse(self.path).query)
+        body = json.dumps({
+            "total": 1,
+            "items": [{"title": query["query"][0], "call": StubNaverHandler.calls}],
+        }).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def start_stub():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubNaverHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+async def run(concurrency):
+    import httpx
+    from fastapi import FastAPI
+    from app.naver_search import search_cache
+    from app.routers import map
+
+    app = FastAPI()
+    app.include_router(map.router, prefix="/api/map")
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        async def search(query):
+            response = await client.get("/api/map/search", params={"query": query})
+            response.raise_for_status()
+            return response.json()
+
+        # 1) 동시 같은 요청 -> 업스트림 1회
+        started = time.perf_counter()
+        results = await asyncio.gather(*(search("닭갈비") for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+        assert StubNaverHandler.calls == 1, StubNaverHandler.calls
+        assert all(r == results[0] for r in results)
+        print(f"동시 {concurrency}건 (같은 검색어): 업스트림 {StubNaverHandler.calls}회, {elapsed * 1000:.0f}ms")
+
+        # 2) 정규화된 같은 키 -> 캐시 적중
+        started = time.perf_counter()
+        for query in ["닭갈비", "  닭갈비 ", "닭갈비"]:
+            await search(query)
+        elapsed = time.perf_counter() - started
+        assert StubNaverHandler.calls == 1, StubNaverHandler.calls
+        print(f"캐시 적중 3건: {elapsed * 1000:.1f}ms (업스트림 호출 없음)")
+
+        # 3) TTL 만료 + 느린 업스트림 -> stale 즉시 반환, 백그라운드 갱신
+        await asyncio.sleep(search_cache.ttl + 0.1)
+        StubNaverHandler.delay = 1.0
+        started = time.perf_counter()
+        stale = await search("닭갈비")
+        elapsed = time.perf_counter() - started
+        assert stale == results[0]
+        assert elapsed < StubNaverHandler.delay
+        print(f"stale 응답 (업스트림 {StubNaverHandler.delay:.0f}초 지연 중): {elapsed * 1000:.1f}ms")
+        await asyncio.sleep(StubNaverHandler.delay + 0.3)
+        refreshed = await search("닭갈비")
+        assert refreshed["items"][0]["call"] == 2, refreshed
+        print("백그라운드 갱신 완료: 새 응답으로 교체됨")
+
+        # 4) 업스트림 실패 -> stale 응답 유지
+        await asyncio.sleep(search_cache.ttl + 0.1)
+        StubNaverHandler.delay = 0.0
+        StubNaverHandler.fail = True
+        assert await search("닭갈비") == refreshed
+        await asyncio.sleep(0.3)
+        assert await search("닭갈비") == refreshed
+        print("업스트림 실패 중에도 stale 응답 제공")
+
+        stats = search_cache.stats()
+        print(f"캐시 통계: {stats}")
+
+
+def main():
+    concurrency = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    server = start_stub()
+    # app 모듈 import 전에 스텁 주소/짧은 TTL 지정
+    os.environ["NAVER_SEARCH_URL"] = f"http://127.0.0.1:{server.server_port}/v1/search/local.json"
+    os.environ.setdefault("NAVER_CLIENT_ID", "stub")
+    os.environ.setdefault("NAVER_CLIENT_SECRET", "stub")
+    os.environ["NAVER_SEARCH_CACHE_TTL"] = "0.5"
+    try:
+        asyncio.run(run(concurrency))
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+AI 응답 Markdown 제거 마이크로 벤치마크
+
+기존 chat()의 re.sub 7단계와 app.markdown_filter를 비교한다.
+1) 응답 전체: 골든 코퍼스의 응답 예시(gemini_*) 전체 텍스트
+2) 스트리밍: 같은 응답을 청크(12글자)로 나눠 MarkdownStreamFilter로 처리 vs 청크마다 기존 7단계 적용
+3) Markdown 기호가 없는 일반 문장 청크
+
+실행 (backend 폴더에서):
+    python scripts/bench_markdown_filter.py [반복 수]
+"""
+import os
+import sys
+import timeit
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(SCRIPTS_DIR))
+
+from check_markdown_filter import load_corpus, reference_strip
+
+CHUNK_SIZE = 12
+
+
+def per_call_us(func, number):
+    return min(timeit.repeat(func, number=number, repeat=5)) / number * 1_000_000
+
+
+def main():
+    number = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    from app.markdown_filter import MarkdownStreamFilter, strip_markdown
+
+    responses = [case["input"] for case in load_corpus() if case["name"].startswith("gemini_")]
+    for text in responses:
+        assert strip_markdown(text) == reference_strip(text)
+    chunked = [[text[i:i + CHUNK_SIZE] for i in range(0, len(text), CHUNK_SIZE)] for text in responses]
+    plain = ["한림대 후문 근처에 있는 가게예요. "] * 20
+
+    def stream_filter(chunks):
+        markdown = MarkdownStreamFilter()
+        for chunk in chunks:
+            markdown.feed(chunk)
+        markdown.flush()
+
+    cases = [
+        (f"응답 전체 ({len(responses)}개)",
+         lambda: [reference_strip(text) for text in responses],
+         lambda: [strip_markdown(text) for text in responses]),
+        (f"스트리밍 ({sum(map(len, chunked))}청크)",
+         lambda: [[reference_strip(chunk) for chunk in chunks] for chunks in chunked],
+         lambda: [stream_filter(chunks) for chunks in chunked]),
+        (f"일반 문장 ({len(plain)}청크)",
+         lambda: [reference_strip(chunk) for chunk in plain],
+         lambda: stream_filter(plain)),
+    ]
+    print(f"{'':<22} {'기존 7단계':>12} {'markdown_filter':>16} {'배율':>6}")
+    for label, before, after in cases:
+        before_us = per_call_us(before, number // 10 or 1)
+        after_us = per_call_us(after, number // 10 or 1)
+        print(f"{label:<22} {before_us:10.1f}us {after_us:14.1f}us {before_us / after_us:5.1f}x")
+
+
+if __name__ == "__main__":
+    main()
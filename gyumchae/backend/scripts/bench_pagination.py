@@ -0,0 +1,117 @@
+"""
+커뮤니티 피드 페이지네이션 벤치마크 (offset vs cursor)
+
+임시 SQLite DB에 게시글을 채운 뒤 1페이지와 깊은 페이지의 응답 시간을
+offset(skip) 방식과 cursor(X-Next-Cursor) 방식으로 비교한다.
+커서로 전체를 순회하면서 중복/누락이 없는지도 함께 확인한다.
+
+실행 (backend 폴더에서):
+    python scripts/bench_pagination.py [게시글 수]
+"""
+import os
+import sys
+import tempfile
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+# app 모듈 import 전에 임시 DB 경로 지정
+TMP_DIR = tempfile.mkdtemp(prefix="gyeomchae-bench-")
+os.environ["DATABASE_FILE"] = os.path.join(TMP_DIR, "bench.db")
+
+from fastapi.testclient import TestClient
+from datetime import datetime, timedelta
+from sqlalchemy import text
+
+from main import app
+from app.database import SessionLocal
+from app.models import User
+from app.pagination import NEXT_CURSOR_HEADER
+
+PAGE_SIZE = 20
+DEEP_PAGE = 500
+REPEAT = 20
+
+
+def seed(num_posts):
+    db = SessionLocal()
+    try:
+        user = User(username="bench", hashed_password="-")
+        db.add(user)
+        db.flush()
+        # 3개씩 같은 초에 작성된 것으로 채움 -> (created_at, id) 동률 처리도 검증됨
+        # created_at은 server_default와 같은 'YYYY-MM-DD HH:MM:SS' 문자열로 직접 넣는다
+        started_at = datetime(2024, 3, 1, 9, 0, 0)
+        db.execute(text(
+            "INSERT INTO posts (title, content, category, author_id, view_count, like_count, comment_count, created_at) "
+            "VALUES (:title, '내용', 'ALL', :author_id, 0, 0, 0, :created_at)"
+        ), [
+            {
+                "title": f"게시글 {i}",
+                "author_id": user.id,
+                "created_at": (started_at + timedelta(seconds=i // 3)).strftime("%Y-%m-%d %H:%M:%S"),
+            }
+            for i in range(num_posts)
+        ])
+        db.commit()
+    finally:
+        db.close()
+
+
+def timed_get(client, params):
+    started = time.perf_counter()
+    for _ in range(REPEAT):
+        response = client.get("/api/community/posts", params=params)
+        response.raise_for_status()
+    return (time.perf_counter() - started) * 1000 / REPEAT, response
+
+
+def main():
+    num_posts = int(sys.argv[1]) if len(sys.argv) > 1 else PAGE_SIZE * (DEEP_PAGE + 10)
+    seed(num_posts)
+    client = TestClient(app)
+
+    # 커서로 깊은 페이지까지 순회하며 중복 확인 + 커서 확보
+    seen_ids = set()
+    cursors = {1: None}
+    cursor = None
+    page = 1
+    while page <= DEEP_PAGE:
+        params = {"limit": PAGE_SIZE}
+        if cursor:
+            params["cursor"] = cursor
+        response = client.get("/api/community/posts", params=params)
+        response.raise_for_status()
+        ids = [post["id"] for post in response.json()]
+        if seen_ids.intersection(ids):
+            print(f"✗ {page}페이지에서 중복 게시글 발견")
+            sys.exit(1)
+        seen_ids.update(ids)
+        cursor = response.headers.get(NEXT_CURSOR_HEADER)
+        if not cursor:
+            break
+        page += 1
+        cursors[page] = cursor
+    deep_page = min(DEEP_PAGE, page)
+
+    # 같은 페이지를 offset으로 조회한 결과와 일치해야 함 (누락 없음)
+    _, offset_response = timed_get(client, {"limit": PAGE_SIZE, "skip": (deep_page - 1) * PAGE_SIZE})
+    _, cursor_response = timed_get(client, {"limit": PAGE_SIZE, "cursor": cursors[deep_page]})
+    if offset_response.json() != cursor_response.json():
+        print(f"✗ {deep_page}페이지: cursor 결과가 offset 결과와 다릅니다")
+        sys.exit(1)
+    print(f"✓ 커서 순회: {deep_page}페이지까지 중복 없음, offset 결과와 일치")
+
+    offset_first, _ = timed_get(client, {"limit": PAGE_SIZE})
+    offset_deep, _ = timed_get(client, {"limit": PAGE_SIZE, "skip": (deep_page - 1) * PAGE_SIZE})
+    cursor_first, _ = timed_get(client, {"limit": PAGE_SIZE})
+    cursor_deep, _ = timed_get(client, {"limit": PAGE_SIZE, "cursor": cursors[deep_page]})
+    print(f"offset 1페이지      : {offset_first:.2f}ms")
+    print(f"offset {deep_page}페이지    : {offset_deep:.2f}ms")
+    print(f"cursor 1페이지      : {cursor_first:.2f}ms")
+    print(f"cursor {deep_page}페이지    : {cursor_deep:.2f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,186 @@
+"""
+경품 추첨 동시성 스트레스 테스트 - 임시 DB에서 여러 스레드가 동시에 추첨
+
+1) 단순 방식: 경품별 남은 수량을 읽고 -> 무작위로 고르고 -> 결과 저장 (읽기와 쓰기 사이에 다른 추첨이 끼어듦)
+2) 경품 원장: app.prize_draw.draw_prize (미리 섞어 둔 칸을 UPDATE ... RETURNING 한 문장으로 가져감)
+원장 방식에서 확인하는 것:
+- 경품별 당첨 수 = 등록한 수량 (초과 발급 없음), 한 칸이 두 영수증에 나가지 않음
+- 같은 영수증을 동시에 여러 번 추첨해도 결과는 하나 (같은 결과 반환)
+- 경품이 모두 나간 뒤의 추첨은 409
+
+실행 (backend 폴더에서):
+    python scripts/bench_prize_draw.py [경품 수] [스레드 수]
+"""
+import os
+import random
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(SCRIPTS_DIR))
+
+USERS = 200
+EXTRA_RECEIPTS = 0.2  # 경품 수보다 20% 많은 영수증 (소진 후 409 확인)
+DUPLICATE_RATE = 0.1  # 10%는 같은 영수증으로 동시에 두 번 추첨
+
+
+def prize_plan(total):
+    first, second, third = max(1, total // 1000), max(1, total // 100), max(1, total // 10)
+    return {"1등": first, "2등": second, "3등": third, "꽝": total - first - second - third}
+
+
+def seed(total):
+    from sqlalchemy import insert
+    from app.database import SessionLocal, engine
+    from app.models import Event, Receipt, Store, StoreCategory, User
+    from app.prize_draw import allocate_prizes
+
+    receipts = int(total * (1 + EXTRA_RECEIPTS))
+    with engine.begin() as conn:
+        # 영수증 1..receipts는 단순 방식, 나머지는 경품 원장 추첨용 (영수증 하나는 한 번만 추첨)
+        conn.execute(insert(User), [{"username": f"user{i}", "hashed_password": "-"} for i in range(USERS)])
+        conn.execute(insert(Store).values(name="벤치 가게", category=StoreCategory.RESTAURANT.name, address="춘천시"))
+        conn.execute(insert(Receipt), [
+            {"user_id": owner(i + 1), "store_id": 1, "image_url": f"r{i}.jpg", "amount": 10000,
+             "verified": True, "status": "verified"}
+            for i in range(receipts * 2)
+        ])
+    db = SessionLocal()
+    try:
+        naive_event, ledger_event = Event(title="단순 방식"), Event(title="경품 원장")
+        db.add_all([naive_event, ledger_event])
+        db.flush()
+        allocate_prizes(db.connection(), ledger_event.id, prize_plan(total))
+        db.commit()
+        return naive_event.id, ledger_event.id, receipts
+    finally:
+        db.close()
+
+
+def owner(receipt_id):
+    return (receipt_id - 1) % USERS + 1
+
+
+def naive_draw(event_id, receipt_id, user_id, plan):
+    """남은 수량을 읽고 고른 뒤 저장 - 동시에 실행되면 초과 발급"""
+    from sqlalchemy import func, insert, select
+    from app.database import engine
+    from app.models import EventResult
+    with engine.connect() as conn:
+        issued = dict(conn.execute(
+            select(EventResult.result, func.count()).where(EventResult.event_id == event_id).group_by(EventResult.result)
+        ).all())
+    remaining = [(prize, count - issued.get(prize, 0)) for prize, count in plan.items()]
+    remaining = [(prize, count) for prize, count in remaining if count > 0]
+    if not remaining:
+        return None
+    prize = random.choices([p for p, _ in remaining], [c for _, c in remaining])[0]
+    time.sleep(0)  # 다른 스레드에 양보 (읽기와 쓰기 사이)
+    with engine.begin() as conn:
+        conn.execute(insert(EventResult).values(user_id=user_id, receipt_id=receipt_id, event_id=event_id, result=prize))
+    return prize
+
+
+def run_draws(func, jobs, threads):
+    latencies, outcomes = [], []
+    lock = threading.Lock()
+
+    def one(job):
+        started = time.perf_counter()
+        outcome = func(*job)
+        elapsed = (time.perf_counter() - started) * 1000
+        with lock:
+            latencies.append(elapsed)
+            outcomes.append((job, outcome))
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(threads) as pool:
+        list(pool.map(one, jobs))
+    return time.perf_counter() - started, sorted(latencies), outcomes
+
+
+def main():
+    total = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    threads = int(sys.argv[2]) if len(sys.argv) > 2 else 32
+    # app 모듈 import 전에 임시 DB 지정 (WAL 등 production 설정)
+    os.environ["DATABASE_FILE"] = os.path.join(tempfile.mkdtemp(prefix="gyeomchae-bench-"), "bench.db")
+    os.environ.setdefault("DATABASE_PROFILE", "production")
+    os.environ["DATABASE_POOL_SIZE"] = str(threads)
+    import main  # noqa: F401 (테이블 생성)
+    from fastapi import HTTPException
+    from sqlalchemy import func, select
+    from app.database import engine
+    from app.models import EventResult, PrizeSlot
+    from app.prize_draw import draw_prize
+
+    plan = prize_plan(total)
+    naive_event, ledger_event, receipts = seed(total)
+    print(f"\n경품 {total:,}개 {plan}, 영수증 {receipts:,}개, 스레드 {threads}개\n")
+
+    # 1) 단순 방식 - 영수증 수만큼 (같은 경품 수량)
+    naive_jobs = [(naive_event, receipt_id, owner(receipt_id), plan) for receipt_id in range(1, receipts + 1)]
+    naive_s, _, _ = run_draws(naive_draw, naive_jobs, threads)
+    with engine.connect() as conn:
+        naive_issued = dict(conn.execute(
+            select(EventResult.result, func.count()).where(EventResult.event_id == naive_event).group_by(EventResult.result)
+        ).all())
+    oversold = {prize: naive_issued.get(prize, 0) - count for prize, count in plan.items() if naive_issued.get(prize, 0) > count}
+    print(f"단순 방식: {receipts / naive_s:,.0f}건/s, 발급 {sum(naive_issued.values()):,}개 "
+          f"(등록 {total:,}개) - 초과 발급 {oversold or '없음'}")
+
+    # 2) 경품 원장 - 일부 영수증은 동시에 두 번 추첨
+    random.seed(7)
+    ledger_jobs = [(ledger_event, receipt_id, owner(receipt_id)) for receipt_id in range(receipts + 1, receipts * 2 + 1)]
+    duplicates = random.sample(ledger_jobs, int(receipts * DUPLICATE_RATE))
+    ledger_jobs += duplicates
+    random.shuffle(ledger_jobs)
+
+    def draw(event_id, receipt_id, user_id):
+        try:
+            result, created = draw_prize(event_id, receipt_id, user_id)
+            return (result.result, created)
+        except HTTPException as e:
+            return e.status_code
+
+    ledger_s, latencies, outcomes = run_draws(draw, ledger_jobs, threads)
+    sold_out = sum(1 for _, outcome in outcomes if outcome == 409)
+    created = Counter(outcome[0] for _, outcome in outcomes if isinstance(outcome, tuple) and outcome[1])
+    repeated = sum(1 for _, outcome in outcomes if isinstance(outcome, tuple) and not outcome[1])
+    by_receipt = {}
+    for (_, receipt_id, _), outcome in outcomes:
+        if isinstance(outcome, tuple):
+            by_receipt.setdefault(receipt_id, set()).add(outcome[0])
+
+    with engine.connect() as conn:
+        duplicate_receipts = conn.execute(
+            select(func.count()).select_from(
+                select(EventResult.receipt_id).where(EventResult.event_id == ledger_event)
+                .group_by(EventResult.receipt_id).having(func.count() > 1).subquery()
+            )
+        ).scalar()
+        slot_claims = dict(conn.execute(
+            select(PrizeSlot.prize, func.count(PrizeSlot.receipt_id)).where(PrizeSlot.event_id == ledger_event).group_by(PrizeSlot.prize)
+        ).all())
+        ledger_issued = dict(conn.execute(
+            select(EventResult.result, func.count()).where(EventResult.event_id == ledger_event).group_by(EventResult.result)
+        ).all())
+
+    print(f"경품 원장: {len(ledger_jobs) / ledger_s:,.0f}건/s (추첨 요청 {len(ledger_jobs):,}개, 같은 영수증 동시 요청 {len(duplicates):,}개)")
+    print(f"  응답 시간: 중앙값 {statistics.median(latencies):.1f}ms, p99 {latencies[int(len(latencies) * 0.99) - 1]:.1f}ms")
+    print(f"  새로 추첨 {sum(created.values()):,}개 {dict(created)}")
+    print(f"  이미 추첨한 영수증 -> 처음 결과 반환 {repeated:,}개, 소진 후 409 {sold_out:,}개")
+    print(f"  영수증당 결과 2개 이상: {duplicate_receipts}개, 한 영수증에 서로 다른 결과 응답: "
+          f"{sum(1 for prizes in by_receipt.values() if len(prizes) > 1)}개")
+    assert ledger_issued == slot_claims == dict(created) == plan, (ledger_issued, slot_claims, created, plan)
+    assert duplicate_receipts == 0 and all(len(prizes) == 1 for prizes in by_receipt.values())
+    assert sold_out + repeated + sum(created.values()) == len(ledger_jobs)
+    print("✓ 초과 발급/중복 추첨 없음")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+AI 채팅 프롬프트 크기 비교 - 전체 카탈로그 vs 관련 음식점 검색(top-k)
+
+고정된 질문 목록에 대해 build_chat_prompt가 만드는 프롬프트의 글자 수와
+대략적인 토큰 수, 프롬프트 생성 시간을 비교하고 검색된 음식점을 보여준다.
+검색 열은 토큰 예산과 관계없이 검색을 강제한 결과이고, 실제 요청에서는
+전체 카탈로그가 AI_CHAT_PROMPT_TOKEN_BUDGET을 넘을 때만 검색을 사용한다.
+토큰 수는 추정치다 (한글 1글자 ≈ 1토큰, 그 외 4글자 ≈ 1토큰).
+
+실행 (backend 폴더에서):
+    python scripts/bench_prompt_tokens.py [top_k]
+"""
+import os
+import sys
+import tempfile
+import time
+
+# 빈 임시 DB 사용 (stores 테이블 행 없이 restaurants.json만 사용)
+os.environ.setdefault("DATABASE_FILE", os.path.join(tempfile.mkdtemp(), "bench_prompt.db"))
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.database import Base, engine
+from app.catalog import restaurant_catalog
+from app.chat_prompt import AI_CHAT_PROMPT_TOKEN_BUDGET, build_chat_prompt, estimate_tokens
+from app.retrieval import get_restaurant_index
+
+QUESTIONS = [
+    "치킨 먹고 싶어",
+    "카페 추천해줘",
+    "혼밥하기 좋은 곳 있어?",
+    "술 마시기 좋은 곳 어디야?",
+    "닭갈비 맛집 알려줘",
+    "싸고 양 많은 곳",
+    "디저트 먹을 만한 데",
+    "오늘 점심 뭐 먹지",
+]
+
+def measure(question, snapshot, top_k, repeat=200):
+    # top_k가 있으면 토큰 예산 0으로 검색을 강제
+    prompt = build_chat_prompt(question, snapshot, top_k, token_budget=0)
+    started = time.perf_counter()
+    for _ in range(repeat):
+        build_chat_prompt(question, snapshot, top_k, token_budget=0)
+    elapsed_us = (time.perf_counter() - started) / repeat * 1_000_000
+    return len(prompt), estimate_tokens(prompt), elapsed_us
+
+def main():
+    top_k = int(sys.argv[1]) if len(sys.argv) > 1 else 8
+    Base.metadata.create_all(bind=engine)
+    snapshot = restaurant_catalog.load()
+    print(f"카탈로그 {len(snapshot.restaurants)}개 (version={snapshot.version}), top_k={top_k}")
+    print(f"{'질문':<22} {'전체(글자/토큰)':>16} {'검색(글자/토큰)':>16} {'절감':>6} {'생성시간(us)':>14}")
+
+    total_full = total_retrieved = 0
+    shown = set()
+    for question in QUESTIONS:
+        full_chars, full_tokens, full_us = measure(question, snapshot, 0)
+        chars, tokens, us = measure(question, snapshot, top_k)
+        total_full += full_tokens
+        total_retrieved += tokens
+        saving = 100 * (1 - tokens / full_tokens)
+        print(f"{question:<22} {full_chars:>7}/{full_tokens:<8} {chars:>7}/{tokens:<8} {saving:5.0f}% {full_us:6.0f}/{us:<6.0f}")
+        names = [r.name for r in get_restaurant_index(snapshot).search(question, top_k)]
+        shown.update(names)
+        print(f"    → {', '.join(names)}")
+
+    print(f"평균 토큰 (추정): 전체 {total_full // len(QUESTIONS)}, 검색 {total_retrieved // len(QUESTIONS)}")
+    print(f"검색 결과에 한 번이라도 나온 가게: {len(shown)}/{len(snapshot.restaurants)}개")
+    mode = "검색" if total_full // len(QUESTIONS) > AI_CHAT_PROMPT_TOKEN_BUDGET else "전체 카탈로그"
+    print(f"AI_CHAT_PROMPT_TOKEN_BUDGET={AI_CHAT_PROMPT_TOKEN_BUDGET} 기준 실제 요청: {mode}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+"""
+영수증 제출(POST /api/events/receipts) 벤치마크 - 임시 DB/업로드 폴더 사용
+
+이벤트 기간처럼 많은 영수증이 동시에 올라오는 상황을 흉내 낸다.
+- 업로드는 이미지를 받는 대로 디스크에 쓰고 바로 202(pending)를 반환 (검증 시간과 무관)
+- 검증은 SQLite 작업 큐(jobs)를 워커 스레드가 처리 (검증 1건에 RECEIPT_VERIFY_DELAY 소요 가정)
+- 업로드 중 파이썬 메모리 사용량(최대)이 동시 업로드 전체 크기보다 훨씬 작은지 확인
+- 같은 이미지 중복 제출/잘못된 금액은 rejected, 나머지는 verified
+- 워커를 멈춘 채 제출한 영수증도 작업 큐에 남아 있다가 워커를 다시 시작하면 처리되는지 확인
+
+실행 (backend 폴더에서):
+    python scripts/bench_receipt_upload.py [영수증 수] [이미지 크기(KB)]
+"""
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(SCRIPTS_DIR))
+
+CONCURRENCY = 50
+CHUNK = 64 * 1024
+VERIFY_DELAY = 0.05  # 검증 1건 처리 시간 가정(초)
+WORKERS = 4
+DUPLICATE_EVERY = 10  # 10건마다 1건은 앞 영수증과 같은 이미지
+INVALID_AMOUNT_EVERY = 25
+
+
+def seed():
+    from app.auth import create_access_token, token_claims
+    from app.database import SessionLocal
+    from app.models import Store, StoreCategory, User
+    db = SessionLocal()
+    try:
+        user = User(username="bench-user", email="bench@example.com", hashed_password="-")
+        store = Store(name="벤치 가게", category=StoreCategory.RESTAURANT, address="춘천시 한림대학길 1")
+        db.add_all([user, store])
+        db.commit()
+        return create_access_token(token_claims(user)), store.id
+    finally:
+        db.close()
+
+
+def image_bytes(number, size):
+    """JPEG 헤더 + 영수증마다 다른 내용"""
+    header = b"\xff\xd8\xff\xe0" + number.to_bytes(8, "big")
+    return header + os.urandom(1024) * ((size - len(header)) // 1024 + 1)
+
+
+async def chunks(data):
+    for start in range(0, len(data), CHUNK):
+        yield data[start:start + CHUNK]
+        await asyncio.sleep(0)
+
+
+def wait_for_queue(job_queue, timeout=300):
+    started = time.perf_counter()
+    while time.perf_counter() - started < timeout:
+        jobs = job_queue.stats()["jobs"]
+        if jobs["queued"] == 0 and jobs["running"] == 0:
+            return time.perf_counter() - started
+        time.sleep(0.05)
+    raise TimeoutError("작업 큐가 비워지지 않았습니다")
+
+
+async def run(count, size):
+    import httpx
+    from sqlalchemy import func
+    from app.database import SessionLocal
+    from app.job_queue import job_queue
+    from app.models import Receipt
+    from app.receipts import RECEIPT_UPLOAD_DIR
+    from main import app
+
+    token, store_id = seed()
+    headers = {"Authorization": f"Bearer {token}", "Content-Type": "image/jpeg"}
+    images = [image_bytes(number, size) for number in range(count)]
+    for number in range(DUPLICATE_EVERY - 1, count, DUPLICATE_EVERY):
+        images[number] = images[number - 1]
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test", timeout=60) as client:
+        semaphore = asyncio.Semaphore(CONCURRENCY)
+        latencies = []
+
+        async def submit(number):
+            amount = -1 if number % INVALID_AMOUNT_EVERY == 0 else 8000 + number
+            async with semaphore:
+                started = time.perf_counter()
+                response = await client.post(
+                    "/api/events/receipts",
+                    params={"store_id": store_id, "amount": amount},
+                    content=chunks(images[number]),
+                    headers=headers,
+                )
+                latencies.append((time.perf_counter() - started) * 1000)
+            assert response.status_code == 202, response.text
+            assert response.json()["status"] == "pending"
+            return response.headers["location"]
+
+        # 1) 워커가 검증하는 동안 동시 업로드
+        job_queue.start()
+        started = time.perf_counter()
+        locations = await asyncio.gather(*(submit(number) for number in range(count)))
+        upload_s = time.perf_counter() - started
+        upload_latencies = sorted(latencies)
+        drain_s = await asyncio.to_thread(wait_for_queue, job_queue)
+
+        statuses = {}
+        for location in locations[:20]:
+            body = (await client.get(location, headers=headers)).json()
+            statuses[body["status"]] = statuses.get(body["status"], 0) + 1
+        oversized = await client.post(
+            "/api/events/receipts", params={"store_id": store_id},
+            content=b"\xff\xd8\xff" + b"0" * (11 * 1024 * 1024), headers=headers,
+        )
+        not_image = await client.post(
+            "/api/events/receipts", params={"store_id": store_id}, content=b"hello" * 100, headers=headers,
+        )
+
+        # 2) 워커를 멈춘 채 제출 -> 작업이 큐에 남아 있다가 재시작 후 처리
+        #    (tracemalloc이 느리게 만들므로 메모리는 이 단계에서만 측정)
+        job_queue.stop()
+        restart_count = min(count, 100)
+        tracemalloc.start()
+        await asyncio.gather(*(submit(number) for number in range(restart_count)))
+        _, peak_memory = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        queued = job_queue.stats()["jobs"]["queued"]
+        job_queue.start()
+        await asyncio.to_thread(wait_for_queue, job_queue)
+        stats = await asyncio.to_thread(job_queue.stats)
+        job_queue.stop()
+
+    db = SessionLocal()
+    try:
+        by_status = dict(db.query(Receipt.status, func.count()).group_by(Receipt.status).all())
+    finally:
+        db.close()
+    leftovers = os.listdir(os.path.join(RECEIPT_UPLOAD_DIR, "tmp"))
+
+    total_mb = count * size / 1024
+    print(f"\n영수증 {count}개 x {size}KB (전체 {total_mb:,.0f}MB), 동시 업로드 {CONCURRENCY}개, "
+          f"워커 {WORKERS}개, 검증 1건 {VERIFY_DELAY * 1000:.0f}ms 가정\n")
+    print(f"업로드 전체: {upload_s:.2f}s ({count / upload_s:,.0f}건/s, {total_mb / upload_s:,.0f}MB/s)")
+    print(f"업로드 응답 시간: 중앙값 {statistics.median(upload_latencies):.0f}ms, "
+          f"p95 {upload_latencies[int(len(upload_latencies) * 0.95) - 1]:.0f}ms (검증을 기다리지 않음)")
+    print(f"업로드 완료 후 검증 큐가 비워지기까지: {drain_s:.2f}s")
+    print(f"처음 20건 상태 조회: {statuses}")
+    print(f"10MB 초과 이미지: {oversized.status_code}, 이미지가 아닌 본문: {not_image.status_code}, "
+          f"남은 임시 파일: {len(leftovers)}개")
+    print(f"\n워커 정지 중 제출 {restart_count}건 -> 큐에 남은 작업 {queued}개, 재시작 후 모두 처리")
+    print(f"이때 업로드 중 최대 메모리(tracemalloc): {peak_memory / 1024 ** 2:.1f}MB "
+          f"(동시 업로드 {CONCURRENCY}개를 메모리에 모으면 {CONCURRENCY * size / 1024:,.0f}MB)")
+    print(f"영수증 상태: {by_status}")
+    print(f"작업 큐: {stats['jobs']}")
+    assert oversized.status_code == 413 and not_image.status_code == 415 and not leftovers
+    assert queued == restart_count
+    assert by_status.get("pending", 0) == 0 and by_status.get("failed", 0) == 0
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    size = int(sys.argv[2]) if len(sys.argv) > 2 else 512
+    # app 모듈 import 전에 임시 DB / 업로드 폴더 지정
+    workdir = tempfile.mkdtemp(prefix="gyeomchae-bench-")
+    os.environ["DATABASE_FILE"] = os.path.join(workdir, "bench.db")
+    os.environ.setdefault("DATABASE_PROFILE", "production")
+    os.environ["RECEIPT_UPLOAD_DIR"] = os.path.join(workdir, "receipts")
+    os.environ["RECEIPT_VERIFY_DELAY"] = str(VERIFY_DELAY)
+    os.environ["JOB_WORKERS"] = str(WORKERS)
+    os.environ["JOB_POLL_INTERVAL"] = "0.2"
+    asyncio.run(run(count, size))
+
+
+if __name__ == "__main__":
+    main()
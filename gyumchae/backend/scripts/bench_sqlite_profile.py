@@ -0,0 +1,100 @@
+"""
+SQLite 엔진 프로파일 동시 읽기/쓰기 부하 테스트 (default vs production)
+
+프로파일마다 새 임시 DB를 만들고, 읽기 스레드(피드 조회)와 쓰기 스레드(좋아요 토글)를
+동시에 돌려 초당 처리량과 'database is locked' 오류 수를 비교한다.
+
+실행 (backend 폴더에서):
+    python scripts/bench_sqlite_profile.py [읽기 스레드 수] [쓰기 스레드 수] [초]
+"""
+import os
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import insert, text
+from sqlalchemy.exc import OperationalError
+
+from app.database import Base, create_database_engine
+from app.models import Post, PostCategory, User
+
+NUM_POSTS = 5000
+NUM_USERS = 50
+
+
+def seed(engine):
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        conn.execute(insert(User), [{"username": f"load{i}", "hashed_password": "-"} for i in range(NUM_USERS)])
+        conn.execute(insert(Post), [
+            {"title": f"게시글 {i}", "content": "내용", "category": PostCategory.ALL, "author_id": i % NUM_USERS + 1}
+            for i in range(NUM_POSTS)
+        ])
+
+
+def reader(engine, stop, stats, index):
+    while not stop.is_set():
+        try:
+            with engine.connect() as conn:
+                conn.execute(text(
+                    "SELECT id, title, like_count FROM posts ORDER BY created_at DESC, id DESC LIMIT 20 OFFSET :skip"
+                ), {"skip": (index * 97) % NUM_POSTS}).fetchall()
+            stats["reads"][index] += 1
+        except OperationalError:
+            stats["errors"][index] += 1
+
+
+def writer(engine, stop, stats, index):
+    counter = 0
+    while not stop.is_set():
+        counter += 1
+        post_id = (index * 7919 + counter) % NUM_POSTS + 1
+        try:
+            with engine.begin() as conn:
+                conn.execute(text(
+                    "INSERT INTO post_likes (post_id, user_id) VALUES (:post_id, :user_id)"
+                ), {"post_id": post_id, "user_id": index % NUM_USERS + 1})
+                conn.execute(text(
+                    "UPDATE posts SET like_count = like_count + 1 WHERE id = :post_id"
+                ), {"post_id": post_id})
+            stats["writes"][index] += 1
+        except OperationalError:
+            stats["errors"][index] += 1
+
+
+def run(profile, num_readers, num_writers, duration):
+    db_path = os.path.join(tempfile.mkdtemp(prefix="gyeomchae-load-"), "load.db")
+    engine = create_database_engine(f"sqlite:///{db_path}", profile)
+    seed(engine)
+
+    workers = num_readers + num_writers
+    stats = {"reads": [0] * workers, "writes": [0] * workers, "errors": [0] * workers}
+    stop = threading.Event()
+    threads = [threading.Thread(target=reader, args=(engine, stop, stats, i)) for i in range(num_readers)]
+    threads += [threading.Thread(target=writer, args=(engine, stop, stats, num_readers + i)) for i in range(num_writers)]
+    for thread in threads:
+        thread.start()
+    time.sleep(duration)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    engine.dispose()
+
+    reads, writes, errors = sum(stats["reads"]), sum(stats["writes"]), sum(stats["errors"])
+    print(f"{profile:<10} 읽기 {reads / duration:>8.0f}/s  쓰기 {writes / duration:>7.0f}/s  잠금 오류 {errors}")
+
+
+def main():
+    num_readers = int(sys.argv[1]) if len(sys.argv) > 1 else 8
+    num_writers = int(sys.argv[2]) if len(sys.argv) > 2 else 2
+    duration = float(sys.argv[3]) if len(sys.argv) > 3 else 5
+    print(f"읽기 스레드 {num_readers}, 쓰기 스레드 {num_writers}, {duration:.0f}초")
+    for profile in ("default", "production"):
+        run(profile, num_readers, num_writers, duration)
+
+
+if __name__ == "__main__":
+    main()
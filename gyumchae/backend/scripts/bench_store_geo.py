@@ -0,0 +1,153 @@
+"""
+가게 위치 검색 벤치마크 - 임시 DB에 가상 가게를 넣고 반경/화면 영역 검색 비교
+
+1) 공간 인덱스 없음: stores 전체에서 위도/경도 범위 조건으로 후보를 찾는 방식 (테이블 전체 스캔)
+2) R*Tree 공간 인덱스 (app.geo)
+두 방식의 결과가 같은지 확인하고, 트리거로 인덱스가 갱신되는지(위치 변경/비활성화/삭제)도 확인한다.
+
+실행 (backend 폴더에서):
+    python scripts/bench_store_geo.py [가게 수]
+"""
+import heapq
+import os
+import random
+import sys
+import tempfile
+import time
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(SCRIPTS_DIR))
+
+# 한림대 기준 좌표
+CENTER = (37.8863, 127.7357)
+SPREAD = 0.15  # 가상 가게 분포 범위 (도, 약 ±16km)
+QUERIES = 200
+
+
+def seed(engine, count):
+    from sqlalchemy import insert
+    from app.models import Store, StoreCategory
+    random.seed(42)
+    categories = list(StoreCategory)
+    rows = [
+        {
+            "name": f"가상 가게 {i}",
+            "category": random.choice(categories),
+            "latitude": CENTER[0] + random.uniform(-SPREAD, SPREAD),
+            "longitude": CENTER[1] + random.uniform(-SPREAD, SPREAD),
+            "rating": 0.0,
+            "view_count": 0,
+            "is_active": random.random() > 0.05,
+        }
+        for i in range(count)
+    ]
+    with engine.begin() as conn:
+        conn.execute(insert(Store), rows)
+
+
+def scan_query(db, bounds, lat, lng, category, limit, radius_m=None):
+    """공간 인덱스 없이 같은 조건으로 조회 (위도/경도 범위 조건 + 전체 스캔 후 거리순 정렬)"""
+    from sqlalchemy import select
+    from app.geo import haversine_m
+    from app.models import Store
+    south, west, north, east = bounds
+    query = (
+        select(Store.id, Store.latitude, Store.longitude)
+        .where(Store.latitude.between(south, north), Store.longitude.between(west, east))
+        .where(Store.is_active == True)
+    )
+    if category is not None:
+        query = query.where(Store.category == category)
+    candidates = []
+    for store_id, store_lat, store_lng in db.execute(query):
+        distance = haversine_m(lat, lng, store_lat, store_lng)
+        if radius_m is None or distance <= radius_m:
+            candidates.append((distance, store_id))
+    nearest = [store_id for _, store_id in heapq.nsmallest(limit, candidates)]
+    # 응답에 필요한 가게 정보 조회 (R*Tree 쪽과 같은 작업)
+    stores = {store.id: store for store in db.query(Store).filter(Store.id.in_(nearest))}
+    return [store_id for store_id in nearest if store_id in stores]
+
+
+def timed(func, args_list):
+    started = time.perf_counter()
+    results = [func(*args) for args in args_list]
+    return (time.perf_counter() - started) / len(args_list) * 1000, results
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    # app 모듈 import 전에 임시 DB 지정
+    os.environ["DATABASE_FILE"] = os.path.join(tempfile.mkdtemp(prefix="gyeomchae-bench-"), "bench.db")
+    import main  # noqa: F401 (테이블/공간 인덱스 생성)
+    from app.database import SessionLocal, engine
+    from app.geo import find_nearby_stores, find_stores_in_bounds, radius_bounds
+    from app.models import Store, StoreCategory
+
+    started = time.perf_counter()
+    seed(engine, count)
+    print(f"\n가상 가게 {count:,}개 등록 (트리거로 공간 인덱스 갱신 포함): {time.perf_counter() - started:.1f}s")
+
+    random.seed(7)
+    db = SessionLocal()
+    try:
+        print(f"\n{'검색':<26} {'인덱스 없음':>12} {'R*Tree':>10} {'배율':>6} {'평균 결과':>8}")
+        for radius in (300, 1000, 3000):
+            args = []
+            for _ in range(QUERIES):
+                lat = CENTER[0] + random.uniform(-SPREAD, SPREAD)
+                lng = CENTER[1] + random.uniform(-SPREAD, SPREAD)
+                category = random.choice([None, StoreCategory.CAFE])
+                args.append((lat, lng, category))
+            scan_ms, scan_results = timed(
+                lambda lat, lng, category: scan_query(db, radius_bounds(lat, lng, radius), lat, lng, category, 50, radius),
+                args,
+            )
+            tree_ms, tree_results = timed(
+                lambda lat, lng, category: [s.id for s, _ in find_nearby_stores(db, lat, lng, radius, category, 50)],
+                args,
+            )
+            assert scan_results == tree_results, f"반경 {radius}m 결과 불일치"
+            average = sum(map(len, tree_results)) / len(tree_results)
+            print(f"{f'반경 {radius}m (상위 50)':<26} {scan_ms:10.2f}ms {tree_ms:8.2f}ms {scan_ms / tree_ms:5.1f}x {average:8.1f}")
+
+        # 지도 화면 (약 2km x 1.5km)
+        args = []
+        for _ in range(QUERIES):
+            lat = CENTER[0] + random.uniform(-SPREAD, SPREAD)
+            lng = CENTER[1] + random.uniform(-SPREAD, SPREAD)
+            args.append((lat - 0.007, lng - 0.011, lat + 0.007, lng + 0.011))
+        scan_ms, scan_results = timed(
+            lambda s, w, n, e: scan_query(db, (s, w, n, e), (s + n) / 2, (w + e) / 2, None, 200),
+            args,
+        )
+        tree_ms, tree_results = timed(
+            lambda s, w, n, e: [store.id for store, _ in find_stores_in_bounds(db, s, w, n, e, limit=200)],
+            args,
+        )
+        assert scan_results == tree_results, "화면 영역 결과 불일치"
+        average = sum(map(len, tree_results)) / len(tree_results)
+        print(f"{'화면 영역 (상위 200)':<26} {scan_ms:10.2f}ms {tree_ms:8.2f}ms {scan_ms / tree_ms:5.1f}x {average:8.1f}")
+
+        # 트리거로 인덱스가 갱신되는지 확인
+        store = db.query(Store).filter(Store.is_active == True).first()
+        far = (CENTER[0] + 1.0, CENTER[1] + 1.0)
+        store.latitude, store.longitude = far
+        db.commit()
+        moved = [s.id for s, _ in find_nearby_stores(db, far[0], far[1], 10)] == [store.id]
+        store.is_active = False
+        db.commit()
+        deactivated = not find_nearby_stores(db, far[0], far[1], 10)
+        store.is_active = True
+        db.commit()
+        db.delete(store)
+        db.commit()
+        deleted = not find_nearby_stores(db, far[0], far[1], 10)
+        print(f"\n트리거 갱신 확인 - 위치 변경: {moved}, 비활성화: {deactivated}, 삭제: {deleted}")
+        assert moved and deactivated and deleted
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,188 @@
+"""
+가게 일괄 가져오기/내보내기 벤치마크 - 임시 DB에 가상 가게 파일을 가져오고 다시 내보냄
+
+1) ORM으로 한 건씩(조회 -> 추가/수정 -> 커밋) vs app.store_import (배치 트랜잭션 + 변경분만 반영)
+2) 같은 파일로 다시 가져오기 (모두 변경 없음), 1%만 바꾼 파일 가져오기 (바뀐 가게만 갱신)
+3) JSON / JSON Lines / CSV 형식별 가져오기
+4) GET /api/stores/export 스트리밍 내보내기 -> 내보낸 파일을 다시 가져오면 모두 변경 없음
+
+실행 (backend 폴더에서):
+    python scripts/bench_store_import.py [가게 수]
+"""
+import asyncio
+import csv
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(SCRIPTS_DIR))
+
+ORM_SAMPLE = 2000
+CATEGORIES = ["음식점", "카페", "술집", "기타", "RESTAURANT", "분식"]
+
+
+def make_records(total, seed=42):
+    random.seed(seed)
+    for index in range(total):
+        yield {
+            "name": f"가게{index}",
+            "category": random.choice(CATEGORIES),
+            "description": f"한림대 근처 가게 {index}번 - 대표 메뉴와 분위기 설명",
+            "menu": [f"메뉴{index % 50}", f"메뉴{index % 70}"],
+            "price_range": random.choice(["저렴", "보통", "비쌈"]),
+            "address": f"강원특별자치도 춘천시 한림대학길 {index}",
+            "latitude": round(37.88 + random.random() / 100, 6),
+            "longitude": round(127.74 + random.random() / 100, 6),
+        }
+
+
+def write_file(path, fmt, records):
+    with open(path, "w", encoding="utf-8", newline="") as file:
+        if fmt == "jsonl":
+            for record in records:
+                file.write(json.dumps(record, ensure_ascii=False) + "\n")
+        elif fmt == "json":
+            file.write('{"restaurants": [\n')
+            for index, record in enumerate(records):
+                file.write(("," if index else "") + json.dumps(record, ensure_ascii=False) + "\n")
+            file.write("]}\n")
+        else:
+            writer = None
+            for record in records:
+                if writer is None:
+                    writer = csv.DictWriter(file, fieldnames=list(record))
+                    writer.writeheader()
+                writer.writerow({**record, "menu": "|".join(record["menu"])})
+
+
+def orm_import(records):
+    """한 건씩 이름 + 주소로 조회해서 추가/수정 후 커밋"""
+    from app.database import SessionLocal
+    from app.models import Store
+    from app.store_import import normalize_record, source_key
+    db = SessionLocal()
+    try:
+        for item in records:
+            values = normalize_record(item)["values"]
+            key = source_key(values["name"], values.get("address"))
+            store = db.query(Store).filter(Store.source_key == key).first()
+            if store is None:
+                db.add(Store(source_key=key, **values))
+            else:
+                for column, value in values.items():
+                    setattr(store, column, value)
+            db.commit()
+    finally:
+        db.close()
+
+
+def timed(label, func, count):
+    started = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - started
+    print(f"{label:<44} {elapsed:7.2f}s {count / elapsed:10,.0f}건/s")
+    return result
+
+
+def summary(stats):
+    return f"추가 {stats.inserted:,} / 갱신 {stats.updated:,} / 변경 없음 {stats.unchanged:,} / 오류 {stats.invalid:,}"
+
+
+async def export_file(path, fmt):
+    import httpx
+    from app.auth import create_access_token
+    from main import app
+    token = create_access_token({"sub": "admin", "uid": 1, "role": "admin"})
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        async with client.stream("GET", "/api/stores/export", params={"format": fmt},
+                                 headers={"Authorization": f"Bearer {token}"}) as response:
+            response.raise_for_status()
+            with open(path, "wb") as file:
+                async for chunk in response.aiter_bytes():
+                    file.write(chunk)
+
+
+def main():
+    total = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    work_dir = tempfile.mkdtemp(prefix="gyeomchae-bench-")
+    # app 모듈 import 전에 임시 DB 지정 (WAL 등 production 설정)
+    os.environ["DATABASE_FILE"] = os.path.join(work_dir, "bench.db")
+    os.environ.setdefault("DATABASE_PROFILE", "production")
+    import main as server  # noqa: F401 (테이블/인덱스 생성)
+    from sqlalchemy import delete, func, insert, select
+    from app.catalog import restaurant_catalog
+    from app.database import engine
+    from app.models import Store, User
+    from app.store_import import import_store_file
+
+    with engine.begin() as conn:
+        conn.execute(insert(User).values(username="admin", hashed_password="-", role="ADMIN"))
+    paths = {fmt: os.path.join(work_dir, f"stores.{fmt}") for fmt in ("jsonl", "json", "csv")}
+    for fmt, path in paths.items():
+        write_file(path, fmt, make_records(total))
+    print(f"\n가상 가게 {total:,}개, 파일 크기 " +
+          ", ".join(f"{fmt} {os.path.getsize(path) / 1024 / 1024:.1f}MB" for fmt, path in paths.items()) + "\n")
+
+    # 1) ORM 한 건씩 (일부만 실행해서 비교)
+    started = time.perf_counter()
+    timed(f"ORM 한 건씩 ({ORM_SAMPLE:,}개)", lambda: orm_import(list(make_records(ORM_SAMPLE))), ORM_SAMPLE)
+    print(f"  {total:,}개 예상 {(time.perf_counter() - started) * total / ORM_SAMPLE:,.0f}s")
+    with engine.begin() as conn:
+        conn.execute(delete(Store))
+
+    # 1) 배치 가져오기
+    stats = timed(f"일괄 가져오기 jsonl ({total:,}개)", lambda: import_store_file(paths["jsonl"], "jsonl"), total)
+    print(f"  {summary(stats)}")
+    assert stats.inserted == total
+
+    # 2) 다시 가져오기 / 1%만 변경
+    stats = timed("같은 파일 다시 가져오기", lambda: import_store_file(paths["jsonl"], "jsonl"), total)
+    print(f"  {summary(stats)}")
+    assert stats.unchanged == total and stats.changed == 0
+    changed_path = os.path.join(work_dir, "changed.jsonl")
+    changed = 0
+
+    def edited():
+        nonlocal changed
+        for index, record in enumerate(make_records(total)):
+            if index % 100 == 0:
+                record["price_range"] = "특가"
+                changed += 1
+            yield record
+    write_file(changed_path, "jsonl", edited())
+    stats = timed("1%만 바꾼 파일 가져오기", lambda: import_store_file(changed_path, "jsonl"), total)
+    print(f"  {summary(stats)}")
+    assert stats.updated == changed and stats.unchanged == total - changed
+
+    # 3) 형식별 (빈 테이블에 가져오기)
+    print()
+    for fmt in ("json", "csv"):
+        with engine.begin() as conn:
+            conn.execute(delete(Store))
+        stats = timed(f"일괄 가져오기 {fmt} ({total:,}개)", lambda: import_store_file(paths[fmt], fmt), total)
+        assert stats.inserted == total, summary(stats)
+
+    # 4) 스트리밍 내보내기 -> 다시 가져오기
+    print()
+    for fmt in ("jsonl", "json", "csv"):
+        exported = os.path.join(work_dir, f"exported.{fmt}")
+        timed(f"내보내기 {fmt} (GET /api/stores/export)", lambda: asyncio.run(export_file(exported, fmt)), total)
+        stats = import_store_file(exported, fmt)
+        print(f"  {os.path.getsize(exported) / 1024 / 1024:.1f}MB -> 다시 가져오기: {summary(stats)}")
+        assert stats.unchanged == total and stats.changed == 0
+
+    restaurant_catalog.mark_stores_changed()
+    with engine.connect() as conn:
+        stores = conn.execute(select(func.count()).select_from(Store)).scalar()
+        categories = dict(conn.execute(select(Store.category, func.count()).group_by(Store.category)).all())
+    print(f"\n가게 {stores:,}개, 카테고리별 { {category.value: count for category, count in categories.items()} }, "
+          f"카탈로그 {len(restaurant_catalog.snapshot().restaurants):,}개")
+
+
+if __name__ == "__main__":
+    main()
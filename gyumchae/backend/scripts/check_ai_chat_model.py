@@ -0,0 +1,79 @@
+"""
+AI 채팅 모델 선택 동작 확인 - 로컬 가짜 Gemini 서버 사용 (오프라인)
+
+- 서버 시작(lifespan) 시 한 번만 모델을 확인하는지
+- 첫 후보가 없으면 다음 후보를 고르는지
+- 채팅 요청 중에는 모델 확인 호출이 없는지
+- 사용 중인 모델이 없어지면(404) 백그라운드에서 다시 골라 복구하는지
+
+실행 (backend 폴더에서):
+    python scripts/check_ai_chat_model.py [채팅 요청 수]
+"""
+import os
+import sys
+import tempfile
+import time
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(SCRIPTS_DIR))
+
+from fake_gemini import FakeGemini
+
+
+def wait_until(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.05)
+    return False
+
+
+def main():
+    requests = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    # 첫 후보(gemini-2.5-flash)는 없는 상태로 시작
+    fake = FakeGemini(available=["gemini-2.5-pro", "gemini-2.0-flash"]).start()
+
+    # app 모듈 import 전에 가짜 서버/임시 DB 지정
+    os.environ["GEMINI_API_KEY"] = "fake-key"
+    os.environ["GEMINI_API_ENDPOINT"] = fake.url
+    os.environ["GEMINI_REPROBE_INTERVAL"] = "0.2"
+    os.environ.pop("GEMINI_MODEL", None)
+    os.environ["DATABASE_FILE"] = os.path.join(tempfile.mkdtemp(prefix="gyeomchae-check-"), "check.db")
+
+    import warnings
+    warnings.filterwarnings("ignore")
+    from fastapi.testclient import TestClient
+    from main import app
+    from app.gemini import gemini_models
+
+    try:
+        with TestClient(app) as client:
+            status = client.get("/api/health").json()["ai_model"]
+            lookups = fake.counts["get_model"] + fake.counts["list_models"]
+            assert status["model"] == "gemini-2.5-pro", status
+            print(f"시작 시 선택된 모델: {status['model']} (모델 확인 호출 {lookups}회)")
+
+            started = time.perf_counter()
+            for _ in range(requests):
+                response = client.post("/api/ai-chat/", json={"message": "닭갈비 맛집 추천해줘"})
+                assert response.status_code == 200, response.text
+            elapsed = time.perf_counter() - started
+            assert fake.counts["get_model"] + fake.counts["list_models"] == lookups
+            print(f"채팅 {requests}건: 평균 {elapsed / requests * 1000:.1f}ms, 추가 모델 확인 호출 0회")
+            print(f"응답 예시: {response.json()['response']!r}")
+
+            # 사용 중인 모델이 사라짐 -> 404 -> 백그라운드 재확인
+            fake.available.discard("gemini-2.5-pro")
+            response = client.post("/api/ai-chat/", json={"message": "카페 추천해줘"})
+            assert response.status_code == 500, response.text
+            assert wait_until(lambda: gemini_models.model_name == "gemini-2.0-flash")
+            response = client.post("/api/ai-chat/", json={"message": "카페 추천해줘"})
+            assert response.status_code == 200, response.text
+            print(f"모델 404 후 재선택: {gemini_models.model_name} (총 확인 {gemini_models.probes}회)")
+    finally:
+        fake.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+AI 응답 Markdown 제거 결과 확인 - 골든 출력 비교
+
+scripts/markdown_golden.json 의 입력마다 strip_markdown()과 MarkdownStreamFilter(여러 청크 크기)의 결과가
+기준 구현(기존 chat()의 re.sub 7단계)으로 만든 기대 출력과 같은지 확인하고,
+무작위 입력으로도 한 번 더 비교한다.
+
+실행 (backend 폴더에서):
+    python scripts/check_markdown_filter.py            # 확인
+    python scripts/check_markdown_filter.py --update   # 기준 구현으로 기대 출력 다시 생성
+"""
+import json
+import os
+import random
+import re
+import sys
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(SCRIPTS_DIR))
+
+GOLDEN_FILE = os.path.join(SCRIPTS_DIR, "markdown_golden.json")
+CHUNK_SIZES = [1, 2, 3, 5, 8, 13, 64]
+FUZZ_CASES = 20000
+FUZZ_PIECES = [
+    "**굵게**", "*기울임*", "# ", "## 제목", "- ", "# - ", "`코드`", "[링크](http://x)", "\n", "\n\n\n",
+    "닭갈비", " ", "\t", "맛집 😊", "**# x**", "* 별", "-", "#", "[안내]", "(괄호)", "`", "[", "]", "(", ")",
+    "```\n", "](u)", "*",
+]
+
+
+def reference_strip(text):
+    """기존 chat()의 Markdown 제거 (규칙별 re.sub을 순서대로 적용)"""
+    text = re.sub(r'\*\*(.*?)\*\*', r'\1', text)
+    text = re.sub(r'\*(.*?)\*', r'\1', text)
+    text = re.sub(r'^#+\s+', '', text, flags=re.MULTILINE)
+    text = re.sub(r'^-\s+', '', text, flags=re.MULTILINE)
+    text = re.sub(r'`([^`]+)`', r'\1', text)
+    text = re.sub(r'\[([^\]]+)\]\([^\)]+\)', r'\1', text)
+    text = re.sub(r'\n{3,}', '\n\n', text)
+    return text
+
+
+def load_corpus():
+    with open(GOLDEN_FILE, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def stream(text, sizes):
+    from app.markdown_filter import MarkdownStreamFilter
+    markdown = MarkdownStreamFilter()
+    output, start, index = [], 0, 0
+    while start < len(text):
+        size = sizes[index % len(sizes)]
+        output.append(markdown.feed(text[start:start + size]))
+        start += size
+        index += 1
+    output.append(markdown.flush())
+    return "".join(output)
+
+
+def check(name, text, expected, failures):
+    from app.markdown_filter import strip_markdown
+    results = {"strip_markdown": strip_markdown(text)}
+    for size in CHUNK_SIZES:
+        results[f"stream({size})"] = stream(text, [size])
+    results["stream(random)"] = stream(text, [random.randint(1, 20) for _ in range(16)])
+    for method, result in results.items():
+        if result != expected:
+            failures.append((name, method, text, expected, result))
+
+
+def update():
+    corpus = load_corpus()
+    for case in corpus:
+        case["expected"] = reference_strip(case["input"])
+    with open(GOLDEN_FILE, "w", encoding="utf-8") as f:
+        json.dump(corpus, f, ensure_ascii=False, indent=2)
+        f.write("\n")
+    print(f"✅ 기대 출력 갱신: {len(corpus)}건")
+
+
+def main():
+    if "--update" in sys.argv:
+        return update()
+
+    random.seed(42)
+    failures = []
+    corpus = load_corpus()
+    for case in corpus:
+        if reference_strip(case["input"]) != case["expected"]:
+            failures.append((case["name"], "reference", case["input"], case["expected"], reference_strip(case["input"])))
+        check(case["name"], case["input"], case["expected"], failures)
+    print(f"골든 출력 {len(corpus)}건 x {len(CHUNK_SIZES) + 2}가지 방식 확인")
+
+    for number in range(FUZZ_CASES):
+        text = "".join(random.choice(FUZZ_PIECES) for _ in range(random.randint(1, 25)))
+        check(f"fuzz-{number}", text, reference_strip(text), failures)
+    print(f"무작위 입력 {FUZZ_CASES}건 확인")
+
+    for name, method, text, expected, result in failures[:10]:
+        print(f"❌ {name} [{method}]\n   입력: {text!r}\n   기대: {expected!r}\n   결과: {result!r}")
+    if failures:
+        print(f"❌ 불일치 {len(failures)}건")
+        sys.exit(1)
+    print("✅ 모두 일치")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+"""
+로컬 가짜 Gemini API 서버 (오프라인 테스트용)
+
+google-generativeai의 REST 전송이 호출하는 엔드포인트만 흉내 낸다.
+- GET  /v1beta/models/{name}               모델 정보 (available에 없으면 404)
+- GET  /v1beta/models                      모델 목록
+- POST /v1beta/models/{name}:generateContent
+- POST /v1beta/models/{name}:streamGenerateContent  (응답을 chunk_size 글자씩 나눠 전송)
+max_concurrent를 지정하면 동시 생성 요청이 그보다 많을 때 429(RESOURCE_EXHAUSTED)로 응답한다.
+
+백엔드를 이 서버에 연결하려면 GEMINI_API_KEY에 아무 값이나,
+GEMINI_API_ENDPOINT=http://127.0.0.1:{포트} 를 지정한다.
+
+실행 (backend 폴더에서):
+    python scripts/fake_gemini.py [포트]
+"""
+import json
+import sys
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+DEFAULT_REPLY = "**한림대 앞** 추천 가게입니다 😊\n\n- 우성닭갈비: 닭갈비가 유명해요"
+
+
+class FakeGemini:
+    """
+    가짜 서버 상태 - 사용 가능한 모델, 응답 내용, 호출 횟수
+    delay는 첫 청크까지의 시간, chunk_delay는 청크 사이 시간 (스트리밍이 아니면 전체 시간을 기다린 뒤 응답)
+    """
+
+    def __init__(self, available=None, reply=DEFAULT_REPLY, delay=0.0, chunk_size=8, chunk_delay=0.0,
+                 max_concurrent=None):
+        self.available = set(available or ["gemini-2.5-flash"])
+        self.reply = reply
+        self.delay = delay
+        self.chunk_size = chunk_size
+        self.chunk_delay = chunk_delay
+        self.max_concurrent = max_concurrent
+        self.counts = Counter()
+        self.prompts = []
+        self.active = 0
+        self.max_active = 0
+        self._lock = threading.Lock()
+        self._server = None
+
+    def chunks(self):
+        return [self.reply[i:i + self.chunk_size] for i in range(0, len(self.reply), self.chunk_size)]
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self._server.server_port}"
+
+    def start(self, port=0):
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def _send(self, status, payload):
+                body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json; charset=UTF-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def _not_found(self, name):
+                self._send(404, {"error": {"code": 404, "message": f"models/{name} is not found", "status": "NOT_FOUND"}})
+
+            def do_GET(self):
+                path = self.path.split("?")[0]
+                if path == "/v1beta/models":
+                    fake.counts["list_models"] += 1
+                    models = [
+                        {"name": f"models/{name}", "supportedGenerationMethods": ["generateContent"]}
+                        for name in sorted(fake.available)
+                    ]
+                    return self._send(200, {"models": models})
+                name = path.rsplit("/", 1)[-1]
+                fake.counts["get_model"] += 1
+                if name not in fake.available:
+                    return self._not_found(name)
+                self._send(200, {"name": f"models/{name}", "supportedGenerationMethods": ["generateContent"]})
+
+            def do_POST(self):
+                path = self.path.split("?")[0]
+                name = path.rsplit("/", 1)[-1].split(":")[0]
+                length = int(self.headers.get("Content-Length", 0))
+                request = json.loads(self.rfile.read(length) or b"{}")
+                streaming = path.endswith(":streamGenerateContent")
+                fake.counts["stream" if streaming else "generate"] += 1
+                if name not in fake.available:
+                    return self._not_found(name)
+                with fake._lock:
+                    if fake.max_concurrent is not None and fake.active >= fake.max_concurrent:
+                        fake.counts["rate_limited"] += 1
+                        limited = True
+                    else:
+                        fake.active += 1
+                        fake.max_active = max(fake.max_active, fake.active)
+                        limited = False
+                if limited:
+                    return self._send(429, {"error": {"code": 429, "message": "Resource has been exhausted", "status": "RESOURCE_EXHAUSTED"}})
+                try:
+                    self._generate(request, streaming)
+                finally:
+                    with fake._lock:
+                        fake.active -= 1
+
+            def _generate(self, request, streaming):
+                fake.prompts.append(request["contents"][-1]["parts"][0]["text"])
+                chunks = fake.chunks()
+                time.sleep(fake.delay)
+                if not streaming:
+                    time.sleep(fake.chunk_delay * max(len(chunks) - 1, 0))
+                    return self._send(200, self._candidate(fake.reply))
+
+                # REST 스트리밍 형식: JSON 배열을 원소 단위로 흘려보냄
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json; charset=UTF-8")
+                self.send_header("Connection", "close")
+                self.end_headers()
+                for index, text in enumerate(chunks):
+                    if index:
+                        time.sleep(fake.chunk_delay)
+                    prefix = "[" if index == 0 else ",\r\n"
+                    self.wfile.write((prefix + json.dumps(self._candidate(text), ensure_ascii=False)).encode("utf-8"))
+                    self.wfile.flush()
+                self.wfile.write(b"]")
+                self.close_connection = True
+
+            @staticmethod
+            def _candidate(text):
+                return {
+                    "candidates": [{
+                        "content": {"role": "model", "parts": [{"text": text}]},
+                        "finishReason": "STOP",
+                        "index": 0,
+                    }]
+                }
+
+            def log_message(self, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", port), Handler)
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def shutdown(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+
+
+if __name__ == "__main__":
+    port = int(sys.argv[1]) if len(sys.argv) > 1 else 8765
+    fake = FakeGemini().start(port)
+    print(f"가짜 Gemini 서버 실행 중: {fake.url} (Ctrl+C로 종료)")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        fake.shutdown()
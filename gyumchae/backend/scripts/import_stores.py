@@ -0,0 +1,71 @@
+"""
+가게 일괄 가져오기 - restaurants.json / JSON Lines / CSV 파일을 stores 테이블에 반영
+
+key(없으면 id, 둘 다 없으면 이름 + 주소)로 기존 가게를 찾아 바뀐 가게만 갱신하고 없는 가게는 추가한다.
+같은 파일로 다시 실행하면 바뀐 레코드만 반영되므로 여러 번 실행해도 된다.
+실행 중인 서버의 카탈로그(AI 채팅 프롬프트)는 재시작하거나 POST /api/stores/import로 가져와야 바로 반영된다.
+
+실행 (backend 폴더에서):
+    python scripts/import_stores.py [파일 ...] [--format json|jsonl|csv] [--batch 2000] [--dry-run]
+    (파일을 지정하지 않으면 restaurants.json)
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.catalog import restaurant_catalog
+from app.database import DATABASE_FILE, Base, engine
+from app.geo import ensure_store_location_index
+from app.fulltext import ensure_fulltext_index
+from app.migrations import upgrade_schema
+from app.store_import import STORE_FORMATS, STORE_IMPORT_BATCH, detect_format, import_store_file
+
+
+def main():
+    parser = argparse.ArgumentParser(description="가게 일괄 가져오기")
+    parser.add_argument("files", nargs="*", help="가져올 파일 (기본: restaurants.json)")
+    parser.add_argument("--format", choices=STORE_FORMATS, help="파일 형식 (기본: 확장자로 판단)")
+    parser.add_argument("--batch", type=int, default=STORE_IMPORT_BATCH, help="한 트랜잭션에서 처리할 레코드 수")
+    parser.add_argument("--dry-run", action="store_true", help="반영하지 않고 바뀔 가게 수만 확인")
+    args = parser.parse_args()
+
+    # 서버를 한 번도 실행하지 않은 DB에서도 동작하도록 테이블/인덱스 준비
+    Base.metadata.create_all(bind=engine)
+    added_columns = upgrade_schema(engine)
+    if added_columns:
+        print(f"✓ 스키마 업그레이드: {', '.join(added_columns)}")
+    ensure_store_location_index(engine)
+    ensure_fulltext_index(engine)
+
+    files = args.files
+    if not files:
+        path = restaurant_catalog.load().path
+        if path is None:
+            sys.exit("❌ restaurants.json 파일을 찾을 수 없습니다. 가져올 파일을 지정해주세요.")
+        files = [str(path)]
+
+    failed = False
+    for path in files:
+        fmt = args.format or detect_format(path)
+        if fmt is None:
+            sys.exit(f"❌ 형식을 알 수 없습니다: {path} (--format {'|'.join(STORE_FORMATS)})")
+        started = time.perf_counter()
+        stats = import_store_file(path, fmt, batch_size=args.batch, dry_run=args.dry_run)
+        elapsed = time.perf_counter() - started
+        prefix = "[dry-run] " if args.dry_run else ""
+        print(f"✓ {prefix}{path} -> {DATABASE_FILE}: 추가 {stats.inserted:,} / 갱신 {stats.updated:,} / "
+              f"변경 없음 {stats.unchanged:,} / 중복 {stats.duplicates:,} / 오류 {stats.invalid:,} ({elapsed:.1f}s)")
+        for error in stats.errors:
+            print(f"  ⚠️ {error}")
+        if stats.failure:
+            print(f"  ❌ {stats.failure}")
+            failed = True
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
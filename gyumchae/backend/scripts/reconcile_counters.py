@@ -0,0 +1,35 @@
+"""
+게시글 좋아요/댓글 카운터 백필 및 정합성 복구
+
+post_likes, comments 테이블을 기준으로 posts.like_count / comment_count를 다시 계산한다.
+기존 DB를 업그레이드했거나 카운터가 어긋났다고 의심될 때 실행.
+
+실행 (backend 폴더에서):
+    python scripts/reconcile_counters.py
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.counters import reconcile_post_counters
+from app.database import DATABASE_FILE, Base, SessionLocal, engine
+from app.migrations import upgrade_schema
+
+
+def main():
+    # 서버를 한 번도 실행하지 않은 DB에서도 동작하도록 테이블 준비
+    Base.metadata.create_all(bind=engine)
+    added_columns = upgrade_schema(engine)
+    if added_columns:
+        print(f"✓ 스키마 업그레이드: {', '.join(added_columns)}")
+    db = SessionLocal()
+    try:
+        updated = reconcile_post_counters(db)
+    finally:
+        db.close()
+    print(f"✓ {DATABASE_FILE}: 카운터가 갱신된 게시글 {updated}개")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,5 @@
 import React, { useState, useEffect, useRef } from 'react';
+import { getToken } from '../utils/api';
 import './AIChat.css';
 
 const API_BASE_URL = process.env.REACT_APP_API_URL || 'http://localhost:8000';
@@ -12,6 +13,7 @@ const AIChat = () => {
   ]);
   const [inputValue, setInputValue] = useState('');
   const [loading, setLoading] = useState(false);
+  const [streaming, setStreaming] = useState(false);
   const messagesEndRef = useRef(null);
   const chatContainerRef = useRef(null);
 
@@ -24,23 +26,12 @@ const AIChat = () => {
     messagesEndRef.current?.scrollIntoView({ behavior: 'smooth' });
   };
 
-  // Markdown 제거 함수
-  const removeMarkdown = (text) => {
-    if (!text) return text;
-    let cleaned = text;
-    // **bold** 제거
-    cleaned = cleaned.replace(/\*\*(.*?)\*\*/g, '$1');
-    // *italic* 제거
-    cleaned = cleaned.replace(/\*(.*?)\*/g, '$1');
-    // # 헤더 제거
-    cleaned = cleaned.replace(/^#+\s+/gm, '');
-    // - 리스트 제거
-    cleaned = cleaned.replace(/^-\s+/gm, '');
-    // `코드` 제거
-    cleaned = cleaned.replace(/`([^`]+)`/g, '$1');
-    // 링크 [text](url) 제거
-    cleaned = cleaned.replace(/\[([^\]]+)\]\([^\)]+\)/g, '$1');
-    return cleaned;
+  // 마지막 AI 메시지에 스트리밍으로 받은 텍스트 이어 붙이기
+  const appendToLastMessage = (text) => {
+    setMessages(prev => {
+      const last = prev[prev.length - 1];
+      return [...prev.slice(0, -1), { ...last, text: last.text + text }];
+    });
   };
 
   const handleSend = async (e) => {
@@ -55,11 +46,16 @@ const AIChat = () => {
     setLoading(true);
 
     try {
-      const response = await fetch(`${API_BASE_URL}/api/ai-chat/`, {
+      // 응답을 생성되는 대로 받기 (Server-Sent Events, Markdown은 서버에서 제거)
+      // 로그인한 경우 토큰 전송 (서버 대기열에서 사용자별로 공평하게 처리)
+      const headers = { 'Content-Type': 'application/json' };
+      const token = getToken();
+      if (token) {
+        headers['Authorization'] = `Bearer ${token}`;
+      }
+      const response = await fetch(`${API_BASE_URL}/api/ai-chat/stream`, {
         method: 'POST',
-        headers: {
-          'Content-Type': 'application/json',
-        },
+        headers,
         body: JSON.stringify({ message: userMessage }),
       });
 
@@ -68,10 +64,44 @@ const AIChat = () => {
         throw new Error(errorData.detail || `서버 오류 (${response.status})`);
       }
 
-      const data = await response.json();
-      // Markdown 제거 후 메시지 추가
-      const cleanedResponse = removeMarkdown(data.response);
-      setMessages(prev => [...prev, { type: 'ai', text: cleanedResponse }]);
+      const reader = response.body.getReader();
+      const decoder = new TextDecoder();
+      let buffer = '';
+      let started = false;
+      let finished = false;
+
+      while (!finished) {
+        const { value, done } = await reader.read();
+        if (done) break;
+        buffer += decoder.decode(value, { stream: true });
+
+        // 이벤트는 빈 줄로 구분
+        const events = buffer.split('\n\n');
+        buffer = events.pop();
+        for (const rawEvent of events) {
+          const lines = rawEvent.split('\n');
+          const eventLine = lines.find(line => line.startsWith('event: '));
+          const dataLine = lines.find(line => line.startsWith('data: '));
+          const eventType = eventLine ? eventLine.slice(7) : 'message';
+          const data = dataLine ? JSON.parse(dataLine.slice(6)) : {};
+
+          if (eventType === 'error') {
+            throw new Error(data.detail || 'AI 응답을 생성할 수 없습니다.');
+          }
+          if (eventType === 'done') {
+            finished = true;
+            break;
+          }
+          if (!started) {
+            // 첫 텍스트가 오면 입력 중 표시 대신 AI 메시지 표시
+            started = true;
+            setStreaming(true);
+            setMessages(prev => [...prev, { type: 'ai', text: data.text }]);
+          } else {
+            appendToLastMessage(data.text);
+          }
+        }
+      }
     } catch (error) {
       console.error('AI 채팅 오류:', error);
       const errorMessage = error.message || '알 수 없는 오류가 발생했습니다.';
@@ -81,6 +111,7 @@ const AIChat = () => {
       }]);
     } finally {
       setLoading(false);
+      setStreaming(false);
     }
   };
 
@@ -106,7 +137,7 @@ const AIChat = () => {
               </div>
             </div>
           ))}
-          {loading && (
+          {loading && !streaming && (
             <div className="message ai">
               <div className="message-bubble loading">
                 <div className="typing-indicator">
@@ -393,114 +393,95 @@ const Map = () => {
 
   // 네이버 검색 API 결과 처리 함수
   const handleSearchApiResults = async (items, mapInstance) => {
-    if (!window.naver || !window.naver.maps || !window.naver.maps.Service) {
-      console.error("네이버 지도 API Service를 사용할 수 없습니다.");
+    if (!window.naver || !window.naver.maps) {
+      console.error("네이버 지도 API를 사용할 수 없습니다.");
       return;
     }
 
+    // 검색 결과 주소를 백엔드에서 한 번에 좌표로 변환 (중복 제거, 가게/캐시 좌표 재사용)
+    const { mapAPI } = await import("../utils/api");
+    let locations = [];
+    try {
+      locations = await mapAPI.geocode(
+        items.map((item) => item.address || item.roadAddress || "")
+      );
+    } catch (error) {
+      console.error("주소 좌표 변환 실패:", error.message);
+    }
+
     const bounds = new window.naver.maps.LatLngBounds();
     const newMarkers = [];
     const newPlaces = [];
-    let processedCount = 0;
-    const totalItems = items.length;
 
-    // 각 검색 결과의 주소를 좌표로 변환
     items.forEach((item, index) => {
-      const address = item.address || item.roadAddress;
-      if (!address) {
-        processedCount++;
-        if (processedCount === totalItems && newMarkers.length > 0) {
-          mapInstance.fitBounds(bounds);
-          setMarkers(newMarkers);
-          setPlaces(newPlaces);
-          console.log("✅ 검색 결과 표시 완료:", newMarkers.length, "개");
-        }
+      const location = locations[index];
+      if (!location || location.latitude == null || location.longitude == null) {
         return;
       }
 
-      window.naver.maps.Service.geocode(
-        {
-          query: address,
-        },
-        (status, geoResponse) => {
-          processedCount++;
-
-          if (
-            status === window.naver.maps.Service.Status.OK &&
-            geoResponse &&
-            geoResponse.result &&
-            geoResponse.result.items &&
-            geoResponse.result.items.length > 0
-          ) {
-            const point = geoResponse.result.items[0].point;
-            const position = new window.naver.maps.LatLng(point.y, point.x);
-            bounds.extend(position);
-
-            const marker = new window.naver.maps.Marker({
-              position: position,
-              map: mapInstance,
-              title: item.title.replace(/<[^>]*>/g, ""),
-            });
-
-            const infoWindow = new window.naver.maps.InfoWindow({
-              content: `
-              <div style="padding: 12px; min-width: 200px; font-family: 'Gmarket Sans TTF', sans-serif;">
-                <div style="font-weight: bold; margin-bottom: 6px; font-size: 15px; color: #002546;">${item.title.replace(
-                  /<[^>]*>/g,
-                  ""
-                )}</div>
-                <div style="font-size: 12px; color: #666; margin-bottom: 4px;">${item.address.replace(
-                  /<[^>]*>/g,
-                  ""
-                )}</div>
-                ${
-                  item.category
-                    ? `<div style="font-size: 11px; color: #999;">${item.category}</div>`
-                    : ""
-                }
-                ${
-                  item.telephone
-                    ? `<div style="font-size: 11px; color: #999; margin-top: 4px;">📞 ${item.telephone}</div>`
-                    : ""
-                }
-              </div>
-            `,
-            });
-
-            window.naver.maps.Event.addListener(marker, "click", () => {
-              markers.forEach((m) => {
-                if (m.infoWindow) m.infoWindow.close();
-              });
-              infoWindow.open(mapInstance, marker);
-            });
-
-            marker.infoWindow = infoWindow;
-            newMarkers.push(marker);
-            newPlaces.push({
-              id: index,
-              name: item.title.replace(/<[^>]*>/g, ""),
-              address: item.address.replace(/<[^>]*>/g, ""),
-              phone: item.telephone || "",
-              category: item.category || "",
-              rating: (Math.random() * 2 + 3).toFixed(1),
-              position: { lat: point.y, lng: point.x },
-            });
-          }
+      const point = { x: location.longitude, y: location.latitude };
+      const position = new window.naver.maps.LatLng(point.y, point.x);
+      bounds.extend(position);
 
-          // 모든 항목 처리 완료 시 지도 업데이트
-          if (processedCount === totalItems) {
-            if (newMarkers.length > 0) {
-              mapInstance.fitBounds(bounds);
-              setMarkers(newMarkers);
-              setPlaces(newPlaces);
-              console.log("✅ 검색 결과 표시 완료:", newMarkers.length, "개");
-            } else {
-              console.warn("좌표 변환 실패 - 주소를 확인할 수 없습니다.");
+      const marker = new window.naver.maps.Marker({
+        position: position,
+        map: mapInstance,
+        title: item.title.replace(/<[^>]*>/g, ""),
+      });
+
+      const infoWindow = new window.naver.maps.InfoWindow({
+        content: `
+          <div style="padding: 12px; min-width: 200px; font-family: 'Gmarket Sans TTF', sans-serif;">
+            <div style="font-weight: bold; margin-bottom: 6px; font-size: 15px; color: #002546;">${item.title.replace(
+              /<[^>]*>/g,
+              ""
+            )}</div>
+            <div style="font-size: 12px; color: #666; margin-bottom: 4px;">${item.address.replace(
+              /<[^>]*>/g,
+              ""
+            )}</div>
+            ${
+              item.category
+                ? `<div style="font-size: 11px; color: #999;">${item.category}</div>`
+                : ""
             }
-          }
-        }
-      );
+            ${
+              item.telephone
+                ? `<div style="font-size: 11px; color: #999; margin-top: 4px;">📞 ${item.telephone}</div>`
+                : ""
+            }
+          </div>
+        `,
+      });
+
+      window.naver.maps.Event.addListener(marker, "click", () => {
+        markers.forEach((m) => {
+          if (m.infoWindow) m.infoWindow.close();
+        });
+        infoWindow.open(mapInstance, marker);
+      });
+
+      marker.infoWindow = infoWindow;
+      newMarkers.push(marker);
+      newPlaces.push({
+        id: index,
+        name: item.title.replace(/<[^>]*>/g, ""),
+        address: item.address.replace(/<[^>]*>/g, ""),
+        phone: item.telephone || "",
+        category: item.category || "",
+        rating: (Math.random() * 2 + 3).toFixed(1),
+        position: { lat: point.y, lng: point.x },
+      });
     });
+
+    if (newMarkers.length > 0) {
+      mapInstance.fitBounds(bounds);
+      setMarkers(newMarkers);
+      setPlaces(newPlaces);
+      console.log("✅ 검색 결과 표시 완료:", newMarkers.length, "개");
+    } else {
+      console.warn("좌표 변환 실패 - 주소를 확인할 수 없습니다.");
+    }
   };
 
   // Geocoder 결과 처리 함수
@@ -127,5 +127,11 @@ export const mapAPI = {
     const params = new URLSearchParams({ query, display: display.toString(), start: start.toString() });
     return fetchAPI(`/api/map/search?${params}`);
   },
+  geocode: async (addresses) => {
+    return fetchAPI('/api/map/geocode', {
+      method: 'POST',
+      body: JSON.stringify({ addresses }),
+    });
+  },
 };
 